@@ -4522,7 +4522,7 @@ When the user mentions any of these topics, run the corresponding script FIRST b
 
 | Topic | First command |
 |---|---|
-| portfolio, positions, P&L, balance, trades | \\\`python3 ~/scripts/polymarket-portfolio.py summary\\\` |
+| portfolio, positions, P&L, balance, trades | \\\`python3 ~/scripts/portfolio-all.py summary\\\` |
 | polymarket, prediction market, odds, betting | \\\`python3 ~/scripts/polymarket-setup-creds.py status\\\` |
 | kalshi | \\\`python3 ~/scripts/kalshi-portfolio.py summary\\\` |
 | browse markets, trending, what markets | \\\`python3 ~/scripts/polymarket-search.py trending\\\` |
@@ -7559,11 +7559,14 @@ export async function configureOpenClaw(
       const financeGuide = fs.readFileSync(path.join(financeSkillDir, "references", "finance-guide.md"), "utf-8");
       const marketDataSh = fs.readFileSync(path.join(financeSkillDir, "assets", "market-data.sh"), "utf-8");
       const marketAnalysisPy = fs.readFileSync(path.join(financeSkillDir, "assets", "market-analysis.py"), "utf-8");
+      // Shared per-day API budget counters (also imported by competitive-intel.py)
+      const rateBudgetPy = fs.readFileSync(path.join(process.cwd(), "skills", "shared", "scripts", "rate_budget.py"), "utf-8");
 
       const financeSkillB64 = Buffer.from(financeSkillMd, "utf-8").toString("base64");
       const financeGuideB64 = Buffer.from(financeGuide, "utf-8").toString("base64");
       const marketDataB64 = Buffer.from(marketDataSh, "utf-8").toString("base64");
       const marketAnalysisB64 = Buffer.from(marketAnalysisPy, "utf-8").toString("base64");
+      const rateBudgetB64 = Buffer.from(rateBudgetPy, "utf-8").toString("base64");
 
       scriptParts.push(
         '# Deploy Financial Analysis skill',
@@ -7574,6 +7577,7 @@ export async function configureOpenClaw(
         `echo '${financeGuideB64}' | base64 -d > "$FINANCE_SKILL_DIR/references/finance-guide.md"`,
         `echo '${marketDataB64}' | base64 -d > "$HOME/scripts/market-data.sh"`,
         `echo '${marketAnalysisB64}' | base64 -d > "$HOME/scripts/market-analysis.py"`,
+        `echo '${rateBudgetB64}' | base64 -d > "$HOME/scripts/rate_budget.py"`,
         'chmod +x "$HOME/scripts/market-data.sh" "$HOME/scripts/market-analysis.py"',
         ''
       );
@@ -7610,11 +7614,16 @@ export async function configureOpenClaw(
       const intelGuide = fs.readFileSync(path.join(intelSkillDir, "references", "intel-guide.md"), "utf-8");
       const intelClientSh = fs.readFileSync(path.join(intelSkillDir, "assets", "competitive-intel.sh"), "utf-8");
       const intelAnalysisPy = fs.readFileSync(path.join(intelSkillDir, "assets", "competitive-intel.py"), "utf-8");
+      const intelRateBudgetPy = fs.readFileSync(path.join(process.cwd(), "skills", "shared", "scripts", "rate_budget.py"), "utf-8");
+      // Shared Brave Search client (also used by social-content.py trends)
+      const braveClientPy = fs.readFileSync(path.join(process.cwd(), "skills", "shared", "scripts", "brave_client.py"), "utf-8");
 
       const intelSkillB64 = Buffer.from(intelSkillMd, "utf-8").toString("base64");
       const intelGuideB64 = Buffer.from(intelGuide, "utf-8").toString("base64");
       const intelClientB64 = Buffer.from(intelClientSh, "utf-8").toString("base64");
       const intelAnalysisB64 = Buffer.from(intelAnalysisPy, "utf-8").toString("base64");
+      const intelRateBudgetB64 = Buffer.from(intelRateBudgetPy, "utf-8").toString("base64");
+      const braveClientB64 = Buffer.from(braveClientPy, "utf-8").toString("base64");
 
       scriptParts.push(
         '# Deploy Competitive Intelligence skill',
@@ -7628,6 +7637,8 @@ export async function configureOpenClaw(
         `echo '${intelGuideB64}' | base64 -d > "$INTEL_SKILL_DIR/references/intel-guide.md"`,
         `echo '${intelClientB64}' | base64 -d > "$HOME/scripts/competitive-intel.sh"`,
         `echo '${intelAnalysisB64}' | base64 -d > "$HOME/scripts/competitive-intel.py"`,
+        `echo '${intelRateBudgetB64}' | base64 -d > "$HOME/scripts/rate_budget.py"`,
+        `echo '${braveClientB64}' | base64 -d > "$HOME/scripts/brave_client.py"`,
         'chmod +x "$HOME/scripts/competitive-intel.sh" "$HOME/scripts/competitive-intel.py"',
         ''
       );
@@ -7712,11 +7723,14 @@ export async function configureOpenClaw(
       const ecomGuide = fs.readFileSync(path.join(ecomSkillDir, "references", "ecommerce-guide.md"), "utf-8");
       const ecomOpsPy = fs.readFileSync(path.join(ecomSkillDir, "assets", "ecommerce-ops.py"), "utf-8");
       const ecomSetupSh = fs.readFileSync(path.join(ecomSkillDir, "assets", "ecommerce-setup.sh"), "utf-8");
+      // Shared token bucket used to pace SP-API calls by usage plan
+      const ecomRateBudgetPy = fs.readFileSync(path.join(process.cwd(), "skills", "shared", "scripts", "rate_budget.py"), "utf-8");
 
       const ecomSkillB64 = Buffer.from(ecomSkillMd, "utf-8").toString("base64");
       const ecomGuideB64 = Buffer.from(ecomGuide, "utf-8").toString("base64");
       const ecomOpsB64 = Buffer.from(ecomOpsPy, "utf-8").toString("base64");
       const ecomSetupB64 = Buffer.from(ecomSetupSh, "utf-8").toString("base64");
+      const ecomRateBudgetB64 = Buffer.from(ecomRateBudgetPy, "utf-8").toString("base64");
 
       scriptParts.push(
         '# Deploy E-Commerce & Marketplace skill (BYOK — no platform keys)',
@@ -7724,10 +7738,12 @@ export async function configureOpenClaw(
         'mkdir -p "$ECOM_SKILL_DIR/references" "$ECOM_SKILL_DIR/assets" "$HOME/scripts"',
         'mkdir -p "$HOME/.openclaw/workspace/ecommerce/reports"',
         'mkdir -p "$HOME/.openclaw/config"',
+        'mkdir -p -m 700 "$HOME/.openclaw/cache/amazon-sp-api"',
         `echo '${ecomSkillB64}' | base64 -d > "$ECOM_SKILL_DIR/SKILL.md"`,
         `echo '${ecomGuideB64}' | base64 -d > "$ECOM_SKILL_DIR/references/ecommerce-guide.md"`,
         `echo '${ecomOpsB64}' | base64 -d > "$HOME/scripts/ecommerce-ops.py"`,
         `echo '${ecomSetupB64}' | base64 -d > "$HOME/scripts/ecommerce-setup.sh"`,
+        `echo '${ecomRateBudgetB64}' | base64 -d > "$HOME/scripts/rate_budget.py"`,
         'chmod +x "$HOME/scripts/ecommerce-ops.py"',
         'chmod +x "$HOME/scripts/ecommerce-setup.sh"',
         ''
@@ -8069,6 +8085,10 @@ export async function configureOpenClaw(
       const kalshiPositions = fs.readFileSync(path.join(predSkillDir, "scripts", "kalshi-positions.py"), "utf-8");
       const kalshiPortfolio = fs.readFileSync(path.join(predSkillDir, "scripts", "kalshi-portfolio.py"), "utf-8");
       const kalshiBrowse = fs.readFileSync(path.join(predSkillDir, "scripts", "kalshi-browse.py"), "utf-8");
+      const kalshiClient = fs.readFileSync(path.join(predSkillDir, "scripts", "kalshi-client.py"), "utf-8");
+      const polyJournal = fs.readFileSync(path.join(predSkillDir, "scripts", "polymarket-journal.py"), "utf-8");
+      const polyChain = fs.readFileSync(path.join(predSkillDir, "scripts", "polymarket-chain.py"), "utf-8");
+      const portfolioAll = fs.readFileSync(path.join(predSkillDir, "scripts", "portfolio-all.py"), "utf-8");
       const polySearch = fs.readFileSync(path.join(predSkillDir, "scripts", "polymarket-search.py"), "utf-8");
       const polySetupCreds = fs.readFileSync(path.join(predSkillDir, "scripts", "polymarket-setup-creds.py"), "utf-8");
       const polyTrade = fs.readFileSync(path.join(predSkillDir, "scripts", "polymarket-trade.py"), "utf-8");
@@ -8090,6 +8110,10 @@ export async function configureOpenClaw(
       const kalshiPositionsB64 = Buffer.from(kalshiPositions, "utf-8").toString("base64");
       const kalshiPortfolioB64 = Buffer.from(kalshiPortfolio, "utf-8").toString("base64");
       const kalshiBrowseB64 = Buffer.from(kalshiBrowse, "utf-8").toString("base64");
+      const kalshiClientB64 = Buffer.from(kalshiClient, "utf-8").toString("base64");
+      const polyJournalB64 = Buffer.from(polyJournal, "utf-8").toString("base64");
+      const polyChainB64 = Buffer.from(polyChain, "utf-8").toString("base64");
+      const portfolioAllB64 = Buffer.from(portfolioAll, "utf-8").toString("base64");
       const polySearchB64 = Buffer.from(polySearch, "utf-8").toString("base64");
       const polySetupCredsB64 = Buffer.from(polySetupCreds, "utf-8").toString("base64");
       const polyTradeB64 = Buffer.from(polyTrade, "utf-8").toString("base64");
@@ -8116,6 +8140,10 @@ export async function configureOpenClaw(
         `echo '${kalshiPositionsB64}' | base64 -d > "$HOME/scripts/kalshi-positions.py"`,
         `echo '${kalshiPortfolioB64}' | base64 -d > "$HOME/scripts/kalshi-portfolio.py"`,
         `echo '${kalshiBrowseB64}' | base64 -d > "$HOME/scripts/kalshi-browse.py"`,
+        `echo '${kalshiClientB64}' | base64 -d > "$HOME/scripts/kalshi-client.py"`,
+        `echo '${polyJournalB64}' | base64 -d > "$HOME/scripts/polymarket-journal.py"`,
+        `echo '${polyChainB64}' | base64 -d > "$HOME/scripts/polymarket-chain.py"`,
+        `echo '${portfolioAllB64}' | base64 -d > "$HOME/scripts/portfolio-all.py"`,
         `echo '${polySearchB64}' | base64 -d > "$HOME/scripts/polymarket-search.py"`,
         `echo '${polySetupCredsB64}' | base64 -d > "$HOME/scripts/polymarket-setup-creds.py"`,
         `echo '${polyTradeB64}' | base64 -d > "$HOME/scripts/polymarket-trade.py"`,
@@ -8123,7 +8151,7 @@ export async function configureOpenClaw(
         `echo '${polyPortfolioB64}' | base64 -d > "$HOME/scripts/polymarket-portfolio.py"`,
         `echo '${polyPositionsB64}' | base64 -d > "$HOME/scripts/polymarket-positions.py"`,
         `echo '${polyVerifyB64}' | base64 -d > "$HOME/scripts/polymarket-verify.py"`,
-        'chmod +x "$HOME/scripts/kalshi-setup.py" "$HOME/scripts/kalshi-trade.py" "$HOME/scripts/kalshi-positions.py" "$HOME/scripts/kalshi-portfolio.py" "$HOME/scripts/kalshi-browse.py" "$HOME/scripts/polymarket-search.py" "$HOME/scripts/polymarket-setup-creds.py" "$HOME/scripts/polymarket-trade.py" "$HOME/scripts/polymarket-wallet.py" "$HOME/scripts/polymarket-portfolio.py" "$HOME/scripts/polymarket-positions.py" "$HOME/scripts/polymarket-verify.py"',
+        'chmod +x "$HOME/scripts/kalshi-setup.py" "$HOME/scripts/kalshi-trade.py" "$HOME/scripts/kalshi-positions.py" "$HOME/scripts/kalshi-portfolio.py" "$HOME/scripts/kalshi-browse.py" "$HOME/scripts/portfolio-all.py" "$HOME/scripts/polymarket-search.py" "$HOME/scripts/polymarket-setup-creds.py" "$HOME/scripts/polymarket-trade.py" "$HOME/scripts/polymarket-wallet.py" "$HOME/scripts/polymarket-portfolio.py" "$HOME/scripts/polymarket-positions.py" "$HOME/scripts/polymarket-verify.py"',
         '# Clean up legacy polymarket symlink (was double-counting skill budget)',
         'rm -f "$HOME/.openclaw/skills/polymarket" 2>/dev/null',
         '# Pip bootstrap + polymarket deps installed in parallel block below (PARALLEL_INSTALL_POLYMARKET)',
@@ -8204,6 +8232,8 @@ export async function configureOpenClaw(
       const solTrade = fs.readFileSync(path.join(solSkillDir, "scripts", "solana-trade.py"), "utf-8");
       const solBalance = fs.readFileSync(path.join(solSkillDir, "scripts", "solana-balance.py"), "utf-8");
       const solPositions = fs.readFileSync(path.join(solSkillDir, "scripts", "solana-positions.py"), "utf-8");
+      const solPrices = fs.readFileSync(path.join(solSkillDir, "scripts", "solana-prices.py"), "utf-8");
+      const solConfirm = fs.readFileSync(path.join(solSkillDir, "scripts", "solana-confirm.py"), "utf-8");
       const solSnipe = fs.readFileSync(path.join(solSkillDir, "scripts", "solana-snipe.py"), "utf-8");
 
       const solSkillB64 = Buffer.from(solSkillMd, "utf-8").toString("base64");
@@ -8216,6 +8246,8 @@ export async function configureOpenClaw(
       const solTradeB64 = Buffer.from(solTrade, "utf-8").toString("base64");
       const solBalanceB64 = Buffer.from(solBalance, "utf-8").toString("base64");
       const solPositionsB64 = Buffer.from(solPositions, "utf-8").toString("base64");
+      const solPricesB64 = Buffer.from(solPrices, "utf-8").toString("base64");
+      const solConfirmB64 = Buffer.from(solConfirm, "utf-8").toString("base64");
       const solSnipeB64 = Buffer.from(solSnipe, "utf-8").toString("base64");
 
       scriptParts.push(
@@ -8232,6 +8264,8 @@ export async function configureOpenClaw(
         `echo '${solTradeB64}' | base64 -d > "$HOME/scripts/solana-trade.py"`,
         `echo '${solBalanceB64}' | base64 -d > "$HOME/scripts/solana-balance.py"`,
         `echo '${solPositionsB64}' | base64 -d > "$HOME/scripts/solana-positions.py"`,
+        `echo '${solPricesB64}' | base64 -d > "$HOME/scripts/solana-prices.py"`,
+        `echo '${solConfirmB64}' | base64 -d > "$HOME/scripts/solana-confirm.py"`,
         `echo '${solSnipeB64}' | base64 -d > "$HOME/scripts/solana-snipe.py"`,
         'chmod +x "$HOME/scripts/setup-solana-wallet.py" "$HOME/scripts/solana-trade.py" "$HOME/scripts/solana-balance.py" "$HOME/scripts/solana-positions.py" "$HOME/scripts/solana-snipe.py"',
         '# Solana deps installed in parallel block below (PARALLEL_INSTALL_SOLANA)',
@@ -12317,6 +12351,8 @@ export async function installSolanaDefiSkill(vm: VMRecord): Promise<SolanaInstal
       { localPath: path.join(solSkillDir, "scripts", "solana-trade.py"), remotePath: "$HOME/scripts/solana-trade.py", executable: true },
       { localPath: path.join(solSkillDir, "scripts", "solana-balance.py"), remotePath: "$HOME/scripts/solana-balance.py", executable: true },
       { localPath: path.join(solSkillDir, "scripts", "solana-positions.py"), remotePath: "$HOME/scripts/solana-positions.py", executable: true },
+      { localPath: path.join(solSkillDir, "scripts", "solana-prices.py"), remotePath: "$HOME/scripts/solana-prices.py" },
+      { localPath: path.join(solSkillDir, "scripts", "solana-confirm.py"), remotePath: "$HOME/scripts/solana-confirm.py" },
       { localPath: path.join(solSkillDir, "scripts", "solana-snipe.py"), remotePath: "$HOME/scripts/solana-snipe.py", executable: true },
     ];
 
@@ -12352,7 +12388,7 @@ export async function installSolanaDefiSkill(vm: VMRecord): Promise<SolanaInstal
       'echo "STEP:files_deployed"',
       '',
       '# Install Python deps',
-      'python3 -m pip install --quiet --break-system-packages solders base58 httpx 2>/dev/null || true',
+      'python3 -m pip install --quiet --break-system-packages solders base58 httpx websockets 2>/dev/null || true',
       'echo "STEP:deps_installed"',
       '',
       '# Generate wallet (idempotent — skips if SOLANA_PRIVATE_KEY exists in .env)',
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Tests for skills/shared/scripts/brave_client.py and its use by competitive-intel.py.
+
+The client replaced one forked competitive-intel.sh per query, so these pin
+what the digest relies on: duplicate queries go out once, responses are
+reused from the shared TTL cache by a second client (another command), queries
+run concurrently, 429s are retried, failures are not cached, and every HTTP
+request is counted against the daily budget. The HTTP layer is a fake; the
+cache lives in a temp dir.
+
+Run: python3 scripts/_test-brave-client.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+_shared = os.path.join(os.path.dirname(__file__), "..", "skills", "shared", "scripts")
+sys.path.insert(0, _shared)
+_spec = importlib.util.spec_from_file_location("brave_client", os.path.join(_shared, "brave_client.py"))
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+class FakeSession:
+    def __init__(self, delay=0.0, fail=(), throttle_once=()):
+        self.calls = []
+        self.delay = delay
+        self.fail = set(fail)
+        self.throttled = set(throttle_once)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get(self, url, params):
+        with self.lock:
+            self.calls.append((url, params["q"]))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        q = params["q"]
+        if q in self.throttled:
+            self.throttled.discard(q)
+            return 429, {"Retry-After": "0"}, b"{}"
+        if q in self.fail:
+            return 500, {}, b"{}"
+        body = {"web": {"results": [{"title": f"{q} result", "url": "https://x"}]}}
+        return 200, {"X-RateLimit-Limit": "50, 15000"}, json.dumps(body).encode()
+
+
+def client(tmp, session):
+    c = _mod.BraveClient("k", cache_dir=tmp)
+    c._get = session.get
+    c.session = session
+    c.bucket = _mod.TokenBucket(per_minute=6000, capacity=50)
+    return c
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    session = FakeSession(delay=0.2)
+    c = client(tmp, session)
+    queries = [(f"q{i}", 10, "pw") for i in range(8)] + [("q0", 10, "pw"), ("q1", 10, "pw")]
+    started = time.monotonic()
+    out = c.search_many(queries)
+    elapsed = time.monotonic() - started
+    ok("duplicates in a batch are sent once", len(session.calls) == 8 and c.stats["deduped"] == 2)
+    ok("every query key gets its response", all(out[q]["web"]["results"] for q in queries))
+    ok(f"8 queries at 0.2 s each run concurrently ({elapsed:.2f}s)",
+       elapsed < 1.0 and 1 < session.max_in_flight <= _mod.MAX_WORKERS)
+    ok("each HTTP request counts against the daily budget", c.budget.count() == 8)
+
+    other = client(tmp, FakeSession())
+    other.search("q3", 10, "pw")
+    ok("a second client (another command) is served from the shared cache",
+       other.session.calls == [] and other.stats["cached"] == 1)
+    other.search("q3", 5, "pw")
+    other.search("q3", 10, "pd")
+    other.search("q3", 10, "pw", news=True)
+    ok("count, freshness and endpoint are part of the cache key", len(other.session.calls) == 3
+       and other.session.calls[-1][0] == _mod.NEWS_URL)
+
+    conn = c._db()
+    with conn:
+        conn.execute("UPDATE responses SET fetched_at = fetched_at - ? WHERE query = 'q4'", (_mod.CACHE_TTL["pw"] + 1,))
+    conn.close()
+    expired = client(tmp, FakeSession())
+    expired.search("q4", 10, "pw")
+    ok("entries past their freshness TTL are refetched", len(expired.session.calls) == 1)
+
+    flaky = client(tmp, FakeSession(fail={"bad"}, throttle_once={"slow"}))
+    ok("HTTP errors return {}", flaky.search("bad") == {} and flaky.stats["failed"] == 1)
+    flaky.search("bad")
+    ok("... and are not cached", len([q for _, q in flaky.session.calls if q == "bad"]) == 2)
+    ok("429 is retried", flaky.search("slow")["web"]["results"] and
+       [q for _, q in flaky.session.calls].count("slow") == 2)
+    ok("rate limit follows X-RateLimit-Limit", flaky.bucket.rate == 50.0)
+
+    spent = client(tmp, FakeSession())
+    spent.budget.record(_mod.DAILY_BUDGET)
+    ok("exhausted budget: no request is sent", spent.search("fresh query") == {} and spent.session.calls == [])
+
+# --- competitive-intel.py digest fan-out ------------------------------------------
+with tempfile.TemporaryDirectory() as tmp:
+    _intel_path = os.path.join(os.path.dirname(__file__), "..", "skills", "competitive-intelligence",
+                               "assets", "competitive-intel.py")
+    _ispec = importlib.util.spec_from_file_location("competitive_intel", _intel_path)
+    intel = importlib.util.module_from_spec(_ispec)
+    _ispec.loader.exec_module(intel)
+    intel.WORKSPACE = Path(tmp)
+    intel.CONFIG_FILE = Path(tmp) / "config.json"
+    intel.SNAPSHOT_DIR = Path(tmp) / "snapshots"
+    intel.REPORT_DIR = Path(tmp) / "reports"
+    intel.save_config({"competitors": [{"name": f"Comp{i}", "domain": f"comp{i}.com"} for i in range(10)]})
+
+    session = FakeSession(delay=0.05)
+    intel._clients["k"] = client(Path(tmp) / "cache", session)
+    with contextlib.redirect_stdout(io.StringIO()):
+        intel.generate_digest("k")
+    ok("digest over 10 competitors: 30 queries, one batch", len(session.calls) == 30)
+    with contextlib.redirect_stdout(io.StringIO()):
+        intel.snapshot_pricing_pages = lambda competitors: {}
+        intel.generate_weekly_report("k")
+        intel.run_scan("k")
+    ok("weekly adds its 31 queries; scan's past-week mentions come from the cache",
+       len(session.calls) == 30 + 31)
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Tests for the SP-API client in skills/ecommerce-marketplace/assets/ecommerce-ops.py.
+
+amazon_api() used to fork a curl LWA token exchange before every call; these
+pin the replacement: the access token is exchanged once, cached on disk
+(0600) with its expiry and reused by later runs, refreshed when it expires,
+changes owner, or is rejected; NextToken pagination is followed to the end;
+each operation is paced by its own usage-plan bucket; 429s are retried. The
+SP-API and Shopify GraphQL clients share http_request()'s kept-alive
+connections. The HTTP layer is a fake; the cache lives in a temp dir.
+
+Run: python3 scripts/_test-ecommerce-amazon-client.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import importlib.util
+import json
+import os
+import stat
+import sys
+import tempfile
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "ecommerce-marketplace", "assets", "ecommerce-ops.py")
+_spec = importlib.util.spec_from_file_location("ecommerce_ops", _path)
+ops = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(ops)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+class FakeAmazon:
+    def __init__(self):
+        self.exchanges = 0
+        self.calls = []
+        self.reject_token = None
+        self.throttle_next = 0
+        self.rate_header = None
+
+    def send(self, client, host, method, path, body, headers):
+        client._local.headers = {}
+        if host == "api.amazon.com":
+            self.exchanges += 1
+            return 200, json.dumps({"access_token": f"Atza|{self.exchanges}", "expires_in": 3600}).encode()
+        parts = urlsplit(path)
+        query = dict(parse_qsl(parts.query))
+        self.calls.append((method, parts.path, query, headers["x-amz-access-token"]))
+        if self.reject_token in (headers["x-amz-access-token"], "*"):
+            return 403, json.dumps({"errors": [{"code": "Unauthorized", "message": "Access denied"}]}).encode()
+        if self.throttle_next:
+            self.throttle_next -= 1
+            return 429, json.dumps({"errors": [{"code": "QuotaExceeded", "message": "throttled"}]}).encode()
+        if self.rate_header:
+            client._local.headers = {"x-amzn-RateLimit-Limit": self.rate_header}
+        if parts.path == "/orders/v0/orders":
+            page = int(query.get("NextToken", "0"))
+            payload = {"Orders": [{"AmazonOrderId": f"111-{page}-{i}"} for i in range(100 if page < 2 else 7)]}
+            if page < 2:
+                payload["NextToken"] = str(page + 1)
+            return 200, json.dumps({"payload": payload}).encode()
+        if parts.path == "/fba/inventory/v1/summaries":
+            page = int(query.get("nextToken", "0"))
+            body = {"payload": {"inventorySummaries": [{"sellerSku": f"S{page}{i}"} for i in range(50)]},
+                    "pagination": {"nextToken": str(page + 1)} if page < 1 else {}}
+            return 200, json.dumps(body).encode()
+        return 200, json.dumps({"payload": {"ok": True, "path": parts.path}}).encode()
+
+
+def setup():
+    tmp = tempfile.mkdtemp()
+    ops.LWA_TOKEN_CACHE = os.path.join(tmp, "amazon-sp-api", "lwa-token.json")
+    ops._amazon_clients.clear()
+    fake = FakeAmazon()
+    ops.SPAPIClient._send = lambda self, *a: fake.send(self, *a)
+    return fake
+
+
+CONFIG = {"enabled": True, "lwa_client_id": "amzn1.app", "lwa_client_secret": "s", "refresh_token": "Atzr|r"}
+ops.subprocess.run = lambda *a, **k: (_ for _ in ()).throw(AssertionError("subprocess called"))
+sleeps = []
+ops.time.sleep = lambda s: sleeps.append(s)
+
+print("== LWA token cache ==")
+fake = setup()
+for i in range(5):
+    result = ops.amazon_api(CONFIG, f"/orders/v0/orders/111-{i}")
+ok("five calls, one token exchange", fake.exchanges == 1 and len(fake.calls) == 5)
+ok("response returned as JSON", result == {"payload": {"ok": True, "path": "/orders/v0/orders/111-4"}})
+mode = stat.S_IMODE(os.stat(ops.LWA_TOKEN_CACHE).st_mode)
+cached = json.load(open(ops.LWA_TOKEN_CACHE))
+ok("token cached on disk with mode 0600", mode == 0o600)
+ok("cache holds expiry, not credentials",
+   abs(cached["expires_at"] - (time.time() + 3600)) < 5 and "Atzr|r" not in json.dumps(cached))
+
+ops._amazon_clients.clear()  # next ecommerce-ops.py run
+ops.amazon_api(CONFIG, "/sellers/v1/marketplaceParticipations")
+ok("later run reuses cached token", fake.exchanges == 1 and fake.calls[-1][3] == "Atza|1")
+
+cached["expires_at"] = time.time() + 60  # inside the refresh margin
+json.dump(cached, open(ops.LWA_TOKEN_CACHE, "w"))
+ops._amazon_clients.clear()
+ops.amazon_api(CONFIG, "/sellers/v1/marketplaceParticipations")
+ok("near-expiry token refreshed", fake.exchanges == 2 and fake.calls[-1][3] == "Atza|2")
+
+ops._amazon_clients.clear()
+ops.amazon_api(dict(CONFIG, refresh_token="Atzr|other-seller"), "/sellers/v1/marketplaceParticipations")
+ok("token for other credentials not reused", fake.exchanges == 3)
+
+fake.reject_token = "Atza|3"
+result = ops.amazon_api(dict(CONFIG, refresh_token="Atzr|other-seller"), "/sellers/v1/marketplaceParticipations")
+ok("403 triggers one refresh and retry", fake.exchanges == 4 and result["payload"]["ok"])
+
+fake.reject_token = "*"
+before = fake.exchanges
+result = ops.amazon_api(dict(CONFIG, refresh_token="Atzr|other-seller"), "/sellers/v1/marketplaceParticipations")
+fake.reject_token = None
+ok("persistent 403 surfaces as error after one refresh",
+   result["error"] == "HTTP 403: Access denied" and fake.exchanges == before + 1)
+
+ok("unconfigured seller rejected without a request",
+   ops.amazon_api({"enabled": True}, "/orders/v0/orders") == {"error": "Amazon not configured (missing LWA credentials)"})
+
+print("== pagination ==")
+fake = setup()
+orders, error = ops.amazon_api_all(CONFIG, "/orders/v0/orders?CreatedAfter=2026-10-01T00:00:00Z",
+                                   lambda page: page["payload"]["Orders"], {"MarketplaceIds": "ATVPDKIKX0DER"})
+ok("NextToken followed to the last page", error is None and len(orders) == 207 and len(fake.calls) == 3)
+ok("filters kept alongside NextToken",
+   fake.calls[2][2] == {"CreatedAfter": "2026-10-01T00:00:00Z", "MarketplaceIds": "ATVPDKIKX0DER", "NextToken": "2"})
+
+summaries, error = ops.amazon_api_all(CONFIG, "/fba/inventory/v1/summaries",
+                                      lambda page: page["payload"]["inventorySummaries"], {"details": "true"})
+ok("FBA pagination.nextToken followed", len(summaries) == 100 and fake.calls[-1][2]["nextToken"] == "1")
+
+print("== rate limits ==")
+client = ops.amazon_client(CONFIG)
+orders_bucket = client._bucket("GET", "/orders/v0/orders")
+items_bucket = client._bucket("GET", "/orders/v0/orders/111-1/orderItems")
+ok("getOrders usage plan (0.0167/s, burst 20)",
+   orders_bucket.capacity == 20 and abs(orders_bucket.rate - 0.0167) < 1e-9)
+ok("per-order operations get their own bucket (0.5/s, burst 30)",
+   items_bucket is not orders_bucket and items_bucket.capacity == 30
+   and items_bucket is client._bucket("GET", "/orders/v0/orders/999"))
+ok("unknown operation gets the default plan", client._bucket("GET", "/catalog/2022-04-01/items").capacity == 5)
+
+fake.rate_header = "0.25"
+ops.amazon_api(CONFIG, "/products/pricing/v0/competitivePrice?Asins=B0X")
+ok("x-amzn-RateLimit-Limit header adopted", client._bucket("GET", "/products/pricing/v0/competitivePrice").rate == 0.25)
+fake.rate_header = None
+
+fake.throttle_next = 2
+sleeps.clear()
+before = len(fake.calls)
+result = ops.amazon_api(CONFIG, "/sellers/v1/marketplaceParticipations")
+ok("429 retried with backoff", result["payload"]["ok"] and len(fake.calls) - before == 3 and sleeps == [1, 2])
+
+fake.throttle_next = 10
+result = ops.amazon_api(CONFIG, "/sellers/v1/marketplaceParticipations")
+ok("gives up after bounded retries", "error" in result)
+
+print("== shared connection layer ==")
+
+
+class FakeConnection:
+    """http.client.HTTPSConnection stand-in; the first request on `drop_first` hosts hits a closed socket."""
+    opened = []
+    drop_first = set()
+
+    def __init__(self, host, timeout=None):
+        self.host = host
+        FakeConnection.opened.append(host)
+
+    def request(self, method, path, body=None, headers=None):
+        if self.host in FakeConnection.drop_first:
+            FakeConnection.drop_first.discard(self.host)
+            raise ConnectionResetError("closed by peer")
+
+    def getresponse(self):
+        return type("Response", (), {"status": 200, "read": lambda _: b'{"ok": true}',
+                                     "getheaders": lambda _: [("X-Amzn-RateLimit-Limit", "2.0")]})()
+
+    def close(self):
+        pass
+
+
+ops = importlib.util.module_from_spec(_spec)  # fresh copy: the fakes above replaced SPAPIClient._send
+_spec.loader.exec_module(ops)
+ops.http.client.HTTPSConnection = FakeConnection
+client = ops.SPAPIClient(CONFIG)
+FakeConnection.drop_first = {ops.SP_API_HOST}
+status, raw = client._send(ops.SP_API_HOST, "GET", "/x", None, {})
+ok("SP-API _send goes through http_request and reconnects once",
+   status == 200 and FakeConnection.opened.count(ops.SP_API_HOST) == 2)
+ok("... keeping the response headers (lower-cased) for pacing",
+   client._local.headers == {"x-amzn-ratelimit-limit": "2.0"})
+client._send(ops.SP_API_HOST, "GET", "/y", None, {})
+ok("... and reusing the kept-alive connection", FakeConnection.opened.count(ops.SP_API_HOST) == 2)
+shopify = ops.ShopifyGraphQL({"shop": "demo.myshopify.com", "access_token": "t"})
+ok("Shopify GraphQL _post shares the same layer", shopify._post(b"{}") == (200, b'{"ok": true}')
+   and "demo.myshopify.com" in FakeConnection.opened)
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Tests for the Shopify inventory sync in skills/ecommerce-marketplace/assets/ecommerce-ops.py.
+
+The sync used to download products.json and fork three curl calls per SKU;
+these pin the replacement: the SKU → (inventory item, location) map is built
+in one paged pass and cached on disk, quantities go out in
+inventorySetQuantities batches of 250, unknown or rejected SKUs trigger a
+single map rebuild, and requests are paced by Shopify's cost-based throttle.
+The GraphQL endpoint is a fake; the workspace lives in a temp dir.
+
+Run: python3 scripts/_test-ecommerce-inventory-sync.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "ecommerce-marketplace", "assets", "ecommerce-ops.py")
+_spec = importlib.util.spec_from_file_location("ecommerce_ops", _path)
+ops = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(ops)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+class FakeShopify:
+    """Answers the SkuMap query and SetQuantities mutation like the Admin API."""
+
+    def __init__(self, n_skus, available=1000.0, restore_rate=50.0):
+        self.catalogue = {f"SKU-{i:04d}": (f"gid://shopify/InventoryItem/{i}", i % 7) for i in range(n_skus)}
+        self.map_pages = 0
+        self.mutations = []
+        self.set = {}
+        self.available = available
+        self.restore_rate = restore_rate
+        self.throttle_next = 0
+        self.reject = set()
+
+    def post(self, body):
+        req = json.loads(body)
+        query, variables = req["query"], req["variables"]
+        cost = {"throttleStatus": {"maximumAvailable": 1000.0, "currentlyAvailable": self.available,
+                                   "restoreRate": self.restore_rate}, "requestedQueryCost": 10}
+        if self.throttle_next:
+            self.throttle_next -= 1
+            return 200, json.dumps({"errors": [{"message": "Throttled", "extensions": {"code": "THROTTLED"}}],
+                                    "extensions": {"cost": cost}}).encode()
+        if "SkuMap" in query:
+            self.map_pages += 1
+            skus = sorted(self.catalogue)
+            start = int(variables["after"] or 0)
+            page = skus[start:start + variables["first"]]
+            edges = [{"node": {
+                "sku": sku.lower(),
+                "inventoryQuantity": 20,
+                "inventoryItem": {"id": self.catalogue[sku][0], "inventoryLevels": {"edges": [
+                    {"node": {"location": {"id": f"gid://shopify/Location/{self.catalogue[sku][1]}"}}}]}},
+            }} for sku in page]
+            end = start + len(page)
+            data = {"productVariants": {"edges": edges,
+                                        "pageInfo": {"hasNextPage": end < len(skus), "endCursor": str(end)}}}
+        else:
+            quantities = variables["input"]["quantities"]
+            self.mutations.append(len(quantities))
+            by_item = {item: sku for sku, (item, _) in self.catalogue.items()}
+            errors = []
+            for i, q in enumerate(quantities):
+                sku = by_item.get(q["inventoryItemId"])
+                if sku is None or sku in self.reject:
+                    errors.append({"field": ["input", "quantities", str(i), "inventoryItemId"],
+                                   "message": "The specified inventory item could not be found.",
+                                   "code": "INVALID_INVENTORY_ITEM"})
+                else:
+                    self.set[sku] = q["quantity"]
+            data = {"inventorySetQuantities": {"inventoryAdjustmentGroup": None if errors else {"id": "g"},
+                                               "userErrors": errors}}
+        return 200, json.dumps({"data": data, "extensions": {"cost": cost}}).encode()
+
+
+def setup(fake):
+    tmp = tempfile.mkdtemp()
+    ops.DATA_DIR = tmp
+    ops.REPORTS_DIR = os.path.join(tmp, "reports")
+    ops.INVENTORY_DB = os.path.join(tmp, "inventory.json")
+    ops.SKU_MAP_CACHE = os.path.join(tmp, "shopify-sku-map.json")
+    ops._shopify_clients.clear()
+    ops.ShopifyGraphQL._post = lambda self, body: fake.post(body)
+    return tmp
+
+
+PCONFIG = {"enabled": True, "shop": "acme.myshopify.com", "access_token": "shpat_x"}
+sleeps = []
+ops.time.sleep = lambda s: sleeps.append(s)
+
+print("== batching and SKU map ==")
+fake = FakeShopify(600)
+setup(fake)
+quantities = {f"sku-{i:04d}": i for i in range(600)}
+results = ops.shopify_set_inventory(PCONFIG, quantities)
+ok("all 600 SKUs synced", all(v is None for v in results.values()) and len(results) == 600)
+ok("quantities batched 250/250/100", fake.mutations == [250, 250, 100])
+ok("map built in one paged pass (6 pages of 100)", fake.map_pages == 6)
+ok("quantities pushed as given", fake.set["SKU-0042"] == 42 and fake.set["SKU-0599"] == 599)
+cache = json.load(open(ops.SKU_MAP_CACHE))
+ok("map cached on disk for the shop", cache["shop"] == PCONFIG["shop"] and len(cache["skus"]) == 600)
+ok("map entry has item and location",
+   cache["skus"]["SKU-0008"] == {"inventory_item_id": "gid://shopify/InventoryItem/8",
+                                 "location_id": "gid://shopify/Location/1", "quantity": 20})
+
+fake.map_pages = 0
+fake.mutations = []
+ops._shopify_clients.clear()
+ops.shopify_set_inventory(PCONFIG, {"SKU-0001": 3})
+ok("second run reuses cached map", fake.map_pages == 0 and fake.mutations == [1])
+
+print("== rebuilds ==")
+fake.map_pages = 0
+results = ops.shopify_set_inventory(PCONFIG, {"SKU-0001": 3, "NOPE": 1})
+ok("unknown SKU triggers one rebuild", fake.map_pages == 6)
+ok("unknown SKU reported, known one synced",
+   results["NOPE"] == "SKU not found in Shopify" and results["SKU-0001"] is None)
+
+cache = json.load(open(ops.SKU_MAP_CACHE))
+cache["built_at"] = time.time() - ops.SKU_MAP_TTL - 1
+json.dump(cache, open(ops.SKU_MAP_CACHE, "w"))
+fake.map_pages = 0
+ops.shopify_set_inventory(PCONFIG, {"SKU-0001": 3})
+ok("stale map rebuilt", fake.map_pages == 6)
+
+# A variant moved to a new inventory item since the map was cached
+fake.catalogue["SKU-0005"] = ("gid://shopify/InventoryItem/9005", 5)
+fake.map_pages = 0
+fake.mutations = []
+results = ops.shopify_set_inventory(PCONFIG, {"SKU-0004": 1, "SKU-0005": 2, "SKU-0006": 3})
+ok("rejected item maps back to its SKU and is retried after rebuild",
+   results == {"SKU-0004": None, "SKU-0005": None, "SKU-0006": None} and fake.map_pages == 6
+   and fake.mutations == [3, 1] and fake.set["SKU-0005"] == 2)
+
+fake.reject = {"SKU-0010"}
+results = ops.shopify_set_inventory(PCONFIG, {"SKU-0010": 1, "SKU-0011": 2})
+ok("persistent rejection reported per SKU",
+   "could not be found" in results["SKU-0010"] and results["SKU-0011"] is None)
+fake.reject = set()
+
+print("== throttle ==")
+fake = FakeShopify(10, available=5.0, restore_rate=50.0)
+setup(fake)
+sleeps.clear()
+ops.shopify_graphql(PCONFIG, "query SkuMap {}", {"first": 1, "after": None}, cost=10)
+ops.shopify_graphql(PCONFIG, "query SkuMap {}", {"first": 1, "after": None}, cost=302)
+ok("waits for the bucket to refill to the query's cost",
+   len(sleeps) == 1 and 5.5 < sleeps[0] <= 5.94)
+
+fake.available = 1000.0
+fake.throttle_next = 2
+fake.map_pages = 0
+result = ops.shopify_graphql(PCONFIG, "query SkuMap {}", {"first": 1, "after": None})
+ok("THROTTLED responses retried", "data" in result and fake.map_pages == 1)
+
+fake.throttle_next = 10
+result = ops.shopify_graphql(PCONFIG, "query SkuMap {}", {"first": 1, "after": None})
+ok("gives up after bounded retries", "error" in result)
+
+print("== inventory-sync command ==")
+fake = FakeShopify(30)
+tmp = setup(fake)
+ops.save_json_db(ops.INVENTORY_DB, {"skus": {f"SKU-{i:04d}": {"quantity": i} for i in range(30)}})
+config = {"platforms": {"shopify": PCONFIG}, "policies": {"inventory_buffer_units": 5, "low_stock_threshold": 3}}
+ops.subprocess.run = lambda *a, **k: (_ for _ in ()).throw(AssertionError("subprocess called"))
+out = io.StringIO()
+with contextlib.redirect_stdout(out):
+    ops.cmd_inventory_sync(argparse.Namespace(full=False, dry_run=False), config)
+text = out.getvalue()
+ok("quick sync: one mutation, no subprocesses", fake.mutations == [30])
+ok("buffer applied", fake.set["SKU-0020"] == 15 and fake.set["SKU-0002"] == 0)
+ok("per-SKU result and low-stock alerts printed",
+   "✅ Synced SKU-0020 → shopify: 15 units" in text and "SKU-0003: 3 remaining" in text)
+
+out = io.StringIO()
+with contextlib.redirect_stdout(out):
+    ops.cmd_inventory_sync(argparse.Namespace(full=True, dry_run=False), config)
+inventory = ops.load_json_db(ops.INVENTORY_DB)
+ok("full pull reconciles from the same paged pass",
+   inventory["skus"]["SKU-0007"]["quantity"] == 20
+   and inventory["skus"]["SKU-0007"]["source"] == "shopify-reconciliation")
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Tests for the local order warehouse in skills/ecommerce-marketplace/assets/ecommerce-ops.py.
+
+Reports used to re-download every order in their range on every run; these
+pin the replacement: orders are upserted into orders.db, each platform keeps
+a high-water mark so later runs only ask for orders updated since then, a
+report reaching further back than the store triggers a created-range
+backfill of just the missing days, a failed platform keeps its old window,
+and P&L / fees / refunds / low stock are SQL aggregates (week-over-week
+included). The monthly trend only reads last month from the store when the
+store covers all of it. Platform fetchers are faked; the workspace lives in a temp dir.
+
+Run: python3 scripts/_test-ecommerce-order-store.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import argparse
+import contextlib
+import datetime
+import importlib.util
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "ecommerce-marketplace", "assets", "ecommerce-ops.py")
+_spec = importlib.util.spec_from_file_location("ecommerce_ops", _path)
+ops = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(ops)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+def order(platform, oid, created, total, updated=None, refunded=0.0, items=1):
+    return {"platform": platform, "order_id": oid, "order_number": oid, "customer": "c", "total": total,
+            "currency": "USD", "items": items, "status": "unfulfilled", "refunded": refunded,
+            "created_at": created, "updated_at": updated or created}
+
+
+class FakeUniverse:
+    """Orders as the platforms hold them; fetchers filter by created/updated like the APIs."""
+
+    def __init__(self):
+        self.orders = {"shopify": {}, "amazon": {}, "ebay": {}}
+        self.calls = []
+        self.fail = set()
+
+    def add(self, o):
+        self.orders[o["platform"]][o["order_id"]] = o
+
+    def fetcher(self, platform):
+        def fetch(pconfig, start, end, field="created"):
+            self.calls.append((platform, start, end, field))
+            if platform in self.fail:
+                raise RuntimeError("HTTP 503: unavailable")
+            key = "created_at" if field == "created" else "updated_at"
+            return [dict(o) for o in self.orders[platform].values()
+                    if o[key] >= start and (end is None or o[key] <= end)]
+        return fetch
+
+
+def setup():
+    tmp = tempfile.mkdtemp()
+    ops.DATA_DIR = tmp
+    ops.REPORTS_DIR = os.path.join(tmp, "reports")
+    ops.RETURNS_DB = os.path.join(tmp, "returns.json")
+    ops.INVENTORY_DB = os.path.join(tmp, "inventory.json")
+    ops.PRICE_LOG = os.path.join(tmp, "price-changes.json")
+    ops.ORDERS_DB = os.path.join(tmp, "orders.db")
+    u = FakeUniverse()
+    fmt = "%Y-%m-%dT%H:%M:%SZ"
+    ops.ORDER_FETCHERS = {p: (u.fetcher(p), fmt) for p in ("shopify", "amazon", "ebay")}
+    return u
+
+
+CONFIG = {"platforms": {"shopify": {"enabled": True}, "amazon": {"enabled": True}, "ebay": {"enabled": True}},
+          "policies": {"low_stock_threshold": 5}}
+ALL = ["shopify", "amazon", "ebay"]
+D = datetime.date
+
+
+def state(platform):
+    conn = sqlite3.connect(ops.ORDERS_DB)
+    row = conn.execute("SELECT covered_from, high_water FROM sync_state WHERE platform = ?", (platform,)).fetchone()
+    conn.close()
+    return row
+
+
+def stored():
+    conn = sqlite3.connect(ops.ORDERS_DB)
+    n = conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+    conn.close()
+    return n
+
+
+print("== incremental sync ==")
+u = setup()
+for i in range(5):
+    u.add(order("shopify", f"S{i}", f"2026-10-{12 + i:02d}T10:00:00Z", 100.0))
+    u.add(order("amazon", f"A{i}", f"2026-10-{12 + i:02d}T11:00:00Z", 50.0))
+u.add(order("ebay", "E0", "2026-10-13T09:00:00Z", 20.0))
+u.add(order("shopify", "OLD", "2026-09-20T10:00:00Z", 999.0))
+
+errors = ops.sync_orders(CONFIG, ALL, D(2026, 10, 12))
+ok("first sync: one created-since fetch per platform",
+   errors == {} and sorted(u.calls) == [(p, "2026-10-12T00:00:00Z", None, "created") for p in sorted(ALL)])
+ok("first sync stores the range's orders only", stored() == 11)
+covered, high_water = state("shopify")
+now = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+ok("state records coverage and a high-water mark", covered == "2026-10-12" and high_water[:13] == now[:13])
+
+u.calls.clear()
+u.add(order("shopify", "S1", "2026-10-13T10:00:00Z", 100.0, updated="2099-01-01T00:00:00Z", refunded=30.0))
+u.add(order("amazon", "A9", "2099-01-01T00:00:00Z", 75.0))
+ops.sync_orders(CONFIG, ALL, D(2026, 10, 12))
+hw = datetime.datetime.strptime(high_water, "%Y-%m-%dT%H:%M:%SZ") - ops.SYNC_OVERLAP
+ok("second sync only asks for orders updated since the high-water mark (minus overlap)",
+   all(c[3] == "updated" and c[1] == hw.strftime("%Y-%m-%dT%H:%M:%SZ") and c[2] is None for c in u.calls)
+   and len(u.calls) == 3)
+conn = ops.orders_db()
+refunded = conn.execute("SELECT refunded FROM orders WHERE order_id = 'S1'").fetchone()[0]
+conn.close()
+ok("updated order replaced, new order added", stored() == 12 and refunded == 30.0)
+
+print("== backfill ==")
+u.calls.clear()
+ops.sync_orders(CONFIG, ["shopify"], D(2026, 9, 15))
+ok("earlier range backfills only the missing days, plus the usual delta",
+   ("shopify", "2026-09-15T00:00:00Z", "2026-10-11T23:59:59Z", "created") in u.calls
+   and sum(1 for c in u.calls if c[3] == "updated") == 1 and len(u.calls) == 2)
+ok("coverage extended", state("shopify")[0] == "2026-09-15" and state("amazon")[0] == "2026-10-12")
+ok("backfilled order stored", stored() == 13)
+
+print("== failures ==")
+before = state("ebay")
+u.fail.add("ebay")
+u.calls.clear()
+errors = ops.sync_orders(CONFIG, ALL, D(2026, 10, 12))
+ok("failed platform reported, state untouched", "503" in errors["ebay"] and state("ebay") == before)
+u.fail.clear()
+u.calls.clear()
+ops.sync_orders(CONFIG, ["ebay"], D(2026, 10, 12))
+ok("next run retries the same window",
+   u.calls == [("ebay", (datetime.datetime.strptime(before[1], "%Y-%m-%dT%H:%M:%SZ") - ops.SYNC_OVERLAP)
+                .strftime("%Y-%m-%dT%H:%M:%SZ"), None, "updated")])
+
+print("== aggregates ==")
+u = setup()
+for i in range(4):
+    u.add(order("shopify", f"S{i}", "2026-10-13T10:00:00Z", 100.0, items=2))
+u.add(order("shopify", "S9", "2026-10-14T10:00:00Z", 100.0, refunded=40.0))
+u.add(order("shopify", "S8", "2026-10-14T11:00:00Z", 100.0, refunded=100.0))
+u.add(order("amazon", "A0", "2026-10-15T10:00:00Z", 200.0))
+u.add(order("ebay", "E0", "2026-10-16T10:00:00Z", 100.0))
+u.add(order("shopify", "P0", "2026-10-06T10:00:00Z", 300.0))     # previous week
+u.add(order("amazon", "P1", "2026-10-07T10:00:00Z", 100.0))
+ops.save_json_db(ops.RETURNS_DB, {"active": [], "completed": [
+    {"rma_number": "RMA-1", "platform": "shopify", "order_id": "S8", "status": "refunded",
+     "refund_amount": 100.0, "refunded_at": "2026-10-15T09:00:00"},
+    {"rma_number": "RMA-2", "platform": "amazon", "order_id": "A7", "status": "refunded",
+     "refund_amount": 25.0, "refunded_at": "2026-10-01T09:00:00"}]})
+ops.save_json_db(ops.INVENTORY_DB, {"skus": {"A": {"quantity": 2}, "B": {"quantity": 50}, "C": {"quantity": 5}}})
+ops.sync_orders(CONFIG, ALL, D(2026, 10, 5))
+conn = ops.orders_db()
+ops._mirror_local_tables(conn)
+totals = ops.order_totals(conn, D(2026, 10, 12), D(2026, 10, 18))
+ok("per-platform counts, revenue and items",
+   totals["shopify"]["orders"] == 6 and totals["shopify"]["revenue"] == 600.0 and totals["shopify"]["items"] == 10
+   and totals["amazon"]["revenue"] == 200.0 and totals["ebay"]["orders"] == 1)
+ok("fees from the platform schedule",
+   abs(totals["shopify"]["fees"] - (600 * 0.029 + 6 * 0.30)) < 1e-9
+   and abs(totals["amazon"]["fees"] - 30.0) < 1e-9 and abs(totals["ebay"]["fees"] - 12.35) < 1e-9)
+refund_total, refund_count = ops.period_refunds(conn, D(2026, 10, 12), D(2026, 10, 18))
+ok("refunds: RMA by date + platform refunds not already under an RMA",
+   refund_total == 140.0 and refund_count == 2)
+ok("low stock from the mirrored inventory", ops.low_stock(conn, 5) == [("A", 2), ("C", 5)])
+conn.close()
+ok("timestamps normalized to UTC",
+   ops._utc("2026-10-13T20:30:00-04:00") == "2026-10-14T00:30:00Z"
+   and ops._utc("2026-10-13T09:00:00.000Z") == "2026-10-13T09:00:00Z")
+
+print("== reports ==")
+u.calls.clear()
+out = io.StringIO()
+with contextlib.redirect_stdout(out):
+    ops.cmd_report(argparse.Namespace(type="weekly", date="2026-10-15"), CONFIG)
+text = out.getvalue()
+ok("weekly P&L from the store", "Total: $900.00 (8 orders, 12 items)" in text
+   and "Returns/Refunds: $140.00 (2 refunds)" in text)
+ok("week-over-week comparison", "Revenue: $400.00 → $900.00 (+125.0%)" in text and "Orders: 2 → 8 (+6)" in text)
+ok("report run costs only the delta", len(u.calls) == 3 and all(c[3] == "updated" for c in u.calls))
+
+out = io.StringIO()
+with contextlib.redirect_stdout(out):
+    ops.cmd_report(argparse.Namespace(type="daily", date="2026-10-13"), CONFIG)
+text = out.getvalue()
+ok("daily report from the store", "Total Orders: 4" in text and "Total Revenue: $400.00" in text
+   and "LOW STOCK (2 items)" in text)
+
+u.fail.add("amazon")
+out = io.StringIO()
+with contextlib.redirect_stdout(out):
+    ops.cmd_report(argparse.Namespace(type="monthly", date="2026-10-20"), CONFIG)
+text = out.getvalue()
+ok("monthly report flags a failed sync but uses stored data",
+   "Amazon: 2 orders, $300.00 revenue (sync failed, stored data only" in text and "Revenue: $1300.00" in text)
+
+print("== monthly trend ==")
+u = setup()
+for day in (29, 30):  # the store will only reach back to 2026-09-29
+    u.add(order("shopify", f"S{day}", f"2026-09-{day}T10:00:00Z", 40.0))
+u.add(order("shopify", "S-oct", "2026-10-05T10:00:00Z", 600.0))
+ops.sync_orders(CONFIG, ALL, D(2026, 9, 29))
+ops.save_json_db(os.path.join(ops.REPORTS_DIR, "monthly-2026-09.json"), {"month": "2026-09", "revenue": 500.0})
+out = io.StringIO()
+with contextlib.redirect_stdout(out):
+    ops.cmd_report(argparse.Namespace(type="monthly", date="2026-10-20"), CONFIG)
+ok("store covers only the last two days of last month: saved report used",
+   "Previous month: $500.00" in out.getvalue() and "Revenue growth: +20.0%" in out.getvalue())
+
+ops.sync_orders(CONFIG, ALL, D(2026, 9, 1))
+out = io.StringIO()
+with contextlib.redirect_stdout(out):
+    ops.cmd_report(argparse.Namespace(type="monthly", date="2026-10-20"), CONFIG)
+ok("store covers all of last month: totals come from the store", "Previous month: $80.00" in out.getvalue())
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
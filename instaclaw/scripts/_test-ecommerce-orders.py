@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Tests for order ingestion in skills/ecommerce-marketplace/assets/ecommerce-ops.py.
+
+Reports used to make one unpaginated request per platform, one platform after
+another, so busy days were silently truncated (Shopify returned 50 orders,
+Amazon NextToken and eBay next were ignored). These pin the replacement:
+every platform is paged to the end, platforms are fetched concurrently, eBay
+offset pages fan out over a bounded pool, orders share one schema, and a
+failing platform is reported rather than dropped. HTTP is faked.
+
+Run: python3 scripts/_test-ecommerce-orders.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import argparse
+import contextlib
+import datetime
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "ecommerce-marketplace", "assets", "ecommerce-ops.py")
+_spec = importlib.util.spec_from_file_location("ecommerce_ops", _path)
+ops = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(ops)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+class FakePlatforms:
+    """Shopify REST + eBay REST via http_request, Amazon via SPAPIClient._send."""
+
+    def __init__(self, shopify=0, amazon=0, ebay=0, delay=0.0):
+        self.counts = {"shopify": shopify, "amazon": amazon, "ebay": ebay}
+        self.delay = delay
+        self.requests = {"shopify": [], "amazon": [], "ebay": []}
+        self.lock = threading.Lock()
+        self.in_flight = {"ebay": 0}
+        self.max_in_flight = {"ebay": 0}
+        self.fail = set()
+        self.throttle = {"shopify": 0}
+
+    def http(self, host, method, path, headers=None, body=None):
+        time.sleep(self.delay)
+        query = dict(parse_qsl(urlsplit(path).query))
+        if host.endswith("myshopify.com"):
+            self.requests["shopify"].append(query)
+            if self.throttle["shopify"]:
+                self.throttle["shopify"] -= 1
+                return 429, {"retry-after": "0.01"}, b'{"errors": "Exceeded 2 calls per second"}'
+            if "shopify" in self.fail:
+                return 401, {}, b'{"errors": "Invalid API key"}'
+            start = int(query.get("page_info", "0"))
+            limit = int(query["limit"])
+            orders = [{"id": 1000 + i, "name": f"#{1000 + i}", "email": "a@b.c", "total_price": "10.00",
+                       "currency": "USD", "line_items": [{"quantity": 2}], "fulfillment_status": None,
+                       "refunds": [{"transactions": [{"kind": "refund", "amount": "4.00"}]}] if i == 0 else [],
+                       "created_at": f"2026-10-13T10:{i % 60:02d}:00Z", "updated_at": "2026-10-13T12:00:00Z"}
+                      for i in range(start, min(start + limit, self.counts["shopify"]))]
+            headers = {}
+            if start + limit < self.counts["shopify"]:
+                headers["link"] = (f'<https://{host}/admin/api/2024-01/orders.json?limit={limit}'
+                                   f'&page_info={start + limit}>; rel="next"')
+            return 200, headers, json.dumps({"orders": orders}).encode()
+        # eBay
+        with self.lock:
+            self.requests["ebay"].append(query)
+            self.in_flight["ebay"] += 1
+            self.max_in_flight["ebay"] = max(self.max_in_flight["ebay"], self.in_flight["ebay"])
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight["ebay"] -= 1
+        offset, limit, total = int(query["offset"]), int(query["limit"]), self.counts["ebay"]
+        orders = [{"orderId": f"E{i}", "buyer": {"username": "bob"},
+                   "pricingSummary": {"total": {"value": "20.00", "currency": "USD"}},
+                   "lineItems": [{"quantity": 1}], "orderFulfillmentStatus": "NOT_STARTED",
+                   "creationDate": f"2026-10-14T09:00:{i % 60:02d}.000Z"}
+                  for i in range(offset, min(offset + limit, total))]
+        data = {"orders": orders, "total": total, "limit": limit, "offset": offset}
+        if offset + limit < total:
+            data["next"] = f"https://api.ebay.com/sell/fulfillment/v1/order?offset={offset + limit}"
+        return 200, {}, json.dumps(data).encode()
+
+    def amazon(self, client, host, method, path, body, headers):
+        client._local.headers = {}
+        time.sleep(self.delay)
+        if host == "api.amazon.com":
+            return 200, b'{"access_token": "Atza|1", "expires_in": 3600}'
+        query = dict(parse_qsl(urlsplit(path).query))
+        self.requests["amazon"].append(query)
+        page = int(query.get("NextToken", "0"))
+        n = self.counts["amazon"]
+        orders = [{"AmazonOrderId": f"111-{i}", "OrderTotal": {"Amount": "30.00", "CurrencyCode": "USD"},
+                   "NumberOfItemsShipped": 1, "NumberOfItemsUnshipped": 2, "OrderStatus": "Unshipped",
+                   "PurchaseDate": f"2026-10-15T08:00:{i % 60:02d}Z", "LastUpdateDate": "2026-10-15T09:00:00Z"}
+                  for i in range(page * 100, min(page * 100 + 100, n))]
+        payload = {"Orders": orders}
+        if page * 100 + 100 < n:
+            payload["NextToken"] = str(page + 1)
+        return 200, json.dumps({"payload": payload}).encode()
+
+
+def setup(fake):
+    tmp = tempfile.mkdtemp()
+    ops.DATA_DIR = tmp
+    ops.REPORTS_DIR = os.path.join(tmp, "reports")
+    ops.RETURNS_DB = os.path.join(tmp, "returns.json")
+    ops.INVENTORY_DB = os.path.join(tmp, "inventory.json")
+    ops.PRICE_LOG = os.path.join(tmp, "price-changes.json")
+    ops.ORDERS_DB = os.path.join(tmp, "orders.db")
+    ops.LWA_TOKEN_CACHE = os.path.join(tmp, "lwa-token.json")
+    ops._amazon_clients.clear()
+    ops.http_request = fake.http
+    ops.SPAPIClient._send = lambda self, *a: fake.amazon(self, *a)
+    # getOrders' usage plan (1 request/minute after the burst) is not under test here
+    ops.SP_API_RATE_LIMITS = [("GET", "/orders/v0/orders", 1000.0, 1000)]
+    return tmp
+
+
+CONFIG = {"platforms": {
+    "shopify": {"enabled": True, "shop": "acme.myshopify.com", "access_token": "shpat_x"},
+    "amazon": {"enabled": True, "lwa_client_id": "id", "lwa_client_secret": "s", "refresh_token": "r",
+               "marketplace_id": "ATVPDKIKX0DER"},
+    "ebay": {"enabled": True, "user_token": "v^1.1"},
+}, "policies": {}}
+ALL = ["shopify", "amazon", "ebay"]
+ops.subprocess.run = lambda *a, **k: (_ for _ in ()).throw(AssertionError("subprocess called"))
+DAY = datetime.date(2026, 10, 13)
+
+print("== pagination ==")
+fake = FakePlatforms(shopify=620, amazon=250, ebay=450)
+setup(fake)
+orders, errors = ops.fetch_orders(CONFIG, ALL, DAY, DAY + datetime.timedelta(days=6))
+by = {p: [o for o in orders if o["platform"] == p] for p in ALL}
+ok("no errors", errors == {})
+ok("Shopify: all 620 orders over 3 Link pages of 250",
+   len(by["shopify"]) == 620 and len(fake.requests["shopify"]) == 3 and fake.requests["shopify"][0]["limit"] == "250")
+ok("Shopify: first request carries the date filter, cursors follow",
+   fake.requests["shopify"][0]["created_at_min"] == "2026-10-13T00:00:00Z"
+   and fake.requests["shopify"][0]["created_at_max"] == "2026-10-19T23:59:59Z"
+   and fake.requests["shopify"][2]["page_info"] == "500")
+ok("Amazon: all 250 orders over 3 NextToken pages",
+   len(by["amazon"]) == 250 and len(fake.requests["amazon"]) == 3
+   and fake.requests["amazon"][0]["MarketplaceIds"] == "ATVPDKIKX0DER")
+ok("eBay: all 450 orders over offsets 0/200/400",
+   len(by["ebay"]) == 450 and sorted(int(q["offset"]) for q in fake.requests["ebay"]) == [0, 200, 400]
+   and fake.requests["ebay"][0]["filter"] == "creationdate:[2026-10-13T00:00:00.000Z..2026-10-19T23:59:59.000Z]")
+ok("newest first", orders[0]["created_at"] >= orders[-1]["created_at"])
+
+print("== schema ==")
+keys = {"platform", "order_id", "order_number", "customer", "total", "currency", "items",
+        "status", "refunded", "created_at", "updated_at"}
+ok("one schema across platforms", all(set(o) == keys for o in orders))
+shop0 = next(o for o in by["shopify"] if o["order_id"] == "1000")
+ok("Shopify normalized", shop0["order_number"] == "#1000" and shop0["total"] == 10.0 and shop0["items"] == 2
+   and shop0["status"] == "unfulfilled" and shop0["refunded"] == 4.0)
+amz = by["amazon"][0]
+ok("Amazon normalized", amz["items"] == 3 and amz["status"] == "unshipped" and amz["total"] == 30.0
+   and amz["updated_at"] == "2026-10-15T09:00:00Z")
+ok("eBay normalized", by["ebay"][0]["status"] == "not_started" and by["ebay"][0]["customer"] == "bob")
+
+print("== concurrency ==")
+fake = FakePlatforms(shopify=10, amazon=10, ebay=1000, delay=0.1)
+setup(fake)
+t0 = time.monotonic()
+orders, errors = ops.fetch_orders(CONFIG, ALL, DAY, DAY)
+elapsed = time.monotonic() - t0
+# eBay: first page, then 4 more pages over EBAY_PAGE_WORKERS=4 → ~2 round trips of 0.2s
+ok("platforms fetched concurrently (time of the slowest, not the sum)", elapsed < 0.75 and len(orders) == 1020)
+ok("eBay page fan-out bounded by EBAY_PAGE_WORKERS",
+   1 < fake.max_in_flight["ebay"] <= ops.EBAY_PAGE_WORKERS)
+
+print("== failures ==")
+fake = FakePlatforms(shopify=5, amazon=5, ebay=5)
+setup(fake)
+fake.fail.add("shopify")
+orders, errors = ops.fetch_orders(CONFIG, ALL, DAY, DAY)
+ok("failing platform reported, others returned",
+   list(errors) == ["shopify"] and "401" in errors["shopify"] and len(orders) == 10)
+
+fake.fail.clear()
+fake.requests["shopify"].clear()
+fake.throttle["shopify"] = 2
+orders, errors = ops.fetch_orders(CONFIG, ["shopify"], DAY, DAY)
+ok("Shopify 429 retried after Retry-After", errors == {} and len(orders) == 5 and len(fake.requests["shopify"]) == 3)
+
+today = datetime.datetime.now(datetime.timezone.utc).date()
+fake.requests["amazon"].clear()
+ops.fetch_orders(CONFIG, ["amazon"], today, today)
+ok("Amazon CreatedBefore omitted when the range ends in the future",
+   "CreatedBefore" not in fake.requests["amazon"][0])
+
+print("== reports ==")
+fake = FakePlatforms(shopify=300, amazon=120, ebay=250)
+setup(fake)
+out = io.StringIO()
+with contextlib.redirect_stdout(out):
+    ops.cmd_report(argparse.Namespace(type="weekly", date="2026-10-15"), CONFIG)
+text = out.getvalue()
+ok("weekly revenue covers every page (300×10 + 120×30 + 250×20)",
+   "Total: $11600.00 (670 orders" in text)
+
+out = io.StringIO()
+with contextlib.redirect_stdout(out):
+    ops.cmd_orders(argparse.Namespace(platform="all", date="2026-10-13"), CONFIG)
+ok("orders command totals all of the day's pages", "Total: 300 orders | Revenue: $3000.00" in out.getvalue())
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
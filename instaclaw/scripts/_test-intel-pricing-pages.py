@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Tests for competitive-intel.py's pricing page pipeline (run_scan snapshots).
+
+Pins the behaviour that replaced one serial competitive-intel.sh snapshot per
+competitor: pages are fetched concurrently, revalidated with ETag /
+If-Modified-Since, normalised to hashed text blocks, skipped when nothing
+visible changed, diffed block-by-block when something did, and prices are
+parsed only from new blocks. Pages come from a local HTTP server; the
+workspace lives in a temp dir.
+
+Run: python3 scripts/_test-intel-pricing-pages.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import contextlib
+import http.server
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# The skill script is hyphenated (skill convention) → load via importlib.
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "competitive-intelligence", "assets", "competitive-intel.py")
+_spec = importlib.util.spec_from_file_location("competitive_intel", _path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+PAGE = """<html><head><title>Pricing</title><style>.x{{color:red}}</style></head><body>
+<nav><a href="/">Home</a></nav>
+<script>window.tracking = "{nonce}";</script>
+<section><h2>Starter</h2><p>$29<span>/mo</span></p><ul><li>1 agent</li><li>Email support</li></ul></section>
+<section><h2>Pro</h2><p>{pro}</p><ul><li>10 agents</li>{extra}</ul></section>
+<section><h2>Enterprise</h2><p>Contact sales</p></section>
+</body></html>"""
+
+PAGES = {}
+HITS = []
+_lock = threading.Lock()
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        with _lock:
+            HITS.append((self.path, self.headers.get("If-None-Match")))
+        time.sleep(0.3)
+        body, etag = PAGES[self.path]
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+# --- Normalisation and extraction -------------------------------------------------
+blocks = _mod.normalize_page(PAGE.format(nonce="a", pro="$99", extra=""))
+texts = [b["text"] for b in blocks]
+ok("scripts, styles and <head> are dropped", not any("tracking" in t or "color" in t or t == "Pricing" for t in texts))
+ok("text is split into blocks at block elements", "Starter" in texts and "$29 /mo" in texts and "1 agent" in texts)
+ok("tracking nonces don't change the page hash", _mod.page_hash(blocks) == _mod.page_hash(
+    _mod.normalize_page(PAGE.format(nonce="b", pro="$99", extra=""))))
+pricing = _mod.extract_pricing(blocks)
+ok("prices belong to the heading above them", pricing == {"Starter": {"price": "29"}, "Pro": {"price": "99"}})
+ok("price formats: $1,299.00 and 49 EUR",
+   _mod.block_prices("from $1,299.00 per year") == ["1299.00"] and _mod.block_prices("49 EUR monthly") == ["49"])
+
+new = _mod.normalize_page(PAGE.format(nonce="a", pro="$129", extra="<li>SSO</li>"))
+calls = []
+real = _mod.block_prices
+_mod.block_prices = lambda text: (calls.append(text), real(text))[1]
+pricing = _mod.extract_pricing(new, blocks)
+_mod.block_prices = real
+ok("incremental extraction parses only new blocks", sorted(calls) == ["$129", "SSO"] and pricing["Pro"]["price"] == "129")
+diff = _mod.diff_blocks(blocks, new)
+ok("block diff reports exactly what changed", diff["added"] == ["$129", "SSO"] and diff["removed"] == ["$99"])
+
+# --- Pipeline against a local server -------------------------------------------------
+server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base = f"http://127.0.0.1:{server.server_port}"
+
+with tempfile.TemporaryDirectory() as tmp:
+    _mod.WORKSPACE = Path(tmp)
+    _mod.SNAPSHOT_DIR = Path(tmp) / "snapshots"
+    _mod.SNAPSHOT_DB = Path(tmp) / "snapshots.db"
+    competitors = [{"name": f"Comp{i}", "domain": f"comp{i}.test", "urls": {"pricing": f"{base}/c{i}"}}
+                   for i in range(6)]
+    for i in range(6):
+        PAGES[f"/c{i}"] = (PAGE.format(nonce="n", pro="$99", extra=""), f'"v1-{i}"' if i % 2 == 0 else None)
+
+    started = time.monotonic()
+    status = _mod.snapshot_pricing_pages(competitors)
+    elapsed = time.monotonic() - started
+    ok(f"6 pages at 0.3 s each fetched concurrently ({elapsed:.2f}s)", elapsed < 1.0)
+    ok("first scan stores baselines", all(v == "Pricing baseline saved" for v in status.values()) and len(status) == 6)
+    ok("baseline snapshot carries blocks and pricing",
+       _mod.load_snapshot("Comp0", "pricing")["pricing"]["Pro"] == {"price": "99"})
+
+    # Scans are daily: move the baselines to yesterday so the next scan adds a new date
+    conn = _mod.snapshot_db()
+    with conn:
+        conn.execute("UPDATE snapshots SET date = ?", ((date.today() - timedelta(days=1)).isoformat(),))
+    conn.close()
+
+    HITS.clear()
+    PAGES["/c1"] = (PAGE.format(nonce="changed-nonce", pro="$99", extra=""), None)
+    PAGES["/c3"] = (PAGE.format(nonce="n", pro="$129", extra="<li>SSO</li>"), None)
+    status = _mod.snapshot_pricing_pages(competitors)
+    ok("ETag pages are revalidated and answered with 304",
+       all(etag for path, etag in HITS if path in ("/c0", "/c2", "/c4")) and status["Comp0"].endswith("(304)"))
+    ok("a 200 with identical visible content is skipped by hash", status["Comp1"] == "Pricing page unchanged")
+    ok("a changed page reports its block diff", status["Comp3"] == "Pricing page changed: +2 / -1 blocks")
+
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        changes = _mod.compare_snapshots("Comp3", "pricing")
+    ok("compare sees the price change and the new block",
+       {"type": "pricing", "plan": "Pro", "old": "99", "new": "129", "pct": (129 - 99) / 99 * 100} in changes
+       and any(c.get("text") == "SSO" for c in changes) and "PAGE CHANGES" in out.getvalue())
+    conn = _mod.snapshot_db()
+    bodies = conn.execute("SELECT COUNT(*) FROM snapshot_bodies").fetchone()[0]
+    dates = conn.execute("SELECT COUNT(DISTINCT date) FROM snapshots WHERE competitor = 'comp0'").fetchone()[0]
+    conn.close()
+    ok("unchanged pages add no new snapshot bodies", bodies == 7)
+    ok("... but are still recorded as checked today", dates == 2)
+
+    PAGES["/c5"] = ("", None)
+    competitors.append({"name": "Down", "domain": "down.test", "urls": {"pricing": "http://127.0.0.1:1/x"}})
+    status = _mod.snapshot_pricing_pages(competitors)
+    ok("a failing page is reported without stopping the scan",
+       status["Down"].startswith("Pricing page failed") and status["Comp0"].endswith("(304)"))
+
+server.shutdown()
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Tests for competitive-intel.py's indexed snapshot store (snapshots.db).
+
+load_snapshot/load_previous_snapshot used to list and sort the whole
+snapshots/ directory on every call. These pin the store that replaced it:
+latest/previous come from the (competitor, category, date) index, unchanged
+content is stored once, files dropped in snapshots/ are ingested (only when
+the folder changed), and retention never removes the last comparable pair.
+Pure local — the workspace lives in a temp dir.
+
+Run: python3 scripts/_test-intel-snapshots.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# The skill script is hyphenated (skill convention) → load via importlib.
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "competitive-intelligence", "assets", "competitive-intel.py")
+_spec = importlib.util.spec_from_file_location("competitive_intel", _path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+def day(offset):
+    return (date.today() + timedelta(days=offset)).isoformat()
+
+
+def rows(sql, *params):
+    conn = _mod.snapshot_db()
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    _mod.WORKSPACE = Path(tmp)
+    _mod.SNAPSHOT_DIR = Path(tmp) / "snapshots"
+    _mod.SNAPSHOT_DB = Path(tmp) / "snapshots.db"
+    _mod.SNAPSHOT_DIR.mkdir()
+
+    ok("empty store: no latest, no previous",
+       _mod.load_snapshot("Acme", "pricing") == {} and _mod.load_previous_snapshot("Acme", "pricing") == {})
+
+    ok("first snapshot counts as a change",
+       _mod.save_snapshot("Acme Corp", "pricing", {"pricing": {"pro": {"price": "99"}}}, date=day(-3)))
+    ok("same content next day is not a change",
+       not _mod.save_snapshot("Acme Corp", "pricing", {"pricing": {"pro": {"price": "99"}}, "fetched_at": "x"},
+                              date=day(-2)))
+    ok("... and its body is stored once", rows("SELECT COUNT(*) FROM snapshot_bodies")[0][0] == 1
+       and rows("SELECT COUNT(*) FROM snapshots")[0][0] == 2)
+    ok("new content is a change", _mod.save_snapshot("acme corp", "pricing", {"pricing": {"pro": {"price": "129"}}},
+                                                    date=day(-1)))
+    ok("latest and previous by date, name case-insensitive",
+       _mod.load_snapshot("ACME CORP", "pricing")["date"] == day(-1)
+       and _mod.load_previous_snapshot("Acme Corp", "pricing")["date"] == day(-2))
+    ok("load by explicit date", _mod.load_snapshot("Acme Corp", "pricing", day(-3))["pricing"]["pro"]["price"] == "99")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        changes = _mod.compare_snapshots("Acme Corp", "pricing")
+    ok("compare_snapshots sees the price change",
+       changes and changes[0]["old"] == "99" and changes[0]["new"] == "129")
+
+    # Drop folder: shell snapshot / hand-written files
+    (_mod.SNAPSHOT_DIR / f"{day(0)}-acme-corp-pricing.json").write_text(
+        json.dumps({"date": day(0), "competitor": "Acme Corp", "category": "pricing",
+                    "pricing": {"pro": {"price": "149"}}}))
+    (_mod.SNAPSHOT_DIR / f"{day(0)}-globex-blog.json").write_text(json.dumps({"content_length": 10}))
+    (_mod.SNAPSHOT_DIR / f"{day(0)}-initech-pricing.json").write_text('{"half": ')
+    ok("dropped file becomes the latest snapshot", _mod.load_snapshot("Acme Corp", "pricing")["date"] == day(0))
+    ok("filename supplies competitor/category when the JSON doesn't",
+       _mod.load_snapshot("globex", "blog").get("content_length") == 10)
+    ok("ingested files are removed; a half-written one is left for later",
+       [f.name for f in _mod.SNAPSHOT_DIR.iterdir()] == [f"{day(0)}-initech-pricing.json"])
+    (_mod.SNAPSHOT_DIR / f"{day(0)}-initech-pricing.json").write_text('{"pricing": {}}')
+    ok("... and picked up once complete", _mod.load_snapshot("initech", "pricing") == {"pricing": {}, "date": day(0)}
+       and not any(_mod.SNAPSHOT_DIR.iterdir()))
+
+    calls = []
+    real_glob = Path.glob
+    Path.glob = lambda self, pattern: (calls.append(pattern), real_glob(self, pattern))[1]
+    for _ in range(50):
+        _mod.load_snapshot("Acme Corp", "pricing")
+    Path.glob = real_glob
+    ok("unchanged drop folder is never listed", calls == [])
+
+    # Retention
+    for i in range(5):
+        _mod.save_snapshot("Old Co", "pricing", {"v": i}, date=day(-_mod.SNAPSHOT_RETENTION_DAYS - 10 - i))
+    _mod.save_snapshot("Acme Corp", "pricing", {"pricing": {"pro": {"price": "149"}}}, date=day(1))
+    old = rows("SELECT date FROM snapshots WHERE competitor = 'old-co' ORDER BY date DESC")
+    ok("retention keeps only the latest pair of an expired series", len(old) == 2)
+    ok("orphaned bodies are pruned",
+       rows("SELECT COUNT(*) FROM snapshot_bodies WHERE hash NOT IN (SELECT hash FROM snapshots)")[0][0] == 0)
+
+    # Lookup cost does not grow with history
+    conn = _mod.snapshot_db()
+    with conn:
+        for c in range(200):
+            for d in range(300):
+                _mod._put_snapshot(conn, f"comp{c}", "pricing", day(-d), {"c": c, "d": d % 7})
+    conn.close()
+    started = time.perf_counter()
+    for c in range(200):
+        _mod.recent_snapshots(f"comp{c}", "pricing", 2)
+    elapsed = time.perf_counter() - started
+    ok(f"latest+previous for 200 competitors over 60k snapshots in {elapsed * 1000:.0f} ms (< 1 s)", elapsed < 1.0)
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
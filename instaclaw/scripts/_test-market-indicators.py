@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Golden tests for market-analysis.py's local indicator engine.
+
+analyze/chart/watchlist compute RSI, MACD, BBANDS, SMA, ADX and STOCH from one
+daily OHLCV fetch instead of asking Alpha Vantage for each indicator, so the
+local math has to match Alpha Vantage's (TA-Lib) definitions. RSI and EMA are
+pinned to the published StockCharts worked examples; the rest are checked
+against independent closed forms. Pure local — no network, no API key.
+
+Run: python3 scripts/_test-market-indicators.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import importlib.util
+import os
+import statistics
+import sys
+
+# The skill script is hyphenated (skill convention) → load via importlib.
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "financial-analysis", "assets", "market-analysis.py")
+_spec = importlib.util.spec_from_file_location("market_analysis", _path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+def close_to(actual, expected, tol):
+    if len(actual) != len(expected):
+        return False
+    return all(abs(a - e) <= tol for a, e in zip(actual, expected))
+
+
+def valid(series):
+    return [v for v in series if v is not None]
+
+
+# --- RSI: StockCharts ChartSchool worked example (Wilder, 14) ---------------
+RSI_CLOSES = [
+    44.3389, 44.0902, 44.1497, 43.6124, 44.3278, 44.8264, 45.0955, 45.4245, 45.8433, 46.0826,
+    45.8931, 46.0328, 45.6140, 46.2820, 46.2820, 46.0028, 46.0328, 46.4116, 46.2222, 45.6439,
+    46.2122, 46.2521, 45.7137, 46.4515, 45.7835, 45.3548, 44.0288, 44.1783, 44.2181, 44.5672,
+    43.4205, 42.6628, 43.1314,
+]
+RSI_GOLDEN = [
+    70.53, 66.32, 66.55, 69.41, 66.36, 57.97, 62.93, 63.26, 56.06, 62.38,
+    54.71, 50.42, 39.99, 41.46, 41.87, 45.46, 37.30, 33.08, 37.77,
+]
+rsi = _mod.rsi(RSI_CLOSES, 14)
+ok("RSI warm-up: first value at index 14", rsi[13] is None and rsi[14] is not None)
+ok("RSI matches StockCharts golden values (±0.01)", close_to(valid(rsi), RSI_GOLDEN, 0.01))
+ok("RSI of a strictly rising series is 100", valid(_mod.rsi([float(i) for i in range(30)], 14))[-1] == 100.0)
+
+# --- EMA: StockCharts 10-day example (seeded with the first SMA) ------------
+EMA_CLOSES = [
+    22.27, 22.19, 22.08, 22.17, 22.18, 22.13, 22.23, 22.43, 22.24, 22.29,
+    22.15, 22.39, 22.38, 22.61, 23.36, 24.05, 23.75, 23.83, 23.95, 23.63,
+    23.82, 23.87, 23.65, 23.19, 23.10, 23.33, 22.68, 23.10, 22.40, 22.17,
+]
+EMA_GOLDEN = [
+    22.22, 22.21, 22.24, 22.27, 22.33, 22.52, 22.80, 22.97, 23.13, 23.28, 23.34,
+    23.43, 23.51, 23.54, 23.47, 23.40, 23.39, 23.26, 23.23, 23.08, 22.92,
+]
+ok("EMA(10) matches StockCharts golden values (±0.01)", close_to(valid(_mod.ema(EMA_CLOSES, 10)), EMA_GOLDEN, 0.01))
+
+# --- SMA / BBANDS: population standard deviation, 2σ --------------------------
+closes = [100 + ((i * 37) % 23) - 11 + i * 0.3 for i in range(260)]
+sma20 = _mod.sma(closes, 20)
+ok("SMA(20) equals the window mean everywhere",
+   all(abs(sma20[i] - statistics.mean(closes[i - 19:i + 1])) < 1e-9 for i in range(19, len(closes))))
+upper, middle, lower = _mod.bbands(closes, 20)
+i = len(closes) - 1
+sd = statistics.pstdev(closes[i - 19:i + 1])
+ok("BBANDS middle is SMA(20)", middle[i] == sma20[i])
+ok("BBANDS bands are middle ± 2 × population stdev",
+   abs(upper[i] - (middle[i] + 2 * sd)) < 1e-9 and abs(lower[i] - (middle[i] - 2 * sd)) < 1e-9)
+
+# --- MACD 12/26/9 -------------------------------------------------------------
+line, signal, hist = _mod.macd(closes)
+e12, e26 = _mod.ema(closes, 12), _mod.ema(closes, 26)
+ok("MACD line starts at bar 25 and equals EMA12 − EMA26",
+   line[24] is None and abs(line[-1] - (e12[-1] - e26[-1])) < 1e-9)
+ok("MACD signal is EMA9 of the line (first at bar 33)", signal[32] is None and signal[33] is not None)
+ok("MACD histogram is line − signal", abs(hist[-1] - (line[-1] - signal[-1])) < 1e-9)
+linear = [float(i) for i in range(100)]
+ok("MACD of a linear series converges to (26−12)/2 × slope = 7",
+   abs(valid(_mod.macd(linear)[0])[-1] - 7.0) < 1e-3)
+
+# --- ADX 14 -------------------------------------------------------------------
+up_h = [10.0 + i for i in range(60)]
+up_l = [9.0 + i for i in range(60)]
+up_c = [9.5 + i for i in range(60)]
+adx_up = _mod.adx(up_h, up_l, up_c, 14)
+ok("ADX warm-up: first value at index 27 (2 × period − 1)", adx_up[26] is None and adx_up[27] is not None)
+ok("ADX of a one-way trend is 100", abs(adx_up[-1] - 100.0) < 1e-9)
+chop_h = [11.0 if i % 2 else 12.0 for i in range(60)]
+chop_l = [9.0 if i % 2 else 10.0 for i in range(60)]
+chop_c = [10.0 if i % 2 else 11.0 for i in range(60)]
+ok("ADX of a symmetric chop stays far below the 25 trend line", valid(_mod.adx(chop_h, chop_l, chop_c, 14))[-1] < 5.0)
+ok("ADX needs 2 × period bars", valid(_mod.adx(up_h[:27], up_l[:27], up_c[:27], 14)) == [])
+
+# --- STOCH 5/3/3 (SMA smoothing) ---------------------------------------------
+st_h = [10, 11, 12, 13, 14, 15, 16, 17, 18]
+st_l = [8, 9, 10, 11, 12, 13, 14, 15, 16]
+st_c = [9, 10, 11, 12, 13, 15, 15, 17, 16]
+# fastK from bar 4: (13-8)/(14-8)=83.33, (15-9)/(15-9)=100, (15-10)/(16-10)=83.33, (17-11)/(17-11)=100, (16-12)/(18-12)=66.67
+slow_k, slow_d = _mod.stoch(st_h, st_l, st_c)
+ok("STOCH slowK = SMA3 of fastK", close_to(valid(slow_k), [88.889, 94.444, 83.333], 0.001))
+ok("STOCH slowD = SMA3 of slowK", close_to(valid(slow_d), [88.889], 0.001))
+
+# --- End-to-end: Alpha Vantage payload → quote + indicators -------------------
+stock_payload = {"Meta Data": {}, "Time Series (Daily)": {
+    f"2024-{1 + d // 28:02d}-{1 + d % 28:02d}": {
+        "1. open": str(closes[d] - 0.5), "2. high": str(closes[d] + 1), "3. low": str(closes[d] - 1),
+        "4. close": str(closes[d]), "5. volume": "1000",
+    } for d in range(260)
+}}
+bars = _mod.parse_daily_series(stock_payload)
+ok("parse_daily_series sorts oldest first", bars[0]["date"] < bars[-1]["date"] and len(bars) == 260)
+ind = _mod.compute_indicators(bars)
+ok("compute_indicators reports every indicator analyze uses",
+   set(ind) == {"rsi", "macd", "macd_signal", "macd_hist", "sma50", "sma200", "adx",
+                "stoch_k", "stoch_d", "bb_upper", "bb_middle", "bb_lower"}
+   and all(v is not None for v in ind.values()))
+ok("compute_indicators SMA200 matches the window mean", abs(ind["sma200"] - statistics.mean(closes[-200:])) < 1e-3)
+short = _mod.compute_indicators(bars[-100:])
+ok("compact (100 bars) history leaves only SMA200 empty",
+   short["sma200"] is None and all(v is not None for k, v in short.items() if k != "sma200"))
+
+quote = _mod.quote_from_bars("spy", bars)
+ok("quote_from_bars: price, change and prev close from the last two bars",
+   quote["price"] == closes[-1] and quote["prev_close"] == closes[-2]
+   and abs(quote["change"] - round(closes[-1] - closes[-2], 4)) < 1e-9 and quote["change_pct"].endswith("%"))
+
+crypto_payload = {"Time Series (Digital Currency Daily)": {
+    "2024-01-02": {"1a. open (USD)": "100", "2a. high (USD)": "110", "3a. low (USD)": "90",
+                   "4a. close (USD)": "105", "5. volume": "12.5"},
+    "2024-01-01": {"1. open": "95", "2. high": "101", "3. low": "94", "4. close": "100", "5. volume": "10"},
+}}
+cbars = _mod.parse_daily_series(crypto_payload)
+ok("parse_daily_series reads both crypto field formats",
+   [b["close"] for b in cbars] == [100.0, 105.0] and cbars[1]["high"] == 110.0)
+ok("crypto_base strips quote-currency suffixes",
+   _mod.crypto_base("btc-usd") == "BTC" and _mod.crypto_base("ETH/USD") == "ETH" and _mod.crypto_base("SOLUSDT") == "SOL")
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Tests for market-analysis.py's persistent OHLCV store (load_bars).
+
+The store is what keeps repeat analyses off the Alpha Vantage budget, so these
+pin the API-call pattern: first run downloads full history, a repeat before the
+next session close costs zero calls, the first call after it costs one compact
+top-up that overwrites the still-forming bar, and a long gap falls back to a
+full download. A fetch made before the close (pre-open) must not count as fresh
+after it, and a spent budget serves stored bars instead of exiting. api_call
+and the clock are faked; the database lives in a temp dir.
+
+Run: python3 scripts/_test-market-ohlcv-store.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import importlib.util
+import os
+import sys
+import tempfile
+import types
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+# The skill script is hyphenated (skill convention) → load via importlib.
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "financial-analysis", "assets", "market-analysis.py")
+_spec = importlib.util.spec_from_file_location("market_analysis", _path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+TODAY = date(2026, 3, 16)
+NOW = datetime(2026, 3, 16, 21, 0, tzinfo=timezone.utc).timestamp()  # 17:00 New York, after the close
+CLOSE = NOW - 1800
+CALLS = []
+
+
+def next_day():
+    """Advance a trading day: the new session has closed and settled."""
+    global TODAY, NOW, CLOSE
+    TODAY, NOW = TODAY + timedelta(days=1), NOW + 86400
+    CLOSE = NOW - 1800
+
+
+def payload(last_day, n, close_of=lambda d: 100.0):
+    days = [last_day - timedelta(days=i) for i in range(n)]
+    return {"Time Series (Daily)": {
+        d.isoformat(): {"1. open": "1", "2. high": "2", "3. low": "0.5",
+                        "4. close": str(close_of(d)), "5. volume": "10"} for d in days
+    }}
+
+
+def fake_api(params, api_key):
+    CALLS.append(params.get("outputsize"))
+    n = 300 if params.get("outputsize") == "full" else _mod.COMPACT_BARS
+    return payload(TODAY, n, close_of=lambda d: 200.0 if d == TODAY else 100.0)
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    _mod.CACHE_DIR = Path(tmp)
+    _mod.OHLCV_DB = Path(tmp) / "ohlcv.db"
+    _mod.BUDGET = _mod.DailyBudget(Path(tmp), _mod.DAILY_BUDGET)
+    _mod.api_call = fake_api
+    _mod.market_date = lambda symbol: TODAY.isoformat()
+    _mod.last_session_close = lambda symbol: CLOSE
+    _mod.time = types.SimpleNamespace(time=lambda: NOW)
+
+    bars, source = _mod.load_bars("spy", "k", history="full")
+    ok("first run downloads full history", CALLS == ["full"] and source == "download" and len(bars) == 300)
+    ok("bars come back oldest first", bars[0]["date"] < bars[-1]["date"])
+
+    CALLS.clear()
+    bars, source = _mod.load_bars("SPY", "k", history="full")
+    ok("fetched since the last close: served from disk with zero API calls",
+       CALLS == [] and source == "store" and len(bars) == 300)
+    bars, source = _mod.load_bars("SPY", "k", history="compact")
+    ok("compact consumers reuse the stored full history", CALLS == [] and len(bars) == 300)
+
+    CALLS.clear()
+    bars, source = _mod.load_bars("SPY", "k", refresh=True)
+    ok("--refresh forces one compact top-up", CALLS == ["compact"] and source == "top-up")
+
+    CALLS.clear()
+    next_day()
+    bars, source = _mod.load_bars("SPY", "k", history="full")
+    ok("after the next close: one compact top-up, not a full download", CALLS == ["compact"] and source == "top-up")
+    ok("top-up appends the new bar without duplicating history",
+       len(bars) == 301 and bars[-1]["date"] == TODAY.isoformat() and len({b["date"] for b in bars}) == 301)
+    ok("top-up overwrites the previously forming bar",
+       next(b for b in bars if b["date"] == (TODAY - timedelta(days=1)).isoformat())["close"] == 100.0)
+
+    CALLS.clear()
+    NOW += 14 * 3600  # 07:00 New York next morning: fetched pre-open, same market date as the close
+    _mod.load_bars("SPY", "k", history="full")
+    ok("pre-open: nothing has closed since the last fetch, no call", CALLS == [])
+    _mod.load_bars("SPY", "k", history="full", refresh=True)
+    next_day()
+    _mod.load_bars("SPY", "k", history="full")
+    ok("a pre-open fetch is not fresh once that day's session closes", CALLS == ["compact", "compact"])
+
+    CALLS.clear()
+    TODAY = TODAY + timedelta(days=_mod.COMPACT_SPAN_DAYS + 10)
+    NOW += (_mod.COMPACT_SPAN_DAYS + 10) * 86400
+    CLOSE = NOW - 1800
+    bars, source = _mod.load_bars("SPY", "k", history="compact")
+    ok("gap longer than compact covers: full download", CALLS == ["full"] and source == "download")
+
+    CALLS.clear()
+    bars, source = _mod.load_bars("QQQ", "k", history="compact")
+    ok("new symbol, compact consumer: one compact download", CALLS == ["compact"] and source == "download")
+    CALLS.clear()
+    _mod.load_bars("QQQ", "k", history="full")
+    ok("... a later full consumer upgrades it to full history", CALLS == ["full"])
+
+    CALLS.clear()
+    bars, source = _mod.load_bars("IWM", "k", offline=True)
+    ok("offline never calls the API", CALLS == [] and bars == [] and source == "store")
+
+    CALLS.clear()
+    next_day()
+    _mod.get_daily_count = lambda: _mod.DAILY_BUDGET
+    bars, source = _mod.load_bars("SPY", "k")
+    ok("budget spent: stored bars served as stale, no call, no exit", CALLS == [] and source == "stale" and bars)
+    try:
+        _mod.load_bars("DIA", "k")
+        ok("budget spent, nothing stored: BudgetExhausted", False)
+    except _mod.BudgetExhausted:
+        ok("budget spent, nothing stored: BudgetExhausted", CALLS == [])
+    _mod.get_daily_count = _mod.BUDGET.count
+
+    CALLS.clear()
+    _mod.api_call = lambda params, api_key: (CALLS.append("fail"), {})[1]
+    next_day()
+    bars, source = _mod.load_bars("SPY", "k")
+    ok("API failure falls back to stored bars", CALLS == ["fail"])
+    ok("... and still returns data", len(bars) > 0 and source == "store")
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Tests for market-analysis.py's options engine (max pain, OI profile, surface).
+
+max_pain() replaced a strikes × contracts double loop with sorted prefix sums,
+so it is checked against that brute-force definition on random chains (ties
+included), on a hand-worked chain, and for speed on a SPY-sized chain.
+Pure local — no network, no API key.
+
+Run: python3 scripts/_test-market-options.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import importlib.util
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+# The skill script is hyphenated (skill convention) → load via importlib.
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "financial-analysis", "assets", "market-analysis.py")
+_spec = importlib.util.spec_from_file_location("market_analysis", _path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+def brute_force_max_pain(options):
+    """The original definition: every strike against every contract."""
+    calls = [o for o in options if o["type"] == "call"]
+    puts = [o for o in options if o["type"] == "put"]
+    best, best_pain = 0, float("inf")
+    for strike in sorted(set(float(o["strike"]) for o in options)):
+        pain = 0
+        for o in calls:
+            if strike > float(o["strike"]):
+                pain += (strike - float(o["strike"])) * int(o["open_interest"]) * 100
+        for o in puts:
+            if strike < float(o["strike"]):
+                pain += (float(o["strike"]) - strike) * int(o["open_interest"]) * 100
+        if pain < best_pain:
+            best, best_pain = strike, pain
+    return best, best_pain
+
+
+def contract(kind, strike, oi, expiration="2026-01-16", volume=0, iv=0.2):
+    return {"type": kind, "strike": str(strike), "open_interest": str(oi), "volume": str(volume),
+            "expiration": expiration, "implied_volatility": str(iv),
+            "delta": "0.5", "gamma": "0.01", "theta": "-0.1", "vega": "0.2"}
+
+
+# --- Hand-worked chain ----------------------------------------------------------
+# Calls: 100×10, 110×5. Puts: 110×10, 120×20.
+# K=100: puts 10·10 + 20·20 = 500     K=110: calls 10·10 = 100, puts 20·10 = 200 → 300
+# K=120: calls 10·20 + 5·10 = 250 → max pain 120 (250 × 100 = $25,000)
+hand = [contract("call", 100, 10), contract("call", 110, 5), contract("put", 110, 10), contract("put", 120, 20)]
+cols = _mod.parse_chain(hand)
+ok("hand-worked chain: max pain strike and payout", _mod.max_pain(cols, _mod.chain_rows(cols)) == (120.0, 25000.0))
+
+# --- Random chains vs brute force ----------------------------------------------
+rng = random.Random(7)
+agree = True
+for _ in range(200):
+    strikes = rng.sample(range(50, 150, 5), rng.randint(1, 12))
+    chain = [contract(rng.choice(["call", "put"]), s, rng.choice([0, 1, 5, 10, 50])) for s in strikes for _ in range(2)]
+    cols = _mod.parse_chain(chain)
+    fast = _mod.max_pain(cols, _mod.chain_rows(cols))
+    slow = brute_force_max_pain(chain)
+    if fast[0] != slow[0] or abs(fast[1] - slow[1]) > 1e-6:
+        agree = False
+        print("    mismatch:", fast, slow)
+        break
+ok("prefix-sum max pain matches brute force on 200 random chains (incl. ties)", agree)
+
+# --- Parsing robustness -----------------------------------------------------------
+messy = [
+    {"type": "CALL", "strike": "100", "open_interest": "", "volume": None, "expiration": "2026-01-16"},
+    {"type": "put", "strike": "95.5", "open_interest": "7", "expiration_date": "2026-01-16"},
+    {"type": "unknown", "strike": "1"},
+]
+cols = _mod.parse_chain(messy)
+ok("parse_chain tolerates blanks/None, upper-case types and expiration_date",
+   cols["type"] == ["call", "put"] and cols["open_interest"] == [0, 7] and cols["expiration"] == ["2026-01-16"] * 2
+   and cols["strike"] == [100.0, 95.5])
+
+# --- OI profile and surface ---------------------------------------------------------
+near = (date.today() + timedelta(days=3)).isoformat()
+far = (date.today() + timedelta(days=30)).isoformat()
+chain = [
+    contract("call", 100, 10, near, volume=4, iv=0.30), contract("put", 100, 30, near, volume=6, iv=0.34),
+    contract("call", 105, 20, near, volume=1), contract("put", 95, 5, near),
+    contract("call", 100, 1, far, iv=0.25), contract("put", 100, 2, far, iv=0.27),
+    contract("call", 300, 99, far),  # far out of the strike window
+]
+cols = _mod.parse_chain(chain)
+profile = _mod.oi_profile(cols, _mod.chain_rows(cols, near))
+ok("oi_profile totals and put/call ratios per expiry",
+   profile["call_oi"] == 30 and profile["put_oi"] == 35 and profile["call_volume"] == 5 and profile["put_volume"] == 6
+   and profile["put_call_ratio_oi"] == round(35 / 30, 3))
+surface = _mod.options_surface(cols, price=101, max_expirations=6, strike_window=0.2)
+ok("surface is ordered by expiration with days-to-expiry",
+   [e["expiration"] for e in surface] == [near, far] and surface[0]["dte"] == 3 and surface[1]["dte"] == 30)
+ok("surface ATM IV averages the nearest call and put", surface[0]["atm_iv"] == 0.32)
+ok("surface strike grid respects the window", all(row["strike"] != 300 for e in surface for row in e["strikes"]))
+ok("surface rows carry both sides with Greeks",
+   surface[0]["strikes"][1]["strike"] == 100 and surface[0]["strikes"][1]["put"]["oi"] == 30
+   and surface[0]["strikes"][1]["call"]["delta"] == 0.5)
+ok("surface top-OI lists rank by open interest", surface[1]["top_call_oi"][0] == {"strike": 300.0, "oi": 99})
+ok("max_expirations limits the surface", len(_mod.options_surface(cols, 101, max_expirations=1)) == 1)
+
+# --- SPY-sized chain -----------------------------------------------------------------
+big = [contract(kind, 300 + s * 0.5, rng.randint(0, 5000), (date.today() + timedelta(days=d)).isoformat())
+       for d in range(0, 200, 7) for s in range(700) for kind in ("call", "put")]
+started = time.perf_counter()
+cols = _mod.parse_chain(big)
+_mod.max_pain(cols, _mod.chain_rows(cols))
+_mod.options_surface(cols, price=475)
+elapsed = time.perf_counter() - started
+ok(f"{len(big):,} contracts: parse + max pain + surface in {elapsed * 1000:.0f} ms (< 2 s)", elapsed < 2.0)
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Tests for market-analysis.py's budget-planned, concurrent watchlist scan.
+
+watchlist_scan() decides what to fetch before spending anything: symbols
+fetched since the last session close are free, fetches stop at the remaining
+daily budget, and the rest are served stale from the store. These pin that plan and the output contract
+(input order for --json, one object per line for --stream). If the budget
+runs out mid-scan, workers must not exit: they return a budget-exhausted
+row and the planner reports it.
+api_call and the clock are faked; the database lives in a temp dir.
+
+Run: python3 scripts/_test-market-watchlist.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+# The skill script is hyphenated (skill convention) → load via importlib.
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "financial-analysis", "assets", "market-analysis.py")
+_spec = importlib.util.spec_from_file_location("market_analysis", _path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+TODAY = date(2026, 3, 16)
+NOW = datetime(2026, 3, 16, 21, 0, tzinfo=timezone.utc).timestamp()
+CALLS = []
+_lock = threading.Lock()
+
+
+def fake_api(params, api_key):
+    with _lock:
+        CALLS.append(params["symbol"])
+    days = [TODAY - timedelta(days=i) for i in range(_mod.COMPACT_BARS)]
+    return {"Time Series (Daily)": {
+        d.isoformat(): {"1. open": "1", "2. high": "2", "3. low": "0.5",
+                        "4. close": str(100 + i % 7), "5. volume": "10"} for i, d in enumerate(days)
+    }}
+
+
+def scan(symbols, **kw):
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        _mod.watchlist_scan(symbols, "k", **kw)
+    return out.getvalue(), err.getvalue()
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    _mod.CACHE_DIR = Path(tmp)
+    _mod.OHLCV_DB = Path(tmp) / "ohlcv.db"
+    _mod.BUDGET = _mod.DailyBudget(Path(tmp), _mod.DAILY_BUDGET)
+    _mod.api_call = fake_api
+    _mod.market_date = lambda symbol: TODAY.isoformat()
+    _mod.last_session_close = lambda symbol: NOW - 1800
+    _mod.time = types.SimpleNamespace(time=lambda: NOW, sleep=time.sleep)
+    _mod.requests_per_minute = lambda: 6000
+
+    out, err = scan(["SPY", "AAPL", "SPY", "NVDA"], as_json=True)
+    rows = json.loads(out)
+    ok("duplicates are scanned once, JSON keeps input order",
+       [r["symbol"] for r in rows] == ["SPY", "AAPL", "NVDA"] and sorted(CALLS) == ["AAPL", "NVDA", "SPY"])
+    ok("plan summary goes to stderr", "3 to fetch" in err)
+    ok("rows carry price, RSI, signal and source",
+       all({"price", "rsi", "signal", "source"} <= set(r) for r in rows) and rows[0]["source"] == "download")
+
+    CALLS.clear()
+    out, err = scan(["SPY", "AAPL", "NVDA"], as_json=True)
+    ok("rescan before the next close: zero API calls, all from the store",
+       CALLS == [] and "3 cached, 0 to fetch" in err and all(r["source"] == "store" for r in json.loads(out)))
+
+    CALLS.clear()
+    _mod.get_daily_count = lambda: _mod.DAILY_BUDGET - 1
+    out, err = scan(["SPY", "QQQ", "IWM", "DIA"], as_json=True)
+    rows = {r["symbol"]: r for r in json.loads(out)}
+    ok("fetches stop at the remaining budget, in input order", CALLS == ["QQQ"] and "2 over budget" in err)
+    ok("over-budget symbols with nothing stored report an error, not a fetch",
+       "error" in rows["IWM"] and "error" in rows["DIA"])
+    ok("cached symbols are still served", rows["SPY"]["source"] == "store" and "stale" not in rows["SPY"])
+
+    CALLS.clear()
+    TODAY, NOW = TODAY + timedelta(days=1), NOW + 86400
+    _mod.get_daily_count = lambda: _mod.DAILY_BUDGET
+    out, err = scan(["SPY"], as_json=True)
+    row = json.loads(out)[0]
+    ok("budget spent: yesterday's bars are served and marked stale",
+       CALLS == [] and row.get("stale") is True and row["as_of"] == (TODAY - timedelta(days=1)).isoformat())
+
+    CALLS.clear()
+    _mod.get_daily_count = lambda: 0
+    out, err = scan(["SPY", "AAPL"], as_json=True, stream=True)
+    lines = [json.loads(line) for line in out.splitlines()]
+    ok("--stream emits one JSON object per symbol", sorted(r["symbol"] for r in lines) == ["AAPL", "SPY"])
+
+    CALLS.clear()
+    TODAY, NOW = TODAY + timedelta(days=1), NOW + 86400
+    count = [_mod.DAILY_BUDGET - 3]
+    _mod.get_daily_count = lambda: count[0]
+    planner = _mod.plan_watchlist
+
+    def plan_then_spend(symbols, refresh=False):
+        plan = planner(symbols, refresh)
+        count[0] = _mod.DAILY_BUDGET  # another process spends the rest while workers wait for tokens
+        return plan
+
+    _mod.plan_watchlist = plan_then_spend
+    _mod.requests_per_minute = lambda: 1  # one token: the other workers have to wait
+    started = time.monotonic()
+    try:
+        out, err = scan(["SPY", "AAPL", "XLE"], as_json=True)
+        rows = {r["symbol"]: r for r in json.loads(out)}
+        exited = False
+    except SystemExit:
+        rows, exited = {}, True
+    ok("budget spent mid-scan: no exit, every symbol gets a row", not exited and sorted(rows) == ["AAPL", "SPY", "XLE"])
+    ok("waiting workers give up instead of blocking on the bucket", time.monotonic() - started < 10 and CALLS == [])
+    ok("stored symbols are served stale with a budget_exhausted status",
+       rows.get("SPY", {}).get("stale") is True and rows["SPY"].get("status") == "budget_exhausted")
+    ok("unstored symbols report budget_exhausted", rows.get("XLE", {}).get("status") == "budget_exhausted"
+       and "error" in rows["XLE"])
+    ok("planner reports the mid-scan exhaustion", "Budget exhausted mid-scan: 3 of 3" in err)
+    _mod.plan_watchlist = planner
+    _mod.requests_per_minute = lambda: 6000
+    _mod.get_daily_count = lambda: 0
+
+    out, err = scan(["SPY", "NOPE"])
+    ok("text mode prints a row per symbol with the disclaimer",
+       " SPY: $" in out and "NOPE:" in out and "not financial advice" in out)
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Tests for the shared balance reads in skills/prediction-markets/scripts/polymarket-chain.py.
+
+Pins the Multicall3 aggregate3 encoding against a hand-decoded call, the
+decoder against a canned reply, and the JSON-RPC batch in erc20_balances():
+RPCs that reject batches (non-list error reply, HTTP 4xx) must fall back to
+single eth_calls instead of reporting no balance. The RPC is faked.
+
+Run: python3 scripts/_test-polymarket-chain.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import importlib.util
+import io
+import os
+import sys
+import urllib.error
+
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "prediction-markets", "scripts", "polymarket-chain.py")
+_spec = importlib.util.spec_from_file_location("polymarket_chain", _path)
+chain = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(chain)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+WALLET = "0x" + "ab" * 20
+W = chain.abi_word
+
+print("== aggregate3 ==")
+encoded = chain.encode_aggregate3([(chain.USDC_E, "0x70a08231" + WALLET[2:].zfill(64))])
+body = encoded[10:]
+words = [body[i:i + 64] for i in range(0, len(body), 64)]
+ok("selector, array offset, length, element head",
+   encoded[:10] == "0x82ad56cb" and words[0] == W(0x20) and words[1] == W(1) and words[2] == W(0x20))
+ok("element: target, allowFailure, bytes offset, 36-byte calldata padded to 64",
+   words[3] == chain.USDC_E[2:].lower().zfill(64) and words[4] == W(1) and words[5] == W(0x60)
+   and words[6] == W(36) and len(words) == 9 and words[8].endswith("0" * 56))
+
+# (true, uint 5_000_000), (false, empty)
+reply = ("0x" + W(0x20) + W(2) + W(0x40) + W(0x100)
+         + W(1) + W(0x40) + W(32) + W(5_000_000)
+         + W(0) + W(0x40) + W(0))
+ok("decode: success → value, failure → None", chain.decode_aggregate3(reply) == [5_000_000, None])
+ok("token ids: decimal and hex", chain.token_id_int("255") == 255 and chain.token_id_int("0xff") == 255)
+
+print("== JSON-RPC batch fallback ==")
+
+
+class FakeRPC:
+    def __init__(self, batch):
+        self.batch = batch  # "ok", "error-object" or "http-400"
+        self.posts = []
+
+    def post(self, rpc_url, payload, timeout):
+        self.posts.append(payload)
+        if isinstance(payload, list):
+            if self.batch == "http-400":
+                raise urllib.error.HTTPError(rpc_url, 400, "Bad Request", {}, io.BytesIO(b""))
+            if self.batch == "error-object":
+                return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch not supported"}}
+            return [{"jsonrpc": "2.0", "id": r["id"], "result": hex(1_000_000 * (r["id"] + 1))} for r in payload]
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": hex(1_000_000 * (payload["id"] + 1))}
+
+
+for mode in ("ok", "error-object", "http-400"):
+    fake = FakeRPC(mode)
+    chain._post = fake.post
+    values = chain.erc20_balances("https://rpc", WALLET, [chain.USDC_E, "0x" + "11" * 20])
+    singles = [p for p in fake.posts if isinstance(p, dict)]
+    expected_singles = 0 if mode == "ok" else 2
+    ok(f"batch {mode}: both balances read ({expected_singles} single calls)",
+       values == [1_000_000, 2_000_000] and len(singles) == expected_singles)
+
+
+def down(rpc_url, payload, timeout):
+    raise urllib.error.URLError("connection refused")
+
+
+chain._post = down
+ok("RPC down: None per token, no exception", chain.erc20_balances("https://rpc", WALLET, [chain.USDC_E]) == [None])
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Tests for the shared trade journal in skills/prediction-markets/scripts/polymarket-journal.py.
+
+trade-log.json/positions.json used to be rewritten whole by three scripts
+that each carried their own copy of the journal code; these pin the shared
+module: legacy files are imported exactly once, the journal is what the
+scripts read back, and both JSON files keep being written as snapshots
+because the dashboard's Polymarket panel reads them (trade-log.json only the
+most recent trades, so its cost doesn't grow with the history). The FIFO P&L ledger
+is pinned on a buy/buy/partial-sell sequence, and a second sync must only
+read trades logged since the first. The workspace lives in a temp dir.
+
+Run: python3 scripts/_test-polymarket-journal.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import importlib.util
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+_dir = os.path.join(os.path.dirname(__file__), "..", "skills", "prediction-markets", "scripts")
+
+
+def _load(name, filename):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(_dir, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+journal = _load("polymarket_journal", "polymarket-journal.py")
+trade = _load("polymarket_trade", "polymarket-trade.py")
+positions_script = _load("polymarket_positions", "polymarket-positions.py")
+portfolio = _load("polymarket_portfolio", "polymarket-portfolio.py")
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+def setup():
+    """Point every loaded copy of the journal module at a fresh temp dir."""
+    tmp = Path(tempfile.mkdtemp())
+    for module in (journal, trade._journal, positions_script._journal, portfolio._journal):
+        module.POLYMARKET_DIR = tmp
+        module.TRADE_JOURNAL_DB = tmp / "trade-journal.db"
+        module.TRADE_LOG_FILE = tmp / "trade-log.json"
+        module.POSITIONS_FILE = tmp / "positions.json"
+    return tmp
+
+
+def trade_count(tmp):
+    conn = sqlite3.connect(str(tmp / "trade-journal.db"))
+    n = conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+    conn.close()
+    return n
+
+
+def buy(order_id, token_id, shares, price):
+    return {"timestamp": "2026-10-15T10:00:00+00:00", "action": "BUY", "order_id": order_id,
+            "token_id": token_id, "shares": shares, "price": price, "amount_usdc": shares * price,
+            "fill_status": "MATCHED"}
+
+
+print("== shared module ==")
+ok("scripts load the shared journal instead of carrying copies",
+   all(not hasattr(m, "JOURNAL_SCHEMA") and not hasattr(m, "LEDGER_TOTAL_FIELDS")
+       and m.open_journal.__module__ == "polymarket_journal"
+       for m in (trade, positions_script, portfolio)))
+
+print("== legacy migration ==")
+tmp = setup()
+legacy_log = [buy("0xa", "T1", 10, 0.4), buy("0xb", "T2", 5, 0.6), "not-a-dict"]
+legacy_positions = [{"token_id": "T1", "shares": 10, "avg_price": 0.4}]
+(tmp / "trade-log.json").write_text(json.dumps(legacy_log))
+(tmp / "positions.json").write_text(json.dumps(legacy_positions))
+conn = journal.open_journal()
+ok("legacy trades imported (non-dict entries skipped)", [t["order_id"] for t in journal.load_trade_log(conn)] == ["0xa", "0xb"])
+ok("legacy positions imported", journal.load_positions(conn) == legacy_positions)
+conn.close()
+ok("trade-log.json left in place for the dashboard", (tmp / "trade-log.json").exists()
+   and not (tmp / "trade-log.json.migrated").exists())
+
+conn = journal.open_journal()
+conn.close()
+ok("second open does not re-import", trade_count(tmp) == 2)
+
+conn = trade._journal.open_journal()
+conn.close()
+ok("other scripts see the migration as done", trade_count(tmp) == 2)
+
+print("== snapshots ==")
+trade.log_trade(buy("0xc", "T1", 4, 0.5))
+snapshot = json.loads((tmp / "trade-log.json").read_text())
+ok("log_trade refreshes trade-log.json from the journal",
+   [t["order_id"] for t in snapshot["trades"]] == ["0xa", "0xb", "0xc"] and trade_count(tmp) == 3)
+
+trade.update_trade_log_entry("0xc", {"fill_status": "CANCELLED"})
+snapshot = json.loads((tmp / "trade-log.json").read_text())
+ok("updates reach the snapshot", snapshot["trades"][-1]["fill_status"] == "CANCELLED")
+
+trade.update_positions("m1", "Will it?", "Yes", "T3", 8, 0.25, "BUY")
+ok("update_positions refreshes positions.json",
+   [p["token_id"] for p in json.loads((tmp / "positions.json").read_text())] == ["T1", "T3"])
+
+positions_script.save_positions([{"token_id": "T3", "shares": 8, "avg_price": 0.25}])
+ok("save_positions replaces the table and the snapshot",
+   [p["token_id"] for p in positions_script.load_positions()] == ["T3"]
+   and [p["token_id"] for p in json.loads((tmp / "positions.json").read_text())] == ["T3"])
+ok("portfolio reads the same journal", [p["token_id"] for p in portfolio.load_positions()] == ["T3"])
+
+print("== fresh install ==")
+tmp = setup()
+conn = journal.open_journal()
+ok("no legacy files: empty journal", journal.load_trade_log(conn) == [] and journal.load_positions(conn) == [])
+conn.close()
+trade.log_trade(buy("0xd", "T9", 1, 0.9))
+ok("first trade creates trade-log.json",
+   [t["order_id"] for t in json.loads((tmp / "trade-log.json").read_text())["trades"]] == ["0xd"])
+
+journal.TRADE_LOG_SNAPSHOT_LIMIT = trade._journal.TRADE_LOG_SNAPSHOT_LIMIT = 5
+for i in range(12):
+    trade.log_trade(buy(f"0xe{i}", "T9", 1, 0.5))
+snapshot = json.loads((tmp / "trade-log.json").read_text())
+ok("snapshot stays bounded as the journal grows",
+   trade_count(tmp) == 13 and [t["order_id"] for t in snapshot["trades"]] == [f"0xe{i}" for i in range(7, 12)])
+trade.update_trade_log_entry("0xe11", {"fill_status": "MATCHED"})
+ok("... fill updates too", len(json.loads((tmp / "trade-log.json").read_text())["trades"]) == 5)
+ok("the journal still holds the full history", len(journal.load_trade_log()) == 13)
+journal.TRADE_LOG_SNAPSHOT_LIMIT = trade._journal.TRADE_LOG_SNAPSHOT_LIMIT = 100
+
+print("== FIFO ledger ==")
+
+
+def fill(action, token_id, shares, price, status="MATCHED"):
+    return {"timestamp": "2026-10-15T10:00:00+00:00", "action": action, "order_id": f"0x{action}{shares}{price}",
+            "token_id": token_id, "shares": shares, "price": price, "amount_usdc": shares * price,
+            "fill_status": status}
+
+
+tmp = setup()
+for t in (fill("BUY", "T1", 10, 0.40), fill("BUY", "T1", 10, 0.60), fill("BUY", "T1", 50, 0.10, status="CANCELLED"),
+          fill("SELL", "T1", 15, 0.70)):
+    trade.log_trade(t)
+conn = journal.open_journal()
+ledger = journal.load_ledger(conn)["T1"]
+ok("buy/buy/partial sell: realized = 15×0.70 − (10×0.40 + 5×0.60)", abs(ledger["realized_pnl"] - 3.5) < 1e-9)
+ok("remaining lot is the back half of the second buy", ledger["lots"] == [{"shares": 5, "price": 0.60}])
+ok("cost basis and volumes from matched fills only",
+   ledger["buy_shares"] == 20 and abs(ledger["buy_cost"] - 10.0) < 1e-9 and abs(ledger["sell_volume"] - 10.5) < 1e-9)
+
+# Corrupt every row already folded in: a sync that re-read history would fail to parse them
+checkpoint = int(conn.execute("SELECT value FROM meta WHERE key = 'ledger_seq'").fetchone()[0])
+with conn:
+    conn.execute("UPDATE trades SET entry = 'not json' WHERE seq <= ?", (checkpoint,))
+with conn:
+    conn.execute("INSERT INTO trades (timestamp, action, order_id, token_id, entry) VALUES (?, ?, ?, ?, ?)",
+                 journal.trade_row(fill("SELL", "T1", 5, 0.50)))
+try:
+    ledger = journal.load_ledger(conn)["T1"]
+    ok("second sync folds in only the new trade", abs(ledger["realized_pnl"] - 3.0) < 1e-9 and ledger["lots"] == [])
+except ValueError:
+    ok("second sync folds in only the new trade", False)
+ok("checkpoint advanced", int(conn.execute("SELECT value FROM meta WHERE key = 'ledger_seq'").fetchone()[0]) == checkpoint + 1)
+conn.close()
+
+tmp = setup()
+trade.log_trade(fill("BUY", "T2", 10, 0.50, status="LIVE"))
+trade.update_trade_log_entry("0xBUY100.5", {"fill_status": "MATCHED"})
+conn = journal.open_journal()
+ok("fill-status change on a folded trade rebuilds the ledger", journal.load_ledger(conn)["T2"]["buy_shares"] == 10)
+conn.close()
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Tests for price freshness in skills/prediction-markets/scripts/polymarket-search.py.
+
+The local catalogue is up to 30 minutes old and its incremental sync keys
+on updatedAt, which doesn't move with prices. These pin that catalogue
+results are only used for matching/ranking — the prices shown come from one
+live Gamma request — and that detail always fetches its market live, using
+the catalogue copy only when Gamma is unreachable. Gamma is faked; the
+catalogue lives in a temp dir.
+
+Run: python3 scripts/_test-polymarket-search.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.parse
+
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "prediction-markets", "scripts", "polymarket-search.py")
+_spec = importlib.util.spec_from_file_location("polymarket_search", _path)
+search = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(search)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+tmp = tempfile.mkdtemp()
+search.CACHE_DIR = tmp
+search.CATALOGUE_DB = os.path.join(tmp, "market-catalogue.db")
+search.CATALOGUE_LOCK = os.path.join(tmp, "market-catalogue.lock")
+search.LEGACY_CACHE_FILE = os.path.join(tmp, "search-cache.json")
+search._spawn_background_sync = lambda: None
+
+
+def market(cid, question, yes, vol):
+    return {"conditionId": cid, "question": question, "outcomePrices": json.dumps([str(yes), str(1 - yes)]),
+            "volume24hr": vol, "liquidityNum": 1000, "endDate": "2026-12-31T00:00:00Z",
+            "updatedAt": "2026-10-18T00:00:00Z", "closed": False}
+
+
+STALE = [market("0xaa", "Will bitcoin hit 200k?", 0.20, 900), market("0xbb", "Will bitcoin hit 150k?", 0.40, 500)]
+LIVE = {"0xaa": market("0xaa", "Will bitcoin hit 200k?", 0.35, 950), "0xbb": market("0xbb", "Will bitcoin hit 150k?", 0.55, 520)}
+
+conn = search._open_db()
+with conn:
+    search._upsert_markets(conn, STALE, time.time())
+    search._meta_set(conn, "last_sync", time.time())
+conn.close()
+
+
+class FakeGamma:
+    def __init__(self, down=False):
+        self.down = down
+        self.calls = []
+
+    def get(self, endpoint, use_cache=True, max_age=search.CACHE_TTL):
+        self.calls.append((endpoint, use_cache, max_age))
+        if self.down:
+            return None, "HTTP 503: unavailable"
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(endpoint).query)
+        ids = query.get("condition_ids", []) + query.get("condition_id", [])
+        return [LIVE[c] for c in ids if c in LIVE], None
+
+
+def run(cmd, **kw):
+    args = argparse.Namespace(json=True, live=False, limit=10, **kw)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        rc = cmd(args)
+    return rc, json.loads(out.getvalue())
+
+
+print("== catalogue results are re-priced live ==")
+gamma = FakeGamma()
+search.gamma_get = gamma.get
+rc, res = run(search.cmd_trending, sort="volume")
+ok("trending ranked from the catalogue", rc == 0 and [m["condition_id"] for m in res["markets"]] == ["0xaa", "0xbb"])
+ok("trending shows live prices", [m["yes_price"] for m in res["markets"]] == [0.35, 0.55] and res["live_prices"])
+ok("one Gamma request for all shown markets, short cache",
+   len(gamma.calls) == 1 and gamma.calls[0][2] == search.PRICE_MAX_AGE)
+
+rc, res = run(search.cmd_search, query="bitcoin", deep=False)
+ok("search answered from the catalogue with live prices",
+   res["search_method"] == "catalogue" and sorted(m["yes_price"] for m in res["markets"]) == [0.35, 0.55])
+
+search.gamma_get = FakeGamma(down=True).get
+rc, res = run(search.cmd_trending, sort="volume")
+ok("Gamma down: catalogue prices, flagged as not live",
+   rc == 0 and res["live_prices"] is False and res["as_of"] and len(res["markets"]) == 2)
+
+print("== detail is always live ==")
+gamma = FakeGamma()
+search.gamma_get = gamma.get
+rc, res = run(search.cmd_detail, market_id="0xaa")
+ok("detail fetched from Gamma even with a fresh catalogue",
+   rc == 0 and res["market"]["yes_price"] == 0.35 and res["as_of"] is None and len(gamma.calls) == 1)
+
+gamma.calls.clear()
+run(search.cmd_detail, market_id="0xaa")
+ok("detail uses the short price cache", gamma.calls[0][1] is True and gamma.calls[0][2] == search.PRICE_MAX_AGE)
+
+search.gamma_get = FakeGamma(down=True).get
+conn = search._open_db()
+with conn:
+    search._meta_set(conn, "last_sync", 0)  # stale catalogue still beats no answer
+conn.close()
+rc, res = run(search.cmd_detail, market_id="0xbb")
+ok("Gamma down: falls back to the catalogue copy with as_of", rc == 0 and res["as_of"] and res["market"]["yes_price"] is not None)
+rc, res = run(search.cmd_detail, market_id="0xcc")
+ok("Gamma down and not catalogued: FAIL", rc == 1 and res["status"] == "FAIL")
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Tests for rpc_batch() in skills/prediction-markets/scripts/polymarket-wallet.py.
+
+Some Polygon RPCs reject JSON-RPC batches outright with an HTTP 4xx rather
+than an error object. These pin that a 4xx on the batch POST falls back to
+single calls straight away (no retry sleeps), that the endpoint isn't sent
+batches again, and that 429 and 5xx stay retryable errors. The HTTP
+session is faked.
+
+Run: python3 scripts/_test-polymarket-wallet.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import importlib.util
+import os
+import sys
+
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "prediction-markets", "scripts", "polymarket-wallet.py")
+_spec = importlib.util.spec_from_file_location("polymarket_wallet", _path)
+wallet = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(wallet)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+class HTTPError(Exception):
+    """Shaped like requests.HTTPError: the status lives on .response."""
+
+    def __init__(self, status):
+        super().__init__(f"{status} Client Error")
+        self.response = type("Response", (), {"status_code": status})()
+
+
+class FakeRPC:
+    def __init__(self, batch_status=None):
+        self.batch_status = batch_status
+        self.batches = 0
+        self.singles = 0
+
+    def post(self, rpc_url, payload):
+        if isinstance(payload, list):
+            self.batches += 1
+            if self.batch_status:
+                raise HTTPError(self.batch_status)
+            return [{"jsonrpc": "2.0", "id": c["id"], "result": hex(c["id"] + 1)} for c in payload]
+        self.singles += 1
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": hex(payload["id"] + 1)}
+
+
+sleeps = []
+wallet.time.sleep = sleeps.append
+CALLS = [("eth_getBalance", ["0xabc", "latest"]), ("eth_chainId", [])]
+
+
+def reset(fake):
+    wallet._post_rpc = fake.post
+    wallet._rpc_cache["no_batch"].clear()
+    sleeps.clear()
+
+
+print("== batch accepted ==")
+fake = FakeRPC()
+reset(fake)
+ok("one batch POST, results in order", wallet.rpc_batch("https://rpc", CALLS) == ["0x1", "0x2"]
+   and fake.batches == 1 and fake.singles == 0)
+
+print("== batch rejected with HTTP 4xx ==")
+for status in (400, 405, 413):
+    fake = FakeRPC(batch_status=status)
+    reset(fake)
+    ok(f"HTTP {status}: falls back to single calls without retrying",
+       wallet.rpc_batch("https://rpc", CALLS) == ["0x1", "0x2"] and fake.singles == 2 and not sleeps)
+wallet.rpc_batch("https://rpc", CALLS)
+ok("endpoint remembered: later reads skip the batch", fake.batches == 1 and fake.singles == 4)
+
+print("== transient errors still retry ==")
+for status in (429, 503):
+    fake = FakeRPC(batch_status=status)
+    reset(fake)
+    try:
+        wallet.rpc_batch("https://rpc", CALLS)
+        raised = False
+    except RuntimeError:
+        raised = True
+    ok(f"HTTP {status}: retried, then raised, no single-call fallback",
+       raised and fake.batches == wallet.RPC_RETRIES and fake.singles == 0 and sleeps == [2, 4])
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Tests for skills/shared/scripts/rate_budget.py (per-day API budget counters).
+
+market-analysis.py, competitive-intel.py and their shell clients all count
+requests through this module, so these pin what they rely on: counts survive
+across processes without lost updates, days roll over, old days are pruned, a
+legacy .rate-log is folded in exactly once, and a check stays cheap no matter
+how many requests have been recorded. Pure local — temp dirs only.
+
+Run: python3 scripts/_test-rate-budget.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "shared", "scripts", "rate_budget.py")
+_spec = importlib.util.spec_from_file_location("rate_budget", _path)
+_mod = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_mod)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+def day(offset):
+    return (datetime.now(timezone.utc) + timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    budget = _mod.DailyBudget(Path(tmp) / "api", limit=5, warn_at=4)
+    ok("empty budget counts zero without creating files", budget.count() == 0 and not (Path(tmp) / "api").exists())
+    ok("record returns the new count", [budget.record() for _ in range(3)] == [1, 2, 3])
+    ok("remaining and exhausted follow the limit", budget.remaining() == 2 and not budget.exhausted())
+    budget.record(2)
+    ok("record(n) adds n; the limit is reached", budget.count() == 5 and budget.exhausted() and budget.remaining() == 0)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: budget.record(), range(200)))
+    ok("200 concurrent thread records: no lost updates", budget.count() == 205)
+
+    procs = [subprocess.Popen([sys.executable, _path, "record", str(budget.cache_dir)], stdout=subprocess.DEVNULL)
+             for _ in range(4)]
+    for p in procs:
+        p.wait()
+    out = subprocess.run([sys.executable, _path, "count", str(budget.cache_dir)], capture_output=True, text=True)
+    ok("CLI record from separate processes and CLI count agree", out.stdout.strip() == "209" and budget.count() == 209)
+
+    # Rollover and retention: write old days directly, then record today
+    budget.path.write_text(json.dumps({"days": {day(-1): 7, day(-(_mod.RETENTION_DAYS + 5)): 99, day(0): 1}}))
+    ok("yesterday's count does not leak into today", budget.count() == 1 and budget.count(day(-1)) == 7)
+    budget.record()
+    history = budget.history()
+    ok("days past retention are pruned on write", day(-(_mod.RETENTION_DAYS + 5)) not in history and history[day(-1)] == 7)
+    ok("counter file stays a few hundred bytes", budget.path.stat().st_size < 500)
+
+    # Legacy .rate-log migration
+    legacy_dir = Path(tmp) / "legacy"
+    legacy_dir.mkdir()
+    lines = [f"{day(0)} 10:00:{i % 60:02d}" for i in range(120)] + [f"{day(-2)} 09:00:00"] * 3 + ["garbage"]
+    (legacy_dir / ".rate-log").write_text("\n".join(lines) + "\n")
+    legacy = _mod.DailyBudget(legacy_dir, limit=500)
+    ok("legacy .rate-log counts carry over", legacy.count() == 120 and legacy.count(day(-2)) == 3)
+    ok("legacy log is renamed, not re-read", not (legacy_dir / ".rate-log").exists()
+       and (legacy_dir / ".rate-log.migrated").exists())
+    ok("recording continues from the migrated count", legacy.record() == 121)
+
+    # A budget check must not scale with request history
+    big = _mod.DailyBudget(Path(tmp) / "big", limit=10 ** 9)
+    big.record(300_000)
+    started = time.perf_counter()
+    for _ in range(1000):
+        big.count()
+    elapsed = time.perf_counter() - started
+    ok(f"1000 checks after 300k requests in {elapsed * 1000:.0f} ms (< 1 s)", elapsed < 1.0 and big.count() == 300_000)
+
+# --- Token bucket ----------------------------------------------------------------
+bucket = _mod.TokenBucket(per_minute=600, capacity=2)  # 10/s
+ok("token bucket allows the burst, then refuses", bucket.try_acquire() and bucket.try_acquire() and not bucket.try_acquire())
+started = time.monotonic()
+for _ in range(3):
+    bucket.acquire()
+elapsed = time.monotonic() - started
+ok(f"acquire paces to the refill rate (3 tokens in {elapsed:.2f}s)", 0.2 <= elapsed < 0.6)
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Tests for confirm_signature() in skills/solana-defi/scripts/solana-confirm.py.
+
+Confirmation races signatureSubscribe on the RPC websocket against
+getSignatureStatuses polling. These pin that whichever path sees the
+signature first wins, that a dropped websocket leaves polling in charge, that
+a tx landing in the last valid block is still reported confirmed, that the
+deadline ends the wait with "timeout", and that "expired" is only ever
+reported from a block height past lastValidBlockHeight — never from
+isBlockhashValid, which is also false for a blockhash the node hasn't seen
+yet (the snipe path re-sending on that would buy twice).
+
+_rpc_async and the websocket are faked; httpx and websockets are only
+placeholders here, every call through them is replaced.
+
+Run: python3 scripts/_test-solana-confirm.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+import time
+import types
+
+try:
+    import httpx  # noqa: F401
+except ImportError:
+    sys.modules["httpx"] = types.ModuleType("httpx")
+
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "solana-defi", "scripts", "solana-confirm.py")
+_spec = importlib.util.spec_from_file_location("solana_confirm", _path)
+confirm = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(confirm)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+class FakeClient:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeRPC:
+    """Answers _rpc_async: `statuses` are consumed per poll (last one repeats), `height` is fixed."""
+
+    def __init__(self, statuses=(None,), height=100):
+        self.statuses = list(statuses)
+        self.height = height
+        self.calls = []
+
+    async def __call__(self, client, rpc_url, method, params):
+        self.calls.append(method)
+        if method == "getSignatureStatuses":
+            status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+            return {"value": [status]}
+        if method == "getBlockHeight":
+            return self.height
+        if method == "isBlockhashValid":
+            return {"value": False}  # what a node says about a blockhash it hasn't seen yet
+        raise AssertionError(f"unexpected RPC {method}")
+
+
+class FakeSocket:
+    """websockets.connect(): sends the subscription, then yields `messages` after `delay`."""
+
+    def __init__(self, messages=(), delay=0.0, fail=False):
+        self.messages = list(messages)
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+
+    def connect(self, url, **kw):
+        if self.fail:
+            raise OSError("connection refused")
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def send(self, raw):
+        self.sent.append(json.loads(raw))
+
+    def __aiter__(self):
+        return self._messages()
+
+    async def _messages(self):
+        await asyncio.sleep(self.delay)
+        for msg in self.messages:
+            yield json.dumps(msg)
+        await asyncio.sleep(3600)  # subscription stays open until cancelled
+
+
+CONFIRMED = {"confirmationStatus": "confirmed", "err": None}
+NOTIFY = {"jsonrpc": "2.0", "method": "signatureNotification",
+          "params": {"result": {"context": {"slot": 1}, "value": {"err": None}}}}
+
+confirm.httpx = types.SimpleNamespace(AsyncClient=lambda **kw: FakeClient())
+confirm.POLL_INTERVAL = 0.01
+
+
+def run(rpc, ws=None, **kw):
+    confirm._rpc_async = rpc
+    sys.modules["websockets"] = ws or FakeSocket(fail=True)
+    kw.setdefault("timeout", 2)
+    started = time.monotonic()
+    result = confirm.confirm_signature("https://rpc", "SIG", ws_url="wss://rpc" if ws else None, **kw)
+    return result, time.monotonic() - started
+
+
+print("== websocket and polling race ==")
+rpc = FakeRPC(statuses=[None])
+ws = FakeSocket(messages=[{"jsonrpc": "2.0", "result": 7, "id": 1}, NOTIFY], delay=0.05)
+(result, elapsed) = run(rpc, ws, last_valid_block_height=200)
+ok("websocket confirms first", result == ("confirmed", None) and elapsed < 1)
+ok("... after subscribing at confirmed commitment",
+   ws.sent and ws.sent[0]["method"] == "signatureSubscribe" and ws.sent[0]["params"] == ["SIG", {"commitment": "confirmed"}])
+
+failed = dict(NOTIFY, params={"result": {"value": {"err": {"InstructionError": [0, "Custom"]}}}})
+(result, _) = run(FakeRPC(statuses=[None]), FakeSocket(messages=[failed]), last_valid_block_height=200)
+ok("websocket reports an on-chain failure", result == ("failed", {"InstructionError": [0, "Custom"]}))
+
+rpc = FakeRPC(statuses=[None, None, CONFIRMED])
+(result, elapsed) = run(rpc, FakeSocket(fail=True), last_valid_block_height=200)
+ok("websocket fails, polling confirms", result == ("confirmed", None) and rpc.calls.count("getSignatureStatuses") == 3)
+
+(result, _) = run(FakeRPC(statuses=[{"confirmationStatus": "processed", "err": None}, CONFIRMED]))
+ok("processed is not confirmed yet", result == ("confirmed", None))
+
+print("== blockhash expiry ==")
+rpc = FakeRPC(statuses=[None, CONFIRMED], height=201)
+(result, _) = run(rpc, last_valid_block_height=200)
+ok("lands in the last valid block: one more status check finds it",
+   result == ("confirmed", None) and rpc.calls == ["getSignatureStatuses", "getBlockHeight", "getSignatureStatuses"])
+
+rpc = FakeRPC(statuses=[None], height=201)
+(result, _) = run(rpc, last_valid_block_height=200)
+ok("past lastValidBlockHeight and not landed: expired", result == ("expired", None))
+
+rpc = FakeRPC(statuses=[None], height=200)
+(result, elapsed) = run(rpc, last_valid_block_height=200, timeout=0.2)
+ok("at lastValidBlockHeight the tx can still land: keeps waiting", result == ("timeout", None))
+
+print("== deadline ==")
+rpc = FakeRPC(statuses=[None])
+(result, elapsed) = run(rpc, FakeSocket(), last_valid_block_height=200, timeout=0.2)
+ok("deadline passes: timeout, promptly", result == ("timeout", None) and elapsed < 1)
+
+print("== blockhash not yet seen ==")
+rpc = FakeRPC(statuses=[None])
+(result, _) = run(rpc, timeout=0.2)
+ok("no lastValidBlockHeight: never expired, waits to the deadline",
+   result == ("timeout", None) and "isBlockhashValid" not in rpc.calls)
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
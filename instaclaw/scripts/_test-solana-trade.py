@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Tests for the swap pipeline in skills/solana-defi/scripts/solana-trade.py.
+
+run_swap() re-quotes straight away on a stale blockhash, which re-signs and
+re-sends a swap. These pin that a swap that was broadcast is only re-quoted
+when its blockhash expired AND getSignatureStatuses says the signature never
+landed — landed, still processing, or unknown (status check or confirmation
+failing) is reported as is, never re-sent — that a send rejected for a stale
+blockhash re-quotes without a backoff sleep, and that buy/sell still run the
+balance checks and report per-step latency.
+
+Jupiter, the RPC and confirmation are faked; httpx, base58 and solders are
+only placeholders here, every call through them is replaced.
+
+Run: python3 scripts/_test-solana-trade.py
+Exit 0 = all pass, 1 = a failure.
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import types
+
+for name, attrs in (("httpx", {}), ("base58", {}), ("solders", {}),
+                    ("solders.keypair", {"Keypair": None}), ("solders.transaction", {"VersionedTransaction": None})):
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        sys.modules[name] = types.ModuleType(name)
+        sys.modules[name].__dict__.update(attrs)
+
+_path = os.path.join(os.path.dirname(__file__), "..", "skills", "solana-defi", "scripts", "solana-trade.py")
+_spec = importlib.util.spec_from_file_location("solana_trade", _path)
+trade = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(trade)
+
+_p = 0
+_f = 0
+
+
+def ok(name, cond):
+    global _p, _f
+    if cond:
+        _p += 1
+        print(f"  PASS  {name}")
+    else:
+        _f += 1
+        print(f"  FAIL  {name}")
+
+
+class FakeChain:
+    """Jupiter + RPC. `confirms` and `send_errors` are consumed per send; `status` answers the landed check."""
+
+    def __init__(self, confirms=(("confirmed", None),), send_errors=(), status=None, status_error=False):
+        self.confirms = list(confirms)
+        self.send_errors = list(send_errors)
+        self.status = status
+        self.status_error = status_error
+        self.quotes = 0
+        self.sent = []
+        self.rpc_calls = []
+        self.balance = 10 ** 9
+        self.tokens = 5_000_000
+
+    def get_quote(self, *args):
+        self.quotes += 1
+        return {"outAmount": str(1000 * self.quotes), "n": self.quotes}
+
+    def build_swap(self, quote, wallet):
+        return {"swapTransaction": f"tx{quote['n']}", "lastValidBlockHeight": 100 + quote["n"]}
+
+    def send(self, rpc_url, signed):
+        if self.send_errors:
+            error = self.send_errors.pop(0)
+            if error:
+                raise Exception(error)
+        self.sent.append(signed)
+        return f"SIG{len(self.sent)}"
+
+    def confirm(self, rpc_url, signature, ws_url=None, last_valid_block_height=None):
+        outcome = self.confirms.pop(0) if len(self.confirms) > 1 else self.confirms[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def rpc(self, rpc_url, method, params, timeout=10):
+        self.rpc_calls.append(method)
+        if method == "getSignatureStatuses":
+            if self.status_error:
+                raise ConnectionError("RPC unreachable")
+            return {"jsonrpc": "2.0", "id": 1, "result": {"value": [self.status]}}
+        if method == "getBalance":
+            return {"result": {"value": self.balance}}
+        if method == "getTokenAccountsByOwner":
+            return {"result": {"value": [{"account": {"data": {"parsed": {"info": {
+                "tokenAmount": {"amount": str(self.tokens), "decimals": 6}}}}}}]}}
+        raise AssertionError(f"unexpected RPC {method}")
+
+
+sleeps = []
+trade.time.sleep = sleeps.append
+trade.ws_url_for = lambda rpc_url, env: None
+trade._sign = lambda swap_transaction, keypair: f"signed-{swap_transaction}"
+trade.load_env = lambda: {"SOLANA_PRIVATE_KEY": "k", "SOLANA_WALLET_ADDRESS": "W", "SOLANA_RPC_URL": "https://rpc"}
+trade.load_config = lambda: {"max_trade_sol": 1.0, "daily_loss_limit_sol": 5.0, "auto_trade": False}
+trade.get_daily_losses = lambda: 0.0
+trade.base58 = types.SimpleNamespace(b58decode=lambda s: b"key")
+trade.Keypair = types.SimpleNamespace(from_bytes=lambda b: "keypair")
+
+
+def use(chain):
+    trade._build_swap = chain.build_swap
+    trade._send = chain.send
+    trade.confirm_signature = chain.confirm
+    trade._rpc = chain.rpc
+    trade._get_quote = chain.get_quote
+    sleeps.clear()
+    return chain
+
+
+def swap(chain):
+    """run_swap(); returns (result or None, latency, printed error or None)."""
+    latency = {}
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            result = trade.run_swap("https://rpc", {}, "W", "keypair", chain.get_quote, latency)
+        return result, latency, None
+    except SystemExit:
+        return None, latency, json.loads(out.getvalue())
+
+
+STALE = ("expired", None)
+
+print("== broadcast swaps are not re-sent on a guess ==")
+chain = use(FakeChain())
+result, latency, _ = swap(chain)
+ok("confirmed on the first send", result[2] == "confirmed" and result[3] == 1 and len(chain.sent) == 1)
+ok("per-step latency reported", {"quote", "swap_build", "sign", "send", "confirm", "total"} <= set(latency))
+
+chain = use(FakeChain(confirms=[STALE, ("confirmed", None)], status=None))
+result, latency, _ = swap(chain)
+ok("expired and confirmed not landed: re-quotes, signs and sends again",
+   chain.quotes == 2 and chain.sent == ["signed-tx1", "signed-tx2"] and result[1] == "SIG2" and result[3] == 2)
+ok("... after checking the first signature, without a backoff sleep",
+   chain.rpc_calls == ["getSignatureStatuses"] and "verify" in latency and not sleeps)
+
+chain = use(FakeChain(confirms=[STALE], status={"confirmationStatus": "confirmed", "err": None}))
+result, _, _ = swap(chain)
+ok("expired but it landed: success, no second send", len(chain.sent) == 1 and result[1:3] == ("SIG1", "confirmed"))
+
+chain = use(FakeChain(confirms=[STALE], status={"confirmationStatus": "processed", "err": None}))
+result, _, _ = swap(chain)
+ok("expired but still processing: reported unconfirmed, no second send",
+   len(chain.sent) == 1 and result[2] == "timeout")
+
+chain = use(FakeChain(confirms=[STALE], status_error=True))
+result, _, _ = swap(chain)
+ok("expired and the status check fails: reported unconfirmed, no second send",
+   len(chain.sent) == 1 and result[2] == "timeout" and chain.quotes == 1)
+
+chain = use(FakeChain(confirms=[ConnectionError("websocket and RPC down")]))
+result, _, _ = swap(chain)
+ok("confirmation errors after broadcast: reported unconfirmed, no retry",
+   len(chain.sent) == 1 and result[2] == "timeout" and not sleeps)
+
+chain = use(FakeChain(confirms=[STALE, ("confirmed", None)],
+                      status={"confirmationStatus": "confirmed", "err": {"InstructionError": [3, "Custom"]}}))
+result, _, _ = swap(chain)
+ok("expired and landed with an error: an on-chain failure (backoff retry), not a stale re-quote",
+   chain.rpc_calls == ["getSignatureStatuses"] and sleeps == [trade.BACKOFF[0]] and len(chain.sent) == 2)
+
+print("== stale blockhash before broadcast ==")
+chain = use(FakeChain(send_errors=['Send failed: {"message": "Blockhash not found"}']))
+result, _, _ = swap(chain)
+ok("send rejected for a stale blockhash: immediate re-quote",
+   chain.quotes == 2 and len(chain.sent) == 1 and result[2] == "confirmed" and not sleeps)
+
+chain = use(FakeChain(confirms=[STALE], status=None))
+result, latency, error = swap(chain)
+ok("re-quotes are capped, then the attempts back off and give up",
+   result is None and error["requotes"] == trade.MAX_STALE_REQUOTES and error["attempt"] == trade.MAX_RETRIES
+   and sleeps == trade.BACKOFF[:trade.MAX_RETRIES - 1] and "latency_ms" in error)
+
+print("== buy / sell ==")
+
+
+def cmd(fn, **kw):
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            fn(argparse.Namespace(slippage=None, json=True, **kw))
+    except SystemExit:
+        pass
+    return json.loads(out.getvalue())
+
+
+chain = use(FakeChain())
+res = cmd(trade.cmd_buy, mint="MINT", amount="0.5")
+ok("buy: balance and first quote both reported in latency",
+   res.get("status") == "success" and {"balance", "quote", "send", "confirm", "total"} <= set(res["latency_ms"]))
+ok("... and the in-flight first quote is the one swapped", chain.quotes == 1 and res["confirmed"] is True)
+
+chain = use(FakeChain())
+chain.balance = 10 ** 8
+res = cmd(trade.cmd_buy, mint="MINT", amount="0.5")
+ok("buy: insufficient balance stops before any send", "Insufficient balance" in res["error"] and not chain.sent)
+
+chain = use(FakeChain(confirms=[STALE, ("confirmed", None)], status=None))
+res = cmd(trade.cmd_sell, mint="MINT", amount="ALL")
+ok("sell: re-quote after a verified non-landing, balance timed",
+   res.get("status") == "success" and res["attempts"] == 2 and res["input_amount"] == chain.tokens
+   and "balance" in res["latency_ms"] and chain.rpc_calls[0] == "getTokenAccountsByOwner")
+
+chain = use(FakeChain())
+res = cmd(trade.cmd_sell, mint="MINT", amount="10")
+ok("sell: more than the token balance stops before any send", "Insufficient token balance" in res["error"]
+   and not chain.sent)
+
+print(f"\n== {_p} passed, {_f} failed ==")
+sys.exit(1 if _f else 0)
@@ -2,7 +2,8 @@
 #
 # fleet-push-ecommerce-skill.sh — Deploy e-commerce marketplace skill to existing VMs
 #
-# Pushes: SKILL.md, ecommerce-ops.py, ecommerce-setup.sh, ecommerce-guide.md to all active VMs.
+# Pushes: SKILL.md, ecommerce-ops.py, ecommerce-setup.sh, rate_budget.py, ecommerce-guide.md
+#         to all active VMs.
 # BYOK — no platform-level API keys deployed. Users provide their own credentials.
 #
 # Usage:
@@ -62,11 +63,12 @@ deploy_to_vm() {
 
   echo "  Deploying to $vm_id ($user@$ip)..."
 
-  local skill_md_b64 guide_b64 ops_b64 setup_b64
+  local skill_md_b64 guide_b64 ops_b64 setup_b64 budget_b64
   skill_md_b64=$(base64 < "$SKILL_DIR/SKILL.md")
   guide_b64=$(base64 < "$SKILL_DIR/references/ecommerce-guide.md")
   ops_b64=$(base64 < "$SKILL_DIR/assets/ecommerce-ops.py")
   setup_b64=$(base64 < "$SKILL_DIR/assets/ecommerce-setup.sh")
+  budget_b64=$(base64 < "$PROJECT_ROOT/skills/shared/scripts/rate_budget.py")
 
   ssh -o StrictHostKeyChecking=no -o ConnectTimeout=10 -o BatchMode=yes -i "$SSH_KEY_FILE" "${user}@${ip}" bash -s <<REMOTE_SCRIPT
 set -e
@@ -75,11 +77,13 @@ SKILL_DIR="\$HOME/.openclaw/skills/ecommerce-marketplace"
 mkdir -p "\$SKILL_DIR/references" "\$SKILL_DIR/assets" "\$HOME/scripts"
 mkdir -p "\$HOME/.openclaw/workspace/ecommerce/reports"
 mkdir -p "\$HOME/.openclaw/config"
+mkdir -p -m 700 "\$HOME/.openclaw/cache/amazon-sp-api"
 
 echo '$skill_md_b64' | base64 -d > "\$SKILL_DIR/SKILL.md"
 echo '$guide_b64' | base64 -d > "\$SKILL_DIR/references/ecommerce-guide.md"
 echo '$ops_b64' | base64 -d > "\$HOME/scripts/ecommerce-ops.py"
 echo '$setup_b64' | base64 -d > "\$HOME/scripts/ecommerce-setup.sh"
+echo '$budget_b64' | base64 -d > "\$HOME/scripts/rate_budget.py"
 chmod +x "\$HOME/scripts/ecommerce-ops.py"
 chmod +x "\$HOME/scripts/ecommerce-setup.sh"
 
@@ -103,10 +107,12 @@ case "$MODE" in
     echo "  ecommerce-guide.md   -> ~/.openclaw/skills/ecommerce-marketplace/references/ecommerce-guide.md"
     echo "  ecommerce-ops.py     -> ~/scripts/ecommerce-ops.py"
     echo "  ecommerce-setup.sh   -> ~/scripts/ecommerce-setup.sh"
+    echo "  rate_budget.py       -> ~/scripts/rate_budget.py"
     echo ""
     echo "Directories created:"
     echo "  ~/.openclaw/workspace/ecommerce/reports/"
     echo "  ~/.openclaw/config/"
+    echo "  ~/.openclaw/cache/amazon-sp-api/ (LWA token cache, 0700)"
     echo ""
     echo "BYOK — No platform-level API keys deployed."
     echo "Users configure their own Shopify/Amazon/eBay credentials via ecommerce-setup.sh init"
@@ -2,7 +2,7 @@
 #
 # fleet-push-finance-skill.sh — Deploy financial analysis skill to existing VMs
 #
-# Pushes: SKILL.md, market-data.sh, market-analysis.py, finance-guide.md,
+# Pushes: SKILL.md, market-data.sh, market-analysis.py, rate_budget.py, finance-guide.md,
 #          ALPHAVANTAGE_API_KEY to all active VMs.
 #
 # Usage:
@@ -78,11 +78,12 @@ deploy_to_vm() {
   echo "  Deploying to $vm_id ($user@$ip)..."
 
   # Read and base64-encode skill files
-  local skill_md_b64 guide_b64 client_b64 analysis_b64
+  local skill_md_b64 guide_b64 client_b64 analysis_b64 budget_b64
   skill_md_b64=$(base64 < "$SKILL_DIR/SKILL.md")
   guide_b64=$(base64 < "$SKILL_DIR/references/finance-guide.md")
   client_b64=$(base64 < "$SKILL_DIR/assets/market-data.sh")
   analysis_b64=$(base64 < "$SKILL_DIR/assets/market-analysis.py")
+  budget_b64=$(base64 < "$PROJECT_ROOT/skills/shared/scripts/rate_budget.py")
 
   # Base64-encode API key for safe transport
   local key_b64
@@ -101,6 +102,7 @@ echo '$skill_md_b64' | base64 -d > "\$SKILL_DIR/SKILL.md"
 echo '$guide_b64' | base64 -d > "\$SKILL_DIR/references/finance-guide.md"
 echo '$client_b64' | base64 -d > "\$HOME/scripts/market-data.sh"
 echo '$analysis_b64' | base64 -d > "\$HOME/scripts/market-analysis.py"
+echo '$budget_b64' | base64 -d > "\$HOME/scripts/rate_budget.py"
 chmod +x "\$HOME/scripts/market-data.sh" "\$HOME/scripts/market-analysis.py"
 
 # Deploy API key
@@ -125,6 +127,7 @@ case "$MODE" in
     echo "  finance-guide.md  → ~/.openclaw/skills/financial-analysis/references/finance-guide.md"
     echo "  market-data.sh    → ~/scripts/market-data.sh"
     echo "  market-analysis.py → ~/scripts/market-analysis.py"
+    echo "  rate_budget.py    → ~/scripts/rate_budget.py"
     echo "  ALPHAVANTAGE_API_KEY → ~/.openclaw/.env"
     echo ""
 
@@ -2,7 +2,8 @@
 #
 # fleet-push-intel-skill.sh — Deploy competitive intelligence skill to existing VMs
 #
-# Pushes: SKILL.md, competitive-intel.sh, competitive-intel.py, intel-guide.md,
+# Pushes: SKILL.md, competitive-intel.sh, competitive-intel.py, rate_budget.py,
+#          brave_client.py, intel-guide.md,
 #          BRAVE_SEARCH_API_KEY to all active VMs.
 #
 # Usage:
@@ -73,11 +74,13 @@ deploy_to_vm() {
 
   echo "  Deploying to $vm_id ($user@$ip)..."
 
-  local skill_md_b64 guide_b64 client_b64 analysis_b64
+  local skill_md_b64 guide_b64 client_b64 analysis_b64 budget_b64 brave_b64
   skill_md_b64=$(base64 < "$SKILL_DIR/SKILL.md")
   guide_b64=$(base64 < "$SKILL_DIR/references/intel-guide.md")
   client_b64=$(base64 < "$SKILL_DIR/assets/competitive-intel.sh")
   analysis_b64=$(base64 < "$SKILL_DIR/assets/competitive-intel.py")
+  budget_b64=$(base64 < "$PROJECT_ROOT/skills/shared/scripts/rate_budget.py")
+  brave_b64=$(base64 < "$PROJECT_ROOT/skills/shared/scripts/brave_client.py")
 
   local key_b64
   key_b64=$(echo -n "$BRAVE_KEY" | base64)
@@ -96,6 +99,8 @@ echo '$skill_md_b64' | base64 -d > "\$SKILL_DIR/SKILL.md"
 echo '$guide_b64' | base64 -d > "\$SKILL_DIR/references/intel-guide.md"
 echo '$client_b64' | base64 -d > "\$HOME/scripts/competitive-intel.sh"
 echo '$analysis_b64' | base64 -d > "\$HOME/scripts/competitive-intel.py"
+echo '$budget_b64' | base64 -d > "\$HOME/scripts/rate_budget.py"
+echo '$brave_b64' | base64 -d > "\$HOME/scripts/brave_client.py"
 chmod +x "\$HOME/scripts/competitive-intel.sh" "\$HOME/scripts/competitive-intel.py"
 
 touch "\$HOME/.openclaw/.env"
@@ -119,6 +124,8 @@ case "$MODE" in
     echo "  intel-guide.md         -> ~/.openclaw/skills/competitive-intelligence/references/intel-guide.md"
     echo "  competitive-intel.sh   -> ~/scripts/competitive-intel.sh"
     echo "  competitive-intel.py   -> ~/scripts/competitive-intel.py"
+    echo "  rate_budget.py         -> ~/scripts/rate_budget.py"
+    echo "  brave_client.py        -> ~/scripts/brave_client.py"
     echo "  BRAVE_SEARCH_API_KEY   -> ~/.openclaw/.env"
     echo ""
 
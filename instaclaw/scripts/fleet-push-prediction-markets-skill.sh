@@ -91,6 +91,10 @@ deploy_to_vm() {
   kalshi_positions_b64=$(base64 < "$SKILL_DIR/scripts/kalshi-positions.py")
   kalshi_portfolio_b64=$(base64 < "$SKILL_DIR/scripts/kalshi-portfolio.py")
   kalshi_browse_b64=$(base64 < "$SKILL_DIR/scripts/kalshi-browse.py")
+  kalshi_client_b64=$(base64 < "$SKILL_DIR/scripts/kalshi-client.py")
+  poly_journal_b64=$(base64 < "$SKILL_DIR/scripts/polymarket-journal.py")
+  poly_chain_b64=$(base64 < "$SKILL_DIR/scripts/polymarket-chain.py")
+  portfolio_all_b64=$(base64 < "$SKILL_DIR/scripts/portfolio-all.py")
   poly_search_b64=$(base64 < "$SKILL_DIR/scripts/polymarket-search.py")
 
   ssh -o StrictHostKeyChecking=no -o ConnectTimeout=10 -o BatchMode=yes -i "$SSH_KEY_FILE" "${user}@${ip}" bash -s <<REMOTE_SCRIPT
@@ -120,6 +124,8 @@ echo '$verify_b64' | base64 -d > "\$HOME/scripts/polymarket-verify.py"
 echo '$portfolio_b64' | base64 -d > "\$HOME/scripts/polymarket-portfolio.py"
 echo '$wallet_py_b64' | base64 -d > "\$HOME/scripts/polymarket-wallet.py"
 echo '$poly_search_b64' | base64 -d > "\$HOME/scripts/polymarket-search.py"
+echo '$poly_journal_b64' | base64 -d > "\$HOME/scripts/polymarket-journal.py"
+echo '$poly_chain_b64' | base64 -d > "\$HOME/scripts/polymarket-chain.py"
 chmod +x "\$HOME/scripts/polymarket-wallet.py"
 chmod +x "\$HOME/scripts/polymarket-setup-creds.py"
 chmod +x "\$HOME/scripts/polymarket-search.py"
@@ -134,11 +140,14 @@ echo '$kalshi_trade_b64' | base64 -d > "\$HOME/scripts/kalshi-trade.py"
 echo '$kalshi_positions_b64' | base64 -d > "\$HOME/scripts/kalshi-positions.py"
 echo '$kalshi_portfolio_b64' | base64 -d > "\$HOME/scripts/kalshi-portfolio.py"
 echo '$kalshi_browse_b64' | base64 -d > "\$HOME/scripts/kalshi-browse.py"
+echo '$kalshi_client_b64' | base64 -d > "\$HOME/scripts/kalshi-client.py"
+echo '$portfolio_all_b64' | base64 -d > "\$HOME/scripts/portfolio-all.py"
 chmod +x "\$HOME/scripts/kalshi-setup.py"
 chmod +x "\$HOME/scripts/kalshi-trade.py"
 chmod +x "\$HOME/scripts/kalshi-positions.py"
 chmod +x "\$HOME/scripts/kalshi-portfolio.py"
 chmod +x "\$HOME/scripts/kalshi-browse.py"
+chmod +x "\$HOME/scripts/portfolio-all.py"
 
 # Backward compat: remove old polymarket dir before symlinking
 rm -rf "\$HOME/.openclaw/skills/polymarket" 2>/dev/null
@@ -195,7 +204,11 @@ case "$MODE" in
     echo "  scripts/kalshi-positions.py         -> ~/scripts/kalshi-positions.py"
     echo "  scripts/kalshi-portfolio.py         -> ~/scripts/kalshi-portfolio.py"
     echo "  scripts/kalshi-browse.py           -> ~/scripts/kalshi-browse.py"
+    echo "  scripts/kalshi-client.py           -> ~/scripts/kalshi-client.py"
+    echo "  scripts/portfolio-all.py           -> ~/scripts/portfolio-all.py"
     echo "  scripts/polymarket-search.py       -> ~/scripts/polymarket-search.py"
+    echo "  scripts/polymarket-journal.py      -> ~/scripts/polymarket-journal.py"
+    echo "  scripts/polymarket-chain.py        -> ~/scripts/polymarket-chain.py"
     echo ""
     echo "Symlink: ~/.openclaw/skills/polymarket -> ~/.openclaw/skills/prediction-markets"
     echo ""
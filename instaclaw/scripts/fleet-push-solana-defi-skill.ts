@@ -38,6 +38,8 @@ const localFiles: Array<{ name: string; localPath: string; remotePath: string; e
   { name: "solana-trade.py", localPath: path.join(skillDir, "scripts/solana-trade.py"), remotePath: "~/scripts/solana-trade.py", executable: true },
   { name: "solana-balance.py", localPath: path.join(skillDir, "scripts/solana-balance.py"), remotePath: "~/scripts/solana-balance.py", executable: true },
   { name: "solana-positions.py", localPath: path.join(skillDir, "scripts/solana-positions.py"), remotePath: "~/scripts/solana-positions.py", executable: true },
+  { name: "solana-prices.py", localPath: path.join(skillDir, "scripts/solana-prices.py"), remotePath: "~/scripts/solana-prices.py" },
+  { name: "solana-confirm.py", localPath: path.join(skillDir, "scripts/solana-confirm.py"), remotePath: "~/scripts/solana-confirm.py" },
   { name: "solana-snipe.py", localPath: path.join(skillDir, "scripts/solana-snipe.py"), remotePath: "~/scripts/solana-snipe.py", executable: true },
 ];
 
@@ -71,7 +73,7 @@ async function deployToVm(vm: any): Promise<boolean> {
       }
 
       // Install pip deps
-      await ssh.execCommand('python3 -m pip install --quiet --break-system-packages solders base58 httpx 2>/dev/null || true');
+      await ssh.execCommand('python3 -m pip install --quiet --break-system-packages solders base58 httpx websockets 2>/dev/null || true');
 
       // Verify
       const check = await ssh.execCommand(`test -f ${SKILL_DIR}/SKILL.md && echo "OK" || (test -f ${SKILL_DIR}.disabled/SKILL.md && echo "OK_DISABLED" || echo "FAIL")`);
@@ -7,31 +7,49 @@ Usage:
     competitive-intel.py weekly-report                         — Generate weekly report
     competitive-intel.py scan                                  — Run full competitor scan
     competitive-intel.py compare --competitor <name> --category <cat>  — Compare snapshots
+    competitive-intel.py snapshots --competitor <name> [--category <cat>] — List stored snapshots
     competitive-intel.py init --competitor <name> --domain <domain>    — Add competitor
     competitive-intel.py rate-status                            — Show API usage
 
 Reads from:
     ~/.openclaw/.env                                    — BRAVE_SEARCH_API_KEY
     ~/.openclaw/workspace/competitive-intel/config.json — Competitor config
-    ~/.openclaw/workspace/competitive-intel/snapshots/  — Historical data
+    ~/.openclaw/workspace/competitive-intel/snapshots.db — Historical snapshots (indexed, deduplicated)
+    ~/.openclaw/workspace/competitive-intel/snapshots/  — Drop folder, ingested into snapshots.db
 """
 
 import argparse
+import difflib
+import gzip
+import hashlib
 import json
 import os
-import subprocess
+import re
+import sqlite3
 import sys
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+from html.parser import HTMLParser
 from pathlib import Path
 
+try:
+    from brave_client import BraveClient
+    from rate_budget import DailyBudget
+except ImportError:  # repo checkout: the shared modules live in skills/shared/scripts
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "shared" / "scripts"))
+    from brave_client import BraveClient
+    from rate_budget import DailyBudget
+
 ENV_FILE = Path.home() / ".openclaw" / ".env"
 WORKSPACE = Path.home() / ".openclaw" / "workspace" / "competitive-intel"
 CONFIG_FILE = WORKSPACE / "config.json"
 SNAPSHOT_DIR = WORKSPACE / "snapshots"
 REPORT_DIR = WORKSPACE / "reports"
 CACHE_DIR = Path.home() / ".openclaw" / "cache" / "brave-search"
-RATE_FILE = CACHE_DIR / ".rate-log"
 DAILY_BUDGET = 200
+BUDGET = DailyBudget(CACHE_DIR, DAILY_BUDGET, warn_at=160)
 
 
 def load_api_key() -> str:
@@ -66,73 +84,464 @@ def save_config(config: dict):
 
 def get_daily_count() -> int:
     """Get today's API request count."""
-    if not RATE_FILE.exists():
-        return 0
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    try:
-        return sum(1 for line in RATE_FILE.read_text().splitlines() if line.startswith(today))
-    except IOError:
-        return 0
+    return BUDGET.count()
+
+
+_clients = {}
+
+
+def brave_client(api_key: str) -> BraveClient:
+    """One pooled client per run; its response cache is shared with every other command."""
+    if api_key not in _clients:
+        _clients[api_key] = BraveClient(api_key)
+    return _clients[api_key]
 
 
 def brave_search(query: str, api_key: str, count: int = 10, freshness: str = "") -> dict:
-    """Run a Brave Search query via the shell helper."""
-    cmd = [str(Path.home() / "scripts" / "competitive-intel.sh"), "search",
-           "--query", query, "--count", str(count)]
-    if freshness:
-        cmd.extend(["--freshness", freshness])
+    """Run a single Brave Search query (cached)."""
+    return brave_client(api_key).search(query, count, freshness)
+
+
+def brave_search_all(queries: list, api_key: str) -> dict:
+    """Run (query, count, freshness) tuples concurrently, deduplicated and cached."""
+    return brave_client(api_key).search_many([q for q in queries if q])
+
+
+def digest_queries(comp: dict) -> dict:
+    """The daily digest's searches for one competitor."""
+    name, domain = comp["name"], comp.get("domain", "")
+    return {
+        "content": (f"site:{domain}/blog OR site:{domain}/changelog", 5, "pd") if domain else None,
+        "news": (f'"{name}" funding OR raised OR launch OR acquired', 5, "pd"),
+        "mentions": (f'"{name}"', 10, "pd"),
+    }
+
+
+def weekly_queries(comp: dict) -> dict:
+    """The weekly report's searches for one competitor."""
+    name = comp["name"]
+    return {
+        "news": (f'"{name}" announcement OR launch OR funding', 10, "pw"),
+        "mentions": (f'"{name}"', 20, "pw"),
+        "jobs": (f'site:linkedin.com/jobs "{name}"', 5, "pw"),
+    }
+
+
+TRENDS_QUERY = ("AI agent platform trends 2026", 5, "pw")
+
+
+# ---------------------------------------------------------------------------
+# Snapshot store
+# ---------------------------------------------------------------------------
+# Snapshots live in snapshots.db, indexed by (competitor, category, date), so
+# latest/previous is one index lookup instead of a scan of snapshots/. Bodies
+# are stored once per content hash: a page that didn't change since the last
+# check adds a dated row pointing at the existing body. snapshots/ stays the
+# drop-in folder — JSON files written there (by competitive-intel.sh snapshot
+# or by hand) are ingested into the store on the next read and removed; the
+# folder is only listed when its mtime says something new arrived.
+
+SNAPSHOT_DB = WORKSPACE / "snapshots.db"
+SNAPSHOT_RETENTION_DAYS = 365
+SNAPSHOT_KEEP_LATEST = 2  # never pruned, so there is always something to compare against
+VOLATILE_FIELDS = ("date", "fetched_at", "content_hash")
+
 
-    env = os.environ.copy()
-    env["BRAVE_SEARCH_API_KEY"] = api_key
+def competitor_slug(name: str) -> str:
+    return name.lower().replace(" ", "-")
 
+
+def snapshot_hash(data: dict) -> str:
+    """Hash of the snapshot content, ignoring when it was taken."""
+    stable = {k: v for k, v in data.items() if k not in VOLATILE_FIELDS}
+    return hashlib.sha256(json.dumps(stable, sort_keys=True).encode()).hexdigest()
+
+
+def snapshot_db() -> sqlite3.Connection:
+    WORKSPACE.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(SNAPSHOT_DB, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(
+        "CREATE TABLE IF NOT EXISTS snapshot_bodies (hash TEXT PRIMARY KEY, data TEXT NOT NULL);"
+        "CREATE TABLE IF NOT EXISTS snapshots (competitor TEXT, category TEXT, date TEXT, hash TEXT NOT NULL,"
+        " fetched_at TEXT, PRIMARY KEY (competitor, category, date)) WITHOUT ROWID;"
+        "CREATE TABLE IF NOT EXISTS snapshot_meta (key TEXT PRIMARY KEY, value TEXT);"
+        "CREATE TABLE IF NOT EXISTS page_validators (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,"
+        " page_hash TEXT, checked_at TEXT);"
+    )
+    _ingest_snapshot_files(conn)
+    return conn
+
+
+def _put_snapshot(conn, competitor: str, category: str, date: str, data: dict) -> bool:
+    """Insert or replace one dated snapshot; returns False if content matches the previous one."""
+    digest = snapshot_hash(data)
+    prev = conn.execute("SELECT hash FROM snapshots WHERE competitor = ? AND category = ? AND date < ? "
+                        "ORDER BY date DESC LIMIT 1", (competitor, category, date)).fetchone()
+    conn.execute("INSERT OR IGNORE INTO snapshot_bodies (hash, data) VALUES (?, ?)", (digest, json.dumps(data)))
+    conn.execute("INSERT OR REPLACE INTO snapshots (competitor, category, date, hash, fetched_at) "
+                 "VALUES (?, ?, ?, ?, ?)", (competitor, category, date, digest,
+                                             data.get("fetched_at") or datetime.now(timezone.utc).isoformat()))
+    return not prev or prev[0] != digest
+
+
+def _ingest_snapshot_files(conn):
+    """Move JSON files dropped in snapshots/ into the store (only when the folder changed)."""
+    if not SNAPSHOT_DIR.exists():
+        return
+    mtime = str(SNAPSHOT_DIR.stat().st_mtime_ns)
+    seen = conn.execute("SELECT value FROM snapshot_meta WHERE key = 'dir_mtime'").fetchone()
+    if seen and seen[0] == mtime:
+        return
+    skipped = False
+    with conn:
+        for f in sorted(SNAPSHOT_DIR.glob("*.json")):
+            try:
+                data = json.loads(f.read_text())
+            except (json.JSONDecodeError, IOError):
+                data = None
+            if not isinstance(data, dict):
+                skipped = True  # half-written or not ours — look again next time
+                continue
+            # Filenames are {date}-{competitor}-{category}.json; the JSON fields win when present
+            date = str(data.get("date") or f.name[:10])
+            rest = f.stem[11:]
+            competitor = competitor_slug(data.get("competitor") or rest.rsplit("-", 1)[0])
+            category = data.get("category") or (rest.rsplit("-", 1)[1] if "-" in rest else "general")
+            _put_snapshot(conn, competitor, category, date, data)
+            f.unlink()
+        if not skipped:
+            conn.execute("INSERT OR REPLACE INTO snapshot_meta (key, value) VALUES ('dir_mtime', ?)",
+                         (str(SNAPSHOT_DIR.stat().st_mtime_ns),))
+
+
+def prune_snapshots(conn):
+    """Drop snapshots past retention (keeping the latest few per key) and orphaned bodies."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=SNAPSHOT_RETENTION_DAYS)).strftime("%Y-%m-%d")
+    with conn:
+        conn.execute(
+            "DELETE FROM snapshots WHERE date < ? AND date NOT IN ("
+            " SELECT s2.date FROM snapshots s2 WHERE s2.competitor = snapshots.competitor"
+            " AND s2.category = snapshots.category ORDER BY s2.date DESC LIMIT ?)",
+            (cutoff, SNAPSHOT_KEEP_LATEST))
+        conn.execute("DELETE FROM snapshot_bodies WHERE hash NOT IN (SELECT hash FROM snapshots)")
+
+
+def save_snapshot(competitor: str, category: str, data: dict, date: str = None) -> bool:
+    """Store a snapshot for today (or `date`). Returns True if the content changed."""
+    date = date or data.get("date") or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    conn = snapshot_db()
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30, env=env)
-        if result.returncode == 0 and result.stdout:
-            return json.loads(result.stdout)
-    except (subprocess.TimeoutExpired, json.JSONDecodeError):
-        pass
-    return {}
+        with conn:
+            changed = _put_snapshot(conn, competitor_slug(competitor), category, date, dict(data, date=date))
+        prune_snapshots(conn)
+        return changed
+    finally:
+        conn.close()
+
+
+def _snapshot_from_row(body: str, date: str, fetched_at: str) -> dict:
+    # A shared body keeps the date it was first seen; report the row's own
+    data = json.loads(body)
+    data["date"] = date
+    if "fetched_at" in data:
+        data["fetched_at"] = fetched_at
+    return data
+
+
+def recent_snapshots(competitor: str, category: str, limit: int = 2) -> list:
+    """The `limit` most recent snapshots, newest first."""
+    conn = snapshot_db()
+    try:
+        rows = conn.execute(
+            "SELECT b.data, s.date, s.fetched_at FROM snapshots s JOIN snapshot_bodies b ON b.hash = s.hash "
+            "WHERE s.competitor = ? AND s.category = ? ORDER BY s.date DESC LIMIT ?",
+            (competitor_slug(competitor), category, limit)).fetchall()
+    finally:
+        conn.close()
+    return [_snapshot_from_row(*r) for r in rows]
 
 
 def load_snapshot(competitor: str, category: str, date: str = None) -> dict:
-    """Load a stored snapshot."""
-    comp_lower = competitor.lower().replace(" ", "-")
-    if date:
-        filename = f"{date}-{comp_lower}-{category}.json"
-    else:
-        # Find most recent
-        pattern = f"-{comp_lower}-{category}.json"
-        candidates = sorted(
-            [f for f in SNAPSHOT_DIR.iterdir() if f.name.endswith(pattern)],
-            reverse=True
-        ) if SNAPSHOT_DIR.exists() else []
-        if not candidates:
-            return {}
-        filename = candidates[0].name
-
-    filepath = SNAPSHOT_DIR / filename
-    if filepath.exists():
-        try:
-            return json.loads(filepath.read_text())
-        except (json.JSONDecodeError, IOError):
-            pass
-    return {}
+    """Load a stored snapshot (the most recent one unless `date` is given)."""
+    if not date:
+        latest = recent_snapshots(competitor, category, 1)
+        return latest[0] if latest else {}
+    conn = snapshot_db()
+    try:
+        row = conn.execute(
+            "SELECT b.data, s.date, s.fetched_at FROM snapshots s JOIN snapshot_bodies b ON b.hash = s.hash "
+            "WHERE s.competitor = ? AND s.category = ? AND s.date = ?",
+            (competitor_slug(competitor), category, date)).fetchone()
+    finally:
+        conn.close()
+    return _snapshot_from_row(*row) if row else {}
 
 
 def load_previous_snapshot(competitor: str, category: str) -> dict:
     """Load the second-most-recent snapshot (for comparison)."""
-    comp_lower = competitor.lower().replace(" ", "-")
-    pattern = f"-{comp_lower}-{category}.json"
-    candidates = sorted(
-        [f for f in SNAPSHOT_DIR.iterdir() if f.name.endswith(pattern)],
-        reverse=True
-    ) if SNAPSHOT_DIR.exists() else []
-    if len(candidates) < 2:
-        return {}
+    recent = recent_snapshots(competitor, category, 2)
+    return recent[1] if len(recent) > 1 else {}
+
+
+def snapshot_history(competitor: str, category: str = None):
+    """List stored snapshot dates, marking the ones whose content changed."""
+    conn = snapshot_db()
     try:
-        return json.loads(candidates[1].read_text())
-    except (json.JSONDecodeError, IOError):
+        query = "SELECT category, date, hash FROM snapshots WHERE competitor = ?"
+        params = [competitor_slug(competitor)]
+        if category:
+            query += " AND category = ?"
+            params.append(category)
+        rows = conn.execute(query + " ORDER BY category, date", params).fetchall()
+    finally:
+        conn.close()
+    if not rows:
+        print(f"No snapshots stored for {competitor}")
+        return
+    print(f"Snapshots: {competitor}")
+    prev = {}
+    for cat, date, digest in rows:
+        mark = "changed" if prev.get(cat) not in (None, digest) else "baseline" if cat not in prev else "unchanged"
+        prev[cat] = digest
+        print(f"  {cat:<10} {date}  {digest[:12]}  {mark}")
+
+
+# ---------------------------------------------------------------------------
+# Pricing page snapshots
+# ---------------------------------------------------------------------------
+# run_scan fetches every competitor's pricing page at once with conditional
+# requests (ETag / Last-Modified remembered per URL), so a scan takes as long
+# as the slowest page and an unchanged page usually costs a 304. Pages are
+# normalised to a list of text blocks (headings, paragraphs, list items, table
+# cells — scripts, styles and markup dropped), each with a content hash. A
+# page whose block hashes match the stored page hash is skipped without
+# parsing prices or diffing; otherwise the blocks are diffed against the
+# previous snapshot and prices are extracted only from blocks that are new.
+
+PAGE_WORKERS = 8
+PAGE_TIMEOUT = 20
+USER_AGENT = "Mozilla/5.0 (compatible; competitive-intel/1.0)"
+SKIP_TAGS = {"script", "style", "noscript", "svg", "template", "iframe", "head"}
+BLOCK_TAGS = {"p", "div", "section", "article", "header", "footer", "main", "aside", "nav", "li", "ul", "ol",
+              "tr", "td", "th", "table", "dt", "dd", "dl", "h1", "h2", "h3", "h4", "h5", "h6", "br",
+              "button", "form", "label", "blockquote", "figcaption"}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+PRICE_RE = re.compile(r"(?:[$€£]\s?(\d[\d,]*(?:\.\d{1,2})?))|(?:(\d[\d,]*(?:\.\d{1,2})?)\s?(?:USD|EUR|GBP)\b)")
+
+
+class _BlockParser(HTMLParser):
+    """Collects visible text as blocks split at block-level element boundaries."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks = []
+        self.stack = []
+        self.skip = 0
+        self.text = []
+
+    def _flush(self):
+        text = " ".join(" ".join(self.text).split())
+        self.text = []
+        if text:
+            tag = next((t for t in reversed(self.stack) if t in BLOCK_TAGS), "body")
+            self.blocks.append((tag, text))
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip += 1
+        elif tag in BLOCK_TAGS:
+            self._flush()
+        if tag != "br":
+            self.stack.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip = max(0, self.skip - 1)
+        elif tag in BLOCK_TAGS:
+            self._flush()
+        if tag in self.stack:
+            while self.stack and self.stack.pop() != tag:
+                pass
+
+    def handle_data(self, data):
+        if not self.skip:
+            self.text.append(data)
+
+
+def normalize_page(html: str) -> list:
+    """HTML → [{"tag", "text", "h"}] text blocks with a per-block content hash."""
+    parser = _BlockParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        pass  # malformed markup: keep whatever was parsed
+    parser._flush()
+    return [{"tag": "h" if tag in HEADING_TAGS else tag, "text": text,
+             "h": hashlib.sha1(f"{tag in HEADING_TAGS}:{text}".encode()).hexdigest()[:16]}
+            for tag, text in parser.blocks]
+
+
+def page_hash(blocks: list) -> str:
+    return hashlib.sha256("".join(b["h"] for b in blocks).encode()).hexdigest()
+
+
+def block_prices(text: str) -> list:
+    return [(a or b).replace(",", "") for a, b in PRICE_RE.findall(text)]
+
+
+def extract_pricing(blocks: list, previous: list = None) -> dict:
+    """Plan → {"price"} from the blocks, reusing price parses of blocks seen last time.
+
+    Each price belongs to the nearest heading above it; the first price under a
+    heading wins (monthly before annual on most pricing pages).
+    """
+    known = {b["h"]: b.get("prices", []) for b in previous or []}
+    pricing = {}
+    plan = None
+    for block in blocks:
+        prices = known[block["h"]] if block["h"] in known else block_prices(block["text"])
+        if prices:
+            block["prices"] = prices
+        if block["tag"] == "h":
+            plan = block["text"][:60]
+        elif prices and plan and plan not in pricing:
+            pricing[plan] = {"price": prices[0]}
+    return pricing
+
+
+def diff_blocks(previous: list, current: list) -> dict:
+    """Structural diff by block hash: which blocks appeared and which disappeared."""
+    prev_hashes = [b["h"] for b in previous]
+    cur_hashes = [b["h"] for b in current]
+    added, removed = [], []
+    matcher = difflib.SequenceMatcher(None, prev_hashes, cur_hashes, autojunk=False)
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op in ("replace", "delete"):
+            removed.extend(b["text"] for b in previous[i1:i2])
+        if op in ("replace", "insert"):
+            added.extend(b["text"] for b in current[j1:j2])
+    return {"added": added, "removed": removed, "unchanged": len(current) - len(added)}
+
+
+def page_validators(url: str) -> dict:
+    conn = snapshot_db()
+    try:
+        row = conn.execute("SELECT etag, last_modified, page_hash FROM page_validators WHERE url = ?",
+                           (url,)).fetchone()
+    finally:
+        conn.close()
+    return dict(zip(("etag", "last_modified", "page_hash"), row)) if row else {}
+
+
+def save_page_validators(url: str, etag: str, last_modified: str, digest: str):
+    conn = snapshot_db()
+    try:
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO page_validators (url, etag, last_modified, page_hash, checked_at) "
+                         "VALUES (?, ?, ?, ?, ?)", (url, etag, last_modified, digest,
+                                                    datetime.now(timezone.utc).isoformat()))
+    finally:
+        conn.close()
+
+
+def fetch_page(url: str, validators: dict) -> tuple:
+    """Conditional GET. Returns (status, html, etag, last_modified); status 304 means unchanged."""
+    headers = {"User-Agent": USER_AGENT, "Accept": "text/html", "Accept-Encoding": "gzip"}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=PAGE_TIMEOUT) as resp:
+            body = resp.read()
+            if resp.headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            charset = resp.headers.get_content_charset() or "utf-8"
+            return resp.status, body.decode(charset, errors="replace"), resp.headers.get("ETag"), \
+                resp.headers.get("Last-Modified")
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, "", validators.get("etag"), validators.get("last_modified")
+        return e.code, "", None, None
+
+
+def snapshot_pricing_page(name: str, url: str, validators: dict) -> dict:
+    """Fetch + normalise one pricing page (runs on a worker thread; no DB access)."""
+    try:
+        status, html, etag, last_modified = fetch_page(url, validators)
+    except Exception as e:
+        return {"name": name, "url": url, "status": "error", "error": str(e)[:100]}
+    if status == 304:
+        return {"name": name, "url": url, "status": "not-modified", "etag": etag, "last_modified": last_modified,
+                "page_hash": validators.get("page_hash")}
+    if status != 200 or not html:
+        return {"name": name, "url": url, "status": "error", "error": f"HTTP {status}"}
+    blocks = normalize_page(html)
+    digest = page_hash(blocks)
+    result = {"name": name, "url": url, "etag": etag, "last_modified": last_modified, "page_hash": digest,
+              "content_length": len(html)}
+    if digest == validators.get("page_hash"):
+        result["status"] = "unchanged"  # served a 200 but nothing visible changed
+        return result
+    result.update(status="changed", blocks=blocks)
+    return result
+
+
+def record_pricing_snapshot(result: dict) -> dict:
+    """Store a fetched page result (main thread). Returns a diff summary for changed pages."""
+    name, url = result["name"], result["url"]
+    previous = load_snapshot(name, "pricing")
+    if result["status"] in ("not-modified", "unchanged"):
+        if previous:
+            # Today's dated row pointing at the same body — no new content stored
+            save_snapshot(name, "pricing", previous, date=datetime.now(timezone.utc).strftime("%Y-%m-%d"))
+        save_page_validators(url, result["etag"], result["last_modified"], result["page_hash"])
+        return {}
+
+    blocks = result["blocks"]
+    prev_blocks = previous.get("blocks", [])
+    pricing = extract_pricing(blocks, prev_blocks)
+    save_snapshot(name, "pricing", {
+        "competitor": name,
+        "category": "pricing",
+        "url": url,
+        "fetched_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "content_length": result["content_length"],
+        "page_hash": result["page_hash"],
+        "pricing": pricing,
+        "blocks": blocks,
+    })
+    save_page_validators(url, result["etag"], result["last_modified"], result["page_hash"])
+    return diff_blocks(prev_blocks, blocks) if prev_blocks else {"added": [], "removed": [], "baseline": True}
+
+
+def snapshot_pricing_pages(competitors: list) -> dict:
+    """Fetch every competitor's pricing page concurrently; returns {name: status line}."""
+    targets = [(c["name"], c.get("urls", {}).get("pricing", f"https://{c['domain']}/pricing"))
+               for c in competitors if c.get("domain")]
+    if not targets:
         return {}
+    validators = {url: page_validators(url) for _, url in targets}
+    with ThreadPoolExecutor(max_workers=min(PAGE_WORKERS, len(targets))) as pool:
+        results = list(pool.map(lambda t: snapshot_pricing_page(t[0], t[1], validators[t[1]]), targets))
+
+    lines = {}
+    for result in results:
+        if result["status"] == "error":
+            lines[result["name"]] = f"Pricing page failed: {result['error']}"
+        elif result["status"] == "not-modified":
+            record_pricing_snapshot(result)
+            lines[result["name"]] = "Pricing page not modified (304)"
+        elif result["status"] == "unchanged":
+            record_pricing_snapshot(result)
+            lines[result["name"]] = "Pricing page unchanged"
+        else:
+            diff = record_pricing_snapshot(result)
+            lines[result["name"]] = ("Pricing baseline saved" if diff.get("baseline") else
+                                     f"Pricing page changed: +{len(diff['added'])} / -{len(diff['removed'])} blocks")
+    return lines
 
 
 def extract_search_results(data: dict) -> list:
@@ -195,7 +604,11 @@ def generate_digest(api_key: str):
     mentions = []
     content = []
 
-    for comp in competitors:
+    # Every competitor's searches go out together before any is processed
+    plans = [(comp, digest_queries(comp)) for comp in competitors]
+    responses = brave_search_all([q for _, queries in plans for q in queries.values()], api_key)
+
+    for comp, queries in plans:
         name = comp["name"]
         domain = comp.get("domain", "")
 
@@ -221,13 +634,13 @@ def generate_digest(api_key: str):
 
         # Content scan — new blog/changelog posts
         if domain:
-            results = brave_search(f"site:{domain}/blog OR site:{domain}/changelog", api_key, count=5, freshness="pd")
+            results = responses[queries["content"]]
             posts = extract_search_results(results)
             for post in posts:
                 content.append({"competitor": name, "title": post["title"], "url": post["url"]})
 
         # Funding/major news check
-        news_results = brave_search(f'"{name}" funding OR raised OR launch OR acquired', api_key, count=5, freshness="pd")
+        news_results = responses[queries["news"]]
         news_items = extract_search_results(news_results)
         for item in news_items:
             title_lower = item["title"].lower()
@@ -235,7 +648,7 @@ def generate_digest(api_key: str):
                 urgent.append({"competitor": name, "title": item["title"], "url": item["url"], "age": item.get("age", "")})
 
         # Social mentions
-        mention_results = brave_search(f'"{name}"', api_key, count=10, freshness="pd")
+        mention_results = responses[queries["mentions"]]
         mention_items = extract_search_results(mention_results)
         sentiment = analyze_sentiment(mention_items)
         if sentiment["total"] > 0:
@@ -310,7 +723,10 @@ def generate_weekly_report(api_key: str):
     key_developments = []
     pricing_matrix = []
 
-    for comp in competitors:
+    plans = [(comp, weekly_queries(comp)) for comp in competitors]
+    responses = brave_search_all([q for _, queries in plans for q in queries.values()] + [TRENDS_QUERY], api_key)
+
+    for comp, queries in plans:
         name = comp["name"]
         domain = comp.get("domain", "")
         priority = comp.get("priority", "secondary")
@@ -318,19 +734,19 @@ def generate_weekly_report(api_key: str):
         comp_info = {"name": name, "priority": priority, "news": [], "sentiment": {}, "jobs": 0, "pricing_changes": []}
 
         # Search for week's news
-        news = brave_search(f'"{name}" announcement OR launch OR funding', api_key, count=10, freshness="pw")
+        news = responses[queries["news"]]
         news_items = extract_search_results(news)
         comp_info["news"] = news_items[:5]
         for item in news_items[:2]:
             key_developments.append(f"{name}: {item['title']}")
 
         # Mentions sentiment
-        mention_data = brave_search(f'"{name}"', api_key, count=20, freshness="pw")
+        mention_data = responses[queries["mentions"]]
         mention_items = extract_search_results(mention_data)
         comp_info["sentiment"] = analyze_sentiment(mention_items)
 
         # Hiring
-        jobs = brave_search(f'site:linkedin.com/jobs "{name}"', api_key, count=5, freshness="pw")
+        jobs = responses[queries["jobs"]]
         job_items = extract_search_results(jobs)
         comp_info["jobs"] = len(job_items)
         comp_info["job_titles"] = [j["title"] for j in job_items[:3]]
@@ -465,7 +881,7 @@ def generate_weekly_report(api_key: str):
         "",
     ])
 
-    trends = brave_search("AI agent platform trends 2026", api_key, count=5, freshness="pw")
+    trends = responses[TRENDS_QUERY]
     trend_items = extract_search_results(trends)
     for t in trend_items[:3]:
         lines.append(f"  * {t['title']}")
@@ -486,8 +902,9 @@ def generate_weekly_report(api_key: str):
 
 def compare_snapshots(competitor: str, category: str):
     """Compare latest vs previous snapshot for a competitor with structured diff analysis."""
-    current = load_snapshot(competitor, category)
-    previous = load_previous_snapshot(competitor, category)
+    recent = recent_snapshots(competitor, category, 2)
+    current = recent[0] if recent else {}
+    previous = recent[1] if len(recent) > 1 else {}
 
     if not current:
         print(f"No current snapshot for {competitor}/{category}")
@@ -580,6 +997,21 @@ def compare_snapshots(competitor: str, category: str):
             print("  No social changes detected")
         print()
 
+    # Page structure changes (pipeline snapshots carry hashed text blocks)
+    cur_blocks = current.get("blocks", [])
+    prev_blocks = previous.get("blocks", [])
+    if cur_blocks and prev_blocks and current.get("page_hash") != previous.get("page_hash"):
+        diff = diff_blocks(prev_blocks, cur_blocks)
+        print("PAGE CHANGES:")
+        print(f"  Blocks: {len(diff['added'])} added, {len(diff['removed'])} removed, {diff['unchanged']} unchanged")
+        for text in diff["added"][:5]:
+            changes.append({"type": "content", "action": "added", "text": text})
+            print(f"  + {text[:100]}")
+        for text in diff["removed"][:5]:
+            changes.append({"type": "content", "action": "removed", "text": text})
+            print(f"  - {text[:100]}")
+        print()
+
     # Content/size changes (fallback if no structured data)
     cur_content = current.get("content", "")
     prev_content = previous.get("content", "")
@@ -655,26 +1087,21 @@ def run_scan(api_key: str):
     print(f"Scanning {len(competitors)} competitor(s)...")
     print()
 
+    # Same past-week mentions query as the weekly report, so one answers the other from cache
+    mention_queries = {comp["name"]: weekly_queries(comp)["mentions"] for comp in competitors}
+    responses = brave_search_all(list(mention_queries.values()), api_key)
+    pricing_status = snapshot_pricing_pages(competitors)
+
     for comp in competitors:
         name = comp["name"]
         domain = comp.get("domain", "")
         print(f"--- {name} ({domain}) ---")
 
-        # Snapshot pricing page
-        if domain:
-            pricing_url = comp.get("urls", {}).get("pricing", f"https://{domain}/pricing")
-            cmd = [str(Path.home() / "scripts" / "competitive-intel.sh"), "snapshot",
-                   "--url", pricing_url, "--competitor", name, "--category", "pricing"]
-            env = os.environ.copy()
-            env["BRAVE_SEARCH_API_KEY"] = api_key
-            try:
-                subprocess.run(cmd, capture_output=True, text=True, timeout=30, env=env)
-                print(f"  Pricing snapshot saved")
-            except subprocess.TimeoutExpired:
-                print(f"  Pricing snapshot timeout", file=sys.stderr)
+        if name in pricing_status:
+            print(f"  {pricing_status[name]}")
 
         # Search for news
-        news = brave_search(f'"{name}"', api_key, count=10, freshness="pw")
+        news = responses[mention_queries[name]]
         items = extract_search_results(news)
         print(f"  Found {len(items)} mentions this week")
 
@@ -690,7 +1117,7 @@ def rate_status():
     count = get_daily_count()
     remaining = DAILY_BUDGET - count
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    status = "WARNING" if count >= 160 else "EXHAUSTED" if count >= DAILY_BUDGET else "OK"
+    status = "EXHAUSTED" if count >= DAILY_BUDGET else "WARNING" if count >= BUDGET.warn_at else "OK"
 
     print(f"Brave Search API Usage")
     print(f"  Date:      {today}")
@@ -712,6 +1139,10 @@ def main():
     p_compare.add_argument("--competitor", required=True)
     p_compare.add_argument("--category", required=True)
 
+    p_history = subparsers.add_parser("snapshots")
+    p_history.add_argument("--competitor", required=True)
+    p_history.add_argument("--category")
+
     p_init = subparsers.add_parser("init")
     p_init.add_argument("--competitor", required=True)
     p_init.add_argument("--domain", required=True)
@@ -730,6 +1161,8 @@ def main():
         init_competitor(args.competitor, args.domain)
     elif args.command == "compare":
         compare_snapshots(args.competitor, args.category)
+    elif args.command == "snapshots":
+        snapshot_history(args.competitor, args.category)
     elif not api_key:
         print("Error: BRAVE_SEARCH_API_KEY not set", file=sys.stderr)
         sys.exit(1)
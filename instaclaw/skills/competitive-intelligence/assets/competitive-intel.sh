@@ -30,10 +30,9 @@ if [ -z "$BRAVE_SEARCH_API_KEY" ]; then
   exit 1
 fi
 
-BRAVE_SEARCH_URL="https://api.search.brave.com/res/v1/web/search"
-BRAVE_NEWS_URL="https://api.search.brave.com/res/v1/news/search"
 CACHE_DIR="$HOME/.openclaw/cache/brave-search"
-RATE_FILE="$CACHE_DIR/.rate-log"
+RATE_BUDGET="$HOME/scripts/rate_budget.py"
+BRAVE_CLIENT="$HOME/scripts/brave_client.py"
 SNAPSHOT_DIR="$HOME/.openclaw/workspace/competitive-intel/snapshots"
 DAILY_BUDGET=200
 
@@ -60,20 +59,13 @@ while [[ $# -gt 0 ]]; do
 done
 
 # Rate limiting
+# Per-day counters shared with the Python engine (~/scripts/rate_budget.py)
 log_request() {
-  local today
-  today=$(date -u +%Y-%m-%d)
-  echo "$today $(date -u +%H:%M:%S)" >> "$RATE_FILE"
+  python3 "$RATE_BUDGET" record "$CACHE_DIR" >/dev/null
 }
 
 get_daily_count() {
-  local today
-  today=$(date -u +%Y-%m-%d)
-  if [ -f "$RATE_FILE" ]; then
-    grep -c "^$today" "$RATE_FILE" 2>/dev/null || echo "0"
-  else
-    echo "0"
-  fi
+  python3 "$RATE_BUDGET" count "$CACHE_DIR" 2>/dev/null || echo "0"
 }
 
 check_rate_limit() {
@@ -88,29 +80,12 @@ check_rate_limit() {
   fi
 }
 
-# Brave Search API call
+# Brave Search API call — through the shared Python client so searches share
+# its pooled session, response cache and budget counters
 brave_search() {
-  local query="$1" count="${2:-10}" freshness="${3:-}" search_url="${4:-$BRAVE_SEARCH_URL}"
-
-  check_rate_limit
-
-  local url="${search_url}?q=$(python3 -c "import urllib.parse; print(urllib.parse.quote('$query'))")&count=${count}"
-  [ -n "$freshness" ] && url="${url}&freshness=${freshness}"
-
-  local response
-  response=$(curl -s --max-time 30 \
-    -H "Accept: application/json" \
-    -H "Accept-Encoding: gzip" \
-    -H "X-Subscription-Token: $BRAVE_SEARCH_API_KEY" \
-    "$url" 2>/dev/null)
-
-  if [ -z "$response" ]; then
-    echo '{"error": "Empty response from Brave Search API"}' >&2
-    return 1
-  fi
-
-  log_request
-  echo "$response"
+  local query="$1" count="${2:-10}" freshness="${3:-}" endpoint="${4:-search}"
+  BRAVE_SEARCH_API_KEY="$BRAVE_SEARCH_API_KEY" python3 "$BRAVE_CLIENT" "$endpoint" \
+    --query "$query" --count "$count" --freshness "$freshness"
 }
 
 case "$CMD" in
@@ -119,14 +94,14 @@ case "$CMD" in
     QUERY="${OPTS[query]:?Usage: competitive-intel.sh search --query <text>}"
     COUNT="${OPTS[count]:-10}"
     FRESHNESS="${OPTS[freshness]:-}"
-    brave_search "$QUERY" "$COUNT" "$FRESHNESS" "$BRAVE_SEARCH_URL"
+    brave_search "$QUERY" "$COUNT" "$FRESHNESS" search
     ;;
 
   news)
     QUERY="${OPTS[query]:?Usage: competitive-intel.sh news --query <text>}"
     COUNT="${OPTS[count]:-5}"
     FRESHNESS="${OPTS[freshness]:-}"
-    brave_search "$QUERY" "$COUNT" "$FRESHNESS" "$BRAVE_NEWS_URL"
+    brave_search "$QUERY" "$COUNT" "$FRESHNESS" news
     ;;
 
   snapshot)
@@ -33,7 +33,19 @@ import sys
 import subprocess
 import datetime
 import hashlib
+import http.client
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+try:
+    from rate_budget import TokenBucket
+except ImportError:  # repo checkout: shared helpers live in skills/shared/scripts
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "shared" / "scripts"))
+    from rate_budget import TokenBucket
 
 CONFIG_PATH = os.environ.get(
     "ECOMMERCE_CONFIG",
@@ -44,6 +56,37 @@ INVENTORY_DB = os.path.join(DATA_DIR, "inventory.json")
 RETURNS_DB = os.path.join(DATA_DIR, "returns.json")
 PRICE_LOG = os.path.join(DATA_DIR, "price-changes.json")
 REPORTS_DIR = os.path.join(DATA_DIR, "reports")
+SKU_MAP_CACHE = os.path.join(DATA_DIR, "shopify-sku-map.json")
+ORDERS_DB = os.path.join(DATA_DIR, "orders.db")
+
+SHOPIFY_API_VERSION = "2024-01"
+SKU_MAP_TTL = 24 * 3600        # variants/locations rarely move; unknown SKUs force a rebuild
+SKU_MAP_PAGE = 100             # variants per query (~300 cost points of the 1000-point bucket)
+SET_QUANTITIES_BATCH = 250     # inventorySetQuantities accepts up to 250 quantities per call
+
+LWA_TOKEN_URL = "https://api.amazon.com/auth/o2/token"
+SP_API_HOST = "sellingpartnerapi-na.amazon.com"
+LWA_TOKEN_CACHE = os.path.expanduser("~/.openclaw/cache/amazon-sp-api/lwa-token.json")
+LWA_REFRESH_MARGIN = 120       # refresh this many seconds before the hour-long token expires
+
+# SP-API usage plans: (method, path prefix, requests/second, burst). Longest prefix wins.
+SP_API_RATE_LIMITS = [
+    ("GET", "/orders/v0/orders/", 0.5, 30),            # getOrder, getOrderItems, ...
+    ("GET", "/orders/v0/orders", 0.0167, 20),          # getOrders
+    ("GET", "/fba/inventory/v1/summaries", 2.0, 2),
+    ("GET", "/products/pricing/v0/competitivePrice", 0.5, 1),
+    ("POST", "/feeds/2021-06-30/feeds", 0.0083, 15),
+    ("GET", "/sellers/v1/marketplaceParticipations", 0.016, 15),
+]
+SP_API_DEFAULT_LIMIT = (1.0, 5)
+
+SHOPIFY_ORDERS_PAGE = 250      # REST maximum; the default of 50 silently truncated busy days
+EBAY_ORDERS_PAGE = 200         # getOrders maximum
+EBAY_PAGE_WORKERS = 4          # eBay pages are offset-addressed, so they can be fetched in parallel
+SYNC_OVERLAP = datetime.timedelta(minutes=10)   # re-read this much before the high-water mark (clock skew)
+
+# Fee schedule used by the P&L: platform → (percent of revenue, fixed per order)
+PLATFORM_FEES = {"shopify": (0.029, 0.30), "amazon": (0.15, 0.0), "ebay": (0.1235, 0.0)}
 
 
 def ensure_dirs():
@@ -159,70 +202,419 @@ def shopify_api(config, endpoint, method="GET", data=None):
         return {"error": str(e)}
 
 
-def shopify_graphql(config, query):
-    """Call Shopify Admin GraphQL API."""
+# ── HTTP ──
+#
+# Every native client (Shopify GraphQL and REST, SP-API, eBay) goes through
+# http_request(): one kept-alive HTTPS connection per host per thread.
+
+_http = threading.local()
+
+
+def http_request(host, method, path, headers=None, body=None):
+    """Request over this thread's kept-alive connection to `host`. Returns (status, headers, body)."""
+    conns = getattr(_http, "conns", None)
+    if conns is None:
+        conns = _http.conns = {}
+    for attempt in range(2):
+        if host not in conns:
+            conns[host] = http.client.HTTPSConnection(host, timeout=30)
+        try:
+            conns[host].request(method, path, body=body, headers=headers or {})
+            resp = conns[host].getresponse()
+            return resp.status, {k.lower(): v for k, v in resp.getheaders()}, resp.read()
+        except (http.client.HTTPException, OSError):
+            # Kept-alive connection closed by the server: reconnect once
+            conns.pop(host).close()
+            if attempt:
+                raise
+
+
+class ShopifyGraphQL:
+    """Admin GraphQL client over one kept-alive HTTPS connection.
+
+    Paces itself by Shopify's cost-based throttle: every response carries
+    extensions.cost.throttleStatus (bucket size, points available, restore
+    rate), and a query is only sent once the bucket has refilled enough to
+    cover its expected cost. THROTTLED responses are retried after the
+    bucket has had time to refill.
+    """
+
+    def __init__(self, config):
+        self.shop = config.get("shop", "")
+        self.token = config.get("access_token", "")
+        self.path = f"/admin/api/{SHOPIFY_API_VERSION}/graphql.json"
+        self.available = None        # points left at `updated`, as last reported
+        self.maximum = 1000.0
+        self.restore_rate = 50.0     # points/second (standard plans)
+        self.updated = time.monotonic()
+
+    def _post(self, body: bytes) -> tuple:
+        """POST to the GraphQL endpoint. Returns (status, body)."""
+        status, _, raw = http_request(self.shop, "POST", self.path, {
+            "X-Shopify-Access-Token": self.token,
+            "Content-Type": "application/json"}, body)
+        return status, raw
+
+    def _wait_for(self, cost: float):
+        if self.available is None:
+            return
+        refilled = self.available + (time.monotonic() - self.updated) * self.restore_rate
+        needed = min(cost, self.maximum) - refilled
+        if needed > 0:
+            time.sleep(needed / self.restore_rate)
+
+    def _track(self, extensions: dict):
+        status = (extensions or {}).get("cost", {}).get("throttleStatus")
+        if status:
+            self.maximum = float(status.get("maximumAvailable", self.maximum))
+            self.available = float(status.get("currentlyAvailable", 0))
+            self.restore_rate = float(status.get("restoreRate", self.restore_rate)) or 50.0
+            self.updated = time.monotonic()
+
+    def execute(self, query: str, variables: dict = None, cost: float = 10) -> dict:
+        """Run one query/mutation; `cost` is its expected point cost. Returns the JSON body."""
+        if not self.shop or not self.token:
+            return {"error": "Shopify not configured"}
+        body = json.dumps({"query": query, "variables": variables or {}}).encode()
+        for attempt in range(5):
+            self._wait_for(cost)
+            try:
+                status, raw = self._post(body)
+            except (http.client.HTTPException, OSError) as e:
+                return {"error": str(e)}
+            if status == 429:
+                time.sleep(1)
+                continue
+            try:
+                result = json.loads(raw) if raw.strip() else {"error": f"Empty response (HTTP {status})"}
+            except ValueError:
+                return {"error": f"HTTP {status}: {raw[:200].decode(errors='replace')}"}
+            self._track(result.get("extensions"))
+            errors = result.get("errors") or []
+            if isinstance(errors, list) and any(
+                    (e.get("extensions") or {}).get("code") == "THROTTLED" for e in errors):
+                requested = result.get("extensions", {}).get("cost", {}).get("requestedQueryCost", cost)
+                cost = max(cost, float(requested))
+                continue
+            return result
+        return {"error": "Shopify GraphQL throttled — retries exhausted"}
+
+
+_shopify_clients = {}
+
+
+def shopify_graphql(config, query, variables=None, cost=10):
+    """Call Shopify Admin GraphQL API (one throttle-aware client per shop)."""
     shop = config.get("shop", "")
-    token = config.get("access_token", "")
-    if not shop or not token:
-        return {"error": "Shopify not configured"}
+    if shop not in _shopify_clients:
+        _shopify_clients[shop] = ShopifyGraphQL(config)
+    return _shopify_clients[shop].execute(query, variables, cost)
+
+
+# ── Shopify inventory sync ──
+
+SKU_MAP_QUERY = """
+query SkuMap($first: Int!, $after: String) {
+  productVariants(first: $first, after: $after) {
+    pageInfo { hasNextPage endCursor }
+    edges { node {
+      sku
+      inventoryQuantity
+      inventoryItem { id inventoryLevels(first: 1) { edges { node { location { id } } } } }
+    } }
+  }
+}
+"""
 
-    url = f"https://{shop}/admin/api/2024-01/graphql.json"
-    cmd = ["curl", "-s", "-X", "POST", url,
-           "-H", f"X-Shopify-Access-Token: {token}",
-           "-H", "Content-Type: application/json",
-           "-d", json.dumps({"query": query})]
+SET_QUANTITIES_MUTATION = """
+mutation SetQuantities($input: InventorySetQuantitiesInput!) {
+  inventorySetQuantities(input: $input) {
+    inventoryAdjustmentGroup { id }
+    userErrors { field message code }
+  }
+}
+"""
 
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        return json.loads(result.stdout) if result.stdout.strip() else {"error": "Empty response"}
-    except Exception as e:
-        return {"error": str(e)}
 
+def build_shopify_sku_map(pconfig):
+    """Page through every variant once: SKU → inventory item, stocking location, quantity."""
+    skus = {}
+    after = None
+    while True:
+        result = shopify_graphql(pconfig, SKU_MAP_QUERY, {"first": SKU_MAP_PAGE, "after": after},
+                                 cost=SKU_MAP_PAGE * 3 + 2)
+        if "error" in result or result.get("errors"):
+            return None, result.get("error") or result.get("errors")
+        page = (result.get("data") or {}).get("productVariants") or {}
+        for edge in page.get("edges", []):
+            node = edge.get("node") or {}
+            sku = (node.get("sku") or "").upper()
+            item = node.get("inventoryItem") or {}
+            levels = (item.get("inventoryLevels") or {}).get("edges") or []
+            if sku and item.get("id") and levels:
+                skus[sku] = {
+                    "inventory_item_id": item["id"],
+                    "location_id": levels[0]["node"]["location"]["id"],
+                    "quantity": node.get("inventoryQuantity") or 0,
+                }
+        info = page.get("pageInfo") or {}
+        if not info.get("hasNextPage"):
+            return skus, None
+        after = info.get("endCursor")
+
+
+def shopify_sku_map(pconfig, refresh=False):
+    """SKU map from the on-disk cache, rebuilt when stale, for another shop, or on request.
+
+    Returns (skus, rebuilt, error).
+    """
+    shop = pconfig.get("shop", "")
+    cached = load_json_db(SKU_MAP_CACHE, {})
+    fresh = cached.get("shop") == shop and time.time() - cached.get("built_at", 0) < SKU_MAP_TTL
+    if fresh and not refresh:
+        return cached.get("skus", {}), False, None
+    skus, error = build_shopify_sku_map(pconfig)
+    if skus is None:
+        return {}, True, error
+    ensure_dirs()
+    save_json_db(SKU_MAP_CACHE, {"shop": shop, "built_at": time.time(), "skus": skus})
+    return skus, True, None
+
+
+def _push_shopify_batches(pconfig, sku_map, quantities):
+    """inventorySetQuantities in batches of SET_QUANTITIES_BATCH. Returns {sku: error}."""
+    failed = {}
+    items = [(sku, qty) for sku, qty in quantities.items() if sku in sku_map]
+    for start in range(0, len(items), SET_QUANTITIES_BATCH):
+        batch = items[start:start + SET_QUANTITIES_BATCH]
+        result = shopify_graphql(pconfig, SET_QUANTITIES_MUTATION, {"input": {
+            "name": "available",
+            "reason": "correction",
+            "ignoreCompareQuantity": True,
+            "quantities": [{
+                "inventoryItemId": sku_map[sku]["inventory_item_id"],
+                "locationId": sku_map[sku]["location_id"],
+                "quantity": qty,
+            } for sku, qty in batch],
+        }}, cost=10)
+        payload = ((result.get("data") or {}).get("inventorySetQuantities")) or {}
+        if "error" in result or result.get("errors") or not payload:
+            reason = result.get("error") or result.get("errors") or "empty response"
+            failed.update({sku: str(reason)[:200] for sku, _ in batch})
+            continue
+        for err in payload.get("userErrors") or []:
+            # field is e.g. ["input", "quantities", "3", "inventoryItemId"]
+            field = err.get("field") or []
+            index = next((int(f) for f in field if str(f).isdigit()), None)
+            skus = [batch[index][0]] if index is not None and index < len(batch) else [s for s, _ in batch]
+            for sku in skus:
+                failed[sku] = err.get("message", "user error")
+    return failed
+
+
+def shopify_set_inventory(pconfig, quantities):
+    """Push {SKU: available} to Shopify. Returns {sku: error or None}.
+
+    Uses the cached SKU map; SKUs it doesn't know, or that Shopify rejects,
+    trigger one map rebuild and retry (variants may have been added or moved).
+    """
+    quantities = {sku.upper(): qty for sku, qty in quantities.items()}
+    sku_map, rebuilt, error = shopify_sku_map(pconfig)
+    if error:
+        return {sku: f"SKU map failed: {error}" for sku in quantities}
+    if not rebuilt and any(sku not in sku_map for sku in quantities):
+        sku_map, rebuilt, error = shopify_sku_map(pconfig, refresh=True)
+        if error:
+            return {sku: f"SKU map failed: {error}" for sku in quantities}
+
+    failed = _push_shopify_batches(pconfig, sku_map, quantities)
+    if failed and not rebuilt:
+        sku_map, rebuilt, error = shopify_sku_map(pconfig, refresh=True)
+        if not error:
+            failed = _push_shopify_batches(pconfig, sku_map, {s: quantities[s] for s in failed})
+
+    results = {sku: None for sku in quantities}
+    results.update(failed)
+    for sku in quantities:
+        if sku not in sku_map:
+            results[sku] = "SKU not found in Shopify"
+    return results
 
-# ── Amazon SP-API helpers ──
 
-def amazon_api(config, endpoint, method="GET", data=None):
-    """Call Amazon SP-API (requires LWA token refresh)."""
-    client_id = config.get("lwa_client_id", "")
-    client_secret = config.get("lwa_client_secret", "")
-    refresh_token = config.get("refresh_token", "")
+# ── Amazon SP-API helpers ──
 
-    if not client_id or not refresh_token:
-        return {"error": "Amazon not configured (missing LWA credentials)"}
+class SPAPIClient:
+    """Native SP-API client: cached LWA token, kept-alive connections, usage-plan pacing.
+
+    The LWA access token (valid for an hour) is cached on disk with its
+    expiry (mode 0600) and shared by every ecommerce-ops.py run, so only the
+    first call in an hour pays the token exchange. Each thread keeps its own
+    HTTPS connection alive; each operation gets a token bucket sized from its
+    usage plan and follows the x-amzn-RateLimit-Limit header when present.
+    """
+
+    def __init__(self, config):
+        self.client_id = config.get("lwa_client_id", "")
+        self.client_secret = config.get("lwa_client_secret", "")
+        self.refresh_token = config.get("refresh_token", "")
+        self.host = SP_API_HOST
+        self.cache_key = hashlib.sha256(f"{self.client_id}:{self.refresh_token}".encode()).hexdigest()[:16]
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self._local = threading.local()
+        self._token = None
+
+    # -- LWA token ----------------------------------------------------------
+
+    def _read_cached_token(self):
+        cached = load_json_db(LWA_TOKEN_CACHE, {})
+        if cached.get("key") == self.cache_key and cached.get("expires_at", 0) - LWA_REFRESH_MARGIN > time.time():
+            return cached
+        return None
+
+    def _write_cached_token(self, token):
+        os.makedirs(os.path.dirname(LWA_TOKEN_CACHE), exist_ok=True)
+        tmp = f"{LWA_TOKEN_CACHE}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(token, f)
+        os.replace(tmp, LWA_TOKEN_CACHE)
+
+    def access_token(self, force_refresh=False):
+        """Return (token, error). Served from memory or disk until shortly before expiry."""
+        with self.lock:
+            if not force_refresh:
+                if self._token and self._token["expires_at"] - LWA_REFRESH_MARGIN > time.time():
+                    return self._token["access_token"], None
+                cached = self._read_cached_token()
+                if cached:
+                    self._token = cached
+                    return cached["access_token"], None
+            body = urlencode({"grant_type": "refresh_token", "refresh_token": self.refresh_token,
+                              "client_id": self.client_id, "client_secret": self.client_secret})
+            try:
+                status, raw = self._send(urlsplit(LWA_TOKEN_URL).netloc, "POST", urlsplit(LWA_TOKEN_URL).path,
+                                         body.encode(), {"Content-Type": "application/x-www-form-urlencoded"})
+                token_data = json.loads(raw)
+            except (http.client.HTTPException, OSError, ValueError) as e:
+                return None, f"LWA token refresh error: {e}"
+            if not token_data.get("access_token"):
+                return None, f"LWA token refresh failed: {token_data}"
+            self._token = {"key": self.cache_key, "access_token": token_data["access_token"],
+                           "expires_at": time.time() + int(token_data.get("expires_in", 3600))}
+            self._write_cached_token(self._token)
+            return self._token["access_token"], None
+
+    # -- HTTP ---------------------------------------------------------------
+
+    def _send(self, host, method, path, body, headers):
+        """One request via http_request(); keeps this thread's response headers. Returns (status, body)."""
+        status, self._local.headers, raw = http_request(host, method, path, headers, body)
+        return status, raw
+
+    def _bucket(self, method, path):
+        plan = max((p for p in SP_API_RATE_LIMITS if p[0] == method and path.startswith(p[1])),
+                   key=lambda p: len(p[1]), default=None)
+        key = (method, plan[1] if plan else path)
+        with self.lock:
+            if key not in self.buckets:
+                rate, burst = plan[2:] if plan else SP_API_DEFAULT_LIMIT
+                self.buckets[key] = TokenBucket(per_minute=rate * 60, capacity=burst)
+            return self.buckets[key]
+
+    def request(self, method, endpoint, data=None, params=None):
+        """Call one SP-API operation; `endpoint` may carry its own query string."""
+        parts = urlsplit(endpoint)
+        query = dict(parse_qsl(parts.query))
+        query.update(params or {})
+        path = parts.path + (f"?{urlencode(query)}" if query else "")
+        body = json.dumps(data).encode() if data else None
+        bucket = self._bucket(method, parts.path)
+
+        refreshed = False
+        for attempt in range(4):
+            token, error = self.access_token(force_refresh=refreshed)
+            if error:
+                return {"error": error}
+            bucket.acquire()
+            try:
+                status, raw = self._send(self.host, method, path, body, {
+                    "x-amz-access-token": token, "Content-Type": "application/json",
+                    "Accept": "application/json"})
+            except (http.client.HTTPException, OSError) as e:
+                return {"error": str(e)}
+            headers = {k.lower(): v for k, v in getattr(self._local, "headers", {}).items()}
+            try:
+                limit = float(headers.get("x-amzn-ratelimit-limit", ""))
+                with bucket.lock:
+                    bucket.rate = limit
+            except ValueError:
+                pass
+            if status == 403 and not refreshed:
+                # Token revoked or expired early: exchange once more, then give up
+                refreshed = True
+                continue
+            if status == 429 and attempt < 3:
+                time.sleep(2 ** attempt)
+                continue
+            try:
+                result = json.loads(raw) if raw.strip() else {}
+            except ValueError:
+                return {"error": f"HTTP {status}: {raw[:200].decode(errors='replace')}"}
+            if status >= 400:
+                errors = result.get("errors") if isinstance(result, dict) else None
+                message = errors[0].get("message", "") if errors else raw[:200].decode(errors="replace")
+                return {"error": f"HTTP {status}: {message}", "errors": errors or []}
+            return result if raw.strip() else {"error": "Empty response"}
+        return {"error": "SP-API throttled — retries exhausted"}
+
+    def pages(self, endpoint, params=None):
+        """Yield every page of a paginated operation, following NextToken / nextToken."""
+        params = dict(params or {})
+        while True:
+            result = self.request("GET", endpoint, params=params)
+            yield result
+            if "error" in result:
+                return
+            payload = result.get("payload") if isinstance(result.get("payload"), dict) else {}
+            next_token = payload.get("NextToken") or result.get("pagination", {}).get("nextToken")
+            if not next_token:
+                return
+            # Orders use NextToken; FBA inventory uses nextToken (with the original filters)
+            params["NextToken" if payload.get("NextToken") else "nextToken"] = next_token
+
+
+_amazon_clients = {}
+
+
+def amazon_client(config):
+    """One SP-API client per seller app, shared by every call in this run."""
+    key = (config.get("lwa_client_id", ""), config.get("refresh_token", ""))
+    if key not in _amazon_clients:
+        _amazon_clients[key] = SPAPIClient(config)
+    return _amazon_clients[key]
 
-    # Step 1: Get access token via LWA
-    token_cmd = [
-        "curl", "-s", "-X", "POST", "https://api.amazon.com/auth/o2/token",
-        "-H", "Content-Type: application/x-www-form-urlencoded",
-        "-d", f"grant_type=refresh_token&refresh_token={refresh_token}"
-               f"&client_id={client_id}&client_secret={client_secret}"
-    ]
 
-    try:
-        token_result = subprocess.run(token_cmd, capture_output=True, text=True, timeout=30)
-        token_data = json.loads(token_result.stdout)
-        access_token = token_data.get("access_token", "")
-        if not access_token:
-            return {"error": f"LWA token refresh failed: {token_data}"}
-    except Exception as e:
-        return {"error": f"LWA token refresh error: {e}"}
+def amazon_api(config, endpoint, method="GET", data=None):
+    """Call Amazon SP-API (cached LWA token, pooled connection, usage-plan rate limits)."""
+    if not config.get("lwa_client_id") or not config.get("refresh_token"):
+        return {"error": "Amazon not configured (missing LWA credentials)"}
+    return amazon_client(config).request(method, endpoint, data)
 
-    # Step 2: Call SP-API
-    marketplace = config.get("marketplace_id", "ATVPDKIKX0DER")
-    base_url = "https://sellingpartnerapi-na.amazon.com"
-    url = f"{base_url}{endpoint}"
 
-    cmd = ["curl", "-s", "-X", method, url,
-           "-H", f"x-amz-access-token: {access_token}",
-           "-H", "Content-Type: application/json"]
-    if data:
-        cmd.extend(["-d", json.dumps(data)])
+def amazon_api_all(config, endpoint, items, params=None):
+    """Every item across all NextToken pages. `items` picks the list out of one response.
 
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        return json.loads(result.stdout) if result.stdout.strip() else {"error": "Empty response"}
-    except Exception as e:
-        return {"error": str(e)}
+    Returns (items, error) — error is set if any page failed (items holds what was fetched).
+    """
+    if not config.get("lwa_client_id") or not config.get("refresh_token"):
+        return [], "Amazon not configured (missing LWA credentials)"
+    collected = []
+    for page in amazon_client(config).pages(endpoint, params):
+        if "error" in page:
+            return collected, page["error"]
+        collected.extend(items(page))
+    return collected, None
 
 
 # ── eBay API helpers ──
@@ -272,6 +664,380 @@ def shipstation_api(config, endpoint, method="GET", data=None):
         return {"error": str(e)}
 
 
+# ── Order ingestion ──
+#
+# Every platform is fetched concurrently (one worker each) and paged to the
+# end: Shopify by Link-header cursor, Amazon by NextToken, eBay by offset
+# (pages fanned out over EBAY_PAGE_WORKERS once the total is known). Orders
+# come back in one schema:
+#
+#   platform, order_id, order_number, customer, total, currency, items,
+#   status, refunded, created_at, updated_at      (timestamps in UTC, ...Z)
+
+def _get_json(host, path, headers, retries=4):
+    """GET returning (json, response headers); retries 429s honouring Retry-After."""
+    for attempt in range(retries):
+        status, resp_headers, body = http_request(host, "GET", path, headers)
+        if status == 429 and attempt < retries - 1:
+            time.sleep(float(resp_headers.get("retry-after") or 2 ** attempt))
+            continue
+        if status >= 400:
+            raise RuntimeError(f"HTTP {status}: {body[:200].decode(errors='replace')}")
+        return (json.loads(body) if body.strip() else {}), resp_headers
+    raise RuntimeError("rate limited — retries exhausted")
+
+
+def _next_link(link_header):
+    """URL of rel="next" in a Shopify Link header, or None."""
+    for part in (link_header or "").split(","):
+        if 'rel="next"' in part:
+            return part.split(";")[0].strip().strip("<>")
+    return None
+
+
+def _utc(ts):
+    """Platform timestamp (any offset, optional fraction) → 'YYYY-MM-DDTHH:MM:SSZ' in UTC."""
+    if not ts:
+        return ""
+    try:
+        parsed = datetime.datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    except ValueError:
+        return ts
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _money(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def normalize_shopify_order(o):
+    refunded = sum(_money(t.get("amount")) for r in o.get("refunds") or []
+                   for t in r.get("transactions") or [] if t.get("kind") == "refund")
+    return {
+        "platform": "shopify",
+        "order_id": str(o.get("id", "")),
+        "order_number": o.get("name") or str(o.get("id", "")),
+        "customer": o.get("email") or "unknown",
+        "total": _money(o.get("total_price")),
+        "currency": o.get("currency", "USD"),
+        "items": sum(int(li.get("quantity", 0) or 0) for li in o.get("line_items") or []),
+        "status": o.get("fulfillment_status") or "unfulfilled",
+        "refunded": refunded,
+        "created_at": _utc(o.get("created_at")),
+        "updated_at": _utc(o.get("updated_at") or o.get("created_at")),
+    }
+
+
+def normalize_amazon_order(o):
+    total = o.get("OrderTotal") or {}
+    return {
+        "platform": "amazon",
+        "order_id": o.get("AmazonOrderId", ""),
+        "order_number": o.get("AmazonOrderId", ""),
+        "customer": o.get("BuyerInfo", {}).get("BuyerEmail") or o.get("BuyerEmail") or "unknown",
+        "total": _money(total.get("Amount")),
+        "currency": total.get("CurrencyCode", "USD"),
+        "items": int(o.get("NumberOfItemsUnshipped", 0) or 0) + int(o.get("NumberOfItemsShipped", 0) or 0),
+        "status": (o.get("OrderStatus") or "").lower(),
+        "refunded": 0.0,
+        "created_at": _utc(o.get("PurchaseDate")),
+        "updated_at": _utc(o.get("LastUpdateDate") or o.get("PurchaseDate")),
+    }
+
+
+def normalize_ebay_order(o):
+    total = (o.get("pricingSummary") or {}).get("total") or {}
+    refunded = sum(_money((r.get("amount") or {}).get("value"))
+                   for r in (o.get("paymentSummary") or {}).get("refunds") or [])
+    return {
+        "platform": "ebay",
+        "order_id": o.get("orderId", ""),
+        "order_number": o.get("orderId", ""),
+        "customer": (o.get("buyer") or {}).get("username") or "unknown",
+        "total": _money(total.get("value")),
+        "currency": total.get("currency", "USD"),
+        "items": sum(int(li.get("quantity", 0) or 0) for li in o.get("lineItems") or []),
+        "status": (o.get("orderFulfillmentStatus") or "").lower(),
+        "refunded": refunded,
+        "created_at": _utc(o.get("creationDate")),
+        "updated_at": _utc(o.get("lastModifiedDate") or o.get("creationDate")),
+    }
+
+
+def fetch_shopify_orders(pconfig, start, end, field="created"):
+    """All Shopify orders created (or updated) in [start, end], following Link cursors.
+
+    `start`/`end` are ISO timestamps; `end` may be None for "until now".
+    """
+    shop, token = pconfig.get("shop", ""), pconfig.get("access_token", "")
+    if not shop or not token:
+        raise RuntimeError("Shopify not configured (missing shop or access_token)")
+    headers = {"X-Shopify-Access-Token": token, "Accept": "application/json"}
+    params = {"status": "any", "limit": SHOPIFY_ORDERS_PAGE, f"{field}_at_min": start}
+    if end:
+        params[f"{field}_at_max"] = end
+    path = f"/admin/api/{SHOPIFY_API_VERSION}/orders.json?" + urlencode(params)
+    orders = []
+    while path:
+        data, resp_headers = _get_json(shop, path, headers)
+        orders.extend(normalize_shopify_order(o) for o in data.get("orders", []))
+        next_url = _next_link(resp_headers.get("link"))
+        # page_info URLs carry the filters; only the path + query are re-sent
+        path = f"{urlsplit(next_url).path}?{urlsplit(next_url).query}" if next_url else None
+    return orders
+
+
+def fetch_amazon_orders(pconfig, start, end, field="created"):
+    """All Amazon orders created (or last updated) in [start, end], following NextToken."""
+    after, before = ("CreatedAfter", "CreatedBefore") if field == "created" else ("LastUpdatedAfter", "LastUpdatedBefore")
+    # *Before must be at least two minutes in the past
+    latest = (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=3)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    params = {"MarketplaceIds": pconfig.get("marketplace_id", "ATVPDKIKX0DER"), after: start}
+    if end and end < latest:
+        params[before] = end
+    orders, error = amazon_api_all(pconfig, "/orders/v0/orders",
+                                   lambda page: page.get("payload", {}).get("Orders", []), params)
+    if error:
+        raise RuntimeError(error)
+    return [normalize_amazon_order(o) for o in orders]
+
+
+def fetch_ebay_orders(pconfig, start, end, field="created"):
+    """All eBay orders created (or modified) in [start, end]; pages after the first are fetched in parallel."""
+    token = pconfig.get("user_token", "")
+    if not token:
+        raise RuntimeError("eBay not configured (missing user_token)")
+    headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+    date_field = "creationdate" if field == "created" else "lastmodifieddate"
+    base = "/sell/fulfillment/v1/order?" + urlencode({"filter": f"{date_field}:[{start}..{end or ''}]",
+                                                       "limit": EBAY_ORDERS_PAGE})
+
+    def page(offset):
+        data, _ = _get_json("api.ebay.com", f"{base}&offset={offset}", headers)
+        return data
+
+    first = page(0)
+    pages = [first]
+    total = int(first.get("total", 0) or 0)
+    if first.get("next") and total > EBAY_ORDERS_PAGE:
+        offsets = range(EBAY_ORDERS_PAGE, total, EBAY_ORDERS_PAGE)
+        with ThreadPoolExecutor(max_workers=EBAY_PAGE_WORKERS) as pool:
+            pages.extend(pool.map(page, offsets))
+    orders, seen = [], set()
+    for data in pages:
+        for o in data.get("orders", []):
+            # Offsets shift if orders arrive mid-fetch; drop the duplicates that causes
+            if o.get("orderId") not in seen:
+                seen.add(o.get("orderId"))
+                orders.append(normalize_ebay_order(o))
+    return orders
+
+
+ORDER_FETCHERS = {
+    "shopify": (fetch_shopify_orders, "%Y-%m-%dT%H:%M:%SZ"),
+    "amazon": (fetch_amazon_orders, "%Y-%m-%dT%H:%M:%SZ"),
+    "ebay": (fetch_ebay_orders, "%Y-%m-%dT%H:%M:%S.000Z"),
+}
+
+
+def _fetch_concurrently(config, jobs):
+    """Run (platform, start, end, field) fetches concurrently; datetimes, end may be None.
+
+    Returns (orders, errors) with errors keyed by platform.
+    """
+    orders, errors = [], {}
+    runnable = []
+    for platform, start, end, field in jobs:
+        pconfig = config.get("platforms", {}).get(platform, {})
+        if platform in ORDER_FETCHERS and pconfig.get("enabled"):
+            fetch, fmt = ORDER_FETCHERS[platform]
+            runnable.append((platform, fetch, pconfig, start.strftime(fmt), end.strftime(fmt) if end else None, field))
+    if not runnable:
+        return orders, errors
+    with ThreadPoolExecutor(max_workers=len(runnable)) as pool:
+        futures = [(platform, pool.submit(fetch, *fargs)) for platform, fetch, *fargs in runnable]
+        for platform, future in futures:
+            try:
+                orders.extend(future.result())
+            except Exception as e:
+                errors[platform] = str(e)
+    return orders, errors
+
+
+def fetch_orders(config, platforms, start_date, end_date):
+    """Orders created between two dates (inclusive, UTC) from all platforms at once.
+
+    Returns (orders, errors): normalized orders, newest first, and {platform: message}
+    for any platform that failed — callers must surface those instead of
+    reporting a silently partial total.
+    """
+    start = datetime.datetime.combine(start_date, datetime.time.min)
+    end = datetime.datetime.combine(end_date, datetime.time(23, 59, 59))
+    orders, errors = _fetch_concurrently(config, [(p, start, end, "created") for p in platforms])
+    orders.sort(key=lambda o: o["created_at"], reverse=True)
+    return orders, errors
+
+
+# ── Order warehouse ──
+#
+# Normalized orders are kept in ~/.openclaw/workspace/ecommerce/orders.db so
+# reports are SQL aggregates instead of re-downloads. Per platform,
+# sync_state records how far back creation dates have been backfilled
+# (covered_from) and the high-water mark of the last incremental sync; each
+# run only asks the APIs for orders updated since then (updated_at_min /
+# LastUpdatedAfter / lastmodifieddate), plus a created-range backfill when a
+# report reaches further back than the store does. inventory.json and the RMA
+# refunds in returns.json are mirrored into the same DB at query time.
+
+def orders_db():
+    ensure_dirs()
+    conn = sqlite3.connect(ORDERS_DB, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(
+        "CREATE TABLE IF NOT EXISTS orders (platform TEXT, order_id TEXT, order_number TEXT, customer TEXT,"
+        " total REAL, currency TEXT, items INTEGER, status TEXT, refunded REAL, created_at TEXT,"
+        " updated_at TEXT, PRIMARY KEY (platform, order_id)) WITHOUT ROWID;"
+        "CREATE INDEX IF NOT EXISTS orders_created ON orders (created_at);"
+        "CREATE TABLE IF NOT EXISTS sync_state (platform TEXT PRIMARY KEY, covered_from TEXT,"
+        " high_water TEXT, synced_at TEXT);"
+        "CREATE TABLE IF NOT EXISTS inventory (sku TEXT PRIMARY KEY, quantity INTEGER);"
+        "CREATE TABLE IF NOT EXISTS rma_refunds (rma_number TEXT PRIMARY KEY, platform TEXT, order_id TEXT,"
+        " amount REAL, refunded_at TEXT);"
+    )
+    return conn
+
+
+def upsert_orders(conn, orders):
+    conn.executemany(
+        "INSERT OR REPLACE INTO orders (platform, order_id, order_number, customer, total, currency, items,"
+        " status, refunded, created_at, updated_at) VALUES (:platform, :order_id, :order_number, :customer,"
+        " :total, :currency, :items, :status, :refunded, :created_at, :updated_at)", orders)
+
+
+def sync_orders(config, platforms, since_date):
+    """Bring the store up to date for `platforms`, covering orders created since `since_date`.
+
+    Returns {platform: error} for platforms that could not be synced; their
+    sync state is left untouched so the next run retries the same window.
+    """
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None, microsecond=0)
+    since = datetime.datetime.combine(since_date, datetime.time.min)
+    conn = orders_db()
+    try:
+        state = {row[0]: row[1:] for row in conn.execute(
+            "SELECT platform, covered_from, high_water FROM sync_state")}
+        jobs, plans = [], {}
+        for platform in platforms:
+            covered_from, high_water = state.get(platform, (None, None))
+            plan = {"covered_from": covered_from, "high_water": high_water}
+            if covered_from is None:
+                jobs.append((platform, since, None, "created"))
+                plan.update(covered_from=since_date.isoformat(), high_water=now)
+            else:
+                if since_date.isoformat() < covered_from:
+                    backfill_end = datetime.datetime.combine(
+                        datetime.date.fromisoformat(covered_from), datetime.time.min) - datetime.timedelta(seconds=1)
+                    jobs.append((platform, since, backfill_end, "created"))
+                    plan["covered_from"] = since_date.isoformat()
+                last = datetime.datetime.strptime(high_water, "%Y-%m-%dT%H:%M:%SZ")
+                jobs.append((platform, last - SYNC_OVERLAP, None, "updated"))
+                plan["high_water"] = now
+            plans[platform] = plan
+
+        orders, errors = _fetch_concurrently(config, jobs)
+        with conn:
+            upsert_orders(conn, [o for o in orders if o["platform"] not in errors])
+            for platform, plan in plans.items():
+                if platform in errors or not config.get("platforms", {}).get(platform, {}).get("enabled"):
+                    continue
+                high_water = plan["high_water"]
+                if isinstance(high_water, datetime.datetime):
+                    high_water = high_water.strftime("%Y-%m-%dT%H:%M:%SZ")
+                conn.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)",
+                             (platform, plan["covered_from"], high_water, now.strftime("%Y-%m-%dT%H:%M:%SZ")))
+        return errors
+    finally:
+        conn.close()
+
+
+def store_covers(conn, platforms, start_date):
+    """True if every platform's orders are backfilled to `start_date` (created_at)."""
+    covered = dict(conn.execute("SELECT platform, covered_from FROM sync_state"))
+    return all(covered.get(p) and covered[p] <= start_date.isoformat() for p in platforms)
+
+
+def _mirror_local_tables(conn):
+    """Refresh the inventory and RMA refund tables from their JSON files (local, cheap)."""
+    inventory = load_json_db(INVENTORY_DB, {"skus": {}})
+    returns = load_json_db(RETURNS_DB, {"completed": []})
+    with conn:
+        conn.execute("DELETE FROM inventory")
+        conn.executemany("INSERT INTO inventory VALUES (?, ?)",
+                         [(sku, int(d.get("quantity", 0) or 0)) for sku, d in inventory.get("skus", {}).items()])
+        conn.execute("DELETE FROM rma_refunds")
+        conn.executemany("INSERT OR REPLACE INTO rma_refunds VALUES (?, ?, ?, ?, ?)", [
+            (r.get("rma_number"), r.get("platform"), str(r.get("order_id", "")),
+             float(r.get("refund_amount", 0) or 0), r.get("refunded_at", "") or "")
+            for r in returns.get("completed", []) if r.get("status") == "refunded"])
+
+
+def _range(start_date, end_date):
+    return f"{start_date}T00:00:00Z", f"{end_date}T23:59:59Z"
+
+
+def order_totals(conn, start_date, end_date, platforms=None):
+    """{platform: {orders, revenue, items, fees, refunded}} for orders created in the range."""
+    fee_sql = " ".join(f"WHEN '{p}' THEN total * {pct} + {fixed}" for p, (pct, fixed) in PLATFORM_FEES.items())
+    query = (f"SELECT platform, COUNT(*), COALESCE(SUM(total), 0), COALESCE(SUM(items), 0),"
+             f" COALESCE(SUM(CASE platform {fee_sql} ELSE 0 END), 0),"
+             f" COALESCE(SUM(CASE WHEN NOT EXISTS (SELECT 1 FROM rma_refunds r WHERE r.platform = o.platform"
+             f"   AND r.order_id IN (o.order_id, o.order_number)) THEN refunded ELSE 0 END), 0)"
+             f" FROM orders o WHERE created_at BETWEEN ? AND ?")
+    params = list(_range(start_date, end_date))
+    if platforms:
+        query += f" AND platform IN ({', '.join('?' * len(platforms))})"
+        params += list(platforms)
+    totals = {}
+    for platform, n, revenue, items, fees, refunded in conn.execute(query + " GROUP BY platform", params):
+        totals[platform] = {"orders": n, "revenue": revenue, "items": items, "fees": fees, "refunded": refunded}
+    return totals
+
+
+def period_refunds(conn, start_date, end_date):
+    """(total, count) of refunds in the range: RMA refunds processed by date, plus
+    platform-reported refunds on the range's orders that did not go through an RMA."""
+    rma_total, rma_count = conn.execute(
+        "SELECT COALESCE(SUM(amount), 0), COUNT(*) FROM rma_refunds WHERE substr(refunded_at, 1, 10) BETWEEN ? AND ?",
+        (str(start_date), str(end_date))).fetchone()
+    platform_total, platform_count = conn.execute(
+        "SELECT COALESCE(SUM(refunded), 0), COUNT(*) FROM orders o WHERE refunded > 0 AND created_at BETWEEN ? AND ?"
+        " AND NOT EXISTS (SELECT 1 FROM rma_refunds r WHERE r.platform = o.platform"
+        "   AND r.order_id IN (o.order_id, o.order_number))", _range(start_date, end_date)).fetchone()
+    return rma_total + platform_total, rma_count + platform_count
+
+
+def low_stock(conn, threshold):
+    return conn.execute("SELECT sku, quantity FROM inventory WHERE quantity <= ? ORDER BY quantity, sku",
+                        (threshold,)).fetchall()
+
+
+def list_orders(conn, start_date, end_date, platforms=None):
+    query = ("SELECT platform, order_id, order_number, customer, total, currency, items, status, refunded,"
+             " created_at, updated_at FROM orders WHERE created_at BETWEEN ? AND ?")
+    params = list(_range(start_date, end_date))
+    if platforms:
+        query += f" AND platform IN ({', '.join('?' * len(platforms))})"
+        params += list(platforms)
+    cols = ["platform", "order_id", "order_number", "customer", "total", "currency", "items", "status",
+            "refunded", "created_at", "updated_at"]
+    return [dict(zip(cols, row)) for row in conn.execute(query + " ORDER BY created_at DESC", params)]
+
+
 # ── Command: orders ──
 
 def cmd_orders(args, config):
@@ -282,57 +1048,23 @@ def cmd_orders(args, config):
         else [p for p, c in config.get("platforms", {}).items() if c.get("enabled")]
     )
 
-    all_orders = []
-
     for platform in platforms_to_check:
-        pconfig = config.get("platforms", {}).get(platform, {})
-        if not pconfig.get("enabled"):
+        if not config.get("platforms", {}).get(platform, {}).get("enabled"):
             print(f"  {platform}: not enabled, skipping")
-            continue
-
-        print(f"  Fetching {platform} orders for {date}...")
-
-        if platform == "shopify":
-            result = shopify_api(pconfig, f"orders.json?created_at_min={date}T00:00:00-00:00&status=any")
-            orders = result.get("orders", [])
-            for o in orders:
-                all_orders.append({
-                    "platform": "shopify",
-                    "order_number": o.get("name", o.get("id")),
-                    "customer": o.get("email", "unknown"),
-                    "total": float(o.get("total_price", 0)),
-                    "items": len(o.get("line_items", [])),
-                    "status": o.get("fulfillment_status", "unfulfilled") or "unfulfilled",
-                    "created_at": o.get("created_at", ""),
-                })
-
-        elif platform == "amazon":
-            result = amazon_api(pconfig, f"/orders/v0/orders?CreatedAfter={date}T00:00:00Z")
-            orders = result.get("payload", {}).get("Orders", [])
-            for o in orders:
-                all_orders.append({
-                    "platform": "amazon",
-                    "order_number": o.get("AmazonOrderId", ""),
-                    "customer": o.get("BuyerEmail", "unknown"),
-                    "total": float(o.get("OrderTotal", {}).get("Amount", 0)),
-                    "items": o.get("NumberOfItemsUnshipped", 0) + o.get("NumberOfItemsShipped", 0),
-                    "status": o.get("OrderStatus", "").lower(),
-                    "created_at": o.get("PurchaseDate", ""),
-                })
-
-        elif platform == "ebay":
-            result = ebay_api(pconfig, f"/sell/fulfillment/v1/order?filter=creationdate:[{date}T00:00:00.000Z..]")
-            orders = result.get("orders", [])
-            for o in orders:
-                all_orders.append({
-                    "platform": "ebay",
-                    "order_number": o.get("orderId", ""),
-                    "customer": o.get("buyer", {}).get("username", "unknown"),
-                    "total": float(o.get("pricingSummary", {}).get("total", {}).get("value", 0)),
-                    "items": len(o.get("lineItems", [])),
-                    "status": o.get("orderFulfillmentStatus", "").lower(),
-                    "created_at": o.get("creationDate", ""),
-                })
+    platforms_to_check = [p for p in platforms_to_check
+                          if config.get("platforms", {}).get(p, {}).get("enabled")]
+    if platforms_to_check:
+        print(f"  Syncing {', '.join(platforms_to_check)} orders for {date}...")
+
+    day = datetime.date.fromisoformat(date)
+    errors = sync_orders(config, platforms_to_check, day)
+    for platform, error in errors.items():
+        print(f"  ❌ {platform}: {error} (showing stored orders)")
+    conn = orders_db()
+    try:
+        all_orders = list_orders(conn, day, day, platforms_to_check)
+    finally:
+        conn.close()
 
     # Print unified results
     if not all_orders:
@@ -400,23 +1132,10 @@ def cmd_inventory(args, config):
             sync_ok = False
             try:
                 if platform == "shopify":
-                    # Find inventory item ID for this SKU, then update
-                    search = shopify_api(pconfig, f"products.json?fields=id,variants")
-                    for p in search.get("products", []):
-                        for v in p.get("variants", []):
-                            if (v.get("sku") or "").upper() == sku:
-                                inv_item_id = v.get("inventory_item_id")
-                                if inv_item_id:
-                                    loc_result = shopify_api(pconfig, f"inventory_levels.json?inventory_item_ids={inv_item_id}")
-                                    levels = loc_result.get("inventory_levels", [])
-                                    if levels:
-                                        loc_id = levels[0].get("location_id")
-                                        shopify_api(pconfig, "inventory_levels/set.json", method="POST", data={
-                                            "location_id": loc_id,
-                                            "inventory_item_id": inv_item_id,
-                                            "available": sync_qty,
-                                        })
-                                        sync_ok = True
+                    error = shopify_set_inventory(pconfig, {sku: sync_qty})[sku]
+                    sync_ok = error is None
+                    if error:
+                        print(f"   Shopify: {error}")
                 elif platform == "amazon":
                     # Update Amazon inventory via feeds API
                     result = amazon_api(pconfig, "/feeds/2021-06-30/feeds", method="POST", data={
@@ -478,25 +1197,28 @@ def cmd_inventory_sync(args, config):
             print(f"  Pulling from {platform}...")
 
             if platform == "shopify":
-                result = shopify_api(pconfig, "products.json?fields=id,title,variants")
-                products = result.get("products", [])
-                for p in products:
-                    for v in p.get("variants", []):
-                        sku = v.get("sku", "").upper()
-                        qty = v.get("inventory_quantity", 0)
-                        if sku:
-                            inventory.setdefault("skus", {})[sku] = {
-                                "quantity": qty,
-                                "last_adjusted": datetime.datetime.now().isoformat(),
-                                "source": "shopify-reconciliation",
-                            }
-                            print(f"    {sku}: {qty} units")
+                # One paged pass over all variants; also refreshes the cached SKU map
+                sku_map, _, error = shopify_sku_map(pconfig, refresh=True)
+                if error:
+                    print(f"    Shopify pull failed: {error}")
+                for sku, entry in sku_map.items():
+                    qty = entry.get("quantity", 0)
+                    inventory.setdefault("skus", {})[sku] = {
+                        "quantity": qty,
+                        "last_adjusted": datetime.datetime.now().isoformat(),
+                        "source": "shopify-reconciliation",
+                    }
+                    print(f"    {sku}: {qty} units")
 
             elif platform == "amazon":
-                result = amazon_api(pconfig, "/fba/inventory/v1/summaries?details=true&granularityType=Marketplace"
-                                    f"&granularityId={pconfig.get('marketplace_id', 'ATVPDKIKX0DER')}"
-                                    "&marketplaceIds=" + pconfig.get("marketplace_id", "ATVPDKIKX0DER"))
-                summaries = result.get("payload", {}).get("inventorySummaries", [])
+                marketplace = pconfig.get("marketplace_id", "ATVPDKIKX0DER")
+                summaries, error = amazon_api_all(
+                    pconfig, "/fba/inventory/v1/summaries",
+                    lambda page: page.get("payload", {}).get("inventorySummaries", []),
+                    {"details": "true", "granularityType": "Marketplace",
+                     "granularityId": marketplace, "marketplaceIds": marketplace})
+                if error:
+                    print(f"    Amazon pull stopped early: {error}")
                 if summaries:
                     for item in summaries:
                         sku = (item.get("sellerSku") or "").upper()
@@ -540,57 +1262,49 @@ def cmd_inventory_sync(args, config):
             print("No SKUs tracked. Run with --full for initial pull.")
             return
 
-        low_stock = []
-        for sku, data in skus.items():
-            qty = data.get("quantity", 0)
-            sync_qty = max(0, qty - buffer)
-
-            if qty <= threshold:
-                low_stock.append((sku, qty))
+        low_stock = [(sku, data.get("quantity", 0)) for sku, data in skus.items()
+                     if data.get("quantity", 0) <= threshold]
+        targets = {sku: max(0, data.get("quantity", 0) - buffer) for sku, data in skus.items()}
 
-            for platform in enabled_platforms:
-                if args.dry_run:
+        for platform in enabled_platforms:
+            if args.dry_run:
+                for sku, sync_qty in targets.items():
                     print(f"  Would sync {sku} → {platform}: {sync_qty} units")
-                else:
-                    pconfig = config.get("platforms", {}).get(platform, {})
-                    sync_ok = False
-                    try:
-                        if platform == "shopify":
-                            search = shopify_api(pconfig, f"products.json?fields=id,variants")
-                            for p in search.get("products", []):
-                                for v in p.get("variants", []):
-                                    if (v.get("sku") or "").upper() == sku:
-                                        inv_item_id = v.get("inventory_item_id")
-                                        if inv_item_id:
-                                            loc_result = shopify_api(pconfig, f"inventory_levels.json?inventory_item_ids={inv_item_id}")
-                                            levels = loc_result.get("inventory_levels", [])
-                                            if levels:
-                                                shopify_api(pconfig, "inventory_levels/set.json", method="POST", data={
-                                                    "location_id": levels[0].get("location_id"),
-                                                    "inventory_item_id": inv_item_id,
-                                                    "available": sync_qty,
-                                                })
-                                                sync_ok = True
-                        elif platform == "amazon":
-                            result = amazon_api(pconfig, "/feeds/2021-06-30/feeds", method="POST", data={
-                                "feedType": "POST_INVENTORY_AVAILABILITY_DATA",
-                                "marketplaceIds": [pconfig.get("marketplace_id", "ATVPDKIKX0DER")],
-                            })
-                            sync_ok = "error" not in result
-                        elif platform == "ebay":
-                            result = ebay_api(pconfig, f"/sell/inventory/v1/inventory_item/{sku}", method="PUT", data={
-                                "availability": {"shipToLocationAvailability": {"quantity": sync_qty}}
-                            })
-                            sync_ok = "error" not in result
-                    except Exception as e:
-                        print(f"  ❌ Sync {sku} → {platform} failed: {e}")
-                        print(f"  ⚠️  PAUSING {sku} on {platform} — manual intervention needed")
-                        continue
-
-                    if sync_ok:
-                        print(f"  ✅ Synced {sku} → {platform}: {sync_qty} units")
+                continue
+
+            pconfig = config.get("platforms", {}).get(platform, {})
+            if platform == "shopify":
+                # Whole catalogue in batched GraphQL mutations against the cached SKU map
+                for sku, error in shopify_set_inventory(pconfig, targets).items():
+                    if error is None:
+                        print(f"  ✅ Synced {sku} → shopify: {targets[sku]} units")
                     else:
-                        print(f"  ❌ Sync {sku} → {platform} failed — listing paused for safety")
+                        print(f"  ❌ Sync {sku} → shopify failed ({error}) — listing paused for safety")
+                continue
+
+            for sku, sync_qty in targets.items():
+                sync_ok = False
+                try:
+                    if platform == "amazon":
+                        result = amazon_api(pconfig, "/feeds/2021-06-30/feeds", method="POST", data={
+                            "feedType": "POST_INVENTORY_AVAILABILITY_DATA",
+                            "marketplaceIds": [pconfig.get("marketplace_id", "ATVPDKIKX0DER")],
+                        })
+                        sync_ok = "error" not in result
+                    elif platform == "ebay":
+                        result = ebay_api(pconfig, f"/sell/inventory/v1/inventory_item/{sku}", method="PUT", data={
+                            "availability": {"shipToLocationAvailability": {"quantity": sync_qty}}
+                        })
+                        sync_ok = "error" not in result
+                except Exception as e:
+                    print(f"  ❌ Sync {sku} → {platform} failed: {e}")
+                    print(f"  ⚠️  PAUSING {sku} on {platform} — manual intervention needed")
+                    continue
+
+                if sync_ok:
+                    print(f"  ✅ Synced {sku} → {platform}: {sync_qty} units")
+                else:
+                    print(f"  ❌ Sync {sku} → {platform} failed — listing paused for safety")
 
         if low_stock:
             print(f"\n⚠️  LOW STOCK ALERTS:")
@@ -1091,7 +1805,7 @@ def cmd_report(args, config):
         print(f"{'='*60}")
         print()
         print("SUMMARY")
-        print("  Fetching orders from all platforms...")
+        print("  Syncing orders from all platforms...")
         print()
 
         # Fetch orders for the day
@@ -1100,44 +1814,19 @@ def cmd_report(args, config):
             print("  No platforms configured. Run ecommerce-setup.sh first.")
             return
 
-        total_orders = 0
-        total_revenue = 0.0
+        day = datetime.date.fromisoformat(report_date)
+        errors = sync_orders(config, enabled, day)
+        conn = orders_db()
+        _mirror_local_tables(conn)
+        totals = order_totals(conn, day, day)
+        total_orders = sum(t["orders"] for t in totals.values())
+        total_revenue = sum(t["revenue"] for t in totals.values())
         platform_stats = {}
-
         for platform in enabled:
-            pconfig = config.get("platforms", {}).get(platform, {})
-
-            if platform == "shopify":
-                result = shopify_api(pconfig, f"orders/count.json?created_at_min={report_date}T00:00:00-00:00"
-                                     f"&created_at_max={report_date}T23:59:59-00:00")
-                count = result.get("count", 0)
-                # Fetch actual orders for revenue
-                orders_result = shopify_api(pconfig, f"orders.json?created_at_min={report_date}T00:00:00-00:00"
-                                            f"&created_at_max={report_date}T23:59:59-00:00&status=any&fields=total_price")
-                orders = orders_result.get("orders", [])
-                rev = sum(float(o.get("total_price", 0)) for o in orders)
-                platform_stats[platform] = {"orders": count, "revenue": rev}
-                total_orders += count
-                total_revenue += rev
-
-            elif platform == "amazon":
-                result = amazon_api(pconfig, f"/orders/v0/orders?CreatedAfter={report_date}T00:00:00Z"
-                                    f"&CreatedBefore={report_date}T23:59:59Z")
-                orders = result.get("payload", {}).get("Orders", [])
-                count = len(orders)
-                rev = sum(float(o.get("OrderTotal", {}).get("Amount", 0)) for o in orders)
-                platform_stats[platform] = {"orders": count, "revenue": rev}
-                total_orders += count
-                total_revenue += rev
-
-            elif platform == "ebay":
-                result = ebay_api(pconfig, f"/sell/fulfillment/v1/order?filter=creationdate:[{report_date}T00:00:00.000Z..{report_date}T23:59:59.000Z]")
-                orders = result.get("orders", [])
-                count = len(orders)
-                rev = sum(float(o.get("pricingSummary", {}).get("total", {}).get("value", 0)) for o in orders)
-                platform_stats[platform] = {"orders": count, "revenue": rev}
-                total_orders += count
-                total_revenue += rev
+            platform_stats[platform] = {"orders": totals.get(platform, {}).get("orders", 0),
+                                        "revenue": totals.get(platform, {}).get("revenue", 0.0)}
+            if platform in errors:
+                platform_stats[platform]["note"] = f"sync failed, stored data only: {errors[platform]}"
 
         print(f"  Total Orders: {total_orders}")
         print(f"  Total Revenue: ${total_revenue:.2f}")
@@ -1153,9 +1842,9 @@ def cmd_report(args, config):
         print(f"\n  Active Returns: {active_returns}")
 
         # Check low stock
-        inventory = load_json_db(INVENTORY_DB, {"skus": {}})
         threshold = config.get("policies", {}).get("low_stock_threshold", 10)
-        low = [(s, d["quantity"]) for s, d in inventory.get("skus", {}).items() if d.get("quantity", 0) <= threshold]
+        low = low_stock(conn, threshold)
+        conn.close()
         if low:
             print(f"\n  ⚠️  LOW STOCK ({len(low)} items):")
             for sku, qty in low:
@@ -1180,60 +1869,42 @@ def cmd_report(args, config):
         print(f"{'='*60}")
         print()
 
-        # Aggregate daily order data for the week
+        # Aggregate order data for the week (and the one before, for comparison)
         enabled = [p for p, c in config.get("platforms", {}).items() if c.get("enabled")]
-        weekly_orders = []
-        weekly_revenue = 0.0
-
-        for platform in enabled:
-            pconfig = config.get("platforms", {}).get(platform, {})
-            if platform == "shopify":
-                result = shopify_api(pconfig,
-                    f"orders.json?created_at_min={week_start}T00:00:00-00:00"
-                    f"&created_at_max={week_end}T23:59:59-00:00&status=any")
-                orders = result.get("orders", [])
-                for o in orders:
-                    total = float(o.get("total_price", 0))
-                    weekly_orders.append({"platform": "shopify", "total": total, "items": len(o.get("line_items", []))})
-                    weekly_revenue += total
+        prev_start = week_start - datetime.timedelta(days=7)
+        prev_end = week_start - datetime.timedelta(days=1)
+        errors = sync_orders(config, enabled, prev_start)
+        for platform, error in errors.items():
+            print(f"  ⚠️  {platform} orders may be incomplete — sync failed: {error}")
+        if errors:
+            print()
 
-            elif platform == "amazon":
-                result = amazon_api(pconfig,
-                    f"/orders/v0/orders?CreatedAfter={week_start}T00:00:00Z&CreatedBefore={week_end}T23:59:59Z")
-                orders = result.get("payload", {}).get("Orders", [])
-                for o in orders:
-                    total = float(o.get("OrderTotal", {}).get("Amount", 0))
-                    weekly_orders.append({"platform": "amazon", "total": total, "items": o.get("NumberOfItemsShipped", 0)})
-                    weekly_revenue += total
+        conn = orders_db()
+        _mirror_local_tables(conn)
+        totals = order_totals(conn, week_start, week_end)
+        prev_totals = order_totals(conn, prev_start, prev_end)
+        refund_total, refund_count = period_refunds(conn, week_start, week_end)
+        prev_refunds, _ = period_refunds(conn, prev_start, prev_end)
+        conn.close()
 
-            elif platform == "ebay":
-                result = ebay_api(pconfig,
-                    f"/sell/fulfillment/v1/order?filter=creationdate:[{week_start}T00:00:00.000Z..{week_end}T23:59:59.000Z]")
-                orders = result.get("orders", [])
-                for o in orders:
-                    total = float(o.get("pricingSummary", {}).get("total", {}).get("value", 0))
-                    weekly_orders.append({"platform": "ebay", "total": total, "items": len(o.get("lineItems", []))})
-                    weekly_revenue += total
+        def platform_total(platform, key):
+            return totals.get(platform, {}).get(key, 0)
 
-        total_items = sum(o["items"] for o in weekly_orders)
+        weekly_revenue = sum(t["revenue"] for t in totals.values())
+        weekly_order_count = sum(t["orders"] for t in totals.values())
+        total_items = sum(t["items"] for t in totals.values())
 
         # Calculate costs (platform fees)
-        shopify_rev = sum(o["total"] for o in weekly_orders if o["platform"] == "shopify")
-        amazon_rev = sum(o["total"] for o in weekly_orders if o["platform"] == "amazon")
-        ebay_rev = sum(o["total"] for o in weekly_orders if o["platform"] == "ebay")
-        shopify_count = sum(1 for o in weekly_orders if o["platform"] == "shopify")
-
-        shopify_fees = shopify_rev * 0.029 + shopify_count * 0.30
-        amazon_fees = amazon_rev * 0.15
-        ebay_fees = ebay_rev * 0.1235
+        shopify_rev = platform_total("shopify", "revenue")
+        amazon_rev = platform_total("amazon", "revenue")
+        ebay_rev = platform_total("ebay", "revenue")
+        shopify_count = platform_total("shopify", "orders")
+
+        shopify_fees = platform_total("shopify", "fees")
+        amazon_fees = platform_total("amazon", "fees")
+        ebay_fees = platform_total("ebay", "fees")
         total_fees = shopify_fees + amazon_fees + ebay_fees
 
-        # Returns/refunds this week
-        returns = load_json_db(RETURNS_DB, {"completed": []})
-        week_refunds = [r for r in returns.get("completed", [])
-                        if r.get("refunded_at", "")[:10] >= str(week_start) and r.get("refunded_at", "")[:10] <= str(week_end)]
-        refund_total = sum(r.get("refund_amount", 0) for r in week_refunds)
-
         # Estimated COGS (assume 40% margin — user can override in config)
         cogs_pct = float(config.get("policies", {}).get("estimated_cogs_pct", 40)) / 100
         cogs = weekly_revenue * cogs_pct
@@ -1244,14 +1915,19 @@ def cmd_report(args, config):
 
         net_profit = weekly_revenue - cogs - total_fees - shipping - refund_total
 
+        prev_revenue = sum(t["revenue"] for t in prev_totals.values())
+        prev_orders = sum(t["orders"] for t in prev_totals.values())
+        prev_profit = (prev_revenue * (1 - cogs_pct - shipping_pct)
+                       - sum(t["fees"] for t in prev_totals.values()) - prev_refunds)
+
         print("REVENUE")
-        print(f"  Total: ${weekly_revenue:.2f} ({len(weekly_orders)} orders, {total_items} items)")
+        print(f"  Total: ${weekly_revenue:.2f} ({weekly_order_count} orders, {total_items} items)")
         if shopify_rev > 0:
             print(f"    Shopify: ${shopify_rev:.2f} ({shopify_count} orders)")
         if amazon_rev > 0:
-            print(f"    Amazon:  ${amazon_rev:.2f} ({sum(1 for o in weekly_orders if o['platform'] == 'amazon')} orders)")
+            print(f"    Amazon:  ${amazon_rev:.2f} ({platform_total('amazon', 'orders')} orders)")
         if ebay_rev > 0:
-            print(f"    eBay:    ${ebay_rev:.2f} ({sum(1 for o in weekly_orders if o['platform'] == 'ebay')} orders)")
+            print(f"    eBay:    ${ebay_rev:.2f} ({platform_total('ebay', 'orders')} orders)")
         print()
 
         print("COSTS")
@@ -1264,7 +1940,7 @@ def cmd_report(args, config):
         if ebay_fees > 0:
             print(f"    eBay (12.35%): ${ebay_fees:.2f}")
         print(f"  Shipping (~{shipping_pct*100:.0f}%): ${shipping:.2f}")
-        print(f"  Returns/Refunds: ${refund_total:.2f} ({len(week_refunds)} refunds)")
+        print(f"  Returns/Refunds: ${refund_total:.2f} ({refund_count} refunds)")
         print()
 
         print("NET PROFIT")
@@ -1273,6 +1949,15 @@ def cmd_report(args, config):
         print(f"  Revenue ${weekly_revenue:.2f} - COGS ${cogs:.2f} - Fees ${total_fees:.2f} - Shipping ${shipping:.2f} - Returns ${refund_total:.2f}")
         print()
 
+        print(f"VS PREVIOUS WEEK ({prev_start} to {prev_end})")
+        if prev_orders:
+            print(f"  Revenue: ${prev_revenue:.2f} → ${weekly_revenue:.2f} ({(weekly_revenue - prev_revenue) / prev_revenue * 100 if prev_revenue else 0:+.1f}%)")
+            print(f"  Orders: {prev_orders} → {weekly_order_count} ({weekly_order_count - prev_orders:+d})")
+            print(f"  Net profit: ${prev_profit:.2f} → ${net_profit:.2f}")
+        else:
+            print("  No orders recorded for the previous week")
+        print()
+
         # Price changes this week
         price_changes = load_json_db(PRICE_LOG, {"changes": []})
         week_price_changes = [c for c in price_changes.get("changes", [])
@@ -1288,7 +1973,7 @@ def cmd_report(args, config):
             print("  ⚠️  Margin below 20% — review pricing and COGS")
         if refund_total > weekly_revenue * 0.05:
             print("  ⚠️  Refund rate >5% — investigate product quality or listing accuracy")
-        if len(weekly_orders) == 0:
+        if weekly_order_count == 0:
             print("  ⚠️  Zero orders this week — check listings and advertising")
         elif margin >= 20:
             print("  ✅ Healthy margins — consider scaling ad spend")
@@ -1296,7 +1981,7 @@ def cmd_report(args, config):
         # Save report
         report_lines = [
             f"Weekly P&L — {week_start} to {week_end}",
-            f"Revenue: ${weekly_revenue:.2f} | Orders: {len(weekly_orders)}",
+            f"Revenue: ${weekly_revenue:.2f} | Orders: {weekly_order_count}",
             f"COGS: ${cogs:.2f} | Fees: ${total_fees:.2f} | Shipping: ${shipping:.2f} | Returns: ${refund_total:.2f}",
             f"Net Profit: ${net_profit:.2f} ({margin:.1f}%)",
         ]
@@ -1320,55 +2005,36 @@ def cmd_report(args, config):
             if f.startswith("weekly-") and f[7:14] >= f"{year}-{mon:02d}" and f[7:14] <= f"{year}-{mon:02d}"
         ]) if os.path.isdir(REPORTS_DIR) else []
 
-        # Also fetch live data for the month from platforms
+        # Bring the order store up to date for the month (only the delta is fetched)
         enabled = [p for p, c in config.get("platforms", {}).items() if c.get("enabled")]
-        monthly_revenue = 0.0
-        monthly_orders = 0
-
+        month_start = datetime.date(year, mon, 1)
+        month_end = (month_start + datetime.timedelta(days=32)).replace(day=1) - datetime.timedelta(days=1)
+        prev_end = month_start - datetime.timedelta(days=1)
+        prev_start = prev_end.replace(day=1)
+        errors = sync_orders(config, enabled, month_start)
+        conn = orders_db()
+        _mirror_local_tables(conn)
+        totals = order_totals(conn, month_start, month_end)
+        # The sync starts at month_start, so last month may be only partly stored
+        # (a weekly report's backfill, or old orders edited recently)
+        prev_totals = order_totals(conn, prev_start, prev_end) if store_covers(conn, enabled, prev_start) else {}
+        refund_total, refund_count = period_refunds(conn, month_start, month_end)
+        conn.close()
+        monthly_orders = sum(t["orders"] for t in totals.values())
+        monthly_revenue = sum(t["revenue"] for t in totals.values())
+
+        names = {"shopify": "Shopify", "amazon": "Amazon", "ebay": "eBay"}
         for platform in enabled:
-            pconfig = config.get("platforms", {}).get(platform, {})
-            if platform == "shopify":
-                result = shopify_api(pconfig,
-                    f"orders/count.json?created_at_min={month}-01T00:00:00-00:00")
-                count = result.get("count", 0)
-                # Get revenue from orders
-                orders_result = shopify_api(pconfig,
-                    f"orders.json?created_at_min={month}-01T00:00:00-00:00&status=any&fields=total_price")
-                orders = orders_result.get("orders", [])
-                rev = sum(float(o.get("total_price", 0)) for o in orders)
-                monthly_orders += count
-                monthly_revenue += rev
-                print(f"  Shopify: {count} orders, ${rev:.2f} revenue")
-
-            elif platform == "amazon":
-                result = amazon_api(pconfig,
-                    f"/orders/v0/orders?CreatedAfter={month}-01T00:00:00Z")
-                orders = result.get("payload", {}).get("Orders", [])
-                rev = sum(float(o.get("OrderTotal", {}).get("Amount", 0)) for o in orders)
-                monthly_orders += len(orders)
-                monthly_revenue += rev
-                print(f"  Amazon: {len(orders)} orders, ${rev:.2f} revenue")
-
-            elif platform == "ebay":
-                result = ebay_api(pconfig,
-                    f"/sell/fulfillment/v1/order?filter=creationdate:[{month}-01T00:00:00.000Z..]")
-                orders = result.get("orders", [])
-                rev = sum(float(o.get("pricingSummary", {}).get("total", {}).get("value", 0)) for o in orders)
-                monthly_orders += len(orders)
-                monthly_revenue += rev
-                print(f"  eBay: {len(orders)} orders, ${rev:.2f} revenue")
-
+            t = totals.get(platform, {"orders": 0, "revenue": 0.0})
+            note = f" (sync failed, stored data only: {errors[platform]})" if platform in errors else ""
+            print(f"  {names.get(platform, platform)}: {t['orders']} orders, ${t['revenue']:.2f} revenue{note}")
         print()
         print(f"MONTHLY TOTALS")
         print(f"  Orders: {monthly_orders}")
         print(f"  Revenue: ${monthly_revenue:.2f}")
 
         # Returns this month
-        returns = load_json_db(RETURNS_DB, {"completed": [], "active": []})
-        month_refunds = [r for r in returns.get("completed", [])
-                         if r.get("refunded_at", "")[:7] == month]
-        refund_total = sum(r.get("refund_amount", 0) for r in month_refunds)
-        print(f"  Refunds: ${refund_total:.2f} ({len(month_refunds)} returns)")
+        print(f"  Refunds: ${refund_total:.2f} ({refund_count} returns)")
 
         # Price changes this month
         price_changes = load_json_db(PRICE_LOG, {"changes": []})
@@ -1382,14 +2048,15 @@ def cmd_report(args, config):
         prev_year = year if mon > 1 else year - 1
         prev_month = f"{prev_year}-{prev_mon:02d}"
         prev_report = os.path.join(REPORTS_DIR, f"monthly-{prev_month}.json")
-        if os.path.exists(prev_report):
-            prev_data = load_json_db(prev_report, {})
-            prev_rev = prev_data.get("revenue", 0)
-            if prev_rev > 0:
-                growth = (monthly_revenue - prev_rev) / prev_rev * 100
-                print(f"TREND vs {prev_month}")
-                print(f"  Revenue growth: {growth:+.1f}%")
-                print(f"  Previous month: ${prev_rev:.2f}")
+        # From the order store when it covers the whole month, else the saved report
+        prev_rev = sum(t["revenue"] for t in prev_totals.values())
+        if not prev_totals and os.path.exists(prev_report):
+            prev_rev = load_json_db(prev_report, {}).get("revenue", 0)
+        if prev_rev > 0:
+            growth = (monthly_revenue - prev_rev) / prev_rev * 100
+            print(f"TREND vs {prev_month}")
+            print(f"  Revenue growth: {growth:+.1f}%")
+            print(f"  Previous month: ${prev_rev:.2f}")
         print()
 
         # Save structured report
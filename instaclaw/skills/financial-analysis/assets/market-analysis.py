@@ -3,30 +3,44 @@
 market-analysis.py — Technical analysis engine for AI agents
 
 Usage:
-    market-analysis.py analyze    --symbol <sym>                     — Full technical analysis
-    market-analysis.py chart      --symbol <sym> [--output path.png] — Generate price chart
-    market-analysis.py watchlist  --symbols SYM1,SYM2,...            — Multi-ticker scan
-    market-analysis.py rate-status                                    — Show API usage stats
+    market-analysis.py analyze    --symbol <sym> [--refresh]           — Full technical analysis
+    market-analysis.py chart      --symbol <sym> [--output path.png]   — Generate price chart
+    market-analysis.py watchlist  --symbols SYM1,SYM2,... [--refresh]  — Multi-ticker scan
+    market-analysis.py options    --symbol <sym>                       — Max pain, put/call, IV, ATM Greeks
+    market-analysis.py options-surface --symbol <sym>                  — Per-expiry OI profile + IV/Greeks surface (JSON)
+    market-analysis.py rate-status                                     — Show API usage stats
 
 Reads from:
     ~/.openclaw/.env  — ALPHAVANTAGE_API_KEY
 
+Daily bars are cached in ~/.openclaw/cache/alphavantage/ohlcv.db; repeat runs
+on the same trading day make no API calls.
+
 Output: Formatted analysis text or JSON (--json flag)
 """
 
 import argparse
 import json
 import os
+import sqlite3
 import subprocess
 import sys
-from datetime import datetime, timezone
+import time
+from datetime import date, datetime, time as dtime, timedelta, timezone
 from pathlib import Path
 
+try:
+    from rate_budget import DailyBudget, TokenBucket
+except ImportError:  # repo checkout: the shared module lives in skills/shared/scripts
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "shared" / "scripts"))
+    from rate_budget import DailyBudget, TokenBucket
+
 ENV_FILE = Path.home() / ".openclaw" / ".env"
 CACHE_DIR = Path.home() / ".openclaw" / "cache" / "alphavantage"
-RATE_FILE = CACHE_DIR / ".rate-log"
+OHLCV_DB = CACHE_DIR / "ohlcv.db"
 BASE_URL = "https://www.alphavantage.co/query"
 DAILY_BUDGET = 500
+BUDGET = DailyBudget(CACHE_DIR, DAILY_BUDGET, warn_at=400)
 
 
 def load_api_key() -> str:
@@ -66,32 +80,25 @@ def api_call(params: dict, api_key: str) -> dict:
 
 
 def log_request():
-    """Log an API request for rate tracking."""
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    now = datetime.now(timezone.utc).strftime("%H:%M:%S")
-    with open(RATE_FILE, "a") as f:
-        f.write(f"{today} {now}\n")
+    """Count an API request against today's budget."""
+    BUDGET.record()
 
 
 def get_daily_count() -> int:
     """Get today's API request count."""
-    if not RATE_FILE.exists():
-        return 0
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    try:
-        return sum(1 for line in RATE_FILE.read_text().splitlines() if line.startswith(today))
-    except IOError:
-        return 0
+    return BUDGET.count()
+
+
+class BudgetExhausted(Exception):
+    """The daily Alpha Vantage budget is spent; main() turns this into exit code 2."""
 
 
 def check_rate_limit():
-    """Check if we're within budget."""
+    """Check if we're within budget; raises BudgetExhausted when it is spent."""
     count = get_daily_count()
     if count >= DAILY_BUDGET:
-        print(f"ERROR: Daily API budget exhausted ({count}/{DAILY_BUDGET})", file=sys.stderr)
-        sys.exit(2)
-    if count >= 400:
+        raise BudgetExhausted(f"Daily API budget exhausted ({count}/{DAILY_BUDGET})")
+    if count >= BUDGET.warn_at:
         print(f"WARNING: Approaching daily budget ({count}/{DAILY_BUDGET})", file=sys.stderr)
 
 
@@ -112,38 +119,6 @@ def get_quote(symbol: str, api_key: str) -> dict:
     }
 
 
-def get_indicator(symbol: str, function: str, api_key: str,
-                  interval: str = "daily", time_period: int = 14) -> list:
-    """Get a technical indicator's recent values."""
-    params = {
-        "function": function,
-        "symbol": symbol,
-        "interval": interval,
-        "time_period": time_period,
-        "series_type": "close",
-    }
-    data = api_call(params, api_key)
-    # Alpha Vantage returns data under "Technical Analysis: <FUNCTION>" key
-    ta_key = f"Technical Analysis: {function}"
-    ta_data = data.get(ta_key, {})
-    if not ta_data:
-        # Try other possible key formats
-        for key in data:
-            if "Technical Analysis" in key:
-                ta_data = data[key]
-                break
-    if not ta_data:
-        return []
-    # Convert to sorted list of (date, values)
-    result = []
-    for date_str, values in sorted(ta_data.items(), reverse=True)[:50]:
-        entry = {"date": date_str}
-        for k, v in values.items():
-            entry[k.lower().replace(" ", "_")] = float(v)
-        result.append(entry)
-    return result
-
-
 CRYPTO_SYMBOLS = {
     "BTC", "ETH", "SOL", "ADA", "DOT", "AVAX", "MATIC", "LINK", "UNI", "AAVE",
     "DOGE", "SHIB", "XRP", "BNB", "LTC", "ATOM", "NEAR", "FTM", "ARB", "OP",
@@ -152,83 +127,635 @@ CRYPTO_SYMBOLS = {
 
 def is_crypto(symbol: str) -> bool:
     """Detect if a symbol is a cryptocurrency."""
-    sym = symbol.upper().replace("-USD", "").replace("/USD", "").replace("USDT", "")
+    sym = crypto_base(symbol)
     return sym in CRYPTO_SYMBOLS or symbol.upper().endswith("-USD") or symbol.upper().endswith("/USD")
 
 
-def analyze_options(symbol: str, api_key: str, as_json: bool = False):
-    """Analyze options chain for a symbol — max pain, put/call ratio, OI, IV rank, Greeks."""
-    check_rate_limit()
+def crypto_base(symbol: str) -> str:
+    """BTC-USD / BTC/USD / BTCUSDT -> BTC."""
+    return symbol.upper().replace("-USD", "").replace("/USD", "").replace("USDT", "")
+
+
+def _bar_field(values: dict, n: int) -> float:
+    # Stocks use "4. close"; crypto uses "4. close" or the older "4a. close (USD)"
+    for k, v in values.items():
+        if k.startswith(f"{n}. ") or k.startswith(f"{n}a. "):
+            return float(v)
+    return 0.0
+
+
+def parse_daily_series(data: dict) -> list:
+    """Alpha Vantage daily time series -> bars sorted oldest first."""
+    ts_key = next((k for k in data if "Time Series" in k), None)
+    if not ts_key:
+        return []
+    bars = []
+    for date_str in sorted(data[ts_key]):
+        values = data[ts_key][date_str]
+        bars.append({
+            "date": date_str,
+            "open": _bar_field(values, 1),
+            "high": _bar_field(values, 2),
+            "low": _bar_field(values, 3),
+            "close": _bar_field(values, 4),
+            "volume": _bar_field(values, 5),
+        })
+    return bars
+
+
+def fetch_daily_bars(symbol: str, api_key: str, outputsize: str = "full") -> list:
+    """One daily OHLCV fetch (TIME_SERIES_DAILY, or DIGITAL_CURRENCY_DAILY for crypto)."""
+    if is_crypto(symbol):
+        return parse_daily_series(api_call({
+            "function": "DIGITAL_CURRENCY_DAILY",
+            "symbol": crypto_base(symbol),
+            "market": "USD",
+        }, api_key))
+    bars = parse_daily_series(api_call({
+        "function": "TIME_SERIES_DAILY",
+        "symbol": symbol,
+        "outputsize": outputsize,
+    }, api_key))
+    if not bars and outputsize == "full":
+        # Free keys may be refused full history; 100 bars still cover everything but SMA200
+        bars = parse_daily_series(api_call({
+            "function": "TIME_SERIES_DAILY",
+            "symbol": symbol,
+            "outputsize": "compact",
+        }, api_key))
+    return bars
+
+
+def quote_from_bars(symbol: str, bars: list) -> dict:
+    """GLOBAL_QUOTE-shaped dict built from the last two daily bars."""
+    if not bars:
+        return {}
+    last = bars[-1]
+    prev_close = bars[-2]["close"] if len(bars) > 1 else last["open"]
+    change = last["close"] - prev_close
+    return {
+        "symbol": symbol.upper(),
+        "price": last["close"],
+        "change": round(change, 4),
+        "change_pct": f"{(change / prev_close * 100) if prev_close else 0:.4f}%",
+        "volume": int(last["volume"]),
+        "prev_close": prev_close,
+        "timestamp": last["date"],
+    }
+
+
+# ---------------------------------------------------------------------------
+# OHLCV store
+# ---------------------------------------------------------------------------
+# Daily bars are kept in ~/.openclaw/cache/alphavantage/ohlcv.db, keyed by
+# (symbol, interval, date). The first request for a symbol downloads full
+# history; afterwards one outputsize=compact call (last 100 bars) tops it up,
+# overwriting the still-forming latest bar. A symbol fetched after the most
+# recent session close has every completed bar and is served straight from
+# disk with no API call at all; one fetched before it (pre-open or mid-session)
+# is topped up once the close has settled. --refresh forces a top-up. With the
+# daily budget spent, stored bars are served with a stale warning instead.
+
+COMPACT_BARS = 100
+COMPACT_SPAN_DAYS = 130  # compact's 100 trading days reach back ~140 calendar days
+CLOSE_SETTLE = timedelta(minutes=30)  # Alpha Vantage publishes the final daily bar shortly after the close
+
+OHLCV_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL, high REAL, low REAL, close REAL, volume REAL,
+    PRIMARY KEY (symbol, interval, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS series (
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    fetched_on TEXT NOT NULL,       -- market date of the last API fetch
+    fetched_at REAL,                -- epoch seconds of the last API fetch
+    full_history INTEGER NOT NULL,  -- 1 once a full download has been attempted
+    PRIMARY KEY (symbol, interval)
+);
+"""
+
+
+def ohlcv_db() -> sqlite3.Connection:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(OHLCV_DB, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(OHLCV_SCHEMA)
+    if "fetched_at" not in {r[1] for r in conn.execute("PRAGMA table_info(series)")}:
+        conn.execute("ALTER TABLE series ADD COLUMN fetched_at REAL")  # NULL: refetched once
+    return conn
+
+
+def store_key(symbol: str) -> str:
+    return crypto_base(symbol) if is_crypto(symbol) else symbol.upper()
+
+
+def market_date(symbol: str) -> str:
+    """Current trading date: UTC for crypto (daily close 00:00 UTC), New York for stocks."""
+    if is_crypto(symbol):
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    try:
+        from zoneinfo import ZoneInfo
+        return datetime.now(ZoneInfo("America/New_York")).strftime("%Y-%m-%d")
+    except Exception:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
 
+def last_session_close(symbol: str) -> float:
+    """Epoch seconds of the most recent daily close that has settled.
+
+    Stocks close at 16:00 New York on weekdays (exchange holidays are not
+    modelled — they cost one extra top-up); crypto's daily bar closes at
+    00:00 UTC every day. CLOSE_SETTLE is added so the final bar is published.
+    """
     now = datetime.now(timezone.utc)
-    timestamp = now.strftime("%b %d, %Y %H:%M UTC")
+    if is_crypto(symbol):
+        tz, close_at, weekdays_only = timezone.utc, dtime(0, 0), False
+    else:
+        try:
+            from zoneinfo import ZoneInfo
+            tz = ZoneInfo("America/New_York")
+        except Exception:
+            tz = timezone(timedelta(hours=-5))
+        close_at, weekdays_only = dtime(16, 0), True
+    day = now.astimezone(tz).date()
+    while True:
+        settled = datetime.combine(day, close_at, tzinfo=tz) + CLOSE_SETTLE
+        if settled <= now and not (weekdays_only and day.weekday() >= 5):
+            return settled.timestamp()
+        day -= timedelta(days=1)
+
+
+def _stored_bars(conn, key: str, interval: str) -> list:
+    rows = conn.execute(
+        "SELECT date, open, high, low, close, volume FROM bars WHERE symbol = ? AND interval = ? ORDER BY date",
+        (key, interval),
+    ).fetchall()
+    return [dict(zip(("date", "open", "high", "low", "close", "volume"), r)) for r in rows]
+
+
+def _save_bars(conn, key: str, interval: str, bars: list, today: str, full_history: bool):
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO bars (symbol, interval, date, open, high, low, close, volume) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(key, interval, b["date"], b["open"], b["high"], b["low"], b["close"], b["volume"]) for b in bars],
+        )
+        conn.execute(
+            "INSERT INTO series (symbol, interval, fetched_on, fetched_at, full_history) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(symbol, interval) DO UPDATE SET fetched_on = excluded.fetched_on, "
+            "fetched_at = excluded.fetched_at, full_history = MAX(series.full_history, excluded.full_history)",
+            (key, interval, today, time.time(), int(full_history)),
+        )
+
+
+def store_is_fresh(symbol: str) -> bool:
+    """True if load_bars() would answer from disk without an API call."""
+    conn = ohlcv_db()
+    try:
+        row = conn.execute("SELECT fetched_at FROM series WHERE symbol = ? AND interval = 'daily'",
+                           (store_key(symbol),)).fetchone()
+    finally:
+        conn.close()
+    return bool(row) and (row[0] or 0) >= last_session_close(symbol)
+
+
+def load_bars(symbol: str, api_key: str, history: str = "full", refresh: bool = False,
+              offline: bool = False) -> tuple:
+    """Daily bars (oldest first) from the local store, fetching only what is missing.
+
+    history="full" wants enough bars for SMA200; "compact" is happy with 100.
+    offline=True never calls the API (stale bars are better than none when the
+    budget is spent). Returns (bars, source) where source is "store", "top-up",
+    "download", or "stale" (stored bars served because the budget is spent).
+    """
+    key = store_key(symbol)
+    interval = "daily"
+    today = market_date(symbol)
+    conn = ohlcv_db()
+    try:
+        stored = _stored_bars(conn, key, interval)
+        meta = conn.execute("SELECT fetched_at, full_history FROM series WHERE symbol = ? AND interval = ?",
+                            (key, interval)).fetchone()
+        fetched_at, full_history = meta if meta else (None, 0)
+        # A compact-only series (watchlist) doesn't satisfy an SMA200 consumer
+        short_history = history == "full" and not full_history and len(stored) < 200
+        fetched_since_close = (fetched_at or 0) >= last_session_close(symbol)
+
+        if offline or (stored and fetched_since_close and not refresh and not short_history):
+            return stored, "store"
+
+        if stored and get_daily_count() >= DAILY_BUDGET:
+            print(f"WARNING: Daily API budget exhausted — serving stored {key} bars as of {stored[-1]['date']} "
+                  f"(may be stale)", file=sys.stderr)
+            return stored, "stale"
+        check_rate_limit()
+        gap_days = (date.fromisoformat(today) - date.fromisoformat(stored[-1]["date"])).days if stored else None
+        needs_download = ((not stored and history == "full") or (stored and gap_days > COMPACT_SPAN_DAYS)
+                          or short_history)
+        # Crypto daily has no outputsize — every fetch is the full series anyway
+        if needs_download or is_crypto(symbol):
+            fresh = fetch_daily_bars(symbol, api_key, outputsize="full")
+            source, full_attempted = "download", True
+        else:
+            fresh = fetch_daily_bars(symbol, api_key, outputsize="compact")
+            source, full_attempted = ("top-up" if stored else "download"), False
+        if not fresh:
+            # API refused or failed — serve whatever is on disk rather than nothing
+            return stored, "store"
+        _save_bars(conn, key, interval, fresh, today, full_attempted)
+        return _stored_bars(conn, key, interval), source
+    finally:
+        conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Indicator engine
+# ---------------------------------------------------------------------------
+# Computes locally what analyze used to request as seven separate Alpha
+# Vantage indicator calls. Definitions follow Alpha Vantage (TA-Lib): EMAs and
+# Wilder averages are seeded with a simple mean of the first `period` values,
+# Bollinger uses the population standard deviation, STOCH is 5/3/3 with SMA
+# smoothing. Every function returns a list aligned to its input, with None
+# during warm-up. Plain Python: the recurrences are sequential anyway and a
+# few thousand bars take well under a millisecond per indicator.
+
+def _first_valid(values: list) -> int:
+    return next((i for i, v in enumerate(values) if v is not None), len(values))
+
+
+def sma(values: list, period: int) -> list:
+    out = [None] * len(values)
+    start = _first_valid(values)
+    total = 0.0
+    for i in range(start, len(values)):
+        total += values[i]
+        if i - start >= period:
+            total -= values[i - period]
+        if i - start >= period - 1:
+            out[i] = total / period
+    return out
+
+
+def ema(values: list, period: int) -> list:
+    out = [None] * len(values)
+    start = _first_valid(values)
+    if len(values) - start < period:
+        return out
+    k = 2 / (period + 1)
+    prev = sum(values[start:start + period]) / period
+    out[start + period - 1] = prev
+    for i in range(start + period, len(values)):
+        prev = values[i] * k + prev * (1 - k)
+        out[i] = prev
+    return out
+
+
+def rsi(closes: list, period: int = 14) -> list:
+    out = [None] * len(closes)
+    if len(closes) <= period:
+        return out
+    changes = [closes[i] - closes[i - 1] for i in range(1, len(closes))]
+    avg_gain = sum(max(c, 0) for c in changes[:period]) / period
+    avg_loss = sum(max(-c, 0) for c in changes[:period]) / period
+
+    def value(gain, loss):
+        return 100.0 if loss == 0 else 100 - 100 / (1 + gain / loss)
+
+    out[period] = value(avg_gain, avg_loss)
+    for i in range(period + 1, len(closes)):
+        c = changes[i - 1]
+        avg_gain = (avg_gain * (period - 1) + max(c, 0)) / period
+        avg_loss = (avg_loss * (period - 1) + max(-c, 0)) / period
+        out[i] = value(avg_gain, avg_loss)
+    return out
+
+
+def macd(closes: list, fast: int = 12, slow: int = 26, signal: int = 9) -> tuple:
+    """Returns (macd, signal, histogram) lists."""
+    fast_ema = ema(closes, fast)
+    slow_ema = ema(closes, slow)
+    line = [f - s if f is not None and s is not None else None for f, s in zip(fast_ema, slow_ema)]
+    sig = ema(line, signal)
+    hist = [m - g if m is not None and g is not None else None for m, g in zip(line, sig)]
+    return line, sig, hist
+
+
+def bbands(closes: list, period: int = 20, nbdev: float = 2.0) -> tuple:
+    """Returns (upper, middle, lower) lists."""
+    middle = sma(closes, period)
+    upper = [None] * len(closes)
+    lower = [None] * len(closes)
+    for i, mid in enumerate(middle):
+        if mid is None:
+            continue
+        window = closes[i - period + 1:i + 1]
+        sd = (sum((x - mid) ** 2 for x in window) / period) ** 0.5
+        upper[i] = mid + nbdev * sd
+        lower[i] = mid - nbdev * sd
+    return upper, middle, lower
+
+
+def adx(highs: list, lows: list, closes: list, period: int = 14) -> list:
+    n = len(closes)
+    out = [None] * n
+    if n < 2 * period:
+        return out
+    tr, plus_dm, minus_dm = [0.0] * n, [0.0] * n, [0.0] * n
+    for i in range(1, n):
+        up = highs[i] - highs[i - 1]
+        down = lows[i - 1] - lows[i]
+        plus_dm[i] = up if up > down and up > 0 else 0.0
+        minus_dm[i] = down if down > up and down > 0 else 0.0
+        tr[i] = max(highs[i] - lows[i], abs(highs[i] - closes[i - 1]), abs(lows[i] - closes[i - 1]))
+
+    # Wilder smoothing: first value is the plain sum, then s - s/period + x
+    s_tr = sum(tr[1:period + 1])
+    s_plus = sum(plus_dm[1:period + 1])
+    s_minus = sum(minus_dm[1:period + 1])
+    dx = [None] * n
+    for i in range(period, n):
+        if i > period:
+            s_tr = s_tr - s_tr / period + tr[i]
+            s_plus = s_plus - s_plus / period + plus_dm[i]
+            s_minus = s_minus - s_minus / period + minus_dm[i]
+        plus_di = 100 * s_plus / s_tr if s_tr else 0.0
+        minus_di = 100 * s_minus / s_tr if s_tr else 0.0
+        di_sum = plus_di + minus_di
+        dx[i] = 100 * abs(plus_di - minus_di) / di_sum if di_sum else 0.0
+
+    first = 2 * period - 1
+    prev = sum(dx[period:first + 1]) / period
+    out[first] = prev
+    for i in range(first + 1, n):
+        prev = (prev * (period - 1) + dx[i]) / period
+        out[i] = prev
+    return out
+
+
+def stoch(highs: list, lows: list, closes: list,
+          fastk_period: int = 5, slowk_period: int = 3, slowd_period: int = 3) -> tuple:
+    """Slow stochastic. Returns (slowk, slowd) lists."""
+    fast_k = [None] * len(closes)
+    for i in range(fastk_period - 1, len(closes)):
+        hh = max(highs[i - fastk_period + 1:i + 1])
+        ll = min(lows[i - fastk_period + 1:i + 1])
+        fast_k[i] = 100 * (closes[i] - ll) / (hh - ll) if hh > ll else 0.0
+    slow_k = sma(fast_k, slowk_period)
+    slow_d = sma(slow_k, slowd_period)
+    return slow_k, slow_d
+
+
+def _latest(series: list):
+    value = series[-1] if series else None
+    return round(value, 4) if value is not None else None
+
+
+def compute_indicators(bars: list, bb_period: int = 20) -> dict:
+    """Latest value of every indicator analyze reports, from one OHLCV series (oldest first)."""
+    highs = [b["high"] for b in bars]
+    lows = [b["low"] for b in bars]
+    closes = [b["close"] for b in bars]
+    macd_line, macd_sig, macd_hist = macd(closes)
+    bb_upper, bb_middle, bb_lower = bbands(closes, bb_period)
+    slow_k, slow_d = stoch(highs, lows, closes)
+    return {
+        "rsi": _latest(rsi(closes, 14)),
+        "macd": _latest(macd_line),
+        "macd_signal": _latest(macd_sig),
+        "macd_hist": _latest(macd_hist),
+        "sma50": _latest(sma(closes, 50)),
+        "sma200": _latest(sma(closes, 200)),
+        "adx": _latest(adx(highs, lows, closes, 14)),
+        "stoch_k": _latest(slow_k),
+        "stoch_d": _latest(slow_d),
+        "bb_upper": _latest(bb_upper),
+        "bb_middle": _latest(bb_middle),
+        "bb_lower": _latest(bb_lower),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Options engine
+# ---------------------------------------------------------------------------
+# The chain is parsed once into parallel columns; everything downstream works
+# on those columns. Max pain uses sorted prefix sums: for a settlement price K,
+# call pain is K * (OI of strikes below K) - (strike x OI below K), put pain the
+# mirror image above K, so every candidate strike is scored in one sweep —
+# O(n log n) for the sort instead of O(strikes x contracts).
+
+CHAIN_FIELDS = ("strike", "open_interest", "volume", "implied_volatility", "delta", "gamma", "theta", "vega")
+
+
+def _num(value, cast=float):
+    try:
+        return cast(float(value))
+    except (TypeError, ValueError):
+        return cast(0)
+
+
+def parse_chain(options: list) -> dict:
+    """Alpha Vantage option contracts -> column dict (one pass, one conversion per field)."""
+    cols = {"type": [], "expiration": [], **{f: [] for f in CHAIN_FIELDS}}
+    for o in options:
+        kind = (o.get("type") or "").lower()
+        if kind not in ("call", "put"):
+            continue
+        cols["type"].append(kind)
+        cols["expiration"].append(o.get("expiration") or o.get("expiration_date") or "")
+        cols["strike"].append(_num(o.get("strike")))
+        cols["open_interest"].append(_num(o.get("open_interest"), int))
+        cols["volume"].append(_num(o.get("volume"), int))
+        for f in ("implied_volatility", "delta", "gamma", "theta", "vega"):
+            cols[f].append(_num(o.get(f)))
+    return cols
+
+
+def chain_rows(cols: dict, expiration: str = None) -> list:
+    """Row indices, optionally limited to one expiration."""
+    if expiration is None:
+        return list(range(len(cols["type"])))
+    return [i for i, e in enumerate(cols["expiration"]) if e == expiration]
+
+
+def max_pain(cols: dict, rows: list) -> tuple:
+    """(strike, total pain in $) minimising option-holder payout at expiry."""
+    call_oi, put_oi = {}, {}
+    for i in rows:
+        book = call_oi if cols["type"][i] == "call" else put_oi
+        strike = cols["strike"][i]
+        book[strike] = book.get(strike, 0) + cols["open_interest"][i]
+    strikes = sorted(set(call_oi) | set(put_oi))
+    if not strikes:
+        return 0, 0
+
+    n = len(strikes)
+    # Calls strictly below K pay K - s: prefix sums of OI and strike x OI
+    call_pain = [0.0] * n
+    oi_below = weighted_below = 0.0
+    for j, k in enumerate(strikes):
+        call_pain[j] = k * oi_below - weighted_below
+        oi = call_oi.get(k, 0)
+        oi_below += oi
+        weighted_below += k * oi
+    # Puts strictly above K pay s - K: suffix sums
+    put_pain = [0.0] * n
+    oi_above = weighted_above = 0.0
+    for j in range(n - 1, -1, -1):
+        k = strikes[j]
+        put_pain[j] = weighted_above - k * oi_above
+        oi = put_oi.get(k, 0)
+        oi_above += oi
+        weighted_above += k * oi
+
+    best = min(range(n), key=lambda j: (call_pain[j] + put_pain[j], j))
+    return strikes[best], (call_pain[best] + put_pain[best]) * 100
+
+
+def oi_profile(cols: dict, rows: list) -> dict:
+    """Open interest and volume totals split by side."""
+    out = {"call_oi": 0, "put_oi": 0, "call_volume": 0, "put_volume": 0}
+    for i in rows:
+        side = cols["type"][i]
+        out[f"{side}_oi"] += cols["open_interest"][i]
+        out[f"{side}_volume"] += cols["volume"][i]
+    out["put_call_ratio_oi"] = round(out["put_oi"] / out["call_oi"], 3) if out["call_oi"] else 0
+    out["put_call_ratio_volume"] = round(out["put_volume"] / out["call_volume"], 3) if out["call_volume"] else 0
+    return out
+
+
+def nearest_contract(cols: dict, rows: list, side: str, price: float):
+    """Row index of the `side` contract with strike closest to price, or None."""
+    candidates = [i for i in rows if cols["type"][i] == side]
+    return min(candidates, key=lambda i: abs(cols["strike"][i] - price), default=None)
+
+
+def contract_greeks(cols: dict, i) -> dict:
+    if i is None:
+        return None
+    return {
+        "strike": cols["strike"][i],
+        "delta": cols["delta"][i],
+        "gamma": cols["gamma"][i],
+        "theta": cols["theta"][i],
+        "vega": cols["vega"][i],
+        "iv": cols["implied_volatility"][i],
+    }
+
 
+def options_surface(cols: dict, price: float, max_expirations: int = 6,
+                    strike_window: float = 0.2, top: int = 5) -> list:
+    """Per-expiry OI/volume profile, max pain and IV/Greeks by strike."""
+    today = date.today()
+    by_expiration = {}
+    for i, e in enumerate(cols["expiration"]):
+        by_expiration.setdefault(e, []).append(i)
+
+    surface = []
+    for expiration in sorted(e for e in by_expiration if e)[:max_expirations]:
+        rows = by_expiration[expiration]
+        pain_strike, pain_value = max_pain(cols, rows)
+        try:
+            dte = (date.fromisoformat(expiration) - today).days
+        except ValueError:
+            dte = None
+
+        strikes = {}
+        for i in rows:
+            strike = cols["strike"][i]
+            if price and abs(strike - price) > price * strike_window:
+                continue
+            strikes.setdefault(strike, {})[cols["type"][i]] = {
+                "oi": cols["open_interest"][i],
+                "volume": cols["volume"][i],
+                **{k: v for k, v in contract_greeks(cols, i).items() if k != "strike"},
+            }
+
+        atm_call = nearest_contract(cols, rows, "call", price)
+        atm_put = nearest_contract(cols, rows, "put", price)
+        atm_ivs = [cols["implied_volatility"][i] for i in (atm_call, atm_put)
+                   if i is not None and cols["implied_volatility"][i] > 0]
+
+        def top_strikes(side):
+            ranked = sorted((i for i in rows if cols["type"][i] == side),
+                            key=lambda i: cols["open_interest"][i], reverse=True)[:top]
+            return [{"strike": cols["strike"][i], "oi": cols["open_interest"][i]} for i in ranked]
+
+        surface.append({
+            "expiration": expiration,
+            "dte": dte,
+            "max_pain": pain_strike,
+            "max_pain_payout": round(pain_value, 2),
+            **oi_profile(cols, rows),
+            "atm_iv": round(sum(atm_ivs) / len(atm_ivs), 4) if atm_ivs else None,
+            "top_call_oi": top_strikes("call"),
+            "top_put_oi": top_strikes("put"),
+            "strikes": [{"strike": k, **strikes[k]} for k in sorted(strikes)],
+        })
+    return surface
+
+
+def fetch_options_chain(symbol: str, api_key: str) -> list:
     # Fetch options chain (uses Alpha Vantage HISTORICAL_OPTIONS endpoint)
     data = api_call({
         "function": "HISTORICAL_OPTIONS",
         "symbol": symbol,
     }, api_key)
-
     options = data.get("data", [])
     if not options:
         print(f"Error: No options data for {symbol}. Options may not be available.", file=sys.stderr)
         print("Note: Alpha Vantage options data requires a premium key for some symbols.", file=sys.stderr)
-        return
+    return options
+
+
+def analyze_options(symbol: str, api_key: str, as_json: bool = False):
+    """Analyze options chain for a symbol — max pain, put/call ratio, OI, IV rank, Greeks."""
+    check_rate_limit()
+
+    now = datetime.now(timezone.utc)
+    timestamp = now.strftime("%b %d, %Y %H:%M UTC")
 
-    # Separate calls and puts
-    calls = [o for o in options if o.get("type", "").lower() == "call"]
-    puts = [o for o in options if o.get("type", "").lower() == "put"]
+    options = fetch_options_chain(symbol, api_key)
+    if not options:
+        return
+    cols = parse_chain(options)
+    rows = chain_rows(cols)
 
     # Get current price for context
     quote = get_quote(symbol, api_key)
     price = quote.get("price", 0) if quote else 0
 
     # Calculate put/call ratio
-    total_call_oi = sum(int(o.get("open_interest", 0)) for o in calls)
-    total_put_oi = sum(int(o.get("open_interest", 0)) for o in puts)
-    total_call_vol = sum(int(o.get("volume", 0)) for o in calls)
-    total_put_vol = sum(int(o.get("volume", 0)) for o in puts)
+    profile = oi_profile(cols, rows)
+    total_call_oi = profile["call_oi"]
+    total_put_oi = profile["put_oi"]
+    total_call_vol = profile["call_volume"]
+    total_put_vol = profile["put_volume"]
 
     pc_ratio_oi = total_put_oi / total_call_oi if total_call_oi > 0 else 0
     pc_ratio_vol = total_put_vol / total_call_vol if total_call_vol > 0 else 0
 
     # Calculate max pain (strike with lowest total $ value of ITM options)
-    strikes = sorted(set(float(o.get("strike", 0)) for o in options))
-    min_pain = float("inf")
-    max_pain_strike = 0
-
-    for strike in strikes:
-        pain = 0
-        for o in calls:
-            s = float(o.get("strike", 0))
-            oi = int(o.get("open_interest", 0))
-            if strike > s:
-                pain += (strike - s) * oi * 100
-        for o in puts:
-            s = float(o.get("strike", 0))
-            oi = int(o.get("open_interest", 0))
-            if strike < s:
-                pain += (s - strike) * oi * 100
-        if pain < min_pain:
-            min_pain = pain
-            max_pain_strike = strike
+    max_pain_strike, _ = max_pain(cols, rows)
 
     # IV rank approximation (compare current avg IV to range)
-    ivs = [float(o.get("implied_volatility", 0)) for o in options if float(o.get("implied_volatility", 0)) > 0]
+    ivs = [iv for iv in cols["implied_volatility"] if iv > 0]
     avg_iv = sum(ivs) / len(ivs) if ivs else 0
     iv_min = min(ivs) if ivs else 0
     iv_max = max(ivs) if ivs else 0
     iv_rank = ((avg_iv - iv_min) / (iv_max - iv_min) * 100) if (iv_max - iv_min) > 0 else 50
 
     # Find nearest expiry options for Greeks display
-    expirations = sorted(set(o.get("expiration_date", "") for o in options))
+    expirations = sorted(set(e for e in cols["expiration"] if e))
     nearest_exp = expirations[0] if expirations else ""
-    nearest_calls = [o for o in calls if o.get("expiration_date") == nearest_exp]
-    nearest_puts = [o for o in puts if o.get("expiration_date") == nearest_exp]
+    nearest_rows = chain_rows(cols, nearest_exp)
 
     # Find ATM options
-    atm_call = min(nearest_calls, key=lambda o: abs(float(o.get("strike", 0)) - price), default=None) if nearest_calls else None
-    atm_put = min(nearest_puts, key=lambda o: abs(float(o.get("strike", 0)) - price), default=None) if nearest_puts else None
+    atm_call = contract_greeks(cols, nearest_contract(cols, nearest_rows, "call", price))
+    atm_put = contract_greeks(cols, nearest_contract(cols, nearest_rows, "put", price))
 
     if as_json:
         print(json.dumps({
@@ -243,22 +770,8 @@ def analyze_options(symbol: str, api_key: str, as_json: bool = False):
             "iv_rank": round(iv_rank, 1),
             "avg_iv": round(avg_iv, 4),
             "expirations": expirations[:5],
-            "atm_call_greeks": {
-                "strike": atm_call.get("strike"),
-                "delta": atm_call.get("delta"),
-                "gamma": atm_call.get("gamma"),
-                "theta": atm_call.get("theta"),
-                "vega": atm_call.get("vega"),
-                "iv": atm_call.get("implied_volatility"),
-            } if atm_call else None,
-            "atm_put_greeks": {
-                "strike": atm_put.get("strike"),
-                "delta": atm_put.get("delta"),
-                "gamma": atm_put.get("gamma"),
-                "theta": atm_put.get("theta"),
-                "vega": atm_put.get("vega"),
-                "iv": atm_put.get("implied_volatility"),
-            } if atm_put else None,
+            "atm_call_greeks": atm_call,
+            "atm_put_greeks": atm_put,
         }, indent=2))
         return
 
@@ -304,16 +817,38 @@ def analyze_options(symbol: str, api_key: str, as_json: bool = False):
 
     print("\n".join(lines))
 
-
-def analyze_symbol(symbol: str, api_key: str, as_json: bool = False):
-    """Run full technical analysis on a symbol."""
+def options_surface_report(symbol: str, api_key: str, max_expirations: int = 6, strike_window: float = 0.2):
+    """JSON options surface: per-expiry OI/volume profile, max pain, IV and Greeks by strike."""
     check_rate_limit()
+    options = fetch_options_chain(symbol, api_key)
+    if not options:
+        return
+    cols = parse_chain(options)
+    quote = get_quote(symbol, api_key)
+    price = quote.get("price", 0) if quote else 0
+    overall_pain, _ = max_pain(cols, chain_rows(cols))
+
+    print(json.dumps({
+        "symbol": symbol,
+        "timestamp": datetime.now(timezone.utc).strftime("%b %d, %Y %H:%M UTC"),
+        "price": price,
+        "contracts": len(cols["type"]),
+        "max_pain": overall_pain,
+        **oi_profile(cols, chain_rows(cols)),
+        "strike_window_pct": strike_window * 100,
+        "expirations": options_surface(cols, price, max_expirations, strike_window),
+    }, indent=2))
 
+
+def analyze_symbol(symbol: str, api_key: str, as_json: bool = False, refresh: bool = False):
+    """Run full technical analysis on a symbol."""
     now = datetime.now(timezone.utc)
     timestamp = now.strftime("%b %d, %Y %H:%M UTC")
 
-    # Get quote
-    quote = get_quote(symbol, api_key)
+    # Daily bars from the local store (at most one API call); quote and every
+    # indicator are derived from them locally
+    bars, source = load_bars(symbol, api_key, history="full", refresh=refresh)
+    quote = quote_from_bars(symbol, bars)
     if not quote:
         print(f"Error: Could not fetch data for {symbol}", file=sys.stderr)
         return
@@ -324,14 +859,7 @@ def analyze_symbol(symbol: str, api_key: str, as_json: bool = False):
     bb_time_period = 20
     # Alpha Vantage uses standard deviation of 2 by default; for crypto context we note the wider range
 
-    # Get indicators (each is a separate API call)
-    rsi_data = get_indicator(symbol, "RSI", api_key, time_period=14)
-    macd_data = get_indicator(symbol, "MACD", api_key)
-    bbands_data = get_indicator(symbol, "BBANDS", api_key, time_period=bb_time_period)
-    sma50_data = get_indicator(symbol, "SMA", api_key, time_period=50)
-    sma200_data = get_indicator(symbol, "SMA", api_key, time_period=200)
-    adx_data = get_indicator(symbol, "ADX", api_key, time_period=14)
-    stoch_data = get_indicator(symbol, "STOCH", api_key, time_period=14)
+    indicators = compute_indicators(bars, bb_period=bb_time_period)
 
     # Crypto: Fetch BTC dominance and DXY context
     btc_context = None
@@ -353,21 +881,21 @@ def analyze_symbol(symbol: str, api_key: str, as_json: bool = False):
             }
 
     # Extract latest values
-    rsi = rsi_data[0].get("rsi", 0) if rsi_data else None
-    sma50 = sma50_data[0].get("sma", 0) if sma50_data else None
-    sma200 = sma200_data[0].get("sma", 0) if sma200_data else None
-    adx = adx_data[0].get("adx", 0) if adx_data else None
+    rsi_val = indicators["rsi"]
+    sma50 = indicators["sma50"]
+    sma200 = indicators["sma200"]
+    adx_val = indicators["adx"]
 
-    macd_val = macd_data[0].get("macd", 0) if macd_data else None
-    macd_signal = macd_data[0].get("macd_signal", 0) if macd_data else None
-    macd_hist = macd_data[0].get("macd_hist", 0) if macd_data else None
+    macd_val = indicators["macd"]
+    macd_signal = indicators["macd_signal"]
+    macd_hist = indicators["macd_hist"]
 
-    bb_upper = bbands_data[0].get("real_upper_band", 0) if bbands_data else None
-    bb_middle = bbands_data[0].get("real_middle_band", 0) if bbands_data else None
-    bb_lower = bbands_data[0].get("real_lower_band", 0) if bbands_data else None
+    bb_upper = indicators["bb_upper"]
+    bb_middle = indicators["bb_middle"]
+    bb_lower = indicators["bb_lower"]
 
-    stoch_k = stoch_data[0].get("slowk", 0) if stoch_data else None
-    stoch_d = stoch_data[0].get("slowd", 0) if stoch_data else None
+    stoch_k = indicators["stoch_k"]
+    stoch_d = indicators["stoch_d"]
 
     price = quote["price"]
 
@@ -386,15 +914,15 @@ def analyze_symbol(symbol: str, api_key: str, as_json: bool = False):
             signals.append(("SMA 50/200", "BEARISH", f"Price below SMA50 ${sma50:.2f}"))
 
     # RSI
-    if rsi is not None:
-        if rsi > 70:
-            signals.append(("RSI", "BEARISH", f"RSI {rsi:.1f} — overbought"))
-        elif rsi < 30:
-            signals.append(("RSI", "BULLISH", f"RSI {rsi:.1f} — oversold"))
-        elif rsi > 50:
-            signals.append(("RSI", "BULLISH", f"RSI {rsi:.1f} — above midline"))
+    if rsi_val is not None:
+        if rsi_val > 70:
+            signals.append(("RSI", "BEARISH", f"RSI {rsi_val:.1f} — overbought"))
+        elif rsi_val < 30:
+            signals.append(("RSI", "BULLISH", f"RSI {rsi_val:.1f} — oversold"))
+        elif rsi_val > 50:
+            signals.append(("RSI", "BULLISH", f"RSI {rsi_val:.1f} — above midline"))
         else:
-            signals.append(("RSI", "BEARISH", f"RSI {rsi:.1f} — below midline"))
+            signals.append(("RSI", "BEARISH", f"RSI {rsi_val:.1f} — below midline"))
 
     # MACD
     if macd_val is not None and macd_signal is not None:
@@ -404,11 +932,11 @@ def analyze_symbol(symbol: str, api_key: str, as_json: bool = False):
             signals.append(("MACD", "BEARISH", f"MACD {macd_val:.4f} < Signal {macd_signal:.4f}"))
 
     # ADX
-    if adx is not None:
-        if adx > 25:
-            signals.append(("ADX", "TRENDING", f"ADX {adx:.1f} — strong trend"))
+    if adx_val is not None:
+        if adx_val > 25:
+            signals.append(("ADX", "TRENDING", f"ADX {adx_val:.1f} — strong trend"))
         else:
-            signals.append(("ADX", "RANGING", f"ADX {adx:.1f} — weak/no trend"))
+            signals.append(("ADX", "RANGING", f"ADX {adx_val:.1f} — weak/no trend"))
 
     # Stochastic
     if stoch_k is not None:
@@ -462,20 +990,9 @@ def analyze_symbol(symbol: str, api_key: str, as_json: bool = False):
             "trend": trend,
             "confidence": confidence,
             "signals": [{"indicator": i, "direction": d, "detail": det} for i, d, det in signals],
-            "indicators": {
-                "rsi": rsi,
-                "macd": macd_val,
-                "macd_signal": macd_signal,
-                "macd_hist": macd_hist,
-                "sma50": sma50,
-                "sma200": sma200,
-                "adx": adx,
-                "stoch_k": stoch_k,
-                "stoch_d": stoch_d,
-                "bb_upper": bb_upper,
-                "bb_middle": bb_middle,
-                "bb_lower": bb_lower,
-            },
+            "indicators": indicators,
+            "data": {"bars": len(bars), "first_date": bars[0]["date"], "last_date": bars[-1]["date"],
+                     "source": source},
             "levels": {
                 "support": [s for s in [sma50, bb_lower] if s],
                 "resistance": [r for r in [sma200, bb_upper] if r],
@@ -526,7 +1043,7 @@ def analyze_symbol(symbol: str, api_key: str, as_json: bool = False):
     print("\n".join(lines))
 
 
-def chart_symbol(symbol: str, api_key: str, output: str):
+def chart_symbol(symbol: str, api_key: str, output: str, refresh: bool = False):
     """Generate a simple price chart with indicators."""
     try:
         import matplotlib
@@ -537,49 +1054,29 @@ def chart_symbol(symbol: str, api_key: str, output: str):
         print("Error: matplotlib not available. Install with: pip3 install matplotlib", file=sys.stderr)
         sys.exit(1)
 
-    check_rate_limit()
-
     # Get daily prices
-    data = api_call({
-        "function": "TIME_SERIES_DAILY",
-        "symbol": symbol,
-        "outputsize": "compact",
-    }, api_key)
-
-    ts_key = "Time Series (Daily)"
-    if ts_key not in data:
+    bars, _ = load_bars(symbol, api_key, history="compact", refresh=refresh)
+    if not bars:
         print(f"Error: No daily data for {symbol}", file=sys.stderr)
         return
 
-    dates = []
-    closes = []
-    for date_str in sorted(data[ts_key].keys()):
-        dates.append(datetime.strptime(date_str, "%Y-%m-%d"))
-        closes.append(float(data[ts_key][date_str]["4. close"]))
-
-    # Get SMA 50
-    sma50_data = get_indicator(symbol, "SMA", api_key, time_period=50)
-    sma50_dates = []
-    sma50_vals = []
-    for entry in reversed(sma50_data):
-        try:
-            sma50_dates.append(datetime.strptime(entry["date"], "%Y-%m-%d"))
-            sma50_vals.append(entry["sma"])
-        except (KeyError, ValueError):
-            pass
+    # Indicators use all stored history so SMA 50 is defined from the first plotted bar
+    closes_all = [b["close"] for b in bars]
+    sma50_series = sma(closes_all, 50)[-COMPACT_BARS:]
+    upper_series, _, lower_series = bbands(closes_all, 20)
+    upper_series, lower_series = upper_series[-COMPACT_BARS:], lower_series[-COMPACT_BARS:]
+    bars = bars[-COMPACT_BARS:]
 
-    # Get Bollinger Bands
-    bb_data = get_indicator(symbol, "BBANDS", api_key, time_period=20)
-    bb_dates = []
-    bb_upper = []
-    bb_lower = []
-    for entry in reversed(bb_data):
-        try:
-            bb_dates.append(datetime.strptime(entry["date"], "%Y-%m-%d"))
-            bb_upper.append(entry["real_upper_band"])
-            bb_lower.append(entry["real_lower_band"])
-        except (KeyError, ValueError):
-            pass
+    dates = [datetime.strptime(b["date"], "%Y-%m-%d") for b in bars]
+    closes = [b["close"] for b in bars]
+
+    # SMA 50 and Bollinger Bands computed from the same series (no extra API calls)
+    sma50_dates = [d for d, v in zip(dates, sma50_series) if v is not None]
+    sma50_vals = [v for v in sma50_series if v is not None]
+
+    bb_dates = [d for d, v in zip(dates, upper_series) if v is not None]
+    bb_upper = [v for v in upper_series if v is not None]
+    bb_lower = [v for v in lower_series if v is not None]
 
     fig, ax = plt.subplots(figsize=(12, 6))
     ax.plot(dates, closes, label=f"{symbol} Close", color="white", linewidth=1.5)
@@ -609,56 +1106,161 @@ def chart_symbol(symbol: str, api_key: str, output: str):
     print(f"Chart saved to {output}")
 
 
-def watchlist_scan(symbols: list, api_key: str, as_json: bool = False):
-    """Quick scan of multiple symbols."""
-    check_rate_limit()
+# ---------------------------------------------------------------------------
+# Watchlist scanner
+# ---------------------------------------------------------------------------
+# The scan is planned before any request goes out: symbols whose bars are
+# already stored for today cost nothing, the rest cost one call each. Only as
+# many fetches as the remaining daily budget allows are made; symbols beyond
+# that are served from their last stored bars (marked stale). Fetches run on a
+# small thread pool behind a token bucket sized to Alpha Vantage's per-minute
+# cap, and each row is printed as soon as it is ready. (REALTIME_BULK_QUOTES
+# would batch quotes, but it is premium-only and carries no history for RSI.)
+
+AV_REQUESTS_PER_MINUTE = 5  # free-tier cap; override with ALPHAVANTAGE_RPM in ~/.openclaw/.env
+SCAN_WORKERS = 4
+BUDGET_EXHAUSTED = "budget_exhausted"  # watchlist row status when the budget ran out mid-scan
+
+
+def requests_per_minute() -> int:
+    value = os.environ.get("ALPHAVANTAGE_RPM", "")
+    if not value and ENV_FILE.exists():
+        try:
+            for line in ENV_FILE.read_text().splitlines():
+                if line.startswith("ALPHAVANTAGE_RPM="):
+                    value = line.split("=", 1)[1].strip().strip('"').strip("'")
+                    break
+        except IOError:
+            pass
+    try:
+        return max(1, int(value))
+    except ValueError:
+        return AV_REQUESTS_PER_MINUTE
+
 
-    results = []
+def plan_watchlist(symbols: list, refresh: bool = False) -> dict:
+    """Split symbols into cached / fetch / over-budget before spending anything."""
+    cached, to_fetch = [], []
     for sym in symbols:
-        quote = get_quote(sym.strip(), api_key)
-        if not quote:
-            results.append({"symbol": sym, "error": "No data"})
-            continue
+        (cached if not refresh and store_is_fresh(sym) else to_fetch).append(sym)
+    remaining = max(0, DAILY_BUDGET - get_daily_count())
+    return {"cached": cached, "fetch": to_fetch[:remaining], "over_budget": to_fetch[remaining:],
+            "budget_remaining": remaining}
 
-        # Get RSI (one API call per symbol)
-        rsi_data = get_indicator(sym.strip(), "RSI", api_key, time_period=14)
-        rsi = rsi_data[0].get("rsi", None) if rsi_data else None
-
-        entry = {
-            "symbol": quote["symbol"],
-            "price": quote["price"],
-            "change_pct": quote["change_pct"],
-            "volume": quote["volume"],
-            "rsi": rsi,
-        }
-
-        # Quick signal
-        if rsi is not None:
-            if rsi > 70:
-                entry["signal"] = "OVERBOUGHT"
-            elif rsi < 30:
-                entry["signal"] = "OVERSOLD"
-            else:
-                entry["signal"] = "NEUTRAL"
 
-        results.append(entry)
+def watchlist_entry(symbol: str, bars: list, source: str, stale: bool = False) -> dict:
+    quote = quote_from_bars(symbol, bars)
+    if not quote:
+        return {"symbol": symbol, "error": "No data"}
+
+    rsi_val = _latest(rsi([b["close"] for b in bars], 14))
+
+    entry = {
+        "symbol": quote["symbol"],
+        "price": quote["price"],
+        "change_pct": quote["change_pct"],
+        "volume": quote["volume"],
+        "rsi": rsi_val,
+        "as_of": quote["timestamp"],
+        "source": source,
+    }
+    if stale:
+        entry["stale"] = True
+
+    # Quick signal
+    if rsi_val is not None:
+        if rsi_val > 70:
+            entry["signal"] = "OVERBOUGHT"
+        elif rsi_val < 30:
+            entry["signal"] = "OVERSOLD"
+        else:
+            entry["signal"] = "NEUTRAL"
+    return entry
+
+
+def _watchlist_line(r: dict) -> str:
+    if "error" in r:
+        return f"  {r['symbol']}: ERROR — {r['error']}"
+    rsi_str = f"RSI {r['rsi']:.0f}" if r.get("rsi") else "RSI N/A"
+    signal = r.get("signal", "")
+    icon = "!" if signal in ("OVERBOUGHT", "OVERSOLD") else " "
+    stale = f" (stale: as of {r['as_of']}, budget)" if r.get("stale") else ""
+    return f" {icon} {r['symbol']}: ${r['price']:.2f} ({r['change_pct']}) | {rsi_str} {signal}{stale}"
+
+
+def watchlist_scan(symbols: list, api_key: str, as_json: bool = False, refresh: bool = False,
+                   stream: bool = False):
+    """Budget-planned, concurrent scan of multiple symbols; rows stream as they complete."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    symbols = list(dict.fromkeys(s.strip() for s in symbols if s.strip()))
+    plan = plan_watchlist(symbols, refresh)
+    print(f"Plan: {len(plan['cached'])} cached, {len(plan['fetch'])} to fetch "
+          f"({plan['budget_remaining']} API calls left today)"
+          + (f", {len(plan['over_budget'])} over budget — serving stored data" if plan["over_budget"] else ""),
+          file=sys.stderr)
+
+    text = not as_json
+    if text:
+        timestamp = datetime.now(timezone.utc).strftime("%b %d, %Y %H:%M UTC")
+        print(f"Watchlist Scan — {timestamp}")
+        print()
+
+    results = {}
+
+    def emit(sym, entry):
+        results[sym] = entry
+        if text:
+            print(_watchlist_line(entry), flush=True)
+        elif stream:
+            print(json.dumps(entry), flush=True)
+
+    for sym in plan["cached"]:
+        emit(sym, watchlist_entry(sym, *load_bars(sym, api_key, history="compact", offline=True)))
+    for sym in plan["over_budget"]:
+        emit(sym, watchlist_entry(sym, *load_bars(sym, api_key, history="compact", offline=True), stale=True))
+
+    if plan["fetch"]:
+        rpm = requests_per_minute()
+        bucket = TokenBucket(rpm, capacity=max(1, rpm // 12))
+
+        def fetch(sym):
+            # Another process can spend the budget while this scan waits for a
+            # token; check it between tries so a worker never blocks on (or
+            # exits over) a budget that is already gone.
+            while not bucket.try_acquire():
+                if get_daily_count() >= DAILY_BUDGET:
+                    break
+                time.sleep(0.1)
+            try:
+                bars, source = load_bars(sym, api_key, history="compact", refresh=refresh)
+            except BudgetExhausted:
+                return {"symbol": sym, "error": "Daily API budget exhausted", "status": BUDGET_EXHAUSTED}
+            entry = watchlist_entry(sym, bars, source, stale=source == "stale")
+            if source == "stale":
+                entry["status"] = BUDGET_EXHAUSTED
+            return entry
+
+        with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(plan["fetch"]))) as pool:
+            futures = {pool.submit(fetch, sym): sym for sym in plan["fetch"]}
+            for future in as_completed(futures):
+                sym = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    entry = {"symbol": sym, "error": str(e)[:100]}
+                emit(sym, entry)
+
+        exhausted = [s for s in plan["fetch"] if results[s].get("status") == BUDGET_EXHAUSTED]
+        if exhausted:
+            print(f"Budget exhausted mid-scan: {len(exhausted)} of {len(plan['fetch'])} fetches not made "
+                  f"({', '.join(exhausted)}) — served stored data where available", file=sys.stderr)
 
     if as_json:
-        print(json.dumps(results, indent=2))
+        if not stream:
+            print(json.dumps([results[s] for s in symbols], indent=2))
         return
 
-    timestamp = datetime.now(timezone.utc).strftime("%b %d, %Y %H:%M UTC")
-    print(f"Watchlist Scan — {timestamp}")
-    print()
-    for r in results:
-        if "error" in r:
-            print(f"  {r['symbol']}: ERROR — {r['error']}")
-            continue
-        rsi_str = f"RSI {r['rsi']:.0f}" if r.get("rsi") else "RSI N/A"
-        signal = r.get("signal", "")
-        icon = "!" if signal in ("OVERBOUGHT", "OVERSOLD") else " "
-        print(f" {icon} {r['symbol']}: ${r['price']:.2f} ({r['change_pct']}) | {rsi_str} {signal}")
-
     print()
     print("This is data analysis, not financial advice.")
 
@@ -668,7 +1270,7 @@ def rate_status():
     count = get_daily_count()
     remaining = DAILY_BUDGET - count
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    status = "WARNING — approaching limit" if count >= 400 else "BUDGET EXHAUSTED" if count >= DAILY_BUDGET else "OK"
+    status = "BUDGET EXHAUSTED" if count >= DAILY_BUDGET else "WARNING — approaching limit" if count >= BUDGET.warn_at else "OK"
 
     print(f"Alpha Vantage API Usage")
     print(f"  Date:      {today}")
@@ -685,21 +1287,33 @@ def main():
     p_analyze = subparsers.add_parser("analyze")
     p_analyze.add_argument("--symbol", required=True)
     p_analyze.add_argument("--json", action="store_true")
+    p_analyze.add_argument("--refresh", action="store_true", help="Top up stored bars even if already fetched since the last close")
 
     # options
     p_options = subparsers.add_parser("options")
     p_options.add_argument("--symbol", required=True)
     p_options.add_argument("--json", action="store_true")
 
+    # options-surface
+    p_surface = subparsers.add_parser("options-surface")
+    p_surface.add_argument("--symbol", required=True)
+    p_surface.add_argument("--expirations", type=int, default=6, help="Nearest N expirations (default 6)")
+    p_surface.add_argument("--strike-window", type=float, default=20,
+                           help="Only strikes within this %% of the price (default 20)")
+    p_surface.add_argument("--json", action="store_true", help="Accepted for consistency; output is always JSON")
+
     # chart
     p_chart = subparsers.add_parser("chart")
     p_chart.add_argument("--symbol", required=True)
     p_chart.add_argument("--output", default="/tmp/chart.png")
+    p_chart.add_argument("--refresh", action="store_true", help="Top up stored bars even if already fetched since the last close")
 
     # watchlist
     p_watch = subparsers.add_parser("watchlist")
     p_watch.add_argument("--symbols", required=True, help="Comma-separated symbols")
     p_watch.add_argument("--json", action="store_true")
+    p_watch.add_argument("--stream", action="store_true", help="With --json: one JSON object per line as each symbol completes")
+    p_watch.add_argument("--refresh", action="store_true", help="Top up stored bars even if already fetched since the last close")
 
     # rate-status
     subparsers.add_parser("rate-status")
@@ -715,17 +1329,23 @@ def main():
         print("Error: ALPHAVANTAGE_API_KEY not set", file=sys.stderr)
         sys.exit(1)
 
-    if args.command == "analyze":
-        analyze_symbol(args.symbol, api_key, as_json=getattr(args, "json", False))
-    elif args.command == "options":
-        analyze_options(args.symbol, api_key, as_json=getattr(args, "json", False))
-    elif args.command == "chart":
-        chart_symbol(args.symbol, api_key, args.output)
-    elif args.command == "watchlist":
-        symbols = [s.strip() for s in args.symbols.split(",")]
-        watchlist_scan(symbols, api_key, as_json=args.json)
-    elif args.command == "rate-status":
-        rate_status()
+    try:
+        if args.command == "analyze":
+            analyze_symbol(args.symbol, api_key, as_json=getattr(args, "json", False), refresh=args.refresh)
+        elif args.command == "options":
+            analyze_options(args.symbol, api_key, as_json=getattr(args, "json", False))
+        elif args.command == "options-surface":
+            options_surface_report(args.symbol, api_key, args.expirations, args.strike_window / 100)
+        elif args.command == "chart":
+            chart_symbol(args.symbol, api_key, args.output, refresh=args.refresh)
+        elif args.command == "watchlist":
+            symbols = [s.strip() for s in args.symbols.split(",")]
+            watchlist_scan(symbols, api_key, as_json=args.json, refresh=args.refresh, stream=args.stream)
+        elif args.command == "rate-status":
+            rate_status()
+    except BudgetExhausted as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(2)
 
 
 if __name__ == "__main__":
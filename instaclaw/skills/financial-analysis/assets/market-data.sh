@@ -40,7 +40,7 @@ fi
 
 BASE_URL="https://www.alphavantage.co/query"
 CACHE_DIR="$HOME/.openclaw/cache/alphavantage"
-RATE_FILE="$HOME/.openclaw/cache/alphavantage/.rate-log"
+RATE_BUDGET="$HOME/scripts/rate_budget.py"
 DAILY_BUDGET=500
 
 mkdir -p "$CACHE_DIR"
@@ -66,20 +66,13 @@ while [[ $# -gt 0 ]]; do
 done
 
 # Rate limiting
+# Per-day counters shared with the Python engine (~/scripts/rate_budget.py)
 log_request() {
-  local today
-  today=$(date -u +%Y-%m-%d)
-  echo "$today $(date -u +%H:%M:%S)" >> "$RATE_FILE"
+  python3 "$RATE_BUDGET" record "$CACHE_DIR" >/dev/null
 }
 
 get_daily_count() {
-  local today
-  today=$(date -u +%Y-%m-%d)
-  if [ -f "$RATE_FILE" ]; then
-    grep -c "^$today" "$RATE_FILE" 2>/dev/null || echo "0"
-  else
-    echo "0"
-  fi
+  python3 "$RATE_BUDGET" count "$CACHE_DIR" 2>/dev/null || echo "0"
 }
 
 check_rate_limit() {
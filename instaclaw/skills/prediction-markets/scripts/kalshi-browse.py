@@ -3,10 +3,17 @@
 kalshi-browse.py — Browse and search Kalshi markets.
 
 Usage:
-  python3 ~/scripts/kalshi-browse.py search --query "bitcoin" [--limit 20] [--json]
-  python3 ~/scripts/kalshi-browse.py trending [--limit 10] [--json]
+  python3 ~/scripts/kalshi-browse.py search --query "bitcoin" [--limit 20] [--category C] [--series S] [--event E] [--live] [--json]
+  python3 ~/scripts/kalshi-browse.py trending [--limit 10] [--sort volume_24h|volume|open_interest|closing] [--category C] [--live] [--json]
   python3 ~/scripts/kalshi-browse.py detail --ticker KXBTC-26MAR14-B90000 [--json]
-  python3 ~/scripts/kalshi-browse.py categories [--json]
+  python3 ~/scripts/kalshi-browse.py categories [--live] [--json]
+  python3 ~/scripts/kalshi-browse.py sync [--quiet] [--json]
+
+search/trending/categories are answered from the local market index
+(~/.openclaw/prediction-markets/kalshi-catalogue.db, SQLite FTS5) when it has
+been synced within CATALOGUE_MAX_AGE; otherwise from a single live page (and a
+background sync is started). Keep it warm from cron:
+  */10 * * * * python3 ~/scripts/kalshi-browse.py sync --quiet
 
 Exit codes:
   0 = success (OK)
@@ -14,8 +21,15 @@ Exit codes:
 """
 
 import argparse
+import fcntl
 import json
+import os
+import re
+import sqlite3
+import subprocess
 import sys
+import time
+import urllib.parse
 from pathlib import Path
 
 # ---------------------------------------------------------------------------
@@ -24,6 +38,12 @@ from pathlib import Path
 
 PREDICTION_DIR = Path.home() / ".openclaw" / "prediction-markets"
 CREDS_FILE = PREDICTION_DIR / "kalshi-creds.json"
+CATALOGUE_DB = PREDICTION_DIR / "kalshi-catalogue.db"
+CATALOGUE_LOCK = PREDICTION_DIR / "kalshi-catalogue.lock"
+CATALOGUE_MAX_AGE = 900  # Serve queries locally if synced within 15 min
+SYNC_PAGE_SIZE = 200  # Kalshi max for /events with nested markets
+SYNC_MAX_PAGES = 200
+SYNC_RATE_LIMIT_RETRIES = 3
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -39,47 +59,18 @@ def load_json(path, default=None):
         return default
 
 
-def _sign_request(api_key_id, private_key_pem, method, path):
-    import base64, time
-    from cryptography.hazmat.primitives import hashes, serialization
-    from cryptography.hazmat.primitives.asymmetric import padding
-
-    timestamp = str(int(time.time() * 1000))
-    message = (timestamp + method.upper() + path).encode("utf-8")
-    private_key = serialization.load_pem_private_key(
-        private_key_pem.encode("utf-8") if isinstance(private_key_pem, str) else private_key_pem,
-        password=None,
-    )
-    signature = private_key.sign(
-        message,
-        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
-        hashes.SHA256(),
-    )
-    return {
-        "KALSHI-ACCESS-KEY": api_key_id,
-        "KALSHI-ACCESS-TIMESTAMP": timestamp,
-        "KALSHI-ACCESS-SIGNATURE": base64.b64encode(signature).decode("utf-8"),
-    }
-
-
-def kalshi_request(creds, method, endpoint):
-    import urllib.request, urllib.error
-    base = "https://trading-api.kalshi.com/trade-api/v2"
-    path = f"/trade-api/v2{endpoint.split('?')[0]}"
-    url = f"{base}{endpoint}"
+def _load_kalshi_client():
+    """Load the shared signed client (kalshi-client.py, deployed alongside this script)."""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(
+        "kalshi_client", Path(__file__).resolve().parent / "kalshi-client.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
-    headers = _sign_request(creds["api_key_id"], creds["private_key_pem"], method, path)
-    headers["Accept"] = "application/json"
 
-    req = urllib.request.Request(url, headers=headers, method=method)
-    try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            return json.loads(resp.read().decode()), None
-    except urllib.error.HTTPError as e:
-        body_text = e.read().decode() if e.fp else ""
-        return None, f"HTTP {e.code}: {body_text[:300]}"
-    except Exception as e:
-        return None, str(e)
+_kalshi = _load_kalshi_client()
+kalshi_request = _kalshi.kalshi_request  # (creds, method, endpoint, body=None) -> (data, error)
 
 
 def load_creds():
@@ -96,6 +87,251 @@ def output(msg, json_mode=False, data=None):
         print(msg)
 
 
+# ---------------------------------------------------------------------------
+# Market index
+# ---------------------------------------------------------------------------
+
+CATALOGUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS markets (
+    ticker TEXT PRIMARY KEY,
+    event_ticker TEXT,
+    series_ticker TEXT,
+    category TEXT,
+    title TEXT,
+    open INTEGER NOT NULL DEFAULT 1,
+    volume REAL,
+    volume_24h REAL,
+    open_interest REAL,
+    close_time TEXT,
+    synced_at REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS markets_event ON markets(event_ticker);
+CREATE INDEX IF NOT EXISTS markets_series ON markets(series_ticker);
+CREATE INDEX IF NOT EXISTS markets_category ON markets(open, category);
+CREATE INDEX IF NOT EXISTS markets_volume ON markets(open, volume);
+CREATE INDEX IF NOT EXISTS markets_volume_24h ON markets(open, volume_24h);
+CREATE INDEX IF NOT EXISTS markets_open_interest ON markets(open, open_interest);
+CREATE INDEX IF NOT EXISTS markets_close_time ON markets(open, close_time);
+CREATE VIRTUAL TABLE IF NOT EXISTS markets_fts USING fts5(
+    title, subtitle, event_title, ticker,
+    tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# bm25 column weights for markets_fts: title, subtitle, event_title, ticker
+FTS_WEIGHTS = (10.0, 4.0, 3.0, 2.0)
+
+TRENDING_SORTS = {
+    # sort name -> catalogue ORDER BY
+    "volume_24h": "volume_24h DESC",
+    "volume": "volume DESC",
+    "open_interest": "open_interest DESC",
+    "closing": "close_time ASC",
+}
+
+
+def _open_db():
+    """Open kalshi-catalogue.db (market index + FTS5 title index)."""
+    PREDICTION_DIR.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(CATALOGUE_DB), timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(CATALOGUE_SCHEMA)
+    return conn
+
+
+def _meta_get(conn, key):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _meta_set(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+def _num(val):
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _upsert_markets(conn, markets, synced_at, event=None):
+    """Insert or refresh Kalshi market objects. Rows whose payload is unchanged only get
+    their synced_at bumped, so a routine sync rewrites just the markets that moved."""
+    event = event or {}
+    changed = 0
+    for m in markets:
+        ticker = m.get("ticker")
+        if not ticker:
+            continue
+        m = dict(m)
+        m.setdefault("event_ticker", event.get("event_ticker", ""))
+        m.setdefault("category", event.get("category", ""))
+        series = m.get("series_ticker") or event.get("series_ticker", "")
+        is_open = 1 if m.get("status", "open") in ("open", "active") else 0
+        data = json.dumps(m, sort_keys=True)
+        row = conn.execute("SELECT rowid, data, open FROM markets WHERE ticker = ?", (ticker,)).fetchone()
+        if row and row[1] == data and row[2] == is_open:
+            conn.execute("UPDATE markets SET synced_at = ? WHERE rowid = ?", (synced_at, row[0]))
+            continue
+        # Live /markets payloads carry no event context, so keep what the last sync recorded
+        conn.execute(
+            "INSERT INTO markets (ticker, event_ticker, series_ticker, category, title, open, volume, volume_24h, "
+            "open_interest, close_time, synced_at, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(ticker) DO UPDATE SET event_ticker = excluded.event_ticker, "
+            "series_ticker = COALESCE(NULLIF(excluded.series_ticker, ''), markets.series_ticker), "
+            "category = CASE WHEN excluded.category = 'uncategorized' THEN markets.category "
+            "ELSE excluded.category END, title = excluded.title, "
+            "open = excluded.open, volume = excluded.volume, volume_24h = excluded.volume_24h, "
+            "open_interest = excluded.open_interest, close_time = excluded.close_time, "
+            "synced_at = excluded.synced_at, data = excluded.data",
+            (
+                ticker,
+                m.get("event_ticker", ""),
+                series,
+                m.get("category", "") or "uncategorized",
+                m.get("title", ""),
+                is_open,
+                _num(m.get("volume")),
+                _num(m.get("volume_24h")),
+                _num(m.get("open_interest")),
+                m.get("close_time", m.get("expiration_time", "")) or "",
+                synced_at,
+                data,
+            ),
+        )
+        rowid = conn.execute("SELECT rowid FROM markets WHERE ticker = ?", (ticker,)).fetchone()[0]
+        event_title = event.get("title")
+        if event_title is None:
+            prev = conn.execute("SELECT event_title FROM markets_fts WHERE rowid = ?", (rowid,)).fetchone()
+            event_title = prev[0] if prev else ""
+        conn.execute("DELETE FROM markets_fts WHERE rowid = ?", (rowid,))
+        conn.execute(
+            "INSERT INTO markets_fts (rowid, title, subtitle, event_title, ticker) VALUES (?, ?, ?, ?, ?)",
+            (rowid, m.get("title", ""), m.get("subtitle", m.get("yes_sub_title", "")) or "",
+             event_title, ticker),
+        )
+        changed += 1
+    return changed
+
+
+def _catalogue_fresh(conn):
+    last_sync = _meta_get(conn, "last_sync")
+    return bool(last_sync) and time.time() - float(last_sync) < CATALOGUE_MAX_AGE
+
+
+def _spawn_background_sync():
+    """Start a detached sync so the next query can be served locally."""
+    try:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "sync", "--quiet"],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        pass
+
+
+def _open_fresh_catalogue(args):
+    """Return an open index connection if it can serve this query, else None.
+
+    A stale index triggers a background sync; the caller falls back to the live API.
+    """
+    if getattr(args, "live", False):
+        return None
+    try:
+        conn = _open_db()
+    except sqlite3.Error:
+        return None
+    if _catalogue_fresh(conn):
+        return conn
+    conn.close()
+    _spawn_background_sync()
+    return None
+
+
+def _filters(args):
+    """WHERE fragments + params for --category / --series / --event."""
+    clauses, params = [], []
+    for col, attr in (("category", "category"), ("series_ticker", "series"), ("event_ticker", "event")):
+        val = getattr(args, attr, None)
+        if val:
+            clauses.append(f"m.{col} = ? COLLATE NOCASE")
+            params.append(val)
+    return clauses, params
+
+
+def catalogue_search(conn, args):
+    """Ranked title search over open markets: bm25 relevance, then 24h volume."""
+    terms = re.findall(r"\w+", args.query.lower())
+    if not terms:
+        return []
+    clauses, params = _filters(args)
+    where = "".join(f" AND {c}" for c in clauses)
+    rows = conn.execute(
+        f"SELECT m.data FROM markets_fts JOIN markets m ON m.rowid = markets_fts.rowid "
+        f"WHERE markets_fts MATCH ? AND m.open = 1{where} "
+        f"ORDER BY bm25(markets_fts, {', '.join(str(w) for w in FTS_WEIGHTS)}), m.volume_24h DESC LIMIT ?",
+        [" OR ".join(f'"{t}"*' for t in terms)] + params + [args.limit],
+    ).fetchall()
+    return [json.loads(r[0]) for r in rows]
+
+
+def catalogue_trending(conn, args):
+    clauses, params = _filters(args)
+    where = "".join(f" AND {c}" for c in clauses)
+    order = TRENDING_SORTS[getattr(args, "sort", "volume")]
+    rows = conn.execute(
+        f"SELECT m.data FROM markets m WHERE m.open = 1{where} ORDER BY m.{order} LIMIT ?",
+        params + [args.limit],
+    ).fetchall()
+    return [json.loads(r[0]) for r in rows]
+
+
+def catalogue_categories(conn):
+    rows = conn.execute(
+        "SELECT category, COUNT(DISTINCT event_ticker) FROM markets WHERE open = 1 "
+        "GROUP BY category ORDER BY 2 DESC"
+    ).fetchall()
+    total = conn.execute("SELECT COUNT(DISTINCT event_ticker) FROM markets WHERE open = 1").fetchone()[0]
+    return dict(rows), total
+
+
+def _remember_markets(markets):
+    """Opportunistically add markets fetched live to the index."""
+    if not markets:
+        return
+    try:
+        conn = _open_db()
+        try:
+            with conn:
+                _upsert_markets(conn, markets, time.time())
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass
+
+
+def _as_of(ts):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(float(ts))) if ts else None
+
+
+def _live_markets_endpoint(args, limit=200):
+    """Single-page /markets query with whatever filters Kalshi can apply server-side."""
+    params = {"status": "open", "limit": limit}
+    if getattr(args, "series", None):
+        params["series_ticker"] = args.series
+    if getattr(args, "event", None):
+        params["event_ticker"] = args.event
+    return f"/markets?{urllib.parse.urlencode(params)}"
+
+
 # ---------------------------------------------------------------------------
 # search subcommand
 # ---------------------------------------------------------------------------
@@ -107,24 +343,38 @@ def cmd_search(args):
                {"status": "FAIL", "error": "not_configured"})
         return 1
 
-    resp, err = kalshi_request(creds, "GET", f"/markets?status=open&limit=200")
-    if err:
-        output(f"FAIL — {err}", args.json, {"status": "FAIL", "error": err})
-        return 1
-
-    markets = resp.get("markets", [])
-    query_lower = args.query.lower()
-    keywords = query_lower.split()
-    matches = [m for m in markets if any(kw in m.get("title", "").lower() for kw in keywords)]
-    matches = matches[:args.limit]
+    as_of = None
+    conn = _open_fresh_catalogue(args)
+    if conn:
+        try:
+            matches = catalogue_search(conn, args)
+            as_of = _as_of(_meta_get(conn, "last_sync"))
+        finally:
+            conn.close()
+    else:
+        resp, err = kalshi_request(creds, "GET", _live_markets_endpoint(args))
+        if err:
+            output(f"FAIL — {err}", args.json, {"status": "FAIL", "error": err})
+            return 1
+
+        markets = resp.get("markets", [])
+        _remember_markets(markets)
+        query_lower = args.query.lower()
+        keywords = query_lower.split()
+        matches = [m for m in markets if any(kw in m.get("title", "").lower() for kw in keywords)]
+        if getattr(args, "category", None):
+            matches = [m for m in matches if (m.get("category") or "").lower() == args.category.lower()]
+        matches = matches[:args.limit]
 
     if args.json:
-        print(json.dumps({"status": "OK", "query": args.query, "markets": matches, "count": len(matches)}, indent=2))
+        print(json.dumps({"status": "OK", "query": args.query, "markets": matches, "count": len(matches),
+                          "source": "catalogue" if as_of else "live", "as_of": as_of}, indent=2))
     else:
         if not matches:
             print(f"OK — No markets found matching '{args.query}'")
             return 0
-        print(f"=== Kalshi Markets: '{args.query}' ({len(matches)} results) ===\n")
+        source = f" [local index as of {as_of}]" if as_of else ""
+        print(f"=== Kalshi Markets: '{args.query}' ({len(matches)} results){source} ===\n")
         for m in matches:
             ticker = m.get("ticker", "?")
             title = m.get("title", "?")
@@ -148,23 +398,37 @@ def cmd_trending(args):
         output("FAIL — Kalshi not configured", args.json, {"status": "FAIL", "error": "not_configured"})
         return 1
 
-    resp, err = kalshi_request(creds, "GET", f"/markets?status=open&limit=200")
-    if err:
-        output(f"FAIL — {err}", args.json, {"status": "FAIL", "error": err})
-        return 1
-
-    markets = resp.get("markets", [])
-    # Sort by volume descending
-    markets.sort(key=lambda m: m.get("volume", 0), reverse=True)
-    top = markets[:args.limit]
+    as_of = None
+    conn = _open_fresh_catalogue(args)
+    if conn:
+        try:
+            top = catalogue_trending(conn, args)
+            as_of = _as_of(_meta_get(conn, "last_sync"))
+        finally:
+            conn.close()
+    else:
+        resp, err = kalshi_request(creds, "GET", _live_markets_endpoint(args))
+        if err:
+            output(f"FAIL — {err}", args.json, {"status": "FAIL", "error": err})
+            return 1
+
+        markets = resp.get("markets", [])
+        _remember_markets(markets)
+        if getattr(args, "category", None):
+            markets = [m for m in markets if (m.get("category") or "").lower() == args.category.lower()]
+        # Sort by volume descending
+        markets.sort(key=lambda m: m.get("volume", 0), reverse=True)
+        top = markets[:args.limit]
 
     if args.json:
-        print(json.dumps({"status": "OK", "markets": top, "count": len(top)}, indent=2))
+        print(json.dumps({"status": "OK", "markets": top, "count": len(top),
+                          "source": "catalogue" if as_of else "live", "as_of": as_of}, indent=2))
     else:
         if not top:
             print("OK — No open markets found")
             return 0
-        print(f"=== Kalshi Trending Markets (Top {len(top)}) ===\n")
+        source = f" [local index as of {as_of}]" if as_of else ""
+        print(f"=== Kalshi Trending Markets (Top {len(top)}){source} ===\n")
         for i, m in enumerate(top, 1):
             ticker = m.get("ticker", "?")
             title = m.get("title", "?")
@@ -187,12 +451,13 @@ def cmd_detail(args):
         output("FAIL — Kalshi not configured", args.json, {"status": "FAIL", "error": "not_configured"})
         return 1
 
-    resp, err = kalshi_request(creds, "GET", f"/markets/{args.ticker}")
+    resp, err = kalshi_request(creds, "GET", f"/markets/{urllib.parse.quote(args.ticker, safe='')}")
     if err:
         output(f"FAIL — {err}", args.json, {"status": "FAIL", "error": err})
         return 1
 
     market = resp.get("market", resp)
+    _remember_markets([market])
 
     if args.json:
         print(json.dumps({"status": "OK", "market": market}, indent=2))
@@ -240,28 +505,134 @@ def cmd_categories(args):
         output("FAIL — Kalshi not configured", args.json, {"status": "FAIL", "error": "not_configured"})
         return 1
 
-    resp, err = kalshi_request(creds, "GET", "/events?status=open&limit=200")
-    if err:
-        output(f"FAIL — {err}", args.json, {"status": "FAIL", "error": err})
-        return 1
+    conn = _open_fresh_catalogue(args)
+    if conn:
+        try:
+            cats, total_events = catalogue_categories(conn)
+        finally:
+            conn.close()
+        sorted_cats = list(cats.items())
+    else:
+        resp, err = kalshi_request(creds, "GET", "/events?status=open&limit=200")
+        if err:
+            output(f"FAIL — {err}", args.json, {"status": "FAIL", "error": err})
+            return 1
 
-    events = resp.get("events", [])
-    cats = {}
-    for e in events:
-        cat = e.get("category", "uncategorized")
-        cats[cat] = cats.get(cat, 0) + 1
+        events = resp.get("events", [])
+        cats = {}
+        for e in events:
+            cat = e.get("category", "uncategorized")
+            cats[cat] = cats.get(cat, 0) + 1
 
-    sorted_cats = sorted(cats.items(), key=lambda x: x[1], reverse=True)
+        sorted_cats = sorted(cats.items(), key=lambda x: x[1], reverse=True)
+        total_events = len(events)
 
     if args.json:
-        print(json.dumps({"status": "OK", "categories": dict(sorted_cats), "total_events": len(events)}, indent=2))
+        print(json.dumps({"status": "OK", "categories": dict(sorted_cats), "total_events": total_events}, indent=2))
     else:
-        print(f"=== Kalshi Event Categories ({len(events)} open events) ===\n")
+        print(f"=== Kalshi Event Categories ({total_events} open events) ===\n")
         for cat, count in sorted_cats:
             print(f"  {cat}: {count} events")
     return 0
 
 
+# ---------------------------------------------------------------------------
+# sync subcommand
+# ---------------------------------------------------------------------------
+
+def sync_catalogue(creds):
+    """Walk /events (with nested markets) by cursor and refresh the local index.
+
+    Every sync re-walks the open events — Kalshi has no updated-since filter that
+    covers price/volume changes — but only markets whose payload changed are
+    rewritten. Markets not seen in a complete walk are marked closed.
+    Returns (stats, error).
+    """
+    PREDICTION_DIR.mkdir(parents=True, exist_ok=True)
+    lock = open(CATALOGUE_LOCK, "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return {"skipped": "sync already running"}, None
+
+    try:
+        conn = _open_db()
+        try:
+            started = time.time()
+            cursor = ""
+            pages = events_seen = markets_seen = changed = 0
+            complete = False
+            while pages < SYNC_MAX_PAGES:
+                params = {"status": "open", "with_nested_markets": "true", "limit": SYNC_PAGE_SIZE}
+                if cursor:
+                    params["cursor"] = cursor  # Opaque; may contain '=', '+', '/'
+                endpoint = f"/events?{urllib.parse.urlencode(params)}"
+                for attempt in range(SYNC_RATE_LIMIT_RETRIES + 1):
+                    resp, err = kalshi_request(creds, "GET", endpoint)
+                    if not (err and err.startswith("HTTP 429")) or attempt == SYNC_RATE_LIMIT_RETRIES:
+                        break
+                    time.sleep(2 ** attempt)
+                if err:
+                    if pages == 0:
+                        return None, err
+                    break
+                pages += 1
+                events = resp.get("events", [])
+                with conn:
+                    for e in events:
+                        nested = e.get("markets") or []
+                        changed += _upsert_markets(conn, nested, started, event=e)
+                        markets_seen += len(nested)
+                events_seen += len(events)
+                cursor = resp.get("cursor") or ""
+                if not cursor or not events:
+                    complete = True
+                    break
+
+            with conn:
+                if complete:
+                    conn.execute("UPDATE markets SET open = 0 WHERE open = 1 AND synced_at < ?", (started,))
+                _meta_set(conn, "last_sync", started)
+            open_count = conn.execute("SELECT COUNT(*) FROM markets WHERE open = 1").fetchone()[0]
+        finally:
+            conn.close()
+    finally:
+        fcntl.flock(lock, fcntl.LOCK_UN)
+        lock.close()
+
+    return {
+        "pages": pages,
+        "events": events_seen,
+        "markets": markets_seen,
+        "changed": changed,
+        "complete": complete,
+        "open_markets": open_count,
+        "duration_ms": int((time.time() - started) * 1000),
+    }, None
+
+
+def cmd_sync(args):
+    creds = load_creds()
+    if not creds:
+        output("FAIL — Kalshi not configured", args.json, {"status": "FAIL", "error": "not_configured"})
+        return 1
+
+    stats, err = sync_catalogue(creds)
+    if err:
+        output(f"FAIL — {err}", args.json, {"status": "FAIL", "error": err})
+        return 1
+    if args.json:
+        print(json.dumps({"status": "OK", **stats}, indent=2))
+    elif not args.quiet:
+        if stats.get("skipped"):
+            print(f"OK — Skipped: {stats['skipped']}")
+        else:
+            print(f"OK — Synced {stats['events']} events / {stats['markets']} markets over {stats['pages']} page(s); "
+                  f"{stats['changed']} changed, {stats['open_markets']} open markets indexed ({stats['duration_ms']} ms)")
+    return 0
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -276,10 +647,20 @@ def main():
     sp_search = subparsers.add_parser("search", help="Search markets by keyword")
     sp_search.add_argument("--query", required=True, help="Search query")
     sp_search.add_argument("--limit", type=int, default=20, help="Max results")
+    sp_search.add_argument("--category", help="Only markets in this category")
+    sp_search.add_argument("--series", help="Only markets in this series ticker")
+    sp_search.add_argument("--event", help="Only markets in this event ticker")
+    sp_search.add_argument("--live", action="store_true", help="Skip the local index and query Kalshi directly")
     sp_search.add_argument("--json", action="store_true")
 
     sp_trending = subparsers.add_parser("trending", help="Show trending markets by volume")
     sp_trending.add_argument("--limit", type=int, default=10, help="Number of markets")
+    sp_trending.add_argument("--sort", choices=sorted(TRENDING_SORTS), default="volume",
+                             help="Ranking for the local index (live mode always sorts by volume)")
+    sp_trending.add_argument("--category", help="Only markets in this category")
+    sp_trending.add_argument("--series", help="Only markets in this series ticker")
+    sp_trending.add_argument("--event", help="Only markets in this event ticker")
+    sp_trending.add_argument("--live", action="store_true", help="Skip the local index and query Kalshi directly")
     sp_trending.add_argument("--json", action="store_true")
 
     sp_detail = subparsers.add_parser("detail", help="Show market details")
@@ -287,14 +668,20 @@ def main():
     sp_detail.add_argument("--json", action="store_true")
 
     sp_cats = subparsers.add_parser("categories", help="List event categories")
+    sp_cats.add_argument("--live", action="store_true", help="Skip the local index and query Kalshi directly")
     sp_cats.add_argument("--json", action="store_true")
 
+    sp_sync = subparsers.add_parser("sync", help="Refresh the local market index (run from cron)")
+    sp_sync.add_argument("--quiet", action="store_true", help="No output unless something fails")
+    sp_sync.add_argument("--json", action="store_true")
+
     args = parser.parse_args()
     if args.command is None:
         parser.print_help()
         return 1
 
-    cmd_map = {"search": cmd_search, "trending": cmd_trending, "detail": cmd_detail, "categories": cmd_categories}
+    cmd_map = {"search": cmd_search, "trending": cmd_trending, "detail": cmd_detail, "categories": cmd_categories,
+               "sync": cmd_sync}
     return cmd_map[args.command](args)
 
 
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+kalshi-client.py — Shared signed Kalshi API client for the kalshi-* scripts.
+
+Not a CLI. Loaded by kalshi-trade.py, kalshi-positions.py, kalshi-portfolio.py
+and kalshi-browse.py from the same directory (~/scripts/), e.g.:
+
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("kalshi_client", Path(__file__).resolve().parent / "kalshi-client.py")
+
+The RSA private key is parsed once per process, each thread keeps its own
+keep-alive HTTPS connection, and kalshi_gather() issues several signed
+requests concurrently.
+
+All request helpers return (data, error) tuples like the scripts always have.
+"""
+
+import base64
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+API_HOST = "trading-api.kalshi.com"
+API_PREFIX = "/trade-api/v2"
+REQUEST_TIMEOUT = 15
+KEEPALIVE_IDLE = 20  # Reconnect before a non-GET if the socket sat idle longer than this
+MAX_CONCURRENCY = 8
+
+# ---------------------------------------------------------------------------
+# Signing
+# ---------------------------------------------------------------------------
+
+_KEYS = {}  # api_key_id -> parsed private key
+_KEYS_LOCK = threading.Lock()
+
+
+def _signing_key(api_key_id, private_key_pem):
+    key = _KEYS.get(api_key_id)
+    if key is None:
+        with _KEYS_LOCK:
+            key = _KEYS.get(api_key_id)
+            if key is None:
+                from cryptography.hazmat.primitives import serialization
+                key = serialization.load_pem_private_key(
+                    private_key_pem.encode("utf-8") if isinstance(private_key_pem, str) else private_key_pem,
+                    password=None,
+                )
+                _KEYS[api_key_id] = key
+    return key
+
+
+def sign_request(api_key_id, private_key_pem, method, path):
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
+
+    timestamp = str(int(time.time() * 1000))
+    message = (timestamp + method.upper() + path).encode("utf-8")
+    signature = _signing_key(api_key_id, private_key_pem).sign(
+        message,
+        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
+        hashes.SHA256(),
+    )
+    return {
+        "KALSHI-ACCESS-KEY": api_key_id,
+        "KALSHI-ACCESS-TIMESTAMP": timestamp,
+        "KALSHI-ACCESS-SIGNATURE": base64.b64encode(signature).decode("utf-8"),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Connection pool (one keep-alive connection per thread)
+# ---------------------------------------------------------------------------
+
+_local = threading.local()
+
+
+def _connection(fresh=False):
+    conn = getattr(_local, "conn", None)
+    idle = time.time() - getattr(_local, "last_used", 0)
+    if conn is not None and (fresh or idle > KEEPALIVE_IDLE):
+        conn.close()
+        conn = None
+    if conn is None:
+        conn = http.client.HTTPSConnection(API_HOST, timeout=REQUEST_TIMEOUT)
+        _local.conn = conn
+    return conn
+
+
+def _drop_connection():
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+    _local.conn = None
+
+
+# ---------------------------------------------------------------------------
+# Requests
+# ---------------------------------------------------------------------------
+
+def kalshi_request(creds, method, endpoint, body=None):
+    """Signed request against the Kalshi trade API. Returns (data, error)."""
+    method = method.upper()
+    path = f"{API_PREFIX}{endpoint}"
+    headers = sign_request(creds["api_key_id"], creds["private_key_pem"], method, path.split("?")[0])
+    headers["Accept"] = "application/json"
+    data = None
+    if body:
+        headers["Content-Type"] = "application/json"
+        data = json.dumps(body).encode("utf-8")
+
+    # GETs are retried once on a dropped keep-alive socket. Order-placing calls are
+    # never retried (the first attempt may have reached the exchange); instead they
+    # get a fresh connection if the pooled one has been idle.
+    attempts = 2 if method == "GET" else 1
+    for attempt in range(attempts):
+        conn = _connection(fresh=attempt > 0)
+        try:
+            conn.request(method, path, body=data, headers=headers)
+            resp = conn.getresponse()
+            body_text = resp.read().decode()
+        except (http.client.HTTPException, OSError) as e:
+            _drop_connection()
+            if attempt == attempts - 1:
+                return None, str(e)
+            continue
+        _local.last_used = time.time()
+        if resp.status >= 400:
+            return None, f"HTTP {resp.status}: {body_text[:300]}"
+        if not body_text:
+            return {}, None
+        try:
+            return json.loads(body_text), None
+        except json.JSONDecodeError as e:
+            return None, str(e)
+    return None, "request failed"
+
+
+def kalshi_gather(creds, calls):
+    """Run several (method, endpoint[, body]) requests concurrently.
+
+    Returns a list of (data, error) in the same order as `calls`. Total latency
+    is roughly that of the slowest call.
+    """
+    if not calls:
+        return []
+    # Parse the key before fanning out so worker threads don't race to do it
+    _signing_key(creds["api_key_id"], creds["private_key_pem"])
+    with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENCY, len(calls))) as pool:
+        futures = [pool.submit(kalshi_request, creds, *call) for call in calls]
+        return [f.result() for f in futures]
@@ -23,6 +23,7 @@ from pathlib import Path
 PREDICTION_DIR = Path.home() / ".openclaw" / "prediction-markets"
 CREDS_FILE = PREDICTION_DIR / "kalshi-creds.json"
 TRADE_LOG_FILE = PREDICTION_DIR / "kalshi-trade-log.json"
+FILLS_LIMIT = 100
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -38,44 +39,18 @@ def load_json(path, default=None):
         return default
 
 
-def _sign_request(api_key_id, private_key_pem, method, path):
-    import base64, time
-    from cryptography.hazmat.primitives import hashes, serialization
-    from cryptography.hazmat.primitives.asymmetric import padding
-
-    timestamp = str(int(time.time() * 1000))
-    message = (timestamp + method.upper() + path).encode("utf-8")
-    private_key = serialization.load_pem_private_key(
-        private_key_pem.encode("utf-8") if isinstance(private_key_pem, str) else private_key_pem,
-        password=None,
-    )
-    signature = private_key.sign(
-        message,
-        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
-        hashes.SHA256(),
-    )
-    return {
-        "KALSHI-ACCESS-KEY": api_key_id,
-        "KALSHI-ACCESS-TIMESTAMP": timestamp,
-        "KALSHI-ACCESS-SIGNATURE": base64.b64encode(signature).decode("utf-8"),
-    }
+def _load_kalshi_client():
+    """Load the shared signed client (kalshi-client.py, deployed alongside this script)."""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(
+        "kalshi_client", Path(__file__).resolve().parent / "kalshi-client.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
 
-def kalshi_request(creds, method, endpoint):
-    import urllib.request, urllib.error
-    base = "https://trading-api.kalshi.com/trade-api/v2"
-    path = f"/trade-api/v2{endpoint.split('?')[0]}"
-    url = f"{base}{endpoint}"
-
-    headers = _sign_request(creds["api_key_id"], creds["private_key_pem"], method, path)
-    headers["Accept"] = "application/json"
-
-    req = urllib.request.Request(url, headers=headers, method=method)
-    try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            return json.loads(resp.read().decode()), None
-    except Exception as e:
-        return None, str(e)
+_kalshi = _load_kalshi_client()
+kalshi_gather = _kalshi.kalshi_gather  # (creds, [(method, endpoint), ...]) -> [(data, error), ...]
 
 
 def load_creds():
@@ -98,18 +73,23 @@ def cmd_summary(args):
             print("FAIL — Kalshi not configured. Run: python3 ~/scripts/kalshi-setup.py setup")
         return 1
 
-    # Balance
-    bal, bal_err = kalshi_request(creds, "GET", "/portfolio/balance")
+    # Balance, positions and recent fills in parallel — latency of the slowest call
+    (bal, bal_err), (pos, pos_err), (fills_resp, fills_err) = kalshi_gather(creds, [
+        ("GET", "/portfolio/balance"),
+        ("GET", "/portfolio/positions?limit=200"),
+        ("GET", f"/portfolio/fills?limit={FILLS_LIMIT}"),
+    ])
     balance_usd = bal.get("balance", 0) / 100 if bal else 0
     portfolio_usd = bal.get("portfolio_value", 0) / 100 if bal else 0
 
-    # Positions
-    pos, pos_err = kalshi_request(creds, "GET", "/portfolio/positions?limit=200")
     positions = pos.get("market_positions", []) if pos else []
     open_positions = [p for p in positions if p.get("position", 0) != 0]
     realized_pnl = sum(p.get("realized_pnl", 0) for p in positions) / 100
     total_fees = sum(p.get("fees_paid", 0) for p in positions) / 100
 
+    fills = fills_resp.get("fills", []) if fills_resp else []
+    last_fill = max((f.get("created_time", "") for f in fills), default="")
+
     # Trade count from local log
     trade_log = load_json(TRADE_LOG_FILE, [])
     wins = sum(1 for t in trade_log if t.get("status") in ("matched", "filled"))
@@ -127,6 +107,8 @@ def cmd_summary(args):
         "total_fees": round(total_fees, 2),
         "total_trades": total,
         "win_rate": round(win_rate, 1),
+        "recent_fills": len(fills),
+        "last_fill_time": last_fill or None,
     }
 
     if args.json:
@@ -142,10 +124,13 @@ def cmd_summary(args):
         print(f"  Total Trades:    {total}")
         if total > 0:
             print(f"  Win Rate:        {win_rate:.0f}%")
+        print(f"  Recent Fills:    {len(fills)}" + (f" (last {last_fill[:19]})" if last_fill else ""))
         if bal_err:
             print(f"\n  WARN: Balance fetch error: {bal_err}")
         if pos_err:
             print(f"  WARN: Positions fetch error: {pos_err}")
+        if fills_err:
+            print(f"  WARN: Fills fetch error: {fills_err}")
     return 0
 
 
@@ -162,22 +147,22 @@ def cmd_detail(args):
             print("FAIL — Kalshi not configured")
         return 1
 
-    # Balance
-    bal, _ = kalshi_request(creds, "GET", "/portfolio/balance")
+    # Balance + positions in parallel
+    (bal, _), (pos, pos_err) = kalshi_gather(creds, [
+        ("GET", "/portfolio/balance"),
+        ("GET", "/portfolio/positions?limit=200"),
+    ])
     balance_usd = bal.get("balance", 0) / 100 if bal else 0
 
-    # Positions
-    pos, pos_err = kalshi_request(creds, "GET", "/portfolio/positions?limit=200")
     positions = pos.get("market_positions", []) if pos else []
     open_positions = [p for p in positions if p.get("position", 0) != 0]
 
-    # Enrich positions with market data
+    # Enrich positions with market data (one concurrent fetch per position)
+    market_results = kalshi_gather(creds, [("GET", f"/markets/{p.get('ticker', '')}") for p in open_positions])
     enriched = []
-    for p in open_positions:
+    for p, (market_data, _) in zip(open_positions, market_results):
         ticker = p.get("ticker", "")
         entry = dict(p)
-        # Fetch market details
-        market_data, _ = kalshi_request(creds, "GET", f"/markets/{ticker}")
         if market_data:
             market = market_data.get("market", market_data)
             entry["market_title"] = market.get("title", market.get("subtitle", ticker))
@@ -191,6 +176,8 @@ def cmd_detail(args):
         print(json.dumps({
             "status": "OK",
             "balance_usd": balance_usd,
+            "portfolio_value_usd": bal.get("portfolio_value", 0) / 100 if bal else 0,
+            "realized_pnl": round(sum(p.get("realized_pnl", 0) for p in positions) / 100, 2),
             "positions": enriched,
             "count": len(enriched),
         }, indent=2))
@@ -46,47 +46,19 @@ def output(msg, json_mode=False, data=None):
         print(msg)
 
 
-def _sign_request(api_key_id, private_key_pem, method, path):
-    import base64, time
-    from cryptography.hazmat.primitives import hashes, serialization
-    from cryptography.hazmat.primitives.asymmetric import padding
-
-    timestamp = str(int(time.time() * 1000))
-    message = (timestamp + method.upper() + path).encode("utf-8")
-    private_key = serialization.load_pem_private_key(
-        private_key_pem.encode("utf-8") if isinstance(private_key_pem, str) else private_key_pem,
-        password=None,
-    )
-    signature = private_key.sign(
-        message,
-        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
-        hashes.SHA256(),
-    )
-    return {
-        "KALSHI-ACCESS-KEY": api_key_id,
-        "KALSHI-ACCESS-TIMESTAMP": timestamp,
-        "KALSHI-ACCESS-SIGNATURE": base64.b64encode(signature).decode("utf-8"),
-    }
+def _load_kalshi_client():
+    """Load the shared signed client (kalshi-client.py, deployed alongside this script)."""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(
+        "kalshi_client", Path(__file__).resolve().parent / "kalshi-client.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
 
-def kalshi_request(creds, method, endpoint):
-    import urllib.request, urllib.error
-    base = "https://trading-api.kalshi.com/trade-api/v2"
-    path = f"/trade-api/v2{endpoint.split('?')[0]}"
-    url = f"{base}{endpoint}"
-
-    headers = _sign_request(creds["api_key_id"], creds["private_key_pem"], method, path)
-    headers["Accept"] = "application/json"
-
-    req = urllib.request.Request(url, headers=headers, method=method)
-    try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            return json.loads(resp.read().decode()), None
-    except urllib.error.HTTPError as e:
-        body_text = e.read().decode() if e.fp else ""
-        return None, f"HTTP {e.code}: {body_text[:300]}"
-    except Exception as e:
-        return None, str(e)
+_kalshi = _load_kalshi_client()
+kalshi_request = _kalshi.kalshi_request  # (creds, method, endpoint, body=None) -> (data, error)
+kalshi_gather = _kalshi.kalshi_gather  # (creds, [(method, endpoint), ...]) -> [(data, error), ...]
 
 
 def load_creds():
@@ -200,16 +172,18 @@ def cmd_pnl(args):
         output("FAIL — Kalshi not configured", args.json, {"status": "FAIL", "error": "not_configured"})
         return 1
 
-    # Get balance
-    bal_resp, bal_err = kalshi_request(creds, "GET", "/portfolio/balance")
+    # Balance and positions in parallel
+    (bal_resp, bal_err), (pos_resp, pos_err) = kalshi_gather(creds, [
+        ("GET", "/portfolio/balance"),
+        ("GET", "/portfolio/positions?limit=200"),
+    ])
     balance_usd = 0.0
     portfolio_usd = 0.0
     if not bal_err:
         balance_usd = bal_resp.get("balance", 0) / 100
         portfolio_usd = bal_resp.get("portfolio_value", 0) / 100
 
-    # Get positions for realized P&L
-    pos_resp, pos_err = kalshi_request(creds, "GET", "/portfolio/positions?limit=200")
+    # Realized P&L from positions
     realized_pnl = 0.0
     total_fees = 0.0
     open_positions = 0
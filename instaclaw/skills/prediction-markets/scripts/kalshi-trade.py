@@ -31,7 +31,7 @@ DAILY_SPEND_FILE = PREDICTION_DIR / "kalshi-daily-spend.json"
 TRADE_LOG_FILE = PREDICTION_DIR / "kalshi-trade-log.json"
 
 # ---------------------------------------------------------------------------
-# Helpers (reuse kalshi_request from kalshi-setup)
+# Helpers (signed requests go through the shared kalshi-client.py)
 # ---------------------------------------------------------------------------
 
 def load_json(path, default=None):
@@ -57,49 +57,19 @@ def output(msg, json_mode=False, data=None):
         print(msg)
 
 
-def _sign_request(api_key_id, private_key_pem, method, path):
-    import base64, time
-    from cryptography.hazmat.primitives import hashes, serialization
-    from cryptography.hazmat.primitives.asymmetric import padding
-
-    timestamp = str(int(time.time() * 1000))
-    message = (timestamp + method.upper() + path).encode("utf-8")
-    private_key = serialization.load_pem_private_key(
-        private_key_pem.encode("utf-8") if isinstance(private_key_pem, str) else private_key_pem,
-        password=None,
-    )
-    signature = private_key.sign(
-        message,
-        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
-        hashes.SHA256(),
-    )
-    return {
-        "KALSHI-ACCESS-KEY": api_key_id,
-        "KALSHI-ACCESS-TIMESTAMP": timestamp,
-        "KALSHI-ACCESS-SIGNATURE": base64.b64encode(signature).decode("utf-8"),
-    }
+def _load_kalshi_client():
+    """Load the shared signed client (kalshi-client.py, deployed alongside this script)."""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(
+        "kalshi_client", Path(__file__).resolve().parent / "kalshi-client.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
 
-def kalshi_request(creds, method, endpoint, body=None):
-    import urllib.request, urllib.error
-    base = "https://trading-api.kalshi.com/trade-api/v2"
-    path = f"/trade-api/v2{endpoint.split('?')[0]}"
-    url = f"{base}{endpoint}"
-
-    headers = _sign_request(creds["api_key_id"], creds["private_key_pem"], method, path)
-    headers["Content-Type"] = "application/json"
-    headers["Accept"] = "application/json"
-
-    data = json.dumps(body).encode("utf-8") if body else None
-    req = urllib.request.Request(url, data=data, headers=headers, method=method)
-    try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            return json.loads(resp.read().decode()), None
-    except urllib.error.HTTPError as e:
-        body_text = e.read().decode() if e.fp else ""
-        return None, f"HTTP {e.code}: {body_text[:300]}"
-    except Exception as e:
-        return None, str(e)
+_kalshi = _load_kalshi_client()
+kalshi_request = _kalshi.kalshi_request  # (creds, method, endpoint, body=None) -> (data, error)
+kalshi_gather = _kalshi.kalshi_gather  # (creds, [(method, endpoint), ...]) -> [(data, error), ...]
 
 
 def load_creds():
@@ -176,8 +146,12 @@ def cmd_buy(args):
                {"status": "FAIL", "error": "not_configured"})
         return 1
 
-    # Pre-trade balance check
-    bal_resp, bal_err = kalshi_request(creds, "GET", "/portfolio/balance")
+    # Pre-trade balance check (and the market quote, if we need one) in parallel
+    calls = [("GET", "/portfolio/balance")]
+    if not args.limit_price:
+        calls.append(("GET", f"/markets/{args.ticker}"))
+    results = kalshi_gather(creds, calls)
+    bal_resp, bal_err = results[0]
     if bal_resp:
         available_cents = bal_resp.get("balance", 0)
         available_usd = available_cents / 100
@@ -192,8 +166,8 @@ def cmd_buy(args):
     if args.limit_price:
         price_cents = args.limit_price
     else:
-        # Fetch current market price
-        market_data, err = kalshi_request(creds, "GET", f"/markets/{args.ticker}")
+        # Current market price (fetched alongside the balance above)
+        market_data, err = results[1]
         if err:
             output(f"FAIL — Could not fetch market: {err}", args.json,
                    {"status": "FAIL", "error": "market_fetch_failed", "detail": err})
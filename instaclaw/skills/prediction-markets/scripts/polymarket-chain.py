@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+polymarket-chain.py — Shared Polygon balance reads for the polymarket-* scripts.
+
+Not a CLI. Loaded by polymarket-trade.py, polymarket-positions.py and
+polymarket-portfolio.py from the same directory (~/scripts/), e.g.:
+
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("polymarket_chain", Path(__file__).resolve().parent / "polymarket-chain.py")
+
+Balances are read over plain JSON-RPC with hand-rolled ABI encoding, so none
+of this needs web3. batch_read_balances() packs every read into Multicall3
+aggregate3 calls; erc20_balances() sends a JSON-RPC batch and falls back to
+one eth_call per token on RPCs that don't support batches.
+"""
+
+import json
+import urllib.error
+import urllib.request
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+USDC_E = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
+# Conditional Tokens (ERC-1155 position shares) and Multicall3 (same address on every EVM chain)
+CONDITIONAL_TOKENS = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL_BATCH_SIZE = 100  # calls per eth_call — keeps public-RPC gas caps happy
+
+ERC20_BALANCE_OF = "0x70a08231"  # balanceOf(address)
+ERC1155_BALANCE_OF = "0x00fdd58e"  # balanceOf(address,uint256)
+
+
+# ---------------------------------------------------------------------------
+# ABI helpers
+# ---------------------------------------------------------------------------
+
+def abi_word(value):
+    """Encode a non-negative int as a 32-byte ABI word (hex, no 0x)."""
+    return format(value, "064x")
+
+
+def token_id_int(token_id):
+    """Polymarket token IDs are large decimal (or occasionally hex) strings."""
+    if isinstance(token_id, str) and token_id.startswith("0x"):
+        return int(token_id, 16)
+    return int(token_id)
+
+
+def encode_aggregate3(calls):
+    """ABI-encode Multicall3.aggregate3((address,bool,bytes)[]) with allowFailure=true.
+
+    calls is a list of (target_address, calldata_hex).
+    """
+    elems = []
+    for target, data_hex in calls:
+        data = bytes.fromhex(data_hex[2:])
+        padded = data.hex() + "00" * ((32 - len(data) % 32) % 32)
+        elems.append(target[2:].lower().zfill(64) + abi_word(1) + abi_word(0x60) + abi_word(len(data)) + padded)
+    heads = []
+    offset = 32 * len(elems)
+    for e in elems:
+        heads.append(abi_word(offset))
+        offset += len(e) // 2
+    return "0x82ad56cb" + abi_word(0x20) + abi_word(len(elems)) + "".join(heads) + "".join(elems)
+
+
+def decode_aggregate3(result_hex):
+    """Decode aggregate3's (bool success, bytes returnData)[] into a list of uint256 or None."""
+    raw = bytes.fromhex(result_hex[2:])
+
+    def word(pos):
+        return int.from_bytes(raw[pos:pos + 32], "big")
+
+    base = word(0) + 32
+    values = []
+    for i in range(word(base - 32)):
+        tup = base + word(base + 32 * i)
+        data_start = tup + word(tup + 32)
+        length = word(data_start)
+        if word(tup) and length >= 32:
+            values.append(word(data_start + 32))
+        else:
+            values.append(None)
+    return values
+
+
+# ---------------------------------------------------------------------------
+# RPC
+# ---------------------------------------------------------------------------
+
+def _post(rpc_url, payload, timeout):
+    req = urllib.request.Request(rpc_url, data=json.dumps(payload).encode(),
+                                 headers={"Content-Type": "application/json"})
+    resp = urllib.request.urlopen(req, timeout=timeout)
+    return json.loads(resp.read().decode())
+
+
+def _uint_result(reply):
+    """uint256 from an eth_call reply, or None if the call errored."""
+    if not isinstance(reply, dict) or "result" not in reply:
+        return None
+    raw = reply.get("result") or "0x0"
+    return int(raw, 16) if raw != "0x" else 0
+
+
+def multicall_balances(rpc_url, calls):
+    """Run (target, calldata) balance reads through Multicall3 in as few eth_calls as possible.
+
+    Returns a list of uint256-or-None aligned with calls, or None if the RPC
+    rejected the multicall entirely.
+    """
+    values = []
+    for i in range(0, len(calls), MULTICALL_BATCH_SIZE):
+        chunk = calls[i:i + MULTICALL_BATCH_SIZE]
+        try:
+            data = _post(rpc_url, {
+                "jsonrpc": "2.0",
+                "method": "eth_call",
+                "params": [{"to": MULTICALL3, "data": encode_aggregate3(chunk)}, "latest"],
+                "id": 1,
+            }, timeout=15)
+            result = data.get("result")
+            if not result or result == "0x":
+                return None
+            values.extend(decode_aggregate3(result))
+        except Exception:
+            return None
+    return values
+
+
+def batch_read_balances(rpc_url, wallet_address, token_ids):
+    """Read CT share balances for every token ID plus USDC.e in one Multicall3 round-trip.
+
+    Returns ({token_id: shares or None}, usdc_e or None), or (None, None) if
+    the multicall failed and the caller should fall back to per-token reads.
+    """
+    addr_word = wallet_address[2:].lower().zfill(64)
+    calls = [(USDC_E, ERC20_BALANCE_OF + addr_word)]
+    valid_ids = []
+    for tid in token_ids:
+        try:
+            calls.append((CONDITIONAL_TOKENS, ERC1155_BALANCE_OF + addr_word + abi_word(token_id_int(tid))))
+            valid_ids.append(tid)
+        except (ValueError, TypeError):
+            continue
+    values = multicall_balances(rpc_url, calls)
+    if values is None or len(values) != len(calls):
+        return None, None
+    usdc = values[0] / 1e6 if values[0] is not None else None
+    shares = {tid: (v / 1e6 if v is not None else None) for tid, v in zip(valid_ids, values[1:])}
+    for tid in token_ids:
+        shares.setdefault(tid, None)
+    return shares, usdc
+
+
+def erc20_balances(rpc_url, wallet_address, tokens, timeout=10):
+    """balanceOf(wallet) for each ERC-20 address in tokens, as raw uint256 (or None on error).
+
+    The reads go out as one JSON-RPC batch. Some RPCs reject batches — with a
+    non-list error reply or an HTTP 4xx — so either case falls back to one
+    eth_call per token. Per-token transport errors leave that entry None.
+    """
+    call_data = ERC20_BALANCE_OF + wallet_address[2:].lower().zfill(64)
+    requests = [
+        {"jsonrpc": "2.0", "method": "eth_call", "params": [{"to": token, "data": call_data}, "latest"], "id": i}
+        for i, token in enumerate(tokens)
+    ]
+    try:
+        replies = _post(rpc_url, requests, timeout)
+    except (urllib.error.URLError, OSError, ValueError):
+        replies = None
+    if isinstance(replies, list):
+        by_id = {r.get("id"): r for r in replies if isinstance(r, dict)}
+        return [_uint_result(by_id.get(i)) for i in range(len(tokens))]
+
+    values = []
+    for request in requests:
+        try:
+            values.append(_uint_result(_post(rpc_url, request, timeout)))
+        except (urllib.error.URLError, OSError, ValueError):
+            values.append(None)
+    return values
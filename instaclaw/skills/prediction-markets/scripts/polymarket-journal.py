@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+polymarket-journal.py — Shared SQLite trade journal for the polymarket-* scripts.
+
+Not a CLI. Loaded by polymarket-trade.py, polymarket-positions.py and
+polymarket-portfolio.py from the same directory (~/scripts/), e.g.:
+
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("polymarket_journal", Path(__file__).resolve().parent / "polymarket-journal.py")
+
+trade-journal.db replaces whole-file rewrites of trade-log.json and
+positions.json: trades are appended as rows indexed by order_id and token_id,
+positions are materialised in their own table, and every write is a single
+SQLite transaction (WAL), so a crash mid-trade never leaves a truncated log.
+
+The same database holds the FIFO lot ledger behind realized P&L, folded in
+incrementally from the journal by sync_ledger().
+
+positions.json and trade-log.json are still written as read-only snapshots
+of the journal — the dashboard's Polymarket panel reads both. trade-log.json
+only holds the most recent trades.
+"""
+
+import json
+import os
+import sqlite3
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+POLYMARKET_DIR = Path.home() / ".openclaw" / "polymarket"
+TRADE_JOURNAL_DB = POLYMARKET_DIR / "trade-journal.db"
+TRADE_LOG_FILE = POLYMARKET_DIR / "trade-log.json"  # Read-only snapshot of the journal's trades
+POSITIONS_FILE = POLYMARKET_DIR / "positions.json"  # Read-only snapshot of the journal's positions
+TRADE_LOG_SNAPSHOT_LIMIT = 100  # Most recent trades kept in trade-log.json (the panel shows 20)
+
+JOURNAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT,
+    action TEXT,
+    order_id TEXT,
+    token_id TEXT,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS trades_order_id ON trades(order_id);
+CREATE INDEX IF NOT EXISTS trades_token_id ON trades(token_id);
+CREATE TABLE IF NOT EXISTS positions (
+    token_id TEXT PRIMARY KEY,
+    position TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS ledger_lots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    token_id TEXT NOT NULL,
+    shares REAL NOT NULL,
+    price REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ledger_lots_token ON ledger_lots(token_id, id);
+CREATE TABLE IF NOT EXISTS ledger_tokens (
+    token_id TEXT PRIMARY KEY,
+    realized_pnl REAL NOT NULL DEFAULT 0,
+    buy_shares REAL NOT NULL DEFAULT 0,
+    buy_cost REAL NOT NULL DEFAULT 0,
+    buy_volume REAL NOT NULL DEFAULT 0,
+    sell_volume REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+# ---------------------------------------------------------------------------
+# Journal
+# ---------------------------------------------------------------------------
+
+def _load_json(path, default=None):
+    if not path.exists():
+        return default
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return default
+
+
+def open_journal():
+    """Open trade-journal.db, creating it and migrating legacy JSON files on first use."""
+    POLYMARKET_DIR.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(TRADE_JOURNAL_DB), timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(JOURNAL_SCHEMA)
+    migrated = conn.execute("SELECT value FROM meta WHERE key = 'migrated_legacy'").fetchone()
+    if not migrated:
+        _migrate_legacy_files(conn)
+    return conn
+
+
+def trade_row(entry):
+    """Indexed columns for a trade entry: (timestamp, action, order_id, token_id, entry)."""
+    return (
+        entry.get("timestamp", ""),
+        (entry.get("action") or "").upper(),
+        entry.get("order_id") or None,
+        entry.get("token_id") or None,
+        json.dumps(entry),
+    )
+
+
+def _migrate_legacy_files(conn):
+    """Import trade-log.json and positions.json into the journal (one-time).
+
+    Both files are left in place: from here on they are rewritten as
+    snapshots of the journal rather than read back.
+    """
+    legacy_log = _load_json(TRADE_LOG_FILE, [])
+    legacy_positions = _load_json(POSITIONS_FILE, [])
+    # IMMEDIATE takes the write lock up front so two concurrent first runs
+    # can't both import the legacy files
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("SELECT value FROM meta WHERE key = 'migrated_legacy'").fetchone():
+            conn.rollback()
+            return
+        if isinstance(legacy_log, list) and legacy_log:
+            conn.executemany(
+                "INSERT INTO trades (timestamp, action, order_id, token_id, entry) VALUES (?, ?, ?, ?, ?)",
+                [trade_row(e) for e in legacy_log if isinstance(e, dict)],
+            )
+        if isinstance(legacy_positions, list):
+            conn.executemany(
+                "INSERT OR IGNORE INTO positions (token_id, position) VALUES (?, ?)",
+                [(p.get("token_id", ""), json.dumps(p)) for p in legacy_positions if isinstance(p, dict)],
+            )
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_legacy', ?)",
+            (datetime.now(timezone.utc).isoformat(),),
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def load_trade_log(conn=None):
+    """Return every journal entry in trade order."""
+    own = conn is None
+    conn = conn or open_journal()
+    try:
+        return [json.loads(row[0]) for row in conn.execute("SELECT entry FROM trades ORDER BY seq")]
+    finally:
+        if own:
+            conn.close()
+
+
+def load_positions(conn=None):
+    """Return materialised open positions in the order they were opened."""
+    own = conn is None
+    conn = conn or open_journal()
+    try:
+        return [json.loads(row[0]) for row in conn.execute("SELECT position FROM positions ORDER BY rowid")]
+    finally:
+        if own:
+            conn.close()
+
+
+def save_positions(positions):
+    """Replace the materialised positions in one transaction and refresh positions.json."""
+    conn = open_journal()
+    try:
+        with conn:
+            conn.execute("DELETE FROM positions")
+            conn.executemany(
+                "INSERT OR REPLACE INTO positions (token_id, position) VALUES (?, ?)",
+                [(p.get("token_id", ""), json.dumps(p)) for p in positions],
+            )
+        export_positions_snapshot(conn)
+    finally:
+        conn.close()
+
+
+# ---------------------------------------------------------------------------
+# FIFO P&L ledger
+# ---------------------------------------------------------------------------
+
+def is_matched(trade):
+    """Check if a trade was actually filled. Only MATCHED fills count for P&L."""
+    status = trade.get("fill_status", trade.get("status", "")).upper()
+    if status == "MATCHED":
+        return True
+    # Backward compat: old entries without fill_status count if they have tx_hashes
+    if not status and trade.get("tx_hashes"):
+        return True
+    return False
+
+
+LEDGER_TOTAL_FIELDS = ("realized_pnl", "buy_shares", "buy_cost", "buy_volume", "sell_volume")
+
+
+def sync_ledger(conn):
+    """Fold journal trades past the ledger checkpoint into the FIFO lot ledger.
+
+    Open buy lots live in ledger_lots and per-token totals (realized P&L,
+    buy cost basis, volumes) in ledger_tokens; meta.ledger_seq records the last
+    trade folded in. Each call only touches trades logged since the previous
+    one, so P&L reads are O(new trades) rather than O(history).
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'ledger_seq'").fetchone()
+        last_seq = int(row[0]) if row else 0
+        new_trades = conn.execute(
+            "SELECT seq, entry FROM trades WHERE seq > ? ORDER BY seq", (last_seq,)
+        ).fetchall()
+        if not new_trades:
+            conn.rollback()
+            return
+
+        lots = {}        # token_id -> deque of [lot_id or None, shares, price]
+        totals = {}      # token_id -> {field: value}
+        consumed = []    # lot ids fully used up by sells
+        for seq, raw in new_trades:
+            last_seq = seq
+            t = json.loads(raw)
+            action = (t.get("action") or "").upper()
+            if action not in ("BUY", "SELL") or not is_matched(t):
+                continue
+            tid = t.get("token_id", "")
+            if tid not in lots:
+                lots[tid] = deque(
+                    [lot_id, shares, price] for lot_id, shares, price in conn.execute(
+                        "SELECT id, shares, price FROM ledger_lots WHERE token_id = ? ORDER BY id", (tid,)
+                    )
+                )
+                stored = conn.execute(
+                    f"SELECT {', '.join(LEDGER_TOTAL_FIELDS)} FROM ledger_tokens WHERE token_id = ?", (tid,)
+                ).fetchone()
+                totals[tid] = dict(zip(LEDGER_TOTAL_FIELDS, stored or (0.0,) * len(LEDGER_TOTAL_FIELDS)))
+            shares = t.get("shares", 0) or 0
+            price = t.get("price", 0) or 0
+            tot = totals[tid]
+            if action == "BUY":
+                lots[tid].append([None, shares, price])
+                tot["buy_shares"] += shares
+                tot["buy_cost"] += shares * price
+                tot["buy_volume"] += t.get("amount_usdc", price * shares)
+            else:
+                tot["sell_volume"] += price * shares
+                remaining = shares
+                cost = 0.0
+                queue = lots[tid]
+                while remaining > 0 and queue:
+                    lot = queue[0]
+                    take = min(remaining, lot[1])
+                    cost += take * lot[2]
+                    lot[1] -= take
+                    remaining -= take
+                    if lot[1] <= 0:
+                        queue.popleft()
+                        if lot[0] is not None:
+                            consumed.append((lot[0],))
+                tot["realized_pnl"] += (price * shares) - cost
+
+        conn.executemany("DELETE FROM ledger_lots WHERE id = ?", consumed)
+        for tid, queue in lots.items():
+            for lot_id, shares, price in queue:
+                if lot_id is None:
+                    conn.execute(
+                        "INSERT INTO ledger_lots (token_id, shares, price) VALUES (?, ?, ?)", (tid, shares, price)
+                    )
+                else:
+                    conn.execute("UPDATE ledger_lots SET shares = ? WHERE id = ?", (shares, lot_id))
+        for tid, tot in totals.items():
+            conn.execute(
+                f"INSERT OR REPLACE INTO ledger_tokens (token_id, {', '.join(LEDGER_TOTAL_FIELDS)}) "
+                f"VALUES (?, {', '.join('?' * len(LEDGER_TOTAL_FIELDS))})",
+                (tid,) + tuple(tot[f] for f in LEDGER_TOTAL_FIELDS),
+            )
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('ledger_seq', ?)", (str(last_seq),))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def load_ledger(conn):
+    """Bring the ledger up to date and return {token_id: totals + open FIFO lots}."""
+    sync_ledger(conn)
+    ledger = {}
+    for row in conn.execute(f"SELECT token_id, {', '.join(LEDGER_TOTAL_FIELDS)} FROM ledger_tokens"):
+        entry = dict(zip(LEDGER_TOTAL_FIELDS, row[1:]))
+        entry["lots"] = []
+        ledger[row[0]] = entry
+    for tid, shares, price in conn.execute("SELECT token_id, shares, price FROM ledger_lots ORDER BY id"):
+        if tid in ledger:
+            ledger[tid]["lots"].append({"shares": shares, "price": price})
+    return ledger
+
+
+def invalidate_ledger(conn, seq):
+    """Drop the ledger if trade seq was already folded into it (e.g. its fill status changed).
+
+    Call inside the transaction that rewrote the trade; the next sync_ledger()
+    rebuilds the ledger from the full journal.
+    """
+    checkpoint = conn.execute("SELECT value FROM meta WHERE key = 'ledger_seq'").fetchone()
+    if checkpoint and seq <= int(checkpoint[0]):
+        conn.execute("DELETE FROM ledger_lots")
+        conn.execute("DELETE FROM ledger_tokens")
+        conn.execute("DELETE FROM meta WHERE key = 'ledger_seq'")
+
+
+# ---------------------------------------------------------------------------
+# JSON snapshots (read by the dashboard, never read back by the scripts)
+# ---------------------------------------------------------------------------
+
+def _write_snapshot(path, data):
+    tmp = path.with_suffix(".tmp")
+    try:
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # Snapshots are for display — never fail a trade over one
+
+
+def export_positions_snapshot(conn):
+    """Atomically refresh positions.json (open positions only — stays small)."""
+    _write_snapshot(POSITIONS_FILE, load_positions(conn))
+
+
+def export_trade_log_snapshot(conn):
+    """Atomically refresh trade-log.json with the most recent trades, oldest first.
+
+    Written as {"trades": [...]}, the shape the panel reads. Only the last
+    TRADE_LOG_SNAPSHOT_LIMIT trades, so a trade costs the same however long
+    the history is — the full history stays in the journal.
+    """
+    rows = conn.execute(
+        "SELECT entry FROM trades ORDER BY seq DESC LIMIT ?", (TRADE_LOG_SNAPSHOT_LIMIT,)
+    ).fetchall()
+    _write_snapshot(TRADE_LOG_FILE, {"trades": [json.loads(row[0]) for row in reversed(rows)]})
@@ -27,8 +27,6 @@ from pathlib import Path
 
 POLYMARKET_DIR = Path.home() / ".openclaw" / "polymarket"
 WALLET_FILE = POLYMARKET_DIR / "wallet.json"
-POSITIONS_FILE = POLYMARKET_DIR / "positions.json"
-TRADE_LOG_FILE = POLYMARKET_DIR / "trade-log.json"
 
 GAMMA_API = "https://gamma-api.polymarket.com"
 CLOB_HOST_DEFAULT = "https://clob.polymarket.com"
@@ -38,6 +36,9 @@ CHAIN_ID = 137
 # USDC contract addresses (Polygon mainnet)
 USDC_E = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
 
+# Conditional Tokens (ERC-1155 position shares)
+CONDITIONAL_TOKENS = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"
+
 ENV_FILE = Path.home() / ".openclaw" / ".env"
 
 RPC_FALLBACKS = [
@@ -66,6 +67,33 @@ def load_wallet():
     return load_json(WALLET_FILE)
 
 
+def _load_sibling(filename):
+    """Load a shared module deployed alongside this script (~/scripts/)."""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(
+        filename[:-3].replace("-", "_"), Path(__file__).resolve().parent / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_journal = _load_sibling("polymarket-journal.py")  # SQLite trade journal, FIFO ledger, snapshots
+_chain = _load_sibling("polymarket-chain.py")  # Multicall3 / batched balance reads
+open_journal = _journal.open_journal
+load_ledger = _journal.load_ledger
+load_positions = _journal.load_positions
+
+
+def load_recent_trades(limit):
+    """Return the newest `limit` journal entries, most recent first."""
+    conn = open_journal()
+    try:
+        rows = conn.execute("SELECT entry FROM trades ORDER BY seq DESC LIMIT ?", (limit,)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    finally:
+        conn.close()
+
+
 def fetch_market_info(market_id):
     """Fetch market info from Gamma API."""
     url = f"{GAMMA_API}/markets/{market_id}"
@@ -103,14 +131,13 @@ def get_market_url(market):
     return None
 
 
-def collect_tx_hashes_for_position(trade_log, token_id):
-    """Gather all tx hashes from trade log entries matching a token ID."""
+def collect_tx_hashes_for_position(conn, token_id):
+    """Gather all tx hashes from journal entries matching a token ID (token_id index)."""
     hashes = []
-    for t in trade_log:
-        if t.get("token_id") == token_id:
-            for tx in t.get("tx_hashes", []):
-                if tx and tx not in hashes:
-                    hashes.append(tx)
+    for (raw,) in conn.execute("SELECT entry FROM trades WHERE token_id = ? ORDER BY seq", (token_id,)):
+        for tx in json.loads(raw).get("tx_hashes", []):
+            if tx and tx not in hashes:
+                hashes.append(tx)
     return hashes
 
 
@@ -237,9 +264,8 @@ def verify_on_chain_balance(wallet, token_id):
         w3 = Web3(Web3.HTTPProvider(rpc_url))
         if not w3.is_connected():
             return None
-        CT_ADDRESS = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"
         CT_ABI = json.loads('[{"inputs":[{"name":"account","type":"address"},{"name":"id","type":"uint256"}],"name":"balanceOf","outputs":[{"name":"","type":"uint256"}],"stateMutability":"view","type":"function"}]')
-        ct = w3.eth.contract(address=Web3.to_checksum_address(CT_ADDRESS), abi=CT_ABI)
+        ct = w3.eth.contract(address=Web3.to_checksum_address(CONDITIONAL_TOKENS), abi=CT_ABI)
         addr = Web3.to_checksum_address(wallet["address"])
         tid = int(token_id, 16) if isinstance(token_id, str) and token_id.startswith("0x") else int(token_id)
         raw = ct.functions.balanceOf(addr, tid).call()
@@ -248,38 +274,6 @@ def verify_on_chain_balance(wallet, token_id):
         return None
 
 
-def is_matched(trade):
-    """Check if a trade was actually filled. Only MATCHED fills count for P&L."""
-    status = trade.get("fill_status", trade.get("status", "")).upper()
-    if status == "MATCHED":
-        return True
-    # Backward compat: old entries without fill_status count if they have tx_hashes
-    if not status and trade.get("tx_hashes"):
-        return True
-    return False
-
-
-def compute_cost_basis(trade_log):
-    """Compute FIFO cost basis per token_id. Returns {token_id: avg_entry_price}."""
-    buys = {}  # token_id -> [(shares, price)]
-    for t in trade_log:
-        if t.get("action") == "BUY" and is_matched(t):
-            tid = t.get("token_id", "")
-            if tid not in buys:
-                buys[tid] = []
-            buys[tid].append((t.get("shares", 0), t.get("price", 0)))
-
-    result = {}
-    for tid, entries in buys.items():
-        total_shares = sum(s for s, _ in entries)
-        total_cost = sum(s * p for s, p in entries)
-        if total_shares > 0:
-            result[tid] = total_cost / total_shares
-        else:
-            result[tid] = 0
-    return result
-
-
 # ---------------------------------------------------------------------------
 # summary subcommand
 # ---------------------------------------------------------------------------
@@ -294,12 +288,28 @@ def cmd_summary(args):
             print("FAIL — No wallet found. Run: bash ~/scripts/setup-polymarket-wallet.sh")
         return 1
 
-    positions = load_json(POSITIONS_FILE, [])
-    trade_log = load_json(TRADE_LOG_FILE, [])
-    cost_basis = compute_cost_basis(trade_log)
-
-    # FIX 8: Get USDC.e cash balance
-    usdc_balance = check_usdc_balance(wallet["address"])
+    # P&L comes from the incrementally maintained FIFO ledger — no full trade-log scan
+    conn = open_journal()
+    try:
+        positions = load_positions(conn)
+        ledger = load_ledger(conn)
+        trade_count = conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+        tx_hashes_by_token = {
+            p["token_id"]: collect_tx_hashes_for_position(conn, p["token_id"])
+            for p in positions if p.get("token_id")
+        }
+    finally:
+        conn.close()
+    # Average entry price across all matched buys, per token
+    cost_basis = {tid: e["buy_cost"] / e["buy_shares"] for tid, e in ledger.items() if e["buy_shares"] > 0}
+
+    # FIX 8: Get USDC.e cash balance + every position's on-chain shares in one multicall
+    held_token_ids = [p.get("token_id") for p in positions if p.get("token_id") and p.get("shares", 0) > 0]
+    on_chain, usdc_balance = _chain.batch_read_balances(get_rpc_url(), wallet["address"], held_token_ids)
+    if on_chain is None:
+        # Multicall unavailable on this RPC — fall back to one read per position
+        usdc_balance = check_usdc_balance(wallet["address"])
+        on_chain = {tid: verify_on_chain_balance(wallet, tid) for tid in held_token_ids}
 
     # FIX 8: Get open orders from CLOB
     open_orders = []
@@ -312,7 +322,7 @@ def cmd_summary(args):
         except Exception:
             pass
 
-    if not positions and not trade_log and not open_orders:
+    if not positions and not trade_count and not open_orders:
         result = {
             "status": "OK",
             "wallet": wallet["address"],
@@ -351,7 +361,7 @@ def cmd_summary(args):
             continue
 
         # FIX 8: Verify on-chain balance — only include verified positions in P&L
-        on_chain_shares = verify_on_chain_balance(wallet, token_id) if token_id else None
+        on_chain_shares = on_chain.get(token_id) if token_id else None
         if on_chain_shares is not None and on_chain_shares <= 0:
             continue  # Skip — no on-chain balance, don't include in P&L
         actual_shares = on_chain_shares if on_chain_shares is not None else shares
@@ -382,7 +392,7 @@ def cmd_summary(args):
         total_pnl += unrealized_pnl
         total_cost += position_cost
 
-        tx_hashes = collect_tx_hashes_for_position(trade_log, token_id)
+        tx_hashes = tx_hashes_by_token.get(token_id, [])
 
         row = {
             "market": question,
@@ -396,34 +406,12 @@ def cmd_summary(args):
             "unrealized_pnl": round(unrealized_pnl, 2),
             "market_url": market_url,
             "tx_links": [f"{POLYGONSCAN}/{tx}" for tx in tx_hashes],
+            "open_lots": ledger.get(token_id, {}).get("lots", []),
         }
         portfolio_rows.append(row)
 
-    # Realized P&L from sells — ONLY count MATCHED fills
-    realized_pnl = 0.0
-    sell_buys = {}
-    for t in trade_log:
-        if t.get("action") == "BUY" and is_matched(t):
-            tid = t.get("token_id", "")
-            if tid not in sell_buys:
-                sell_buys[tid] = []
-            sell_buys[tid].append({"shares": t.get("shares", 0), "price": t.get("price", 0)})
-    for t in trade_log:
-        if t.get("action") == "SELL" and is_matched(t):
-            tid = t.get("token_id", "")
-            sell_price = t.get("price", 0)
-            remaining = t.get("shares", 0)
-            buy_list = sell_buys.get(tid, [])
-            cost = 0.0
-            while remaining > 0 and buy_list:
-                entry = buy_list[0]
-                take = min(remaining, entry["shares"])
-                cost += take * entry["price"]
-                entry["shares"] -= take
-                remaining -= take
-                if entry["shares"] <= 0:
-                    buy_list.pop(0)
-            realized_pnl += (sell_price * t.get("shares", 0)) - cost
+    # Realized P&L from sells — ONLY MATCHED fills are folded into the ledger
+    realized_pnl = sum(e["realized_pnl"] for e in ledger.values())
 
     combined_pnl = total_pnl + realized_pnl
 
@@ -464,7 +452,7 @@ def cmd_summary(args):
             "realized_pnl": round(realized_pnl, 2),
             "total_pnl": round(combined_pnl, 2),
             "roi_pct": round((combined_pnl / total_cost) * 100, 1) if total_cost > 0 else 0,
-            "trade_count": len(trade_log),
+            "trade_count": trade_count,
         }, indent=2))
     else:
         print(f"=== Portfolio Summary — {wallet['address']} ===\n")
@@ -513,7 +501,7 @@ def cmd_summary(args):
         print(f"  Total P&L:       ${combined_pnl:+.2f}")
         if total_cost > 0:
             print(f"  ROI:             {(combined_pnl / total_cost) * 100:+.1f}%")
-        print(f"  Total Trades:    {len(trade_log)}")
+        print(f"  Total Trades:    {trade_count}")
 
     return 0
 
@@ -524,18 +512,15 @@ def cmd_summary(args):
 
 def cmd_trades(args):
     """Show trade history with tx links."""
-    trade_log = load_json(TRADE_LOG_FILE, [])
+    trades = load_recent_trades(args.limit)
 
-    if not trade_log:
+    if not trades:
         if args.json:
             print(json.dumps({"status": "OK", "trades": [], "count": 0}))
         else:
             print("OK — No trades recorded yet.")
         return 0
 
-    # Most recent first, then apply limit
-    trades = list(reversed(trade_log))[:args.limit]
-
     if args.json:
         out = []
         for t in trades:
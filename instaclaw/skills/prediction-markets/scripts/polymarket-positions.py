@@ -26,8 +26,6 @@ from pathlib import Path
 
 POLYMARKET_DIR = Path.home() / ".openclaw" / "polymarket"
 WALLET_FILE = POLYMARKET_DIR / "wallet.json"
-POSITIONS_FILE = POLYMARKET_DIR / "positions.json"
-TRADE_LOG_FILE = POLYMARKET_DIR / "trade-log.json"
 
 CLOB_HOST_DEFAULT = "https://clob.polymarket.com"
 GAMMA_API = "https://gamma-api.polymarket.com"
@@ -56,17 +54,28 @@ def load_json(path, default=None):
         return default
 
 
-def save_json(path, data):
-    """Save data to a JSON file."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
-
-
 def load_wallet():
     return load_json(WALLET_FILE)
 
 
+def _load_sibling(filename):
+    """Load a shared module deployed alongside this script (~/scripts/)."""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(
+        filename[:-3].replace("-", "_"), Path(__file__).resolve().parent / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_journal = _load_sibling("polymarket-journal.py")  # SQLite trade journal, FIFO ledger, snapshots
+_chain = _load_sibling("polymarket-chain.py")  # Multicall3 / batched balance reads
+open_journal = _journal.open_journal
+load_ledger = _journal.load_ledger
+load_positions = _journal.load_positions
+save_positions = _journal.save_positions
+
+
 def fetch_market_info(market_id):
     """Fetch market info from Gamma API."""
     url = f"{GAMMA_API}/markets/{market_id}"
@@ -235,12 +244,20 @@ def cmd_list(args):
     By default, only shows positions with verified on-chain balance > 0.
     Use --all to show everything including unverified positions.
     """
-    positions = load_json(POSITIONS_FILE, [])
+    positions = load_positions()
     wallet = load_wallet()
 
     show_all = getattr(args, 'all', False)
 
-    # Try to fetch current prices and verify on-chain for each position
+    # Verify every position on-chain in one multicall (per-token fallback if unsupported)
+    on_chain = {}
+    if not show_all and wallet:
+        token_ids = [p.get("token_id") for p in positions if p.get("token_id")]
+        on_chain, _ = _chain.batch_read_balances(get_rpc_url(), wallet["address"], token_ids)
+        if on_chain is None:
+            on_chain = {tid: verify_on_chain_balance(wallet, tid) for tid in token_ids}
+
+    # Try to fetch current prices for each position
     enriched = []
     skipped = 0
     for p in positions:
@@ -249,7 +266,7 @@ def cmd_list(args):
 
         # FIX 7: On-chain verification — filter out positions with 0 on-chain balance
         if not show_all and wallet and token_id:
-            on_chain_shares = verify_on_chain_balance(wallet, token_id)
+            on_chain_shares = on_chain.get(token_id)
             if on_chain_shares is not None:
                 entry["on_chain_shares"] = on_chain_shares
                 entry["verified"] = True
@@ -337,19 +354,13 @@ def cmd_list(args):
 # ---------------------------------------------------------------------------
 
 def cmd_sync(args):
-    """Verify positions on-chain via Conditional Tokens balanceOf()."""
-    try:
-        from web3 import Web3
-    except ImportError:
-        print("FAIL — web3 not installed. Run: pip3 install web3")
-        return 1
-
+    """Verify positions on-chain via Conditional Tokens balanceOf(), batched through Multicall3."""
     wallet = load_wallet()
     if not wallet:
         print("FAIL — No wallet found. Run: bash ~/scripts/setup-polymarket-wallet.sh")
         return 1
 
-    positions = load_json(POSITIONS_FILE, [])
+    positions = load_positions()
     if not positions:
         if args.json:
             print(json.dumps({"status": "OK", "message": "no_positions", "positions": []}))
@@ -357,17 +368,19 @@ def cmd_sync(args):
             print("OK — No positions to sync")
         return 0
 
-    rpc_url = get_rpc_url()
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
-    if not w3.is_connected():
-        print(f"FAIL — Cannot connect to Polygon RPC: {rpc_url}")
-        return 1
-
-    ct_contract = w3.eth.contract(
-        address=Web3.to_checksum_address(CONDITIONAL_TOKENS),
-        abi=CT_BALANCE_ABI,
-    )
-    address_cs = Web3.to_checksum_address(wallet["address"])
+    token_ids = [p.get("token_id", "") for p in positions]
+    on_chain, _ = _chain.batch_read_balances(get_rpc_url(), wallet["address"], token_ids)
+    if on_chain is None:
+        # Multicall unavailable on this RPC — fall back to one balanceOf per position
+        try:
+            from web3 import Web3  # noqa: F401
+        except ImportError:
+            print("FAIL — web3 not installed. Run: pip3 install web3")
+            return 1
+        on_chain = {tid: verify_on_chain_balance(wallet, tid) for tid in token_ids}
+        if all(v is None for v in on_chain.values()):
+            print(f"FAIL — Cannot connect to Polygon RPC: {get_rpc_url()}")
+            return 1
 
     results = []
     updated = False
@@ -376,55 +389,36 @@ def cmd_sync(args):
         token_id = p.get("token_id", "")
         local_shares = p.get("shares", 0)
 
-        try:
-            # Token IDs in Polymarket are large hex strings — convert to int
-            if isinstance(token_id, str):
-                if token_id.startswith("0x"):
-                    token_id_int = int(token_id, 16)
-                else:
-                    token_id_int = int(token_id)
-            else:
-                token_id_int = int(token_id)
-
-            on_chain_raw = ct_contract.functions.balanceOf(address_cs, token_id_int).call()
-            # CT shares have 6 decimal places (like USDC)
-            on_chain_shares = on_chain_raw / 1e6
-
-            discrepancy = abs(on_chain_shares - local_shares) > 0.01
-            if discrepancy:
-                results.append({
-                    "token_id": str(token_id),
-                    "question": p.get("question", ""),
-                    "outcome": p.get("outcome", ""),
-                    "local_shares": local_shares,
-                    "on_chain_shares": on_chain_shares,
-                    "discrepancy": True,
-                })
-                p["shares"] = on_chain_shares
-                p["updated_at"] = datetime.now(timezone.utc).isoformat()
-                p["last_sync"] = "on_chain"
-                updated = True
-            else:
-                results.append({
-                    "token_id": str(token_id),
-                    "question": p.get("question", ""),
-                    "outcome": p.get("outcome", ""),
-                    "local_shares": local_shares,
-                    "on_chain_shares": on_chain_shares,
-                    "discrepancy": False,
-                })
-        except Exception as e:
+        # CT shares have 6 decimal places (like USDC) — already scaled by the reader
+        on_chain_shares = on_chain.get(token_id)
+        if on_chain_shares is None:
             results.append({
                 "token_id": str(token_id),
                 "question": p.get("question", ""),
-                "error": str(e),
+                "error": "on-chain balance read failed",
             })
+            continue
+
+        discrepancy = abs(on_chain_shares - local_shares) > 0.01
+        results.append({
+            "token_id": str(token_id),
+            "question": p.get("question", ""),
+            "outcome": p.get("outcome", ""),
+            "local_shares": local_shares,
+            "on_chain_shares": on_chain_shares,
+            "discrepancy": discrepancy,
+        })
+        if discrepancy:
+            p["shares"] = on_chain_shares
+            p["updated_at"] = datetime.now(timezone.utc).isoformat()
+            p["last_sync"] = "on_chain"
+            updated = True
 
     # Remove positions with 0 shares
     positions = [p for p in positions if p.get("shares", 0) > 0]
 
     if updated:
-        save_json(POSITIONS_FILE, positions)
+        save_positions(positions)
 
     if args.json:
         print(json.dumps({
@@ -453,58 +447,21 @@ def cmd_sync(args):
 # pnl subcommand
 # ---------------------------------------------------------------------------
 
-def is_matched(trade):
-    """Check if a trade was actually filled. Only MATCHED fills count for P&L."""
-    status = trade.get("fill_status", trade.get("status", "")).upper()
-    if status == "MATCHED":
-        return True
-    # Backward compat: old entries without fill_status count if they have tx_hashes
-    if not status and trade.get("tx_hashes"):
-        return True
-    return False
-
-
 def cmd_pnl(args):
     """Calculate P&L from positions and trade log."""
-    positions = load_json(POSITIONS_FILE, [])
-    trade_log = load_json(TRADE_LOG_FILE, [])
-
-    # Calculate realized P&L from sells in trade log
-    # ONLY count MATCHED fills — LIVE/PENDING/CANCELLED orders never executed
-    realized_pnl = 0.0
-    total_buy_volume = 0.0
-    total_sell_volume = 0.0
-
-    buys_by_token = {}  # token_id -> list of (shares, price)
-    for t in trade_log:
-        if not is_matched(t):
-            continue
-        token_id = t.get("token_id", "")
-        if t.get("action") == "BUY":
-            shares = t.get("shares", 0)
-            price = t.get("price", 0)
-            amount = t.get("amount_usdc", price * shares)
-            total_buy_volume += amount
-            if token_id not in buys_by_token:
-                buys_by_token[token_id] = []
-            buys_by_token[token_id].append({"shares": shares, "price": price})
-        elif t.get("action") == "SELL":
-            shares_sold = t.get("shares", 0)
-            sell_price = t.get("price", 0)
-            total_sell_volume += sell_price * shares_sold
-            # FIFO cost basis
-            buy_list = buys_by_token.get(token_id, [])
-            remaining = shares_sold
-            cost_basis = 0.0
-            while remaining > 0 and buy_list:
-                entry = buy_list[0]
-                take = min(remaining, entry["shares"])
-                cost_basis += take * entry["price"]
-                entry["shares"] -= take
-                remaining -= take
-                if entry["shares"] <= 0:
-                    buy_list.pop(0)
-            realized_pnl += (sell_price * shares_sold) - cost_basis
+    conn = open_journal()
+    try:
+        positions = load_positions(conn)
+        ledger = load_ledger(conn)
+        trade_count = conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+    finally:
+        conn.close()
+
+    # Realized P&L and volumes come from the FIFO ledger, which only folds in
+    # MATCHED fills — LIVE/PENDING/CANCELLED orders never executed
+    realized_pnl = sum(e["realized_pnl"] for e in ledger.values())
+    total_buy_volume = sum(e["buy_volume"] for e in ledger.values())
+    total_sell_volume = sum(e["sell_volume"] for e in ledger.values())
 
     # Calculate unrealized P&L from current positions
     unrealized_pnl = 0.0
@@ -548,7 +505,7 @@ def cmd_pnl(args):
         "total_buy_volume": round(total_buy_volume, 2),
         "total_sell_volume": round(total_sell_volume, 2),
         "open_positions": len(positions),
-        "total_trades": len(trade_log),
+        "total_trades": trade_count,
     }
 
     if args.json:
@@ -563,7 +520,7 @@ def cmd_pnl(args):
         print(f"  Buy Volume:      ${total_buy_volume:.2f}")
         print(f"  Sell Volume:     ${total_sell_volume:.2f}")
         print(f"  Open Positions:  {len(positions)}")
-        print(f"  Total Trades:    {len(trade_log)}")
+        print(f"  Total Trades:    {trade_count}")
 
         if open_cost > 0:
             roi = (total_pnl / open_cost) * 100
@@ -3,9 +3,19 @@
 polymarket-search.py — Search and browse Polymarket markets via Gamma API.
 
 Usage:
-  python3 ~/scripts/polymarket-search.py search --query "bitcoin" [--limit 10] [--json]
-  python3 ~/scripts/polymarket-search.py trending [--limit 10] [--json]
-  python3 ~/scripts/polymarket-search.py detail --market-id <condition_id> [--json]
+  python3 ~/scripts/polymarket-search.py search --query "bitcoin" [--limit 10] [--live] [--json]
+  python3 ~/scripts/polymarket-search.py trending [--limit 10] [--sort volume|liquidity|total|ending] [--live] [--json]
+  python3 ~/scripts/polymarket-search.py detail --market-id <condition_id> [--live] [--json]
+  python3 ~/scripts/polymarket-search.py sync [--full] [--quiet] [--json]
+
+search/trending are matched and ranked from the local market catalogue
+(~/.openclaw/polymarket/market-catalogue.db, SQLite FTS5) when it has been
+synced within CATALOGUE_MAX_AGE, otherwise from Gamma (and a background
+sync is started). Prices are not trusted from the catalogue — incremental
+syncs key on updatedAt, which doesn't move with the order book — so the
+markets shown are re-priced from Gamma (one request, PRICE_MAX_AGE cache),
+and detail always fetches its market live. Keep the catalogue warm from cron:
+  */15 * * * * python3 ~/scripts/polymarket-search.py sync --quiet
 
 Exit codes:
   0 = success (OK)
@@ -13,10 +23,15 @@ Exit codes:
 """
 
 import argparse
+import fcntl
 import json
 import os
+import re
+import sqlite3
+import subprocess
 import sys
 import time
+import urllib.parse
 import urllib.request
 import urllib.error
 
@@ -26,8 +41,16 @@ import urllib.error
 
 GAMMA_BASE = "https://gamma-api.polymarket.com"
 CACHE_DIR = os.path.join(os.path.expanduser("~"), ".openclaw", "polymarket")
-CACHE_FILE = os.path.join(CACHE_DIR, "search-cache.json")
-CACHE_TTL = 300  # 5 minutes
+CATALOGUE_DB = os.path.join(CACHE_DIR, "market-catalogue.db")
+CATALOGUE_LOCK = os.path.join(CACHE_DIR, "market-catalogue.lock")
+LEGACY_CACHE_FILE = os.path.join(CACHE_DIR, "search-cache.json")
+CACHE_TTL = 300  # 5 minutes — raw Gamma response cache
+CATALOGUE_MAX_AGE = 1800  # Match/rank search and trending locally if synced within 30 min
+PRICE_MAX_AGE = 30  # Prices shown are at most this old (response cache for re-pricing and detail)
+PRICE_FIELDS = ("outcomePrices", "bestBid", "bestAsk", "lastTradePrice", "spread", "volume24hr", "liquidityNum")
+SYNC_MAX_PAGES = 300  # Full sync cap (30k markets)
+SYNC_INCREMENTAL_MAX_PAGES = 50
+FULL_SYNC_INTERVAL = 24 * 3600  # Periodic full sweep catches closures and anything incremental missed
 MAX_RETRIES = 3
 RETRY_BACKOFF = 2  # seconds
 REQUEST_TIMEOUT = 15
@@ -36,51 +59,256 @@ MAX_PAGES_DEEP = 20
 PAGE_SIZE = 100
 
 # ---------------------------------------------------------------------------
-# Cache helpers
+# Catalogue / cache storage
 # ---------------------------------------------------------------------------
 
-def _load_cache():
+CATALOGUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS markets (
+    condition_id TEXT PRIMARY KEY,
+    question TEXT,
+    volume_24h REAL,
+    volume_total REAL,
+    liquidity REAL,
+    end_date TEXT,
+    closed INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT,
+    synced_at REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS markets_volume_24h ON markets(closed, volume_24h);
+CREATE INDEX IF NOT EXISTS markets_volume_total ON markets(closed, volume_total);
+CREATE INDEX IF NOT EXISTS markets_liquidity ON markets(closed, liquidity);
+CREATE INDEX IF NOT EXISTS markets_end_date ON markets(closed, end_date);
+CREATE VIRTUAL TABLE IF NOT EXISTS markets_fts USING fts5(
+    question, group_title, event_title, description,
+    tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    ts REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS http_cache_ts ON http_cache(ts);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# bm25 column weights for markets_fts: question, group_title, event_title, description
+FTS_WEIGHTS = (10.0, 5.0, 3.0, 1.0)
+
+
+def _open_db():
+    """Open market-catalogue.db (catalogue + FTS5 index + Gamma response cache)."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(CATALOGUE_DB, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(CATALOGUE_SCHEMA)
+    if os.path.exists(LEGACY_CACHE_FILE):
+        try:
+            os.remove(LEGACY_CACHE_FILE)  # Superseded by the http_cache table
+        except OSError:
+            pass
+    return conn
+
+
+def _meta_get(conn, key):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _meta_set(conn, key, value):
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+def _cache_get(url, max_age=CACHE_TTL):
+    try:
+        conn = _open_db()
+    except sqlite3.Error:
+        return None
     try:
-        with open(CACHE_FILE) as f:
-            return json.load(f)
-    except (IOError, json.JSONDecodeError):
-        return {}
+        row = conn.execute("SELECT ts, data FROM http_cache WHERE url = ?", (url,)).fetchone()
+    finally:
+        conn.close()
+    if row and time.time() - row[0] < max_age:
+        return json.loads(row[1])
+    return None
+
+
+def _cache_set(url, data):
+    try:
+        conn = _open_db()
+    except sqlite3.Error:
+        return
+    try:
+        now = time.time()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO http_cache (url, ts, data) VALUES (?, ?, ?)",
+                         (url, now, json.dumps(data)))
+            conn.execute("DELETE FROM http_cache WHERE ts < ?", (now - CACHE_TTL,))
+    except sqlite3.Error:
+        pass
+    finally:
+        conn.close()
 
 
-def _save_cache(cache):
+def _to_float(val):
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _upsert_markets(conn, markets, synced_at):
+    """Insert or refresh Gamma market objects in the catalogue and its FTS index."""
+    count = 0
+    for m in markets:
+        cid = (m.get("condition_id", m.get("conditionId")) or "").lower()
+        if not cid:
+            continue
+        events = m.get("events") or []
+        event_title = events[0].get("title", "") if events and isinstance(events[0], dict) else ""
+        conn.execute(
+            "INSERT INTO markets (condition_id, question, volume_24h, volume_total, liquidity, end_date, "
+            "closed, updated_at, synced_at, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(condition_id) DO UPDATE SET question = excluded.question, "
+            "volume_24h = excluded.volume_24h, volume_total = excluded.volume_total, "
+            "liquidity = excluded.liquidity, end_date = excluded.end_date, closed = excluded.closed, "
+            "updated_at = excluded.updated_at, synced_at = excluded.synced_at, data = excluded.data",
+            (
+                cid,
+                m.get("question", ""),
+                _to_float(m.get("volume24hr", m.get("volume_num", 0))),
+                _to_float(m.get("volumeNum", m.get("volume", 0))),
+                _to_float(m.get("liquidityNum", m.get("liquidity_num", 0))),
+                (m.get("endDate", m.get("end_date_iso", "")) or ""),
+                1 if m.get("closed") else 0,
+                m.get("updatedAt", ""),
+                synced_at,
+                json.dumps(m),
+            ),
+        )
+        rowid = conn.execute("SELECT rowid FROM markets WHERE condition_id = ?", (cid,)).fetchone()[0]
+        conn.execute("DELETE FROM markets_fts WHERE rowid = ?", (rowid,))
+        conn.execute(
+            "INSERT INTO markets_fts (rowid, question, group_title, event_title, description) VALUES (?, ?, ?, ?, ?)",
+            (rowid, m.get("question", ""), m.get("groupItemTitle", ""), event_title, m.get("description", "")),
+        )
+        count += 1
+    return count
+
+
+def _catalogue_fresh(conn):
+    """True if the catalogue was synced recently enough to answer queries locally."""
+    last_sync = _meta_get(conn, "last_sync")
+    return bool(last_sync) and time.time() - float(last_sync) < CATALOGUE_MAX_AGE
+
+
+def _spawn_background_sync():
+    """Start a detached incremental sync so the next query can be served locally."""
     try:
-        os.makedirs(CACHE_DIR, exist_ok=True)
-        with open(CACHE_FILE, "w") as f:
-            json.dump(cache, f)
-    except IOError:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "sync", "--quiet"],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
         pass
 
 
-def _cache_get(url):
-    cache = _load_cache()
-    entry = cache.get(url)
-    if entry and time.time() - entry.get("ts", 0) < CACHE_TTL:
-        return entry.get("data")
+def _open_fresh_catalogue(args):
+    """Return an open catalogue connection if it can serve this query, else None.
+
+    A stale catalogue triggers a background sync; the caller falls back to Gamma.
+    """
+    if getattr(args, "live", False):
+        return None
+    try:
+        conn = _open_db()
+    except sqlite3.Error:
+        return None
+    if _catalogue_fresh(conn):
+        return conn
+    conn.close()
+    _spawn_background_sync()
     return None
 
 
-def _cache_set(url, data):
-    cache = _load_cache()
-    # Prune expired entries
-    now = time.time()
-    cache = {k: v for k, v in cache.items() if now - v.get("ts", 0) < CACHE_TTL}
-    cache[url] = {"ts": now, "data": data}
-    _save_cache(cache)
+def _fts_query(query):
+    """Turn free text into an FTS5 OR-query of prefix terms (any keyword may match)."""
+    terms = re.findall(r"\w+", query.lower())
+    return " OR ".join(f'"{t}"*' for t in terms)
+
+
+def catalogue_search(conn, query, limit):
+    """Ranked keyword search over open markets: bm25 relevance, then 24h volume."""
+    fts = _fts_query(query)
+    if not fts:
+        return []
+    rows = conn.execute(
+        f"SELECT m.data FROM markets_fts JOIN markets m ON m.rowid = markets_fts.rowid "
+        f"WHERE markets_fts MATCH ? AND m.closed = 0 "
+        f"ORDER BY bm25(markets_fts, {', '.join(str(w) for w in FTS_WEIGHTS)}), m.volume_24h DESC LIMIT ?",
+        (fts, limit),
+    ).fetchall()
+    return [json.loads(r[0]) for r in rows]
+
+
+TRENDING_SORTS = {
+    # sort name -> (catalogue ORDER BY, Gamma order param, ascending)
+    "volume": ("volume_24h DESC", "volume24hr", "false"),
+    "total": ("volume_total DESC", "volumeNum", "false"),
+    "liquidity": ("liquidity DESC", "liquidityNum", "false"),
+    "ending": ("end_date ASC", "endDate", "true"),
+}
+
+
+def catalogue_trending(conn, sort, limit):
+    order_by = TRENDING_SORTS[sort][0]
+    where = "closed = 0" + (" AND end_date >= strftime('%Y-%m-%dT%H:%M:%SZ', 'now')" if sort == "ending" else "")
+    rows = conn.execute(f"SELECT data FROM markets WHERE {where} ORDER BY {order_by} LIMIT ?", (limit,)).fetchall()
+    return [json.loads(r[0]) for r in rows]
+
+
+def catalogue_row(conn, condition_id):
+    """Catalogue copy of one market regardless of catalogue age — detail's fallback when Gamma is down."""
+    row = conn.execute(
+        "SELECT data, synced_at FROM markets WHERE condition_id = ?", (condition_id.lower(),)
+    ).fetchone()
+    if not row:
+        return None, None
+    return json.loads(row[0]), row[1]
+
+
+def _as_of(ts):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(float(ts))) if ts else None
+
+
+def _remember_markets(markets):
+    """Opportunistically add markets fetched live to the catalogue."""
+    if not markets:
+        return
+    try:
+        conn = _open_db()
+        try:
+            with conn:
+                _upsert_markets(conn, markets, time.time())
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass
 
 # ---------------------------------------------------------------------------
 # HTTP helpers
 # ---------------------------------------------------------------------------
 
-def gamma_get(endpoint):
-    """GET from Gamma API with retries and caching."""
+def gamma_get(endpoint, use_cache=True, max_age=CACHE_TTL):
+    """GET from Gamma API with retries and caching (responses younger than max_age are reused)."""
     url = f"{GAMMA_BASE}{endpoint}"
 
-    cached = _cache_get(url)
+    cached = _cache_get(url, max_age) if use_cache else None
     if cached is not None:
         return cached, None
 
@@ -93,7 +321,8 @@ def gamma_get(endpoint):
             })
             with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT) as resp:
                 data = json.loads(resp.read().decode())
-                _cache_set(url, data)
+                if use_cache:
+                    _cache_set(url, data)
                 return data, None
         except urllib.error.HTTPError as e:
             body = e.read().decode() if e.fp else ""
@@ -105,6 +334,40 @@ def gamma_get(endpoint):
 
     return None, last_err
 
+
+def _condition_id(m):
+    return (m.get("condition_id") or m.get("conditionId") or "").lower()
+
+
+def fetch_live_markets(condition_ids):
+    """Current Gamma market objects for condition_ids, in one request. Returns ({cid: market}, error)."""
+    if not condition_ids:
+        return {}, None
+    query = urllib.parse.urlencode([("condition_ids", cid) for cid in condition_ids]
+                                   + [("limit", len(condition_ids))])
+    data, err = gamma_get(f"/markets?{query}", max_age=PRICE_MAX_AGE)
+    if err:
+        return {}, err
+    markets = data if isinstance(data, list) else (data or {}).get("markets", (data or {}).get("data", []))
+    return {_condition_id(m): m for m in markets if _condition_id(m)}, None
+
+
+def reprice_markets(markets):
+    """Overlay live price/volume fields onto catalogue market objects.
+
+    Returns True if the prices are live; on a Gamma error the catalogue
+    prices are left in place and the caller labels them with the sync time.
+    """
+    live, err = fetch_live_markets([_condition_id(m) for m in markets if _condition_id(m)])
+    if err:
+        return False
+    for m in markets:
+        fresh = live.get(_condition_id(m))
+        if fresh:
+            m.update({k: fresh[k] for k in PRICE_FIELDS if k in fresh})
+    _remember_markets(list(live.values()))
+    return True
+
 # ---------------------------------------------------------------------------
 # Format helpers
 # ---------------------------------------------------------------------------
@@ -232,18 +495,35 @@ def _search_via_markets_pagination(query, limit, max_pages):
 def cmd_search(args):
     deep = getattr(args, "deep", False)
     max_pages = MAX_PAGES_DEEP if deep else MAX_PAGES
+    matches = []
+    as_of = None
 
-    # 1. Try events endpoint (server-side title search)
-    matches, events_err = _search_via_events(args.query, args.limit)
+    # 0. Local catalogue (FTS5, bm25-ranked) when it's fresh; prices re-fetched live
+    conn = _open_fresh_catalogue(args)
+    if conn:
+        try:
+            matches = catalogue_search(conn, args.query, args.limit)
+            as_of = _as_of(_meta_get(conn, "last_sync"))
+        finally:
+            conn.close()
+
+    live_prices = True
+    if matches:
+        search_method = "catalogue"
+        live_prices = reprice_markets(matches)
+    else:
+        # 1. Try events endpoint (server-side title search)
+        matches, events_err = _search_via_events(args.query, args.limit)
 
-    # 2. If events returned nothing, fall back to paginated /markets
-    if not matches:
-        matches, markets_err = _search_via_markets_pagination(args.query, args.limit, max_pages)
-        if not matches and markets_err and not events_err:
-            _fail(f"Gamma API error: {markets_err}", args.json)
-            return 1
+        # 2. If events returned nothing, fall back to paginated /markets
+        if not matches:
+            matches, markets_err = _search_via_markets_pagination(args.query, args.limit, max_pages)
+            if not matches and markets_err and not events_err:
+                _fail(f"Gamma API error: {markets_err}", args.json)
+                return 1
 
-    search_method = "events" if matches and not events_err else "markets"
+        search_method = "events" if matches and not events_err else "markets"
+        _remember_markets(matches)
     matches = matches[:args.limit]
 
     if args.json:
@@ -260,12 +540,16 @@ def cmd_search(args):
                 "end_date": (m.get("endDate", m.get("end_date_iso", "")) or "")[:10],
             })
         print(json.dumps({"status": "OK", "query": args.query, "count": len(results),
-                          "search_method": search_method, "deep": deep, "markets": results}, indent=2))
+                          "search_method": search_method, "deep": deep, "as_of": as_of,
+                          "live_prices": live_prices, "markets": results}, indent=2))
     else:
         if not matches:
             print(f"OK — No markets found matching '{args.query}'")
             return 0
-        mode_label = f" [deep scan: {max_pages * PAGE_SIZE} markets]" if deep else ""
+        if search_method == "catalogue":
+            mode_label = f" [local catalogue as of {as_of}{'; live prices' if live_prices else ''}]"
+        else:
+            mode_label = f" [deep scan: {max_pages * PAGE_SIZE} markets]" if deep else ""
         print(f"=== Polymarket: '{args.query}' ({len(matches)} results{mode_label}) ===\n")
         for m in matches:
             yes, no = _parse_prices(m)
@@ -285,14 +569,28 @@ def cmd_search(args):
 # ---------------------------------------------------------------------------
 
 def cmd_trending(args):
-    data, err = gamma_get(f"/markets?closed=false&order=volume24hr&ascending=false&limit={args.limit}")
-    if err:
-        _fail(f"Gamma API error: {err}", args.json)
-        return 1
+    sort = getattr(args, "sort", "volume")
+    as_of = None
+    live_prices = True
+    conn = _open_fresh_catalogue(args)
+    if conn:
+        try:
+            markets = catalogue_trending(conn, sort, args.limit)
+            as_of = _as_of(_meta_get(conn, "last_sync"))
+        finally:
+            conn.close()
+        live_prices = reprice_markets(markets)
+    else:
+        _, order, ascending = TRENDING_SORTS[sort]
+        data, err = gamma_get(f"/markets?closed=false&order={order}&ascending={ascending}&limit={args.limit}")
+        if err:
+            _fail(f"Gamma API error: {err}", args.json)
+            return 1
 
-    markets = data if isinstance(data, list) else data.get("markets", data.get("data", []))
-    if not markets:
-        markets = []
+        markets = data if isinstance(data, list) else data.get("markets", data.get("data", []))
+        if not markets:
+            markets = []
+        _remember_markets(markets)
 
     top = markets[:args.limit]
 
@@ -309,12 +607,14 @@ def cmd_trending(args):
                 "liquidity": m.get("liquidityNum", m.get("liquidity_num", 0)),
                 "end_date": (m.get("endDate", m.get("end_date_iso", "")) or "")[:10],
             })
-        print(json.dumps({"status": "OK", "count": len(results), "markets": results}, indent=2))
+        print(json.dumps({"status": "OK", "count": len(results), "sort": sort, "as_of": as_of,
+                          "live_prices": live_prices, "markets": results}, indent=2))
     else:
         if not top:
             print("OK — No open markets found")
             return 0
-        print(f"=== Polymarket Trending Markets (Top {len(top)}) ===\n")
+        source = f" [local catalogue as of {as_of}{'; live prices' if live_prices else ''}]" if as_of else ""
+        print(f"=== Polymarket Trending Markets (Top {len(top)} by {sort}){source} ===\n")
         for i, m in enumerate(top, 1):
             yes, no = _parse_prices(m)
             question = m.get("question", "?")
@@ -387,17 +687,32 @@ def cmd_events(args):
 # ---------------------------------------------------------------------------
 
 def cmd_detail(args):
-    data, err = gamma_get(f"/markets?condition_id={args.market_id}")
+    """One market, always priced live; the catalogue copy is only a fallback when Gamma is unreachable."""
+    as_of = None
+    data, err = gamma_get(f"/markets?{urllib.parse.urlencode({'condition_id': args.market_id})}",
+                          use_cache=not getattr(args, "live", False), max_age=PRICE_MAX_AGE)
     if err:
-        _fail(f"Gamma API error: {err}", args.json)
-        return 1
-
-    markets = data if isinstance(data, list) else data.get("markets", data.get("data", []))
-    if not markets:
-        _fail(f"No market found with condition_id: {args.market_id}", args.json)
-        return 1
+        m = None
+        try:
+            conn = _open_db()
+            try:
+                m, synced_at = catalogue_row(conn, args.market_id)
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
+        if m is None:
+            _fail(f"Gamma API error: {err}", args.json)
+            return 1
+        as_of = _as_of(synced_at)
+    else:
+        markets = data if isinstance(data, list) else data.get("markets", data.get("data", []))
+        if not markets:
+            _fail(f"No market found with condition_id: {args.market_id}", args.json)
+            return 1
 
-    m = markets[0]
+        m = markets[0]
+        _remember_markets([m])
     yes, no = _parse_prices(m)
 
     if args.json:
@@ -415,7 +730,8 @@ def cmd_detail(args):
                 "end_date": m.get("endDate", m.get("end_date_iso", "")),
                 "resolution_source": m.get("resolutionSource", m.get("resolution_source", "")),
                 "active": m.get("active", True),
-            }
+            },
+            "as_of": as_of,
         }, indent=2))
     else:
         question = m.get("question", "?")
@@ -438,10 +754,110 @@ def cmd_detail(args):
             print(f"  End Date:       {end[:19]}")
         if res_source:
             print(f"  Resolution:     {res_source}")
+        if as_of:
+            print(f"  As of:          {as_of} (Gamma unreachable — prices from the local catalogue)")
         if desc:
             print(f"\n  Description: {desc[:500]}")
     return 0
 
+# ---------------------------------------------------------------------------
+# sync subcommand
+# ---------------------------------------------------------------------------
+
+def sync_catalogue(full=False):
+    """Refresh the local market catalogue from Gamma. Returns (stats, error).
+
+    Incremental syncs walk /markets newest-updatedAt first and stop at the
+    stored high-water mark. A full sync (first run, --full, or once every
+    FULL_SYNC_INTERVAL) walks every open market and marks anything it didn't
+    see as closed. Concurrent syncs are serialised with a non-blocking flock.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    lock = open(CATALOGUE_LOCK, "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return {"skipped": "sync already running"}, None
+
+    try:
+        conn = _open_db()
+        try:
+            hwm = _meta_get(conn, "updated_hwm") or ""
+            last_full = float(_meta_get(conn, "last_full_sync") or 0)
+            started = time.time()
+            full = full or not hwm or started - last_full > FULL_SYNC_INTERVAL
+            max_pages = SYNC_MAX_PAGES if full else SYNC_INCREMENTAL_MAX_PAGES
+            closed_filter = "closed=false&" if full else ""  # Incremental also sees newly-closed markets
+            newest = hwm
+            upserted = 0
+            pages = 0
+            complete = False
+
+            for page in range(max_pages):
+                data, err = gamma_get(
+                    f"/markets?{closed_filter}order=updatedAt&ascending=false"
+                    f"&limit={PAGE_SIZE}&offset={page * PAGE_SIZE}",
+                    use_cache=False,
+                )
+                if err:
+                    if page == 0:
+                        return None, err
+                    break
+                markets = data if isinstance(data, list) else (data or {}).get("markets", (data or {}).get("data", []))
+                pages += 1
+                if not markets:
+                    complete = True
+                    break
+                fresh = markets if full else [m for m in markets if (m.get("updatedAt") or "") > hwm]
+                with conn:
+                    upserted += _upsert_markets(conn, fresh, started)
+                newest = max([newest] + [m.get("updatedAt") or "" for m in markets])
+                if len(markets) < PAGE_SIZE or len(fresh) < len(markets):
+                    complete = True
+                    break
+
+            with conn:
+                if full and complete:
+                    conn.execute("UPDATE markets SET closed = 1 WHERE closed = 0 AND synced_at < ?", (started,))
+                    _meta_set(conn, "last_full_sync", started)
+                # Only advance the high-water mark past pages we actually walked
+                if complete or full:
+                    _meta_set(conn, "updated_hwm", newest)
+                _meta_set(conn, "last_sync", started)
+            open_count = conn.execute("SELECT COUNT(*) FROM markets WHERE closed = 0").fetchone()[0]
+        finally:
+            conn.close()
+    finally:
+        fcntl.flock(lock, fcntl.LOCK_UN)
+        lock.close()
+
+    return {
+        "mode": "full" if full else "incremental",
+        "pages": pages,
+        "upserted": upserted,
+        "complete": complete,
+        "open_markets": open_count,
+        "duration_ms": int((time.time() - started) * 1000),
+    }, None
+
+
+def cmd_sync(args):
+    stats, err = sync_catalogue(full=getattr(args, "full", False))
+    if err:
+        _fail(f"Gamma API error: {err}", args.json)
+        return 1
+    if args.json:
+        print(json.dumps({"status": "OK", **stats}, indent=2))
+    elif not args.quiet:
+        if stats.get("skipped"):
+            print(f"OK — Skipped: {stats['skipped']}")
+        else:
+            print(f"OK — Catalogue {stats['mode']} sync: {stats['upserted']} markets updated "
+                  f"over {stats['pages']} page(s), {stats['open_markets']} open markets indexed "
+                  f"({stats['duration_ms']} ms)")
+    return 0
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -467,26 +883,37 @@ def main():
     sp_search.add_argument("--query", required=True, help="Search query")
     sp_search.add_argument("--limit", type=int, default=10, help="Max results")
     sp_search.add_argument("--deep", action="store_true", help="Deep scan: search up to 2000 markets instead of 500")
+    sp_search.add_argument("--live", action="store_true", help="Skip the local catalogue and query Gamma directly")
     sp_search.add_argument("--json", action="store_true")
 
     sp_trending = subparsers.add_parser("trending", help="Show trending markets by volume")
     sp_trending.add_argument("--limit", type=int, default=10, help="Number of markets")
+    sp_trending.add_argument("--sort", choices=sorted(TRENDING_SORTS), default="volume",
+                             help="volume (24h), total (all-time volume), liquidity, or ending (soonest)")
+    sp_trending.add_argument("--live", action="store_true", help="Skip the local catalogue and query Gamma directly")
     sp_trending.add_argument("--json", action="store_true")
 
     sp_detail = subparsers.add_parser("detail", help="Show market details")
     sp_detail.add_argument("--market-id", required=True, help="Market condition_id")
+    sp_detail.add_argument("--live", action="store_true", help="Bypass the short price cache")
     sp_detail.add_argument("--json", action="store_true")
 
     sp_events = subparsers.add_parser("events", help="Browse event groups")
     sp_events.add_argument("--limit", type=int, default=10, help="Number of events")
     sp_events.add_argument("--json", action="store_true")
 
+    sp_sync = subparsers.add_parser("sync", help="Refresh the local market catalogue (run from cron)")
+    sp_sync.add_argument("--full", action="store_true", help="Re-walk every open market instead of only recent updates")
+    sp_sync.add_argument("--quiet", action="store_true", help="No output unless something fails")
+    sp_sync.add_argument("--json", action="store_true")
+
     args = parser.parse_args()
     if args.command is None:
         parser.print_help()
         return 1
 
-    cmd_map = {"search": cmd_search, "trending": cmd_trending, "detail": cmd_detail, "events": cmd_events}
+    cmd_map = {"search": cmd_search, "trending": cmd_trending, "detail": cmd_detail, "events": cmd_events,
+               "sync": cmd_sync}
     return cmd_map[args.command](args)
 
 
@@ -24,6 +24,7 @@ Exit codes:
 import argparse
 import json
 import os
+import re
 import sys
 import time
 import urllib.request
@@ -38,9 +39,8 @@ POLYMARKET_DIR = Path.home() / ".openclaw" / "polymarket"
 WALLET_FILE = POLYMARKET_DIR / "wallet.json"
 RISK_CONFIG_FILE = POLYMARKET_DIR / "risk-config.json"
 DAILY_SPEND_FILE = POLYMARKET_DIR / "daily-spend.json"
-TRADE_LOG_FILE = POLYMARKET_DIR / "trade-log.json"
-POSITIONS_FILE = POLYMARKET_DIR / "positions.json"
 RISK_ACK_FILE = POLYMARKET_DIR / "polymarket-risk.json"
+ENDPOINT_CACHE_FILE = POLYMARKET_DIR / "endpoint-cache.json"
 
 CLOB_HOST_DEFAULT = "https://clob.polymarket.com"
 GAMMA_API = "https://gamma-api.polymarket.com"
@@ -58,6 +58,13 @@ RPC_FALLBACKS = [
     "https://polygon-bor-rpc.publicnode.com",
 ]
 
+# Endpoint cache lifetimes (seconds). Trade commands are one-shot processes,
+# so without this every order re-probes hosts and re-derives API creds.
+ENDPOINT_GOOD_TTL = 6 * 3600      # last-known-good CLOB host / RPC
+ENDPOINT_DEAD_TTL = 10 * 60       # negative entry for an unreachable host
+API_CREDS_TTL = 7 * 24 * 3600     # derived L2 API creds (deterministic per wallet)
+CLOB_AUTH_ERRORS = ("unauthorized/invalid api key",)  # CLOB error body for rejected L2 creds
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -373,14 +380,115 @@ def _is_connection_error(exc):
     return any(kw in err_str for kw in ("connection", "refused", "unreachable", "timeout", "errno"))
 
 
+def _load_endpoint_cache():
+    """Load endpoint-cache.json, dropping expired entries."""
+    cache = load_json(ENDPOINT_CACHE_FILE, {}) or {}
+    now = time.time()
+    for key in ("clob", "rpc", "creds"):
+        entry = cache.get(key)
+        if not isinstance(entry, dict) or entry.get("expires_at", 0) <= now:
+            cache.pop(key, None)
+    dead = cache.get("dead") if isinstance(cache.get("dead"), dict) else {}
+    cache["dead"] = {url: exp for url, exp in dead.items() if exp > now}
+    return cache
+
+
+def _save_endpoint_cache(cache):
+    """Atomically write endpoint-cache.json (0600 — it holds API secrets)."""
+    try:
+        ENDPOINT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = ENDPOINT_CACHE_FILE.with_suffix(".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp, ENDPOINT_CACHE_FILE)
+    except OSError:
+        pass  # Cache is an optimization — never fail a trade over it
+
+
+def _cache_endpoint_good(cache, kind, url, latency_ms):
+    """Record url as the last-known-good endpoint for kind ("clob" or "rpc")."""
+    cache[kind] = {
+        "url": url,
+        "latency_ms": round(latency_ms, 1),
+        "expires_at": time.time() + ENDPOINT_GOOD_TTL,
+    }
+    cache.get("dead", {}).pop(url, None)
+
+
+def _cache_endpoint_dead(cache, url):
+    """Record a negative entry so the next run tries url last."""
+    cache.setdefault("dead", {})[url] = time.time() + ENDPOINT_DEAD_TTL
+    for kind in ("clob", "rpc"):
+        if cache.get(kind, {}).get("url") == url:
+            cache.pop(kind, None)
+
+
+def _order_by_health(urls, cache, kind):
+    """Order urls: last-known-good first, then untested, then known-dead."""
+    good = cache.get(kind, {}).get("url")
+    dead = cache.get("dead", {})
+    return sorted(urls, key=lambda u: 0 if u == good else (2 if u in dead else 1))
+
+
+def _is_auth_error(exc):
+    """Check if an exception is the CLOB rejecting our L2 API credentials.
+
+    Only HTTP 401/403 (PolyApiException.status_code, or its string form) or the
+    CLOB's own auth error message count — anything else (bad order, balance,
+    rate limit) must not throw away creds that are still valid.
+    """
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status in (401, 403)
+    err_str = str(exc)
+    if re.search(r"status_code=(401|403)\b", err_str):
+        return True
+    return any(msg in err_str.lower() for msg in CLOB_AUTH_ERRORS)
+
+
+def note_clob_failure(client, exc):
+    """Invalidate cached endpoint state after a failed CLOB call.
+
+    Connection errors mark the client's host dead; auth errors drop the
+    cached API creds so the next run re-derives them.
+    """
+    cache = _load_endpoint_cache()
+    if _is_auth_error(exc):
+        cache.pop("creds", None)
+    elif _is_connection_error(exc) and getattr(client, "host", None):
+        _cache_endpoint_dead(cache, client.host)
+    else:
+        return
+    _save_endpoint_cache(cache)
+
+
+def note_rpc_failure(rpc_url):
+    """Drop rpc_url from the last-known-good cache after a failed call.
+
+    Only fallback RPCs are cached (POLYGON_RPC_URL from .env is never cached),
+    so this only ever demotes an endpoint get_rpc_url() picked itself; the
+    next run probes RPC_FALLBACKS again.
+    """
+    cache = _load_endpoint_cache()
+    if cache.get("rpc", {}).get("url") != rpc_url:
+        return
+    _cache_endpoint_dead(cache, rpc_url)
+    _save_endpoint_cache(cache)
+
+
 def init_clob_client(wallet):
     """Initialize and authenticate CLOB client with proxy failover.
 
-    Tries hosts in order: primary proxy → backup proxy → direct CLOB host.
+    Tries hosts in order: primary proxy → backup proxy → direct CLOB host,
+    reordered by endpoint-cache.json so the last-known-good host goes first
+    and recently-dead hosts go last. Derived API creds are cached per wallet;
+    a fresh known-good host with cached creds needs no network round-trip.
     Logs which host succeeded so the agent knows proxy state.
     """
     try:
         from py_clob_client.client import ClobClient
+        from py_clob_client.clob_types import ApiCreds
     except ImportError:
         return None, "py-clob-client not installed. Run: pip3 install 'py-clob-client==0.34.6'"
 
@@ -395,12 +503,41 @@ def init_clob_client(wallet):
             hosts.append(h)
             seen.add(h)
 
+    cache = _load_endpoint_cache()
+    known_good = cache.get("clob", {}).get("url")
+    hosts = _order_by_health(hosts, cache, "clob")
+
+    address = (wallet.get("address") or "").lower()
+    cached_creds = cache.get("creds")
+    if cached_creds and cached_creds.get("address") != address:
+        cached_creds = None
+
     errors = []
     for host in hosts:
         try:
+            started = time.monotonic()
             client = ClobClient(host, key=wallet["private_key"], chain_id=CHAIN_ID)
-            api_creds = client.create_or_derive_api_creds()
-            client.set_api_creds(api_creds)
+            if cached_creds:
+                client.set_api_creds(ApiCreds(
+                    api_key=cached_creds["api_key"],
+                    api_secret=cached_creds["api_secret"],
+                    api_passphrase=cached_creds["api_passphrase"],
+                ))
+                if host != known_good:
+                    client.get_ok()  # Cheap connectivity probe for an unproven host
+            else:
+                api_creds = client.create_or_derive_api_creds()
+                client.set_api_creds(api_creds)
+                cache["creds"] = {
+                    "address": address,
+                    "api_key": api_creds.api_key,
+                    "api_secret": api_creds.api_secret,
+                    "api_passphrase": api_creds.api_passphrase,
+                    "expires_at": time.time() + API_CREDS_TTL,
+                }
+            if host != known_good or not cached_creds:
+                _cache_endpoint_good(cache, "clob", host, (time.monotonic() - started) * 1000)
+                _save_endpoint_cache(cache)
             if host != primary:
                 print(f"NOTE: Connected via fallback host {host} (primary {primary} was unreachable)", file=sys.stderr)
             return client, None
@@ -408,26 +545,49 @@ def init_clob_client(wallet):
             errors.append(f"{host}: {e}")
             if not _is_connection_error(e):
                 # Non-connection error (e.g. auth failure) — don't try other hosts
+                if cached_creds and _is_auth_error(e):
+                    cache.pop("creds", None)
+                _save_endpoint_cache(cache)
                 return None, f"CLOB client init failed at {host}: {e}"
+            _cache_endpoint_dead(cache, host)
             continue
 
+    _save_endpoint_cache(cache)
     return None, f"All CLOB hosts unreachable: {'; '.join(errors)}"
 
 
+def _load_sibling(filename):
+    """Load a shared module deployed alongside this script (~/scripts/)."""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(
+        filename[:-3].replace("-", "_"), Path(__file__).resolve().parent / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_journal = _load_sibling("polymarket-journal.py")  # SQLite trade journal, FIFO ledger, snapshots
+_chain = _load_sibling("polymarket-chain.py")  # Multicall3 / batched balance reads
+open_journal = _journal.open_journal
+sync_ledger = _journal.sync_ledger
+
+
 def had_recent_sell(seconds=60):
     """Check if a sell was logged within the last N seconds (settlement delay)."""
     from datetime import datetime, timezone, timedelta
-    log = load_json(TRADE_LOG_FILE, [])
-    if not log:
+    conn = open_journal()
+    try:
+        recent = conn.execute("SELECT action, timestamp FROM trades ORDER BY seq DESC LIMIT 10").fetchall()
+    finally:
+        conn.close()
+    if not recent:
         return False
     cutoff = datetime.now(timezone.utc) - timedelta(seconds=seconds)
-    for entry in reversed(log[-10:]):
-        action = entry.get("action", "").upper()
-        ts_str = entry.get("timestamp", "")
+    for action, ts_str in recent:
         if action != "SELL":
             continue
         try:
-            ts = datetime.fromisoformat(ts_str)
+            ts = datetime.fromisoformat(ts_str or "")
             if ts.tzinfo is None:
                 ts = ts.replace(tzinfo=timezone.utc)
             if ts >= cutoff:
@@ -438,64 +598,118 @@ def had_recent_sell(seconds=60):
 
 
 def log_trade(entry):
-    """Append a trade entry to trade-log.json."""
-    log = load_json(TRADE_LOG_FILE, [])
-    log.append(entry)
-    save_json(TRADE_LOG_FILE, log)
+    """Append a trade entry to the journal, fold it into the P&L ledger and refresh trade-log.json."""
+    conn = open_journal()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO trades (timestamp, action, order_id, token_id, entry) VALUES (?, ?, ?, ?, ?)",
+                _journal.trade_row(entry),
+            )
+        sync_ledger(conn)
+        _journal.export_trade_log_snapshot(conn)
+    finally:
+        conn.close()
 
 
 def update_trade_log_entry(order_id, updates):
-    """Update an existing trade log entry by order_id."""
-    log = load_json(TRADE_LOG_FILE, [])
-    for entry in reversed(log):
-        if entry.get("order_id") == order_id:
+    """Update the most recent journal entry for order_id."""
+    conn = open_journal()
+    try:
+        with conn:
+            row = conn.execute(
+                "SELECT seq, entry FROM trades WHERE order_id = ? ORDER BY seq DESC LIMIT 1",
+                (order_id,),
+            ).fetchone()
+            if not row:
+                return
+            entry = json.loads(row[1])
             entry.update(updates)
-            break
-    save_json(TRADE_LOG_FILE, log)
+            conn.execute(
+                "UPDATE trades SET timestamp = ?, action = ?, order_id = ?, token_id = ?, entry = ? WHERE seq = ?",
+                _journal.trade_row(entry) + (row[0],),
+            )
+            _journal.invalidate_ledger(conn, row[0])
+        _journal.export_trade_log_snapshot(conn)
+    finally:
+        conn.close()
+
+
+def find_trades_by_order_ids(order_ids):
+    """Look up journal entries by order_id via the index. Returns {order_id: entry}."""
+    order_ids = [oid for oid in order_ids if oid]
+    if not order_ids:
+        return {}
+    conn = open_journal()
+    try:
+        found = {}
+        for i in range(0, len(order_ids), 500):  # Stay under SQLite's bound-parameter limit
+            chunk = order_ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for oid, entry in conn.execute(
+                f"SELECT order_id, entry FROM trades WHERE order_id IN ({placeholders}) ORDER BY seq",
+                chunk,
+            ):
+                found[oid] = json.loads(entry)
+        return found
+    finally:
+        conn.close()
 
 
 def update_positions(market_id, market_question, outcome, token_id, shares, avg_price, side):
-    """Update positions.json after a trade."""
-    positions = load_json(POSITIONS_FILE, [])
-
-    existing = None
-    for p in positions:
-        if p.get("token_id") == token_id:
-            existing = p
-            break
-
-    if side == "BUY":
-        if existing:
-            old_shares = existing.get("shares", 0)
-            old_cost = existing.get("avg_price", 0) * old_shares
-            new_cost = avg_price * shares
-            total_shares = old_shares + shares
-            existing["shares"] = total_shares
-            existing["avg_price"] = (old_cost + new_cost) / total_shares if total_shares > 0 else 0
-            existing["updated_at"] = datetime.now(timezone.utc).isoformat()
-        else:
-            positions.append({
-                "market_id": market_id,
-                "question": market_question,
-                "outcome": outcome,
-                "token_id": token_id,
-                "shares": shares,
-                "avg_price": avg_price,
-                "opened_at": datetime.now(timezone.utc).isoformat(),
-                "updated_at": datetime.now(timezone.utc).isoformat(),
-            })
-    elif side == "SELL":
-        if existing:
-            existing["shares"] = max(0, existing.get("shares", 0) - shares)
-            existing["updated_at"] = datetime.now(timezone.utc).isoformat()
-            if existing["shares"] <= 0:
-                positions.remove(existing)
+    """Update the materialised position for token_id after a trade."""
+    conn = open_journal()
+    try:
+        with conn:
+            row = conn.execute("SELECT position FROM positions WHERE token_id = ?", (token_id,)).fetchone()
+            existing = json.loads(row[0]) if row else None
+            now = datetime.now(timezone.utc).isoformat()
+
+            if side == "BUY":
+                if existing:
+                    old_shares = existing.get("shares", 0)
+                    old_cost = existing.get("avg_price", 0) * old_shares
+                    new_cost = avg_price * shares
+                    total_shares = old_shares + shares
+                    existing["shares"] = total_shares
+                    existing["avg_price"] = (old_cost + new_cost) / total_shares if total_shares > 0 else 0
+                    existing["updated_at"] = now
+                else:
+                    existing = {
+                        "market_id": market_id,
+                        "question": market_question,
+                        "outcome": outcome,
+                        "token_id": token_id,
+                        "shares": shares,
+                        "avg_price": avg_price,
+                        "opened_at": now,
+                        "updated_at": now,
+                    }
+            elif side == "SELL":
+                if not existing:
+                    return
+                existing["shares"] = max(0, existing.get("shares", 0) - shares)
+                existing["updated_at"] = now
 
-    save_json(POSITIONS_FILE, positions)
+            if existing["shares"] <= 0:
+                conn.execute("DELETE FROM positions WHERE token_id = ?", (token_id,))
+            else:
+                conn.execute(
+                    "INSERT INTO positions (token_id, position) VALUES (?, ?) "
+                    "ON CONFLICT(token_id) DO UPDATE SET position = excluded.position",
+                    (token_id, json.dumps(existing)),
+                )
+        _journal.export_positions_snapshot(conn)
+    finally:
+        conn.close()
 
 
 def get_rpc_url():
-    """Read POLYGON_RPC_URL from env file, or find a working fallback."""
+    """Read POLYGON_RPC_URL from env file, or find a working fallback.
+
+    The fallback probe result is kept in endpoint-cache.json, so later runs
+    reuse the last-known-good RPC instead of probing again.
+    """
     if ENV_FILE.exists():
         with open(ENV_FILE) as f:
             for line in f:
@@ -504,16 +718,25 @@ def get_rpc_url():
                     val = line.split("=", 1)[1].strip().strip('"').strip("'")
                     if val:
                         return val
-    for rpc in RPC_FALLBACKS:
+    cache = _load_endpoint_cache()
+    cached = cache.get("rpc", {}).get("url")
+    if cached in RPC_FALLBACKS:
+        return cached
+    for rpc in _order_by_health(RPC_FALLBACKS, cache, "rpc"):
         try:
+            started = time.monotonic()
             payload = json.dumps({"jsonrpc": "2.0", "method": "eth_blockNumber", "params": [], "id": 1}).encode()
             req = urllib.request.Request(rpc, data=payload, headers={"Content-Type": "application/json"})
             resp = urllib.request.urlopen(req, timeout=5)
             data = json.loads(resp.read().decode())
             if "result" in data:
+                _cache_endpoint_good(cache, "rpc", rpc, (time.monotonic() - started) * 1000)
+                _save_endpoint_cache(cache)
                 return rpc
         except Exception:
-            continue
+            pass
+        _cache_endpoint_dead(cache, rpc)
+    _save_endpoint_cache(cache)
     return RPC_FALLBACKS[0]
 
 
@@ -545,28 +768,17 @@ def get_clob_host():
 
 
 def check_usdc_balance(wallet_address):
-    """Check USDC.e and native USDC balances. Returns (usdc_e, usdc_native) or (None, None)."""
-    rpc_url = get_rpc_url()
-    addr_padded = wallet_address[2:].lower().zfill(64)
-    call_data = "0x70a08231" + addr_padded  # balanceOf(address)
+    """Check USDC.e and native USDC balances. Returns (usdc_e, usdc_native) or (None, None).
 
-    balances = {}
-    for label, token_addr in [("usdc_e", USDC_E), ("usdc_native", USDC_NATIVE)]:
-        try:
-            payload = json.dumps({
-                "jsonrpc": "2.0",
-                "method": "eth_call",
-                "params": [{"to": token_addr, "data": call_data}, "latest"],
-                "id": 1,
-            }).encode()
-            req = urllib.request.Request(rpc_url, data=payload, headers={"Content-Type": "application/json"})
-            resp = urllib.request.urlopen(req, timeout=10)
-            data = json.loads(resp.read().decode())
-            raw = data.get("result", "0x0")
-            balances[label] = int(raw, 16) / 1e6 if raw and raw != "0x" else 0.0
-        except Exception:
-            balances[label] = None
-    return balances.get("usdc_e"), balances.get("usdc_native")
+    Both balanceOf calls go out as a single JSON-RPC batch, or as two single
+    eth_calls on RPCs that reject batches.
+    """
+    rpc_url = get_rpc_url()
+    values = _chain.erc20_balances(rpc_url, wallet_address, [USDC_E, USDC_NATIVE])
+    if all(v is None for v in values):
+        note_rpc_failure(rpc_url)
+    usdc_e, usdc_native = (v / 1e6 if v is not None else None for v in values)
+    return usdc_e, usdc_native
 
 
 def output_result(msg, json_mode=False, data=None):
@@ -998,6 +1210,7 @@ def cmd_buy(args):
                 {"status": "FAIL", "error": "approval_needed"},
             )
             return 1
+        note_clob_failure(client, e)
         output_result(
             f"FAIL — Order failed: {e}",
             args.json,
@@ -1308,6 +1521,7 @@ def cmd_sell(args):
         signed_order = client.create_order(order_args)
         resp = client.post_order(signed_order, order_type)
     except Exception as e:
+        note_clob_failure(client, e)
         output_result(
             f"FAIL — Sell order failed: {e}",
             args.json,
@@ -1564,13 +1778,9 @@ def cmd_check_orders(args):
         output_result("OK — No open orders", args.json, {"status": "OK", "orders": [], "count": 0})
         return 0
 
-    # Enrich with trade log data for market question
-    trade_log = load_json(TRADE_LOG_FILE, [])
-    order_id_to_question = {}
-    for t in trade_log:
-        oid = t.get("order_id", "")
-        if oid:
-            order_id_to_question[oid] = t.get("market_question", "")
+    # Enrich with trade journal data for market question (indexed by order_id)
+    journal_entries = find_trades_by_order_ids([o.get("id", o.get("order_id", "")) for o in orders])
+    order_id_to_question = {oid: t.get("market_question", "") for oid, t in journal_entries.items()}
 
     enriched = []
     now = datetime.now(timezone.utc)
@@ -16,7 +16,6 @@ Exit codes:
 import argparse
 import json
 import os
-import subprocess
 import sys
 import time
 from pathlib import Path
@@ -138,20 +137,163 @@ def output(msg, json_mode=False, data=None):
         print(msg)
 
 
-def get_token_balance(w3, token_addr, wallet_addr, retries=3):
-    """Get ERC-20 token balance in human-readable units (6 decimals for USDC).
-    Retries on RPC timeout to prevent false-zero readings."""
-    contract = w3.eth.contract(address=w3.to_checksum_address(token_addr), abi=ERC20_ABI)
+# ---------------------------------------------------------------------------
+# Wallet RPC layer
+# ---------------------------------------------------------------------------
+# One requests.Session backs both the raw JSON-RPC batches and the Web3
+# provider, so every call in a run reuses the same keep-alive connection.
+# The reads each subcommand needs up front (chain id, gas price, nonce,
+# balances, allowances) go out as a single JSON-RPC batch instead of one
+# round-trip apiece. Chain id is fetched once per process; gas price is
+# reused for GAS_PRICE_TTL seconds.
+
+GAS_PRICE_TTL = 15
+RPC_RETRIES = 3
+
+SELECTOR_BALANCE_OF = "0x70a08231"
+SELECTOR_ALLOWANCE = "0xdd62ed3e"
+
+_session = None
+_rpc_cache = {"no_batch": set()}  # "chain_id" -> int, "gas_price" -> (wei, fetched_at), "no_batch" -> {rpc_url}
+
+
+def rpc_session():
+    """Process-wide HTTP session shared by rpc_batch() and connect_web3()."""
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+        _session.headers["Content-Type"] = "application/json"
+    return _session
+
+
+def connect_web3(rpc_url):
+    """Web3 instance riding the shared session (used for signing, sending, receipts)."""
+    from web3 import Web3
+    return Web3(Web3.HTTPProvider(rpc_url, session=rpc_session(), request_kwargs={"timeout": 30}))
+
+
+def _word(addr):
+    return addr[2:].lower().zfill(64)
+
+
+def balance_of_call(token_addr, owner):
+    return ("eth_call", [{"to": token_addr, "data": SELECTOR_BALANCE_OF + _word(owner)}, "latest"])
+
+
+def allowance_call(token_addr, owner, spender):
+    return ("eth_call", [{"to": token_addr, "data": SELECTOR_ALLOWANCE + _word(owner) + _word(spender)}, "latest"])
+
+
+def _post_rpc(rpc_url, payload):
+    resp = rpc_session().post(rpc_url, json=payload, timeout=15)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _batch_rejected(exc):
+    """True for an HTTP 4xx on a batch POST — the endpoint doesn't take batches.
+
+    429 is rate limiting, not a batch problem, so it stays a retryable error.
+    """
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status is not None and 400 <= status < 500 and status != 429
+
+
+def rpc_batch(rpc_url, calls, retries=RPC_RETRIES):
+    """Send [(method, params), ...] as one JSON-RPC batch; returns raw results in order.
+
+    Any per-call error fails the whole attempt and the batch is retried (2s, 4s)
+    — a transient timeout must never surface as a false-zero balance. Endpoints
+    that reject batches (a non-list reply or an HTTP 4xx) get the same calls one
+    by one over the same session, and aren't sent batches again this process.
+    """
+    payload = [{"jsonrpc": "2.0", "id": i, "method": m, "params": p} for i, (m, p) in enumerate(calls)]
     last_err = None
     for attempt in range(retries):
         try:
-            raw = contract.functions.balanceOf(w3.to_checksum_address(wallet_addr)).call()
-            return raw / 1e6
+            replies = None
+            if rpc_url not in _rpc_cache["no_batch"]:
+                try:
+                    replies = _post_rpc(rpc_url, payload)
+                except Exception as e:
+                    if not _batch_rejected(e):
+                        raise
+            if not isinstance(replies, list):
+                _rpc_cache["no_batch"].add(rpc_url)
+                replies = [dict(_post_rpc(rpc_url, call), id=call["id"]) for call in payload]
+            by_id = {r.get("id"): r for r in replies}
+            results = []
+            for i, (method, _) in enumerate(calls):
+                reply = by_id.get(i)
+                if reply is None or "error" in reply or reply.get("result") is None:
+                    raise RuntimeError(f"{method}: {(reply or {}).get('error', 'no result')}")
+                results.append(reply["result"])
+            return results
         except Exception as e:
             last_err = e
             if attempt < retries - 1:
                 time.sleep(2 * (attempt + 1))
-    raise RuntimeError(f"Balance check failed after {retries} attempts: {last_err}")
+    raise RuntimeError(f"RPC failed after {retries} attempts: {last_err}")
+
+
+def read_wallet_state(rpc_url, owner, spender=None, nonce=False):
+    """Everything a subcommand needs before signing, in one round-trip.
+
+    Returns {"chain_id", "gas_price", "pol_wei", "balances": {token: raw},
+    "allowances": {token: raw} (when spender given), "nonce" (when asked)}.
+    """
+    calls = [("eth_getBalance", [owner, "latest"])]
+    calls += [balance_of_call(addr, owner) for addr in TOKEN_MAP.values()]
+    if spender:
+        calls += [allowance_call(addr, owner, spender) for addr in TOKEN_MAP.values()]
+    if nonce:
+        calls.append(("eth_getTransactionCount", [owner, "pending"]))
+    if "chain_id" not in _rpc_cache:
+        calls.append(("eth_chainId", []))
+    gas_cached = _rpc_cache.get("gas_price")
+    if not gas_cached or time.time() - gas_cached[1] > GAS_PRICE_TTL:
+        calls.append(("eth_gasPrice", []))
+
+    results = iter(int(r, 16) for r in rpc_batch(rpc_url, calls))
+    state = {"pol_wei": next(results)}
+    state["balances"] = {name: next(results) for name in TOKEN_MAP}
+    if spender:
+        state["allowances"] = {name: next(results) for name in TOKEN_MAP}
+    if nonce:
+        state["nonce"] = next(results)
+    if "chain_id" not in _rpc_cache:
+        _rpc_cache["chain_id"] = next(results)
+    if not gas_cached or time.time() - gas_cached[1] > GAS_PRICE_TTL:
+        _rpc_cache["gas_price"] = (next(results), time.time())
+    state["chain_id"] = _rpc_cache["chain_id"]
+    state["gas_price"] = _rpc_cache["gas_price"][0]
+    return state
+
+
+def gas_price(rpc_url):
+    """Gas price in wei, refreshed at most every GAS_PRICE_TTL seconds."""
+    cached = _rpc_cache.get("gas_price")
+    if cached and time.time() - cached[1] <= GAS_PRICE_TTL:
+        return cached[0]
+    value = int(rpc_batch(rpc_url, [("eth_gasPrice", [])])[0], 16)
+    _rpc_cache["gas_price"] = (value, time.time())
+    return value
+
+
+def load_wallet_state(rpc_url, address, json_mode, spender=None, nonce=False):
+    """read_wallet_state() with the subcommands' shared FAIL handling. Returns state or None."""
+    try:
+        state = read_wallet_state(rpc_url, address, spender=spender, nonce=nonce)
+    except Exception as e:
+        output(f"FAIL — Cannot read wallet state from Polygon RPC {rpc_url}: {e}", json_mode,
+               {"status": "FAIL", "error": "rpc_connection_failed", "detail": str(e)})
+        return None
+    if state["chain_id"] != CHAIN_ID:
+        output(f"FAIL — RPC {rpc_url} is on chain {state['chain_id']}, expected Polygon ({CHAIN_ID})", json_mode,
+               {"status": "FAIL", "error": "wrong_chain", "chain_id": state["chain_id"]})
+        return None
+    return state
 
 
 # ---------------------------------------------------------------------------
@@ -203,35 +345,22 @@ def cmd_transfer(args):
         return 1
 
     rpc_url = get_rpc_url()
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
-    if not w3.is_connected():
-        output(f"FAIL — Cannot connect to Polygon RPC: {rpc_url}", args.json,
-               {"status": "FAIL", "error": "rpc_connection_failed"})
-        return 1
-
     address_cs = Web3.to_checksum_address(wallet["address"])
     private_key = wallet["private_key"]
 
-    # Retry nonce fetch — RPC timeouts at this step would crash the withdrawal
-    nonce = None
-    for attempt in range(3):
-        try:
-            nonce = w3.eth.get_transaction_count(address_cs)
-            break
-        except Exception as e:
-            if attempt < 2:
-                time.sleep(2 * (attempt + 1))
-            else:
-                output(f"FAIL — Could not fetch nonce after 3 attempts: {e}", args.json,
-                       {"status": "FAIL", "error": "nonce_fetch_failed", "detail": str(e)})
-                return 1
+    # Chain id, nonce, gas price and all balances in one batch (retried on RPC timeouts)
+    state = load_wallet_state(rpc_url, address_cs, args.json, nonce=True)
+    if state is None:
+        return 1
+    w3 = connect_web3(rpc_url)
+    nonce = state["nonce"]
 
     token_name = args.token.lower()
 
     if token_name == "pol":
         # Native POL/MATIC transfer
         value_wei = w3.to_wei(amount, "ether")
-        bal_wei = w3.eth.get_balance(address_cs)
+        bal_wei = state["pol_wei"]
         if bal_wei < value_wei:
             bal_human = bal_wei / 1e18
             output(
@@ -247,7 +376,7 @@ def cmd_transfer(args):
             "value": value_wei,
             "nonce": nonce,
             "gas": 21000,
-            "gasPrice": w3.eth.gas_price,
+            "gasPrice": state["gas_price"],
             "chainId": CHAIN_ID,
         }
         unit = "POL"
@@ -265,7 +394,7 @@ def cmd_transfer(args):
         token_addr_cs = Web3.to_checksum_address(token_addr)
 
         # Check balance first
-        balance = get_token_balance(w3, token_addr, wallet["address"])
+        balance = state["balances"][token_name] / 1e6  # 6 decimals for USDC
         if balance < amount:
             output(
                 f"FAIL — Insufficient {token_name.upper()} balance: ${balance:.2f} (need ${amount:.2f})",
@@ -280,7 +409,7 @@ def cmd_transfer(args):
             "from": address_cs,
             "nonce": nonce,
             "gas": 100000,
-            "gasPrice": w3.eth.gas_price,
+            "gasPrice": state["gas_price"],
             "chainId": CHAIN_ID,
         })
         unit = token_name.upper()
@@ -343,12 +472,51 @@ def cmd_transfer(args):
 # ---------------------------------------------------------------------------
 
 def cmd_balance(args):
-    """Delegate to polymarket-setup-creds.py status for balance info."""
-    cmd = ["python3", str(Path.home() / "scripts" / "polymarket-setup-creds.py"), "status"]
-    if args.json:
-        cmd.append("--json")
-    result = subprocess.run(cmd)
-    return result.returncode
+    """POL, USDC and USDC.e balances plus swap-router allowances in one RPC round-trip.
+
+    For credentials and Polymarket exchange approvals use
+    polymarket-setup-creds.py status.
+    """
+    wallet = load_wallet()
+    if not wallet:
+        output(
+            "FAIL — No wallet found at ~/.openclaw/polymarket/wallet.json\n"
+            "Run: bash ~/scripts/setup-polymarket-wallet.sh",
+            args.json,
+            {"status": "FAIL", "error": "wallet_not_found"},
+        )
+        return 1
+
+    rpc_url = get_rpc_url()
+    state = load_wallet_state(rpc_url, wallet["address"], args.json, spender=UNISWAP_V3_ROUTER)
+    if state is None:
+        return 1
+
+    balances = {
+        "usdc_e": state["balances"]["usdc.e"] / 1e6,
+        "usdc_native": state["balances"]["usdc"] / 1e6,
+        "pol_matic": state["pol_wei"] / 1e18,
+    }
+    router_approved = {name: raw > 0 for name, raw in state["allowances"].items()}
+    output(
+        f"OK — {wallet['address']}\n"
+        f"  USDC.e: ${balances['usdc_e']:.2f}  (Polymarket collateral)\n"
+        f"  USDC:   ${balances['usdc_native']:.2f}\n"
+        f"  POL:    {balances['pol_matic']:.4f}\n"
+        f"  Swap router approved: USDC={'yes' if router_approved['usdc'] else 'no'}, "
+        f"USDC.e={'yes' if router_approved['usdc.e'] else 'no'}",
+        args.json,
+        {
+            "status": "OK",
+            "address": wallet["address"],
+            "balances": balances,
+            "swap_router_allowance": {
+                name: "unlimited" if raw >= 2**255 else raw / 1e6 for name, raw in state["allowances"].items()
+            },
+            "gas_price_gwei": state["gas_price"] / 1e9,
+        },
+    )
+    return 0
 
 
 # ---------------------------------------------------------------------------
@@ -411,12 +579,6 @@ def cmd_swap(args):
         return 1
 
     rpc_url = get_rpc_url()
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
-    if not w3.is_connected():
-        output(f"FAIL — Cannot connect to Polygon RPC: {rpc_url}", args.json,
-               {"status": "FAIL", "error": "rpc_connection_failed"})
-        return 1
-
     address_cs = Web3.to_checksum_address(wallet["address"])
     private_key = wallet["private_key"]
 
@@ -424,8 +586,16 @@ def cmd_swap(args):
     token_out_addr = Web3.to_checksum_address(TOKEN_MAP[token_to])
     router_addr = Web3.to_checksum_address(UNISWAP_V3_ROUTER)
 
+    # Chain id, balances, router allowance, nonce and gas price in one batch
+    state = load_wallet_state(rpc_url, address_cs, args.json, spender=router_addr, nonce=True)
+    if state is None:
+        return 1
+    w3 = connect_web3(rpc_url)
+    # Tracked locally from here on: bumped after each tx we broadcast
+    nonce = state["nonce"]
+
     # Check source token balance
-    balance = get_token_balance(w3, TOKEN_MAP[token_from], wallet["address"])
+    balance = state["balances"][token_from] / 1e6
     if balance < amount:
         output(
             f"FAIL — Insufficient {token_from.upper()} balance: ${balance:.2f} (need ${amount:.2f})",
@@ -439,24 +609,24 @@ def cmd_swap(args):
 
     # Step 1: Check and set allowance for router
     token_in_contract = w3.eth.contract(address=token_in_addr, abi=ERC20_ABI)
-    current_allowance = token_in_contract.functions.allowance(address_cs, router_addr).call()
+    current_allowance = state["allowances"][token_from]
 
     if current_allowance < amount_in:
         if not args.json:
             print(f"  Approving Uniswap V3 Router to spend {token_from.upper()}...")
         try:
-            nonce = w3.eth.get_transaction_count(address_cs)
             approve_tx = token_in_contract.functions.approve(
                 router_addr, 2**256 - 1
             ).build_transaction({
                 "from": address_cs,
                 "nonce": nonce,
                 "gas": 100000,
-                "gasPrice": w3.eth.gas_price,
+                "gasPrice": gas_price(rpc_url),
                 "chainId": CHAIN_ID,
             })
             signed = w3.eth.account.sign_transaction(approve_tx, private_key)
             tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
+            nonce += 1
             receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
             if receipt.status != 1:
                 output("FAIL — Approval transaction reverted", args.json,
@@ -479,7 +649,6 @@ def cmd_swap(args):
 
     for fee_tier in SWAP_FEE_TIERS:
         try:
-            nonce = w3.eth.get_transaction_count(address_cs)
             swap_params = (
                 token_in_addr,    # tokenIn
                 token_out_addr,   # tokenOut
@@ -494,11 +663,12 @@ def cmd_swap(args):
                 "from": address_cs,
                 "nonce": nonce,
                 "gas": 300000,
-                "gasPrice": w3.eth.gas_price,
+                "gasPrice": gas_price(rpc_url),
                 "chainId": CHAIN_ID,
             })
             signed = w3.eth.account.sign_transaction(swap_tx, private_key)
             tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
+            nonce += 1  # consumed even if the swap reverts
             receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
 
             if receipt.status == 1:
@@ -587,7 +757,7 @@ def main():
     sp_transfer.add_argument("--json", action="store_true", help="Output as JSON")
 
     # balance
-    sp_balance = subparsers.add_parser("balance", help="Check wallet balances (delegates to setup-creds status)")
+    sp_balance = subparsers.add_parser("balance", help="Check POL/USDC/USDC.e balances and swap-router allowances")
     sp_balance.add_argument("--json", action="store_true", help="Output as JSON")
 
     # swap
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+portfolio-all.py — One portfolio view across Polymarket, Kalshi and Solana.
+
+Runs the per-venue scripts (polymarket-portfolio.py, kalshi-portfolio.py,
+solana-positions.py) concurrently under one shared timeout, normalises their
+output into a single schema and prints each venue as soon as it returns.
+The last good result per venue is cached, so a slow or failing venue is
+shown "as of" its previous snapshot instead of blocking the answer.
+
+Usage:
+  python3 ~/scripts/portfolio-all.py summary [--timeout 25] [--venues polymarket,kalshi,solana] [--json] [--stream]
+  python3 ~/scripts/portfolio-all.py summary --cached [--json]
+
+  --stream  With --json: emit one JSON line per venue as it arrives, then a
+            final {"type": "total", ...} line (NDJSON).
+  --cached  Print the last snapshot without touching the network.
+
+Exit codes:
+  0 = success (OK) — at least one venue reported (live or cached)
+  1 = error (FAIL) — nothing configured, or every venue failed with no snapshot
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+HOME_SCRIPTS_DIR = Path.home() / "scripts"
+PREDICTION_DIR = Path.home() / ".openclaw" / "prediction-markets"
+SNAPSHOT_FILE = PREDICTION_DIR / "portfolio-snapshot.json"
+ENV_FILE = Path.home() / ".openclaw" / ".env"
+DEFAULT_TIMEOUT = 25  # seconds, shared across all venues
+
+VENUES = {
+    # venue -> (script, args, "is configured" check)
+    "polymarket": ("polymarket-portfolio.py", ["summary", "--json"],
+                   lambda: (Path.home() / ".openclaw" / "polymarket" / "wallet.json").exists()),
+    "kalshi": ("kalshi-portfolio.py", ["detail", "--json"],
+               lambda: (PREDICTION_DIR / "kalshi-creds.json").exists()),
+    "solana": ("solana-positions.py", ["summary", "--json"],
+               lambda: bool(_read_env_var("SOLANA_WALLET_ADDRESS"))),
+}
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def load_json(path, default=None):
+    if not path.exists():
+        return default
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return default
+
+
+def save_json(path, data):
+    """Atomic write with 0600 permissions."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _read_env_var(name):
+    if os.environ.get(name):
+        return os.environ[name]
+    if not ENV_FILE.exists():
+        return None
+    try:
+        with open(ENV_FILE) as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith(f"{name}="):
+                    return line.split("=", 1)[1].strip().strip('"').strip("'")
+    except IOError:
+        pass
+    return None
+
+
+def _iso(ts):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+
+def _num(val):
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _find_script(name):
+    for d in (SCRIPTS_DIR, HOME_SCRIPTS_DIR, SCRIPTS_DIR.parent.parent / "solana-defi" / "scripts"):
+        if (d / name).exists():
+            return d / name
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Normalisation — every venue becomes the same shape
+# ---------------------------------------------------------------------------
+
+def _venue_record(venue, cash, positions, realized=None, positions_value=None):
+    positions_value = round(sum(p["value_usd"] for p in positions), 2) if positions_value is None else positions_value
+    return {
+        "venue": venue,
+        "cash_usd": round(cash, 2),
+        "positions_value_usd": round(positions_value, 2),
+        "total_value_usd": round(cash + positions_value, 2),
+        "unrealized_pnl_usd": round(sum(p.get("unrealized_pnl_usd") or 0 for p in positions), 2),
+        "realized_pnl_usd": None if realized is None else round(realized, 2),
+        "positions": positions,
+    }
+
+
+def normalise_polymarket(data):
+    positions = [{
+        "venue": "polymarket",
+        "id": p.get("market_id"),
+        "title": p.get("market"),
+        "outcome": p.get("outcome"),
+        "quantity": p.get("shares"),
+        "value_usd": round(_num(p.get("value_usdc")), 2),
+        "unrealized_pnl_usd": p.get("unrealized_pnl"),
+    } for p in data.get("verified_positions", data.get("positions", []))]
+    return _venue_record("polymarket", _num(data.get("usdc_balance")), positions,
+                         realized=_num(data.get("realized_pnl")))
+
+
+def normalise_kalshi(data):
+    positions = [{
+        "venue": "kalshi",
+        "id": p.get("ticker"),
+        "title": p.get("market_title", p.get("ticker")),
+        "outcome": "yes" if p.get("position", 0) > 0 else "no",
+        "quantity": abs(p.get("position", 0)),
+        "value_usd": round(p.get("market_exposure", 0) / 100, 2),
+        "unrealized_pnl_usd": None,
+    } for p in data.get("positions", [])]
+    positions_value = data.get("portfolio_value_usd")
+    return _venue_record("kalshi", _num(data.get("balance_usd")), positions,
+                         realized=data.get("realized_pnl"),
+                         positions_value=_num(positions_value) if positions_value is not None else None)
+
+
+def normalise_solana(data):
+    positions = [{
+        "venue": "solana",
+        "id": "SOL",
+        "title": "SOL",
+        "outcome": None,
+        "quantity": data.get("sol_balance"),
+        "value_usd": round(_num(data.get("sol_value_usd")), 2),
+        "unrealized_pnl_usd": None,
+    }]
+    positions += [{
+        "venue": "solana",
+        "id": p.get("mint"),
+        "title": p.get("symbol", p.get("mint")),
+        "outcome": None,
+        "quantity": p.get("balance"),
+        "value_usd": round(_num(p.get("value_usd")), 2),
+        "unrealized_pnl_usd": None,
+    } for p in data.get("positions", [])]
+    return _venue_record("solana", 0.0, positions)
+
+
+NORMALISERS = {"polymarket": normalise_polymarket, "kalshi": normalise_kalshi, "solana": normalise_solana}
+
+# ---------------------------------------------------------------------------
+# Fan-out
+# ---------------------------------------------------------------------------
+
+async def fetch_venue(venue):
+    """Run one venue script; returns a normalised record with source/status fields."""
+    script, script_args, _ = VENUES[venue]
+    path = _find_script(script)
+    started = time.time()
+    base = {"venue": venue, "source": "live", "as_of": _iso(started)}
+    if path is None:
+        return {**base, "status": "FAIL", "error": f"{script} not installed"}
+
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, str(path), *script_args,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await proc.communicate()
+    except asyncio.CancelledError:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+
+    latency_ms = int((time.time() - started) * 1000)
+    try:
+        data = json.loads(stdout.decode() or "null")
+    except json.JSONDecodeError:
+        data = None
+    if not isinstance(data, dict) or data.get("status") == "FAIL" or data.get("error"):
+        err = (data or {}).get("error") if isinstance(data, dict) else None
+        err = err or stderr.decode().strip()[-300:] or f"exit code {proc.returncode}"
+        return {**base, "status": "FAIL", "error": err, "latency_ms": latency_ms}
+    try:
+        record = NORMALISERS[venue](data)
+    except (KeyError, TypeError, AttributeError) as e:
+        return {**base, "status": "FAIL", "error": f"unexpected output: {e}", "latency_ms": latency_ms}
+    return {**base, **record, "status": "OK", "latency_ms": latency_ms}
+
+
+async def gather_portfolio(venues, timeout, on_result):
+    """Fetch all venues concurrently; call on_result(record) as each one lands.
+
+    Anything still running when the shared deadline expires is cancelled and
+    reported as TIMEOUT.
+    """
+    tasks = {asyncio.ensure_future(fetch_venue(v)): v for v in venues}
+    deadline = time.monotonic() + timeout
+    pending = set(tasks)
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            try:
+                record = task.result()
+            except Exception as e:
+                record = {"venue": tasks[task], "source": "live", "status": "FAIL", "error": str(e)}
+            on_result(record)
+    for task in pending:
+        task.cancel()
+        on_result({"venue": tasks[task], "source": "live", "status": "TIMEOUT",
+                   "error": f"no response within {timeout}s"})
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _with_cache_fallback(record, snapshot):
+    """Swap a failed/timed-out venue for its last good snapshot, if we have one."""
+    if record.get("status") == "OK":
+        return record
+    cached = snapshot.get("venues", {}).get(record["venue"])
+    if not cached:
+        return record
+    cached = {k: v for k, v in cached.items() if k != "latency_ms"}
+    return {**cached, "source": "cache", "status": "STALE", "live_status": record["status"],
+            "error": record.get("error")}
+
+
+def _totals(records):
+    counted = [r for r in records if r.get("status") in ("OK", "STALE")]
+    realized = [r["realized_pnl_usd"] for r in counted if r.get("realized_pnl_usd") is not None]
+    return {
+        "type": "total",
+        "status": "OK" if counted else "FAIL",
+        "venues": [r["venue"] for r in counted],
+        "stale_venues": [r["venue"] for r in counted if r["status"] == "STALE"],
+        "failed_venues": [r["venue"] for r in records if r not in counted],
+        "cash_usd": round(sum(r["cash_usd"] for r in counted), 2),
+        "positions_value_usd": round(sum(r["positions_value_usd"] for r in counted), 2),
+        "total_value_usd": round(sum(r["total_value_usd"] for r in counted), 2),
+        "unrealized_pnl_usd": round(sum(r["unrealized_pnl_usd"] for r in counted), 2),
+        "realized_pnl_usd": round(sum(realized), 2) if realized else None,
+        "open_positions": sum(len(r["positions"]) for r in counted),
+    }
+
+
+def _print_venue(record):
+    venue = record["venue"].capitalize()
+    if record.get("status") not in ("OK", "STALE"):
+        print(f"  {venue:<11} {record.get('status')} — {record.get('error', '')}")
+        return
+    stale = ""
+    if record["status"] == "STALE":
+        live = f", live: {record['live_status']}" if record.get("live_status") else ""
+        stale = f"  (as of {record.get('as_of')}{live})"
+    latency = f"  [{record['latency_ms']} ms]" if record.get("latency_ms") is not None and not stale else ""
+    print(f"  {venue:<11} ${record['total_value_usd']:>10,.2f}  cash ${record['cash_usd']:,.2f}  "
+          f"positions ${record['positions_value_usd']:,.2f} ({len(record['positions'])}){stale}{latency}")
+    sys.stdout.flush()
+
+
+# ---------------------------------------------------------------------------
+# summary subcommand
+# ---------------------------------------------------------------------------
+
+def cmd_summary(args):
+    snapshot = load_json(SNAPSHOT_FILE, {}) or {}
+    wanted = [v.strip() for v in args.venues.split(",")] if args.venues else list(VENUES)
+    unknown = [v for v in wanted if v not in VENUES]
+    if unknown:
+        msg = f"Unknown venue(s): {', '.join(unknown)}"
+        print(json.dumps({"status": "FAIL", "error": msg}) if args.json else f"FAIL — {msg}")
+        return 1
+
+    if args.cached:
+        records = [{**{k: x for k, x in r.items() if k != "latency_ms"}, "source": "cache", "status": "STALE"}
+                   for v, r in snapshot.get("venues", {}).items() if v in wanted]
+        total = _totals(records)
+        if args.json:
+            print(json.dumps({**total, "type": "snapshot", "as_of": snapshot.get("as_of"), "records": records}, indent=2))
+        else:
+            if not records:
+                print("FAIL — No portfolio snapshot yet. Run: python3 ~/scripts/portfolio-all.py summary")
+                return 1
+            print(f"=== Portfolio (snapshot as of {snapshot.get('as_of')}) ===\n")
+            for r in records:
+                _print_venue(r)
+            print(f"\n  Total:      ${total['total_value_usd']:,.2f}")
+        return 0 if records else 1
+
+    configured = [v for v in wanted if VENUES[v][2]()]
+    if not configured:
+        msg = "No venues configured (Polymarket wallet, Kalshi creds or SOLANA_WALLET_ADDRESS)"
+        print(json.dumps({"status": "FAIL", "error": "not_configured", "detail": msg}) if args.json else f"FAIL — {msg}")
+        return 1
+
+    records = []
+    started = time.time()
+    if not args.json:
+        print(f"=== Portfolio ({', '.join(configured)}) ===\n")
+
+    def on_result(record):
+        record = _with_cache_fallback(record, snapshot)
+        records.append(record)
+        if args.json and args.stream:
+            print(json.dumps({"type": "venue", **record}))
+            sys.stdout.flush()
+        elif not args.json:
+            _print_venue(record)
+
+    asyncio.run(gather_portfolio(configured, args.timeout, on_result))
+
+    # Persist fresh venues; keep previous entries for venues that failed this time
+    fresh = {r["venue"]: r for r in records if r.get("status") == "OK"}
+    if fresh:
+        venues = {**snapshot.get("venues", {}), **fresh}
+        save_json(SNAPSHOT_FILE, {"as_of": _iso(time.time()), "venues": venues})
+
+    records.sort(key=lambda r: configured.index(r["venue"]))
+    total = _totals(records)
+    total["elapsed_ms"] = int((time.time() - started) * 1000)
+    if args.json:
+        if args.stream:
+            print(json.dumps(total))
+        else:
+            print(json.dumps({**total, "records": records}, indent=2))
+    else:
+        print(f"\n  Total:      ${total['total_value_usd']:,.2f}  "
+              f"(cash ${total['cash_usd']:,.2f} + positions ${total['positions_value_usd']:,.2f})")
+        if total["realized_pnl_usd"] is not None:
+            print(f"  Realized P&L: ${total['realized_pnl_usd']:+,.2f}")
+        if total["stale_venues"]:
+            print(f"  WARN: {', '.join(total['stale_venues'])} shown from last snapshot")
+        print(f"  ({total['elapsed_ms']} ms)")
+    return 0 if total["status"] == "OK" else 1
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Cross-venue portfolio (Polymarket + Kalshi + Solana)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    sp_sum = subparsers.add_parser("summary", help="Fetch all configured venues in parallel")
+    sp_sum.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Shared deadline in seconds")
+    sp_sum.add_argument("--venues", help="Comma-separated subset: polymarket,kalshi,solana")
+    sp_sum.add_argument("--cached", action="store_true", help="Show the last snapshot without fetching")
+    sp_sum.add_argument("--stream", action="store_true", help="With --json: NDJSON, one line per venue")
+    sp_sum.add_argument("--json", action="store_true")
+
+    args = parser.parse_args()
+    if args.command is None:
+        parser.print_help()
+        return 1
+
+    cmd_map = {"summary": cmd_summary}
+    return cmd_map[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
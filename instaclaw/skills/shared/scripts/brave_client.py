@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+brave_client.py — Shared Brave Search client for skill scripts.
+
+A bounded worker pool whose threads each keep one HTTPS connection alive
+(stdlib only), and a TTL response cache shared by every caller on the VM
+(competitive-intel.py digest / weekly / scan, competitive-intel.sh search /
+news, social-content.py trends):
+
+    ~/.openclaw/cache/brave-search/responses.db   (SQLite, WAL)
+
+Cache keys are (endpoint, query, count, freshness); a `"{name}"` past-week
+query issued by the weekly report is answered from disk by a scan an hour
+later. Within one batch identical queries are sent once. Requests are counted
+against the Brave daily budget (rate_budget.py) and paced by a token bucket
+that starts at the free-tier 1 query/second and follows the per-second limit
+Brave reports in X-RateLimit-Limit.
+
+Python (deployed next to the skill scripts in ~/scripts/):
+    from brave_client import BraveClient
+    client = BraveClient(api_key)
+    client.search('"Acme" funding', count=5, freshness="pd")
+    client.search_many([("q1", 10, "pw"), ("q2", 5, "pw")])   # {(q, count, freshness): data}
+
+Shell:
+    python3 ~/scripts/brave_client.py search --query "Acme launch" --count 10 --freshness pw
+    python3 ~/scripts/brave_client.py news   --query "Acme funding" --count 5
+"""
+
+import argparse
+import gzip
+import http.client
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+try:
+    from rate_budget import DailyBudget, TokenBucket
+except ImportError:  # repo checkout: run from skills/shared/scripts with a different cwd
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from rate_budget import DailyBudget, TokenBucket
+
+WEB_URL = "https://api.search.brave.com/res/v1/web/search"
+NEWS_URL = "https://api.search.brave.com/res/v1/news/search"
+CACHE_DIR = Path.home() / ".openclaw" / "cache" / "brave-search"
+DAILY_BUDGET = 200
+MAX_WORKERS = 4
+TIMEOUT = 20
+# Results for a past-day window go stale faster than for a past-month one
+CACHE_TTL = {"pd": 3600, "pw": 6 * 3600, "pm": 24 * 3600, "py": 24 * 3600}
+DEFAULT_TTL = 6 * 3600
+
+
+class BraveClient:
+    """Pooled, cached, budget-aware Brave Search client. Safe to share across threads."""
+
+    def __init__(self, api_key: str, cache_dir=None, max_workers: int = MAX_WORKERS):
+        self.api_key = api_key
+        self.cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR
+        self.cache_db = self.cache_dir / "responses.db"
+        self.budget = DailyBudget(self.cache_dir, DAILY_BUDGET, warn_at=160)
+        self.bucket = TokenBucket(per_minute=60, capacity=1)
+        self.max_workers = max_workers
+        self.stats = {"cached": 0, "fetched": 0, "deduped": 0, "failed": 0}
+        self._local = threading.local()
+        self._pool = None
+
+    # -- cache --------------------------------------------------------------
+
+    def _db(self) -> sqlite3.Connection:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.cache_db, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS responses ("
+                     "endpoint TEXT, query TEXT, count INTEGER, freshness TEXT, "
+                     "fetched_at REAL, body TEXT, PRIMARY KEY (endpoint, query, count, freshness))")
+        return conn
+
+    def _cached(self, endpoint: str, query: str, count: int, freshness: str):
+        conn = self._db()
+        try:
+            row = conn.execute("SELECT fetched_at, body FROM responses "
+                               "WHERE endpoint = ? AND query = ? AND count = ? AND freshness = ?",
+                               (endpoint, query, count, freshness)).fetchone()
+        finally:
+            conn.close()
+        if row and time.time() - row[0] < CACHE_TTL.get(freshness, DEFAULT_TTL):
+            return json.loads(row[1])
+        return None
+
+    def _store(self, endpoint: str, query: str, count: int, freshness: str, data: dict):
+        now = time.time()
+        conn = self._db()
+        try:
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                             (endpoint, query, count, freshness, now, json.dumps(data)))
+                conn.execute("DELETE FROM responses WHERE fetched_at < ?", (now - max(CACHE_TTL.values()),))
+        finally:
+            conn.close()
+
+    # -- HTTP ---------------------------------------------------------------
+
+    def _get(self, url: str, params: dict) -> tuple:
+        """GET over this thread's kept-alive HTTPS connection. Returns (status, headers, body)."""
+        parts = urlsplit(url)
+        for attempt in range(2):
+            conn = getattr(self._local, "conn", None)
+            if conn is None:
+                conn = self._local.conn = http.client.HTTPSConnection(parts.netloc, timeout=TIMEOUT)
+            try:
+                conn.request("GET", f"{parts.path}?{urlencode(params)}", headers={
+                    "Accept": "application/json", "Accept-Encoding": "gzip",
+                    "X-Subscription-Token": self.api_key})
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.HTTPException, OSError):
+                # A pooled connection the server already closed: reconnect once
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+                continue
+            if resp.getheader("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            return resp.status, dict(resp.getheaders()), body
+
+    def _follow_rate_limit(self, headers):
+        """Brave sends e.g. 'X-RateLimit-Limit: 20, 15000' (per second, per month)."""
+        try:
+            per_second = int(headers.get("X-RateLimit-Limit", "").split(",")[0])
+        except ValueError:
+            return
+        if per_second > 0:
+            with self.bucket.lock:
+                self.bucket.rate = float(per_second)
+                self.bucket.capacity = per_second
+
+    def _fetch(self, endpoint: str, query: str, count: int, freshness: str) -> dict:
+        if self.budget.exhausted():
+            print(f"Brave Search daily budget exhausted ({self.budget.count()}/{DAILY_BUDGET})", file=sys.stderr)
+            return {}
+        params = {"q": query, "count": count}
+        if freshness:
+            params["freshness"] = freshness
+        url = NEWS_URL if endpoint == "news" else WEB_URL
+        for attempt in range(3):
+            self.bucket.acquire()
+            try:
+                status, headers, body = self._get(url, params)
+            except (http.client.HTTPException, OSError) as e:
+                print(f"Brave Search request failed: {e}", file=sys.stderr)
+                return {}
+            self.budget.record()
+            self._follow_rate_limit(headers)
+            if status == 429 and attempt < 2:
+                time.sleep(float(headers.get("Retry-After", "1") or 1))
+                continue
+            if status != 200:
+                print(f"Brave Search HTTP {status}: {body[:200].decode(errors='replace')}", file=sys.stderr)
+                return {}
+            try:
+                return json.loads(body)
+            except ValueError:
+                return {}
+        return {}
+
+    # -- public -------------------------------------------------------------
+
+    def search(self, query: str, count: int = 10, freshness: str = "", news: bool = False) -> dict:
+        """One query; served from the shared cache when fresh."""
+        return self.search_many([(query, count, freshness)], news=news)[(query, count, freshness)]
+
+    def search_many(self, queries: list, news: bool = False) -> dict:
+        """Run (query, count, freshness) tuples concurrently; returns {tuple: response}.
+
+        Duplicates are sent once and cache hits cost nothing. Failed queries map to {}.
+        """
+        endpoint = "news" if news else "web"
+        unique = list(dict.fromkeys((q, int(c), f or "") for q, c, f in queries))
+        self.stats["deduped"] += len(queries) - len(unique)
+
+        results, missing = {}, []
+        for key in unique:
+            hit = self._cached(endpoint, *key)
+            if hit is not None:
+                results[key] = hit
+                self.stats["cached"] += 1
+            else:
+                missing.append(key)
+
+        def fetch(key):
+            data = self._fetch(endpoint, *key)
+            if data:
+                self._store(endpoint, *key, data)
+            return key, data
+
+        if missing:
+            # The pool outlives the batch so its threads' connections are reused by the next one
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            for key, data in self._pool.map(fetch, missing):
+                results[key] = data
+                self.stats["fetched" if data else "failed"] += 1
+
+        # Callers may pass freshness=None; answer under the key they used
+        return {(q, c, f): results[(q, int(c), f or "")] for q, c, f in queries}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Brave Search client (shared cache)")
+    parser.add_argument("endpoint", choices=["search", "news"])
+    parser.add_argument("--query", required=True)
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--freshness", default="")
+    args = parser.parse_args()
+
+    api_key = os.environ.get("BRAVE_SEARCH_API_KEY", "")
+    if not api_key:
+        print('{"error": "BRAVE_SEARCH_API_KEY not set. Check ~/.openclaw/.env"}', file=sys.stderr)
+        sys.exit(1)
+    client = BraveClient(api_key)
+    if client.budget.exhausted():
+        print(f'{{"error": "Daily API budget exhausted ({client.budget.count()}/{DAILY_BUDGET}). '
+              f'Resets at midnight UTC."}}', file=sys.stderr)
+        sys.exit(2)
+    if client.budget.count() >= client.budget.warn_at:
+        print(f"WARNING: Approaching daily budget ({client.budget.count()}/{DAILY_BUDGET})", file=sys.stderr)
+    data = client.search(args.query, args.count, args.freshness, news=args.endpoint == "news")
+    if not data:
+        print('{"error": "Empty response from Brave Search API"}', file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(data))
+
+
+if __name__ == "__main__":
+    main()
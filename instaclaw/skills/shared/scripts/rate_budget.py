@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+rate_budget.py — Shared API budget counters and rate limiter for skill scripts.
+
+Each API (Alpha Vantage, Brave Search, ...) keeps its usage in one small JSON
+file of per-day counters inside its cache dir:
+
+    ~/.openclaw/cache/<api>/.rate-budget.json   {"days": {"2026-03-16": 42, ...}}
+
+Checking the budget reads a few hundred bytes no matter how many requests
+have been made; recording a request rewrites the file atomically under an
+exclusive flock, so concurrent scripts (and threads) never lose a count.
+Days roll over at midnight UTC and counters older than RETENTION_DAYS are
+dropped on write. A legacy append-only `.rate-log` in the same dir is folded
+into the counters once and renamed to `.rate-log.migrated`.
+
+Python (deployed next to the skill scripts in ~/scripts/):
+    from rate_budget import DailyBudget, TokenBucket
+    budget = DailyBudget(Path.home() / ".openclaw/cache/alphavantage", limit=500, warn_at=400)
+    budget.count(); budget.record(); budget.remaining()
+
+Shell:
+    python3 ~/scripts/rate_budget.py count  ~/.openclaw/cache/alphavantage
+    python3 ~/scripts/rate_budget.py record ~/.openclaw/cache/alphavantage
+"""
+
+import fcntl
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+COUNTER_FILE = ".rate-budget.json"
+LOCK_FILE = ".rate-budget.lock"
+LEGACY_LOG = ".rate-log"
+RETENTION_DAYS = 30
+
+
+def utc_day() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+class DailyBudget:
+    """Per-day request counter for one API, shared by every script that calls it."""
+
+    def __init__(self, cache_dir, limit: int, warn_at: int = None):
+        self.cache_dir = Path(cache_dir)
+        self.limit = limit
+        self.warn_at = warn_at if warn_at is not None else int(limit * 0.8)
+        self.path = self.cache_dir / COUNTER_FILE
+
+    def _read(self) -> dict:
+        try:
+            days = json.loads(self.path.read_text()).get("days", {})
+            return days if isinstance(days, dict) else {}
+        except (IOError, ValueError):
+            return {}
+
+    def _write(self, days: dict):
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=".rate-budget.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"days": days}, f, sort_keys=True)
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _locked_update(self, update) -> dict:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_dir / LOCK_FILE, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                days = self._read()
+                if not self.path.exists():
+                    days = self._migrate_legacy(days)
+                update(days)
+                cutoff = (datetime.now(timezone.utc) - timedelta(days=RETENTION_DAYS)).strftime("%Y-%m-%d")
+                days = {d: n for d, n in days.items() if d >= cutoff}
+                self._write(days)
+                return days
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _migrate_legacy(self, days: dict) -> dict:
+        """Fold an old one-line-per-request .rate-log into per-day counters (once)."""
+        legacy = self.cache_dir / LEGACY_LOG
+        if not legacy.exists():
+            return days
+        try:
+            with open(legacy) as f:
+                for line in f:
+                    day = line[:10]
+                    if len(day) == 10 and day[4] == "-" and day[7] == "-":
+                        days[day] = days.get(day, 0) + 1
+            legacy.rename(legacy.with_name(LEGACY_LOG + ".migrated"))
+        except IOError:
+            pass
+        return days
+
+    def count(self, day: str = None) -> int:
+        """Requests recorded for `day` (default: today, UTC)."""
+        day = day or utc_day()
+        if not self.path.exists() and (self.cache_dir / LEGACY_LOG).exists():
+            return self._locked_update(lambda days: None).get(day, 0)
+        return int(self._read().get(day, 0))
+
+    def record(self, n: int = 1) -> int:
+        """Add `n` requests to today's counter; returns the new count."""
+        day = utc_day()
+
+        def bump(days):
+            days[day] = int(days.get(day, 0)) + n
+
+        return self._locked_update(bump)[day]
+
+    def remaining(self) -> int:
+        return max(0, self.limit - self.count())
+
+    def exhausted(self) -> bool:
+        return self.count() >= self.limit
+
+    def history(self) -> dict:
+        """Retained per-day counts, oldest first."""
+        return dict(sorted(self._read().items()))
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `per_minute` tokens per minute, bursting to `capacity`."""
+
+    def __init__(self, per_minute: int, capacity: int = 1):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def acquire(self):
+        while not self.try_acquire():
+            with self.lock:
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(max(wait, 0.001))
+
+
+def main():
+    if len(sys.argv) != 3 or sys.argv[1] not in ("count", "record"):
+        print("Usage: rate_budget.py count|record <cache-dir>", file=sys.stderr)
+        sys.exit(1)
+    budget = DailyBudget(Path(sys.argv[2]).expanduser(), limit=0)
+    print(budget.count() if sys.argv[1] == "count" else budget.record())
+
+
+if __name__ == "__main__":
+    main()
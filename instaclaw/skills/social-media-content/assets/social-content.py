@@ -16,9 +16,7 @@ Reads from:
 
 import argparse
 import json
-import os
 import re
-import subprocess
 import sys
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
@@ -457,39 +455,33 @@ def detect_trends(industry: str):
         print("  5. 'X vs Y' — comparison content drives debate")
         return
 
-    # Use Brave Search via competitive-intel.sh (already deployed)
-    intel_script = Path.home() / "scripts" / "competitive-intel.sh"
-    if not intel_script.exists():
-        print("competitive-intel.sh not found. Install competitive-intelligence skill first.")
+    # Shared Brave client: pooled, and its cache is shared with competitive-intel
+    client_path = Path.home() / "scripts" / "brave_client.py"
+    if not client_path.exists():
+        print("brave_client.py not found. Install competitive-intelligence skill first.")
         return
+    sys.path.insert(0, str(client_path.parent))
+    from brave_client import BraveClient
 
-    env = os.environ.copy()
-    env["BRAVE_SEARCH_API_KEY"] = api_key
+    data = BraveClient(api_key).search(f"{industry} trends 2026", count=20, freshness="pw")
+    if not data:
+        print("Trend detection failed: no results from Brave Search", file=sys.stderr)
+        return
+    results = data.get("web", {}).get("results", [])
 
-    try:
-        result = subprocess.run(
-            [str(intel_script), "search", "--query", f"{industry} trends 2026", "--count", "20", "--freshness", "pw"],
-            capture_output=True, text=True, timeout=30, env=env,
-        )
-        if result.returncode == 0 and result.stdout:
-            data = json.loads(result.stdout)
-            results = data.get("web", {}).get("results", [])
-
-            print(f"Trending in '{industry}' (past week):")
-            print()
-            for i, r in enumerate(results[:10], 1):
-                print(f"  {i}. {r.get('title', 'No title')}")
-                print(f"     {r.get('url', '')}")
-                if r.get("age"):
-                    print(f"     Age: {r['age']}")
-                print()
-
-            print("Content opportunities:")
-            print("  - React to the top trending story with your unique angle")
-            print("  - Create a thread summarizing the top 3 developments")
-            print("  - Write a contrarian take on the most popular narrative")
-    except (subprocess.TimeoutExpired, json.JSONDecodeError) as e:
-        print(f"Trend detection failed: {e}", file=sys.stderr)
+    print(f"Trending in '{industry}' (past week):")
+    print()
+    for i, r in enumerate(results[:10], 1):
+        print(f"  {i}. {r.get('title', 'No title')}")
+        print(f"     {r.get('url', '')}")
+        if r.get("age"):
+            print(f"     Age: {r['age']}")
+        print()
+
+    print("Content opportunities:")
+    print("  - React to the top trending story with your unique angle")
+    print("  - Create a thread summarizing the top 3 developments")
+    print("  - Write a contrarian take on the most popular narrative")
 
 
 def main():
@@ -5,6 +5,7 @@ import argparse
 import json
 import os
 import sys
+from pathlib import Path
 
 try:
     import httpx
@@ -12,8 +13,6 @@ except ImportError:
     print(json.dumps({"error": "Missing httpx. Run: pip install httpx"}), file=sys.stderr)
     sys.exit(1)
 
-DEXSCREENER_BASE = "https://api.dexscreener.com"
-
 def load_env():
     env = {}
     env_path = os.path.expanduser("~/.openclaw/.env")
@@ -59,27 +58,19 @@ def get_token_accounts(rpc_url: str, address: str) -> list:
             })
     return tokens
 
-def get_token_price(mint: str) -> dict | None:
-    try:
-        resp = httpx.get(f"{DEXSCREENER_BASE}/latest/dex/tokens/{mint}", timeout=10)
-        if resp.status_code != 200:
-            return None
-        pairs = resp.json().get("pairs", [])
-        # Filter for Solana pairs, pick highest liquidity
-        sol_pairs = [p for p in pairs if p.get("chainId") == "solana"]
-        if not sol_pairs:
-            return None
-        best = max(sol_pairs, key=lambda p: (p.get("liquidity", {}).get("usd") or 0))
-        return {
-            "price_usd": best.get("priceUsd"),
-            "price_change_24h": best.get("priceChange", {}).get("h24"),
-            "volume_24h": best.get("volume", {}).get("h24"),
-            "liquidity_usd": best.get("liquidity", {}).get("usd"),
-            "symbol": best.get("baseToken", {}).get("symbol", "???"),
-            "name": best.get("baseToken", {}).get("name", "Unknown"),
-        }
-    except Exception:
-        return None
+def _load_sibling(filename):
+    """Load a shared module deployed alongside this script (~/scripts/)."""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(
+        filename[:-3].replace("-", "_"), Path(__file__).resolve().parent / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+_prices = _load_sibling("solana-prices.py")  # Batched, file-cached DexScreener prices
+http_client = _prices.http_client
+get_token_prices = _prices.get_token_prices
+get_token_price = _prices.get_token_price
 
 def cmd_check(args):
     """Full balance check: SOL + tokens with prices."""
@@ -94,10 +85,11 @@ def cmd_check(args):
     sol_balance = get_sol_balance(rpc_url, address)
     tokens = get_token_accounts(rpc_url, address)
 
-    # Enrich tokens with price data (top 10 only to avoid rate limits)
+    # Enrich every token with price data (batched + cached)
+    prices = get_token_prices([t["mint"] for t in tokens])
     enriched = []
-    for token in tokens[:10]:
-        price_data = get_token_price(token["mint"])
+    for token in tokens:
+        price_data = prices.get(token["mint"])
         entry = {**token}
         if price_data:
             entry.update(price_data)
@@ -149,7 +141,7 @@ def cmd_price(args):
 def cmd_search(args):
     """Search for a token by name/symbol."""
     try:
-        resp = httpx.get(f"{DEXSCREENER_BASE}/latest/dex/search", params={"q": args.query}, timeout=10)
+        resp = http_client().get(f"{_prices.DEXSCREENER_BASE}/latest/dex/search", params={"q": args.query})
         pairs = resp.json().get("pairs", [])
         sol_pairs = [p for p in pairs if p.get("chainId") == "solana"][:10]
         results = []
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Transaction confirmation shared by solana-trade.py and solana-snipe.py.
+
+Not a CLI — loaded from the same directory (~/scripts/) by the Solana scripts.
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+
+# Transaction confirmation: signatureSubscribe over the RPC websocket, raced
+# against getSignatureStatuses polling (first poll is immediate, which also
+# covers a tx that lands before the subscription is registered). The wait ends
+# as soon as either path sees the signature, or once the block height passes
+# lastValidBlockHeight — the tx can never land after that. Expiry is only ever
+# judged from a block height: isBlockhashValid also answers false for a
+# blockhash the node hasn't seen yet, which would report a live tx as expired.
+
+CONFIRM_TIMEOUT = 90  # hard cap; blockhash expiry (~60-90s) normally ends the wait first
+POLL_INTERVAL = 2
+
+def ws_url_for(rpc_url, env):
+    if env.get("SOLANA_WS_URL"):
+        return env["SOLANA_WS_URL"]
+    if rpc_url.startswith("https://"):
+        return "wss://" + rpc_url[len("https://"):]
+    if rpc_url.startswith("http://"):
+        return "ws://" + rpc_url[len("http://"):]
+    return None
+
+async def _rpc_async(client, rpc_url, method, params):
+    resp = await client.post(rpc_url, json={"jsonrpc": "2.0", "id": 1, "method": method, "params": params})
+    return resp.json().get("result")
+
+async def _confirm_via_ws(ws_url, signature):
+    import websockets
+    async with websockets.connect(ws_url, ping_interval=20) as ws:
+        await ws.send(json.dumps({
+            "jsonrpc": "2.0", "id": 1,
+            "method": "signatureSubscribe",
+            "params": [signature, {"commitment": "confirmed"}],
+        }))
+        async for raw in ws:
+            msg = json.loads(raw)
+            if "error" in msg:
+                raise Exception(f"signatureSubscribe failed: {msg['error']}")
+            if msg.get("method") == "signatureNotification":
+                err = msg["params"]["result"]["value"].get("err")
+                return ("failed", err) if err else ("confirmed", None)
+    raise Exception("websocket closed before confirmation")
+
+async def _signature_status(client, rpc_url, signature):
+    result = await _rpc_async(client, rpc_url, "getSignatureStatuses",
+                              [[signature], {"searchTransactionHistory": True}])
+    status = ((result or {}).get("value") or [None])[0]
+    if status and status.get("confirmationStatus") in ("confirmed", "finalized"):
+        return ("failed", status["err"]) if status.get("err") else ("confirmed", None)
+    return None
+
+async def _blockhash_expired(client, rpc_url, last_valid_block_height):
+    if not last_valid_block_height:
+        return False  # no bound known — only the deadline ends the wait
+    height = await _rpc_async(client, rpc_url, "getBlockHeight", [{"commitment": "confirmed"}])
+    return height is not None and height > last_valid_block_height
+
+async def _confirm_via_poll(client, rpc_url, signature, last_valid_block_height):
+    while True:
+        try:
+            outcome = await _signature_status(client, rpc_url, signature)
+            if outcome:
+                return outcome
+            if await _blockhash_expired(client, rpc_url, last_valid_block_height):
+                # One last look: it may have landed in the final valid block
+                return await _signature_status(client, rpc_url, signature) or ("expired", None)
+        except Exception:
+            pass  # transient RPC hiccup — keep polling until the deadline
+        await asyncio.sleep(POLL_INTERVAL)
+
+async def _confirm(rpc_url, ws_url, signature, last_valid_block_height, timeout):
+    async with httpx.AsyncClient(timeout=10) as client:
+        tasks = [asyncio.ensure_future(_confirm_via_poll(client, rpc_url, signature, last_valid_block_height))]
+        if ws_url:
+            tasks.append(asyncio.ensure_future(_confirm_via_ws(ws_url, signature)))
+        deadline = time.monotonic() + timeout
+        try:
+            pending = set(tasks)
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    # Websocket unavailable or dropped — polling carries on
+            return ("timeout", None)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+def confirm_signature(rpc_url, signature, ws_url=None, last_valid_block_height=None, timeout=CONFIRM_TIMEOUT):
+    """Wait for a signature. Returns (state, err): state is confirmed | failed | expired | timeout.
+
+    expired is only reported once the block height has passed
+    last_valid_block_height; without one the wait runs to the timeout.
+    """
+    return asyncio.run(_confirm(rpc_url, ws_url, signature, last_valid_block_height, timeout))
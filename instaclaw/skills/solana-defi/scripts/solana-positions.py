@@ -6,6 +6,7 @@ import json
 import os
 import sys
 from datetime import datetime
+from pathlib import Path
 
 try:
     import httpx
@@ -13,7 +14,7 @@ except ImportError:
     print(json.dumps({"error": "Missing httpx. Run: pip install httpx"}), file=sys.stderr)
     sys.exit(1)
 
-DEXSCREENER_BASE = "https://api.dexscreener.com"
+SOL_MINT = "So11111111111111111111111111111111111111112"
 TRADE_LOG = os.path.expanduser("~/.openclaw/solana-defi/trades.json")
 LOSS_TRACKER = os.path.expanduser("~/.openclaw/solana-defi/daily-losses.json")
 
@@ -60,22 +61,18 @@ def get_token_accounts(rpc_url: str, address: str) -> list:
             })
     return tokens
 
-def get_token_price(mint: str):
-    try:
-        resp = httpx.get(f"{DEXSCREENER_BASE}/latest/dex/tokens/{mint}", timeout=10)
-        pairs = resp.json().get("pairs", [])
-        sol_pairs = [p for p in pairs if p.get("chainId") == "solana"]
-        if not sol_pairs:
-            return None
-        best = max(sol_pairs, key=lambda p: (p.get("liquidity", {}).get("usd") or 0))
-        return {
-            "price_usd": best.get("priceUsd"),
-            "symbol": best.get("baseToken", {}).get("symbol", "???"),
-            "name": best.get("baseToken", {}).get("name", "Unknown"),
-            "change_24h": best.get("priceChange", {}).get("h24"),
-        }
-    except Exception:
-        return None
+def _load_sibling(filename):
+    """Load a shared module deployed alongside this script (~/scripts/)."""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(
+        filename[:-3].replace("-", "_"), Path(__file__).resolve().parent / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+_prices = _load_sibling("solana-prices.py")  # Batched, file-cached DexScreener prices
+get_token_prices = _prices.get_token_prices
+get_token_price = _prices.get_token_price
 
 def load_trades() -> list:
     try:
@@ -97,15 +94,16 @@ def cmd_summary(args):
     sol_balance = get_sol_balance(rpc_url, address)
     tokens = get_token_accounts(rpc_url, address)
 
-    # Get SOL price
-    sol_price_data = get_token_price("So11111111111111111111111111111111111111112")
+    # SOL + every held token priced in one batched (and cached) lookup
+    prices = get_token_prices([SOL_MINT] + [t["mint"] for t in tokens])
+    sol_price_data = prices.get(SOL_MINT)
     sol_price_usd = float(sol_price_data["price_usd"]) if sol_price_data and sol_price_data.get("price_usd") else 0
 
     total_usd = sol_balance * sol_price_usd
     positions = []
 
-    for token in tokens[:10]:
-        price_data = get_token_price(token["mint"])
+    for token in tokens:
+        price_data = prices.get(token["mint"])
         entry = {
             "mint": token["mint"],
             "balance": token["balance"],
@@ -113,7 +111,7 @@ def cmd_summary(args):
         if price_data:
             entry["symbol"] = price_data.get("symbol", "???")
             entry["name"] = price_data.get("name", "Unknown")
-            entry["change_24h"] = price_data.get("change_24h")
+            entry["change_24h"] = price_data.get("price_change_24h")
             if price_data.get("price_usd"):
                 value = float(price_data["price_usd"]) * token["balance"]
                 entry["value_usd"] = round(value, 2)
@@ -155,6 +153,13 @@ def cmd_detail(args):
         balance = accounts[0]["account"]["data"]["parsed"]["info"]["tokenAmount"]["uiAmount"]
 
     price_data = get_token_price(args.mint) or {}
+    if price_data:
+        price_data = {
+            "price_usd": price_data.get("price_usd"),
+            "symbol": price_data.get("symbol"),
+            "name": price_data.get("name"),
+            "change_24h": price_data.get("price_change_24h"),
+        }
 
     # Look up trade history for this mint
     trades = [t for t in load_trades() if t.get("mint") == args.mint]
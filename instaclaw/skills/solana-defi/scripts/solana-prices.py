@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""DexScreener token prices shared by solana-balance.py and solana-positions.py.
+
+Not a CLI — loaded from the same directory (~/scripts/) by the Solana scripts.
+
+DexScreener accepts up to 30 comma-separated mints per request. Prices are
+cached for PRICE_TTL seconds in a file shared by the Solana scripts, so a
+summary right after a balance check costs no extra round-trip.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+DEXSCREENER_BASE = "https://api.dexscreener.com"
+PRICE_CACHE = os.path.expanduser("~/.openclaw/solana-defi/price-cache.json")
+PRICE_TTL = 60
+PRICE_BATCH = 30
+
+_client = None
+
+def http_client() -> "httpx.Client":
+    """One pooled client per process (keep-alive across batches)."""
+    global _client
+    if _client is None:
+        _client = httpx.Client(timeout=10)
+    return _client
+
+def _load_price_cache() -> dict:
+    try:
+        with open(PRICE_CACHE) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def _save_price_cache(cache: dict):
+    now = time.time()
+    cache = {m: e for m, e in cache.items() if now - e.get("ts", 0) < PRICE_TTL}
+    os.makedirs(os.path.dirname(PRICE_CACHE), exist_ok=True)
+    tmp = f"{PRICE_CACHE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp, PRICE_CACHE)
+    except OSError:
+        pass
+
+def _best_pair_price(pairs: list):
+    if not pairs:
+        return None
+    best = max(pairs, key=lambda p: (p.get("liquidity", {}).get("usd") or 0))
+    return {
+        "price_usd": best.get("priceUsd"),
+        "price_change_24h": best.get("priceChange", {}).get("h24"),
+        "volume_24h": best.get("volume", {}).get("h24"),
+        "liquidity_usd": best.get("liquidity", {}).get("usd"),
+        "symbol": best.get("baseToken", {}).get("symbol", "???"),
+        "name": best.get("baseToken", {}).get("name", "Unknown"),
+    }
+
+def _fetch_price_batch(mints: list) -> dict:
+    try:
+        resp = http_client().get(f"{DEXSCREENER_BASE}/latest/dex/tokens/{','.join(mints)}")
+        if resp.status_code != 200:
+            return {}
+        pairs = resp.json().get("pairs") or []
+    except Exception:
+        return {}
+    by_mint = {m: [] for m in mints}
+    for p in pairs:
+        mint = p.get("baseToken", {}).get("address")
+        if p.get("chainId") == "solana" and mint in by_mint:
+            by_mint[mint].append(p)
+    return {m: _best_pair_price(ps) for m, ps in by_mint.items()}
+
+def get_token_prices(mints: list) -> dict:
+    """Prices for many mints: {mint: price dict or None}. Cached, batched, concurrent."""
+    cache = _load_price_cache()
+    now = time.time()
+    result, missing = {}, []
+    for mint in dict.fromkeys(mints):
+        entry = cache.get(mint)
+        if entry and now - entry.get("ts", 0) < PRICE_TTL:
+            result[mint] = entry.get("data")
+        else:
+            missing.append(mint)
+    if missing:
+        batches = [missing[i:i + PRICE_BATCH] for i in range(0, len(missing), PRICE_BATCH)]
+        with ThreadPoolExecutor(max_workers=min(4, len(batches))) as pool:
+            fetched = {}
+            for part in pool.map(_fetch_price_batch, batches):
+                fetched.update(part)
+        for mint, data in fetched.items():
+            result[mint] = data
+            cache[mint] = {"ts": now, "data": data}
+        for mint in missing:
+            result.setdefault(mint, None)  # Request failed — don't cache the miss
+        if fetched:
+            _save_price_cache(cache)
+    return result
+
+def get_token_price(mint: str):
+    return get_token_prices([mint]).get(mint)
@@ -2,10 +2,12 @@
 """PumpPortal sniping: buy/sell on pump.fun, watch for new launches."""
 
 import argparse
+import asyncio
 import json
 import os
 import sys
 import time
+from pathlib import Path
 
 try:
     import httpx
@@ -58,14 +60,44 @@ def get_daily_losses():
 
 def classify_error(msg):
     lower = msg.lower()
-    permanent = ["insufficient funds", "invalid mint", "graduated", "account not found"]
+    # "blockhash expired" is raised after the tx was broadcast: re-sending could buy twice
+    permanent = ["insufficient funds", "invalid mint", "graduated", "account not found", "blockhash expired"]
     for p in permanent:
         if p in lower:
             return "permanent"
     return "transient"
 
-def send_and_confirm(rpc_url, keypair, tx_bytes):
-    """Sign a transaction and send it."""
+def _load_sibling(filename):
+    """Load a shared module deployed alongside this script (~/scripts/)."""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(
+        filename[:-3].replace("-", "_"), Path(__file__).resolve().parent / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+_confirmation = _load_sibling("solana-confirm.py")  # signatureSubscribe raced against status polling
+ws_url_for = _confirmation.ws_url_for
+confirm_signature = _confirmation.confirm_signature
+
+def _last_valid_block_height(rpc_url):
+    """Expiry bound for a PumpPortal tx, which doesn't come with one.
+
+    Read after sending: the node's latest blockhash (processed) is at least as
+    new as the one PumpPortal built the tx with, so its bound is never earlier.
+    """
+    try:
+        resp = httpx.post(rpc_url, json={
+            "jsonrpc": "2.0", "id": 1,
+            "method": "getLatestBlockhash",
+            "params": [{"commitment": "processed"}],
+        }, timeout=10)
+        return resp.json()["result"]["value"]["lastValidBlockHeight"]
+    except Exception:
+        return None  # no bound: confirmation waits out CONFIRM_TIMEOUT instead
+
+def send_and_confirm(rpc_url, keypair, tx_bytes, ws_url=None):
+    """Sign a transaction, send it, and wait for confirmation."""
     import base64 as b64
     tx = VersionedTransaction.from_bytes(tx_bytes)
     signed = VersionedTransaction(tx.message, [keypair])
@@ -82,20 +114,13 @@ def send_and_confirm(rpc_url, keypair, tx_bytes):
 
     signature = result["result"]
 
-    # Confirm
-    for _ in range(15):
-        time.sleep(2)
-        status_resp = httpx.post(rpc_url, json={
-            "jsonrpc": "2.0", "id": 1,
-            "method": "getSignatureStatuses",
-            "params": [[signature], {"searchTransactionHistory": True}]
-        }, timeout=10)
-        statuses = status_resp.json().get("result", {}).get("value", [None])
-        if statuses[0] and statuses[0].get("confirmationStatus") in ("confirmed", "finalized"):
-            if statuses[0].get("err"):
-                raise Exception(f"On-chain error: {statuses[0]['err']}")
-            return signature
-    return signature  # return anyway, might confirm later
+    state, err = confirm_signature(rpc_url, signature, ws_url=ws_url,
+                                   last_valid_block_height=_last_valid_block_height(rpc_url))
+    if state == "failed":
+        raise Exception(f"On-chain error: {err}")
+    if state == "expired":
+        raise Exception(f"Blockhash expired before {signature} confirmed")
+    return signature  # confirmed, or timed out (might confirm later)
 
 def cmd_buy(args):
     """Buy a token on pump.fun via PumpPortal."""
@@ -144,7 +169,7 @@ def cmd_buy(args):
 
             import base64
             tx_bytes = base64.b64decode(resp.content)
-            signature = send_and_confirm(rpc_url, keypair, tx_bytes)
+            signature = send_and_confirm(rpc_url, keypair, tx_bytes, ws_url=ws_url_for(rpc_url, env))
 
             print(json.dumps({
                 "status": "success",
@@ -209,7 +234,7 @@ def cmd_sell(args):
 
             import base64
             tx_bytes = base64.b64decode(resp.content)
-            signature = send_and_confirm(rpc_url, keypair, tx_bytes)
+            signature = send_and_confirm(rpc_url, keypair, tx_bytes, ws_url=ws_url_for(rpc_url, env))
 
             print(json.dumps({
                 "status": "success",
@@ -228,58 +253,196 @@ def cmd_sell(args):
                 sys.exit(1)
             time.sleep(BACKOFF[attempt])
 
+# Watch pipeline: a reconnecting websocket reader feeds a bounded queue, a
+# processor runs each launch through the filter chain and buffers matches,
+# and output is flushed in batches. When the processor falls behind during a
+# launch burst the reader drops the OLDEST queued message — for sniping a
+# fresh launch is worth more than a stale one. Counters go to stderr so
+# stdout stays clean JSONL.
+
+WATCH_QUEUE_SIZE = 1000
+FLUSH_BATCH = 50
+FLUSH_INTERVAL = 0.5
+STATS_INTERVAL = 10
+RECONNECT_BACKOFF = [1, 2, 5, 10, 30]
+
+def _split_list(values):
+    items = set()
+    for v in values or []:
+        items.update(x.strip() for x in v.split(",") if x.strip())
+    return items
+
+def build_filters(args):
+    """Filter chain: list of (name, predicate) run in order; the first False rejects."""
+    import re
+
+    filters = []
+    if args.min_sol:
+        filters.append(("min_sol", lambda e: (e["market_cap_sol"] or 0) >= args.min_sol))
+    if args.max_age:
+        filters.append(("max_age", lambda e: e["age_s"] <= args.max_age))
+    allow = _split_list(args.allow_creator)
+    if allow:
+        filters.append(("creator_allow", lambda e: e["creator"] in allow))
+    deny = _split_list(args.deny_creator)
+    if deny:
+        filters.append(("creator_deny", lambda e: e["creator"] not in deny))
+    if args.name_regex:
+        pattern = re.compile(args.name_regex, re.IGNORECASE)
+        filters.append(("name_regex", lambda e: bool(
+            pattern.search(e["name"] or "") or pattern.search(e["symbol"] or ""))))
+    return filters
+
+def to_event(data, received_at):
+    # PumpPortal launches carry no creation time; fall back to when we received it
+    created = data.get("timestamp")
+    created_s = created / 1000 if isinstance(created, (int, float)) and created > 1e12 else created
+    return {
+        "type": "new_token",
+        "mint": data.get("mint"),
+        "name": data.get("name"),
+        "symbol": data.get("symbol"),
+        "creator": data.get("traderPublicKey"),
+        "initial_buy_sol": data.get("initialBuy"),
+        "market_cap_sol": data.get("marketCapSol", 0),
+        "age_s": round(time.time() - (created_s or received_at), 2),
+    }
+
+async def _read_stream(queue, stats, deadline):
+    import websockets
+
+    failures = 0
+    while time.time() < deadline:
+        try:
+            async with websockets.connect(PUMPPORTAL_WS, ping_interval=20) as ws:
+                await ws.send(json.dumps({"method": "subscribeNewToken"}))
+                async for raw in ws:
+                    failures = 0
+                    if queue.full():
+                        queue.get_nowait()
+                        stats["dropped"] += 1
+                    queue.put_nowait((time.time(), raw))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            stats["last_error"] = str(e)[:100]
+        # Closed cleanly or failed — either way reconnect with backoff
+        delay = min(RECONNECT_BACKOFF[min(failures, len(RECONNECT_BACKOFF) - 1)], max(0, deadline - time.time()))
+        failures += 1
+        stats["reconnects"] += 1
+        print(json.dumps({"type": "reconnect", "in_s": delay, "error": stats.get("last_error")}), file=sys.stderr, flush=True)
+        await asyncio.sleep(delay)
+
+def _flush(buffer, stats):
+    if not buffer:
+        return
+    now = time.time()
+    sys.stdout.write("".join(json.dumps(event) + "\n" for _, event in buffer))
+    sys.stdout.flush()
+    for received_at, _ in buffer:
+        latency = (now - received_at) * 1000
+        stats["latency_sum_ms"] += latency
+        stats["latency_max_ms"] = max(stats["latency_max_ms"], latency)
+    stats["emitted"] += len(buffer)
+    buffer.clear()
+
+async def _process(queue, filters, stats):
+    buffer = []
+    last_flush = time.time()
+    try:
+        while True:
+            timeout = max(0.0, FLUSH_INTERVAL - (time.time() - last_flush))
+            try:
+                received_at, raw = await asyncio.wait_for(queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                received_at = None
+            if received_at is not None:
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    stats["errors"] += 1
+                    data = None
+                if data and data.get("mint"):  # skip subscription acks
+                    stats["seen"] += 1
+                    event = to_event(data, received_at)
+                    for name, predicate in filters:
+                        if not predicate(event):
+                            stats["rejected"][name] = stats["rejected"].get(name, 0) + 1
+                            break
+                    else:
+                        stats["matched"] += 1
+                        buffer.append((received_at, event))
+            if len(buffer) >= FLUSH_BATCH or time.time() - last_flush >= FLUSH_INTERVAL:
+                _flush(buffer, stats)
+                last_flush = time.time()
+    finally:
+        _flush(buffer, stats)
+
+async def _report_stats(queue, stats):
+    last_seen = 0
+    last_at = time.time()
+    while True:
+        await asyncio.sleep(STATS_INTERVAL)
+        now = time.time()
+        print(json.dumps({
+            "type": "stats",
+            "rate_per_s": round((stats["seen"] - last_seen) / (now - last_at), 2),
+            "seen": stats["seen"],
+            "matched": stats["matched"],
+            "dropped": stats["dropped"],
+            "reconnects": stats["reconnects"],
+            "queue_depth": queue.qsize(),
+            "latency_ms_avg": round(stats["latency_sum_ms"] / stats["emitted"], 1) if stats["emitted"] else None,
+            "latency_ms_max": round(stats["latency_max_ms"], 1),
+        }), file=sys.stderr, flush=True)
+        last_seen, last_at = stats["seen"], now
+
 def cmd_watch(args):
     """Watch for new pump.fun launches via PumpPortal WebSocket.
 
-    Outputs events as JSONL to stdout. Runs for --duration seconds (default 300).
+    Outputs matching events as JSONL to stdout, then a summary line. Runs for
+    --duration seconds (default 300), reconnecting through network blips.
     """
     try:
-        import websockets
-        import asyncio
+        import websockets  # noqa: F401
     except ImportError:
         print(json.dumps({"error": "Missing websockets. Run: pip install websockets"}))
         sys.exit(1)
 
-    min_sol = args.min_sol or 0
-    max_age = args.max_age or 60  # seconds
+    try:
+        filters = build_filters(args)
+    except Exception as e:
+        print(json.dumps({"error": f"Invalid filter: {e}"}))
+        sys.exit(1)
     duration = args.duration or 300
 
+    stats = {"seen": 0, "matched": 0, "emitted": 0, "dropped": 0, "errors": 0, "reconnects": 0,
+             "rejected": {}, "latency_sum_ms": 0.0, "latency_max_ms": 0.0}
+
     async def _watch():
-        import websockets
-        async with websockets.connect(PUMPPORTAL_WS) as ws:
-            await ws.send(json.dumps({"method": "subscribeNewToken"}))
-            start = time.time()
-            seen = 0
-            matched = 0
-
-            while time.time() - start < duration:
-                try:
-                    msg = await asyncio.wait_for(ws.recv(), timeout=10)
-                    data = json.loads(msg)
-                    seen += 1
-
-                    market_cap = data.get("marketCapSol", 0)
-                    if market_cap >= min_sol:
-                        matched += 1
-                        event = {
-                            "type": "new_token",
-                            "mint": data.get("mint"),
-                            "name": data.get("name"),
-                            "symbol": data.get("symbol"),
-                            "creator": data.get("traderPublicKey"),
-                            "initial_buy_sol": data.get("initialBuy"),
-                            "market_cap_sol": market_cap,
-                        }
-                        print(json.dumps(event), flush=True)
-                except asyncio.TimeoutError:
-                    continue
-                except Exception as e:
-                    print(json.dumps({"error": str(e)[:100]}), flush=True)
-                    break
-
-            print(json.dumps({"type": "summary", "seen": seen, "matched": matched, "duration_s": int(time.time() - start)}))
-
-    asyncio.run(_watch())
+        queue = asyncio.Queue(maxsize=WATCH_QUEUE_SIZE)
+        start = time.time()
+        tasks = [
+            asyncio.ensure_future(_read_stream(queue, stats, start + duration)),
+            asyncio.ensure_future(_process(queue, filters, stats)),
+            asyncio.ensure_future(_report_stats(queue, stats)),
+        ]
+        await asyncio.wait(tasks, timeout=duration)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return int(time.time() - start)
+
+    elapsed = asyncio.run(_watch())
+    print(json.dumps({
+        "type": "summary",
+        "seen": stats["seen"],
+        "matched": stats["matched"],
+        "dropped": stats["dropped"],
+        "rejected": stats["rejected"],
+        "reconnects": stats["reconnects"],
+        "duration_s": elapsed,
+    }))
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="PumpPortal sniping")
@@ -299,7 +462,10 @@ if __name__ == "__main__":
 
     w = sub.add_parser("watch")
     w.add_argument("--min-sol", type=float)
-    w.add_argument("--max-age", type=int)
+    w.add_argument("--max-age", type=int, help="Drop launches older than this many seconds by the time they are processed")
+    w.add_argument("--allow-creator", action="append", help="Only creators in this comma-separated list (repeatable)")
+    w.add_argument("--deny-creator", action="append", help="Skip creators in this comma-separated list (repeatable)")
+    w.add_argument("--name-regex", help="Only tokens whose name or symbol matches (case-insensitive)")
     w.add_argument("--duration", type=int, default=300)
     w.add_argument("--json", action="store_true")
 
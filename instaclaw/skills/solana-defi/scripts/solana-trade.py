@@ -6,6 +6,7 @@ import json
 import os
 import sys
 import time
+from pathlib import Path
 
 try:
     import httpx
@@ -70,6 +71,176 @@ def classify_error(msg):
             return "transient"
     return "unknown"
 
+def _load_sibling(filename):
+    """Load a shared module deployed alongside this script (~/scripts/)."""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location(
+        filename[:-3].replace("-", "_"), Path(__file__).resolve().parent / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+_confirmation = _load_sibling("solana-confirm.py")  # signatureSubscribe raced against status polling
+ws_url_for = _confirmation.ws_url_for
+confirm_signature = _confirmation.confirm_signature
+
+# Trade pipeline: one pooled client (HTTP/2 when the h2 package is installed)
+# carries both Jupiter and RPC traffic, the buy-side balance check runs
+# alongside the first quote, and a stale blockhash re-quotes straight away —
+# the swap tx embeds the blockhash, so sleeping through BACKOFF only makes the
+# retry staler. A swap that was broadcast is only re-quoted once its blockhash
+# has expired AND the signature is confirmed not to have landed; if that can't
+# be checked, it is reported unconfirmed instead of re-sent. Each step's wall
+# time is reported under "latency_ms".
+
+STALE_BLOCKHASH_ERRORS = ["blockhash not found", "blockhash expired"]
+MAX_STALE_REQUOTES = 3
+
+_client = None
+
+def http_client():
+    """One pooled client per process for Jupiter and RPC calls."""
+    global _client
+    if _client is None:
+        try:
+            import h2  # noqa: F401 — httpx only negotiates HTTP/2 when this is installed
+            http2 = True
+        except ImportError:
+            http2 = False
+        _client = httpx.Client(timeout=15, http2=http2)
+    return _client
+
+def _timed(latency, step, fn, *args, **kwargs):
+    started = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        latency[step] = round((time.perf_counter() - started) * 1000, 1)
+
+def _rpc(rpc_url, method, params, timeout=10):
+    resp = http_client().post(rpc_url, json={
+        "jsonrpc": "2.0", "id": 1,
+        "method": method,
+        "params": params,
+    }, timeout=timeout)
+    return resp.json()
+
+def _get_quote(input_mint, output_mint, amount, slippage):
+    resp = http_client().get(f"{JUPITER_BASE}/quote", params={
+        "inputMint": input_mint,
+        "outputMint": output_mint,
+        "amount": str(amount),
+        "slippageBps": slippage,
+    })
+    if resp.status_code != 200:
+        raise Exception(f"Quote failed: {resp.text[:200]}")
+    return resp.json()
+
+def _build_swap(quote, wallet_address):
+    resp = http_client().post(f"{JUPITER_BASE}/swap", json={
+        "quoteResponse": quote,
+        "userPublicKey": wallet_address,
+        "wrapAndUnwrapSol": True,
+        "dynamicComputeUnitLimit": True,
+        "prioritizationFeeLamports": "auto",
+    })
+    if resp.status_code != 200:
+        raise Exception(f"Swap build failed: {resp.text[:200]}")
+    return resp.json()
+
+def _sign(swap_transaction, keypair):
+    import base64
+    tx = VersionedTransaction.from_bytes(base64.b64decode(swap_transaction))
+    signed_tx = VersionedTransaction(tx.message, [keypair])
+    return base64.b64encode(bytes(signed_tx)).decode("utf-8")
+
+def _send(rpc_url, signed_bytes):
+    send_result = _rpc(rpc_url, "sendTransaction",
+                       [signed_bytes, {"encoding": "base64", "skipPreflight": False, "maxRetries": 3}], timeout=30)
+    if "error" in send_result:
+        raise Exception(f"Send failed: {json.dumps(send_result['error'])[:200]}")
+    return send_result["result"]
+
+def _landed_status(rpc_url, signature):
+    """The signature's status after its blockhash expired: a status dict, or None if it never landed.
+
+    Raises if the RPC can't answer — the caller must not assume it didn't land.
+    """
+    result = _rpc(rpc_url, "getSignatureStatuses", [[signature], {"searchTransactionHistory": True}])
+    if "error" in result or "result" not in result:
+        raise Exception(f"Status check failed: {json.dumps(result.get('error'))[:200]}")
+    return (result["result"].get("value") or [None])[0]
+
+def execute_swap(rpc_url, env, wallet_address, keypair, quote, latency):
+    """Build, sign, send and confirm a swap for `quote`. Returns (signature, state)."""
+    swap_data = _timed(latency, "swap_build", _build_swap, quote, wallet_address)
+    signed_bytes = _timed(latency, "sign", _sign, swap_data["swapTransaction"], keypair)
+    signature = _timed(latency, "send", _send, rpc_url, signed_bytes)
+
+    # Wait for confirmation (websocket push, polling fallback, blockhash-expiry deadline).
+    # From here on the swap is broadcast: an error means "unconfirmed", not "retry".
+    try:
+        state, err = _timed(latency, "confirm", confirm_signature, rpc_url, signature,
+                            ws_url=ws_url_for(rpc_url, env),
+                            last_valid_block_height=swap_data.get("lastValidBlockHeight"))
+    except Exception:
+        return signature, "timeout"
+    if state == "failed":
+        raise Exception(f"Transaction failed on-chain: {err}")
+    if state == "expired":
+        try:
+            status = _timed(latency, "verify", _landed_status, rpc_url, signature)
+        except Exception:
+            return signature, "timeout"  # outcome unknown — never re-send on a guess
+        if status is None:
+            raise Exception(f"Blockhash expired before {signature} landed")
+        if status.get("err"):
+            raise Exception(f"Transaction failed on-chain: {status['err']}")
+        return signature, "confirmed" if status.get("confirmationStatus") in ("confirmed", "finalized") else "timeout"
+    return signature, state
+
+def is_stale_blockhash(msg):
+    lower = msg.lower()
+    return any(p in lower for p in STALE_BLOCKHASH_ERRORS)
+
+def run_swap(rpc_url, env, wallet_address, keypair, get_quote, latency, first_quote=None, started=None):
+    """Quote-and-swap with retries. `first_quote` may be a Future already in flight.
+
+    Returns (quote, signature, state, attempts). Exits with a JSON error once
+    retries are exhausted or the error is permanent.
+    """
+    attempt = 0
+    requotes = 0
+    started = started or time.perf_counter()
+    while True:
+        try:
+            if first_quote is not None:
+                pending, first_quote = first_quote, None
+                quote = pending.result()
+            else:
+                quote = _timed(latency, "quote", get_quote)
+            signature, state = execute_swap(rpc_url, env, wallet_address, keypair, quote, latency)
+            latency["total"] = round((time.perf_counter() - started) * 1000, 1)
+            return quote, signature, state, attempt + requotes + 1
+        except Exception as e:
+            err_class = classify_error(str(e))
+            if err_class != "permanent" and is_stale_blockhash(str(e)) and requotes < MAX_STALE_REQUOTES:
+                requotes += 1
+                continue
+            if err_class == "permanent" or attempt == MAX_RETRIES - 1:
+                latency["total"] = round((time.perf_counter() - started) * 1000, 1)
+                print(json.dumps({
+                    "error": str(e)[:200],
+                    "attempt": attempt + 1,
+                    "max_retries": MAX_RETRIES,
+                    "requotes": requotes,
+                    "error_class": err_class,
+                    "latency_ms": latency,
+                }))
+                sys.exit(1)
+            time.sleep(BACKOFF[attempt])
+            attempt += 1
+
 def cmd_quote(args):
     """Get a swap quote from Jupiter."""
     env = load_env()
@@ -78,18 +249,12 @@ def cmd_quote(args):
     amount_lamports = int(float(args.amount) * 1e9) if input_mint == SOL_MINT else int(float(args.amount) * 1e6)
     slippage = args.slippage or 100  # 1% default
 
-    resp = httpx.get(f"{JUPITER_BASE}/quote", params={
-        "inputMint": input_mint,
-        "outputMint": output_mint,
-        "amount": str(amount_lamports),
-        "slippageBps": slippage,
-    }, timeout=15)
-
-    if resp.status_code != 200:
-        print(json.dumps({"error": f"Quote failed: {resp.text[:200]}"}))
+    try:
+        quote = _get_quote(input_mint, output_mint, amount_lamports, slippage)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
         sys.exit(1)
 
-    quote = resp.json()
     out_amount = int(quote.get("outAmount", 0))
     price_impact = quote.get("priceImpactPct", "0")
 
@@ -105,6 +270,8 @@ def cmd_quote(args):
 
 def cmd_buy(args):
     """Buy a token with SOL via Jupiter."""
+    from concurrent.futures import ThreadPoolExecutor
+
     env = load_env()
     config = load_config()
 
@@ -132,100 +299,36 @@ def cmd_buy(args):
     amount_lamports = int(amount_sol * 1e9)
     slippage = args.slippage or 100
 
-    # Check balance first
-    bal_resp = httpx.post(rpc_url, json={
-        "jsonrpc": "2.0", "id": 1,
-        "method": "getBalance",
-        "params": [wallet_address]
-    }, timeout=10)
-    balance_lamports = bal_resp.json().get("result", {}).get("value", 0)
+    def get_quote():
+        return _get_quote(SOL_MINT, args.mint, amount_lamports, slippage)
+
+    # Balance check and first quote in parallel — the quote is the slow leg
+    latency = {}
+    started = time.perf_counter()
+    pool = ThreadPoolExecutor(max_workers=2)
+    quote_future = pool.submit(_timed, latency, "quote", get_quote)
+    balance_future = pool.submit(_timed, latency, "balance", _rpc, rpc_url, "getBalance", [wallet_address])
+    pool.shutdown(wait=False)
+
+    balance_lamports = balance_future.result().get("result", {}).get("value", 0)
     if balance_lamports < amount_lamports + 10_000_000:  # reserve 0.01 SOL for fees
         print(json.dumps({"error": f"Insufficient balance: {balance_lamports / 1e9:.4f} SOL (need {amount_sol + 0.01} SOL)"}))
         sys.exit(1)
 
-    for attempt in range(MAX_RETRIES):
-        try:
-            # Get quote
-            quote_resp = httpx.get(f"{JUPITER_BASE}/quote", params={
-                "inputMint": SOL_MINT,
-                "outputMint": args.mint,
-                "amount": str(amount_lamports),
-                "slippageBps": slippage,
-            }, timeout=15)
-            if quote_resp.status_code != 200:
-                raise Exception(f"Quote failed: {quote_resp.text[:200]}")
-            quote = quote_resp.json()
-
-            # Build swap tx
-            swap_resp = httpx.post(f"{JUPITER_BASE}/swap", json={
-                "quoteResponse": quote,
-                "userPublicKey": wallet_address,
-                "wrapAndUnwrapSol": True,
-                "dynamicComputeUnitLimit": True,
-                "prioritizationFeeLamports": "auto",
-            }, timeout=15)
-            if swap_resp.status_code != 200:
-                raise Exception(f"Swap build failed: {swap_resp.text[:200]}")
-            swap_data = swap_resp.json()
-
-            # Sign and send
-            import base64
-            tx_bytes = base64.b64decode(swap_data["swapTransaction"])
-            tx = VersionedTransaction.from_bytes(tx_bytes)
-            signed_tx = VersionedTransaction(tx.message, [keypair])
-            signed_bytes = base64.b64encode(bytes(signed_tx)).decode("utf-8")
-
-            send_resp = httpx.post(rpc_url, json={
-                "jsonrpc": "2.0", "id": 1,
-                "method": "sendTransaction",
-                "params": [signed_bytes, {"encoding": "base64", "skipPreflight": False, "maxRetries": 3}]
-            }, timeout=30)
-
-            send_result = send_resp.json()
-            if "error" in send_result:
-                raise Exception(f"Send failed: {json.dumps(send_result['error'])[:200]}")
-
-            signature = send_result["result"]
-
-            # Wait for confirmation
-            confirmed = False
-            for _ in range(15):
-                time.sleep(2)
-                status_resp = httpx.post(rpc_url, json={
-                    "jsonrpc": "2.0", "id": 1,
-                    "method": "getSignatureStatuses",
-                    "params": [[signature], {"searchTransactionHistory": True}]
-                }, timeout=10)
-                statuses = status_resp.json().get("result", {}).get("value", [None])
-                if statuses[0] and statuses[0].get("confirmationStatus") in ("confirmed", "finalized"):
-                    if statuses[0].get("err"):
-                        raise Exception(f"Transaction failed on-chain: {statuses[0]['err']}")
-                    confirmed = True
-                    break
-
-            out_amount = int(quote.get("outAmount", 0))
-            print(json.dumps({
-                "status": "success",
-                "action": "BUY",
-                "input_sol": amount_sol,
-                "output_amount": out_amount,
-                "output_mint": args.mint,
-                "signature": signature,
-                "confirmed": confirmed,
-            }))
-            return
-
-        except Exception as e:
-            err_class = classify_error(str(e))
-            if err_class == "permanent" or attempt == MAX_RETRIES - 1:
-                print(json.dumps({
-                    "error": str(e)[:200],
-                    "attempt": attempt + 1,
-                    "max_retries": MAX_RETRIES,
-                    "error_class": err_class,
-                }))
-                sys.exit(1)
-            time.sleep(BACKOFF[attempt])
+    quote, signature, state, attempts = run_swap(rpc_url, env, wallet_address, keypair, get_quote, latency,
+                                                 first_quote=quote_future, started=started)
+    out_amount = int(quote.get("outAmount", 0))
+    print(json.dumps({
+        "status": "success",
+        "action": "BUY",
+        "input_sol": amount_sol,
+        "output_amount": out_amount,
+        "output_mint": args.mint,
+        "signature": signature,
+        "confirmed": state == "confirmed",
+        "attempts": attempts,
+        "latency_ms": latency,
+    }))
 
 def cmd_sell(args):
     """Sell a token for SOL via Jupiter."""
@@ -242,17 +345,15 @@ def cmd_sell(args):
     keypair = Keypair.from_bytes(privkey_bytes)
     slippage = args.slippage or 100
 
-    # Get token balance
-    token_resp = httpx.post(rpc_url, json={
-        "jsonrpc": "2.0", "id": 1,
-        "method": "getTokenAccountsByOwner",
-        "params": [
-            wallet_address,
-            {"mint": args.mint},
-            {"encoding": "jsonParsed"}
-        ]
-    }, timeout=10)
-    accounts = token_resp.json().get("result", {}).get("value", [])
+    # Get token balance (the sell amount depends on it, so this one can't overlap the quote)
+    latency = {}
+    started = time.perf_counter()
+    token_result = _timed(latency, "balance", _rpc, rpc_url, "getTokenAccountsByOwner", [
+        wallet_address,
+        {"mint": args.mint},
+        {"encoding": "jsonParsed"}
+    ])
+    accounts = token_result.get("result", {}).get("value", [])
     if not accounts:
         print(json.dumps({"error": f"No token account found for mint {args.mint}"}))
         sys.exit(1)
@@ -269,63 +370,23 @@ def cmd_sell(args):
             print(json.dumps({"error": f"Insufficient token balance. Have: {token_amount}, want to sell: {sell_amount}"}))
             sys.exit(1)
 
-    for attempt in range(MAX_RETRIES):
-        try:
-            quote_resp = httpx.get(f"{JUPITER_BASE}/quote", params={
-                "inputMint": args.mint,
-                "outputMint": SOL_MINT,
-                "amount": str(sell_amount),
-                "slippageBps": slippage,
-            }, timeout=15)
-            if quote_resp.status_code != 200:
-                raise Exception(f"Quote failed: {quote_resp.text[:200]}")
-            quote = quote_resp.json()
-
-            swap_resp = httpx.post(f"{JUPITER_BASE}/swap", json={
-                "quoteResponse": quote,
-                "userPublicKey": wallet_address,
-                "wrapAndUnwrapSol": True,
-                "dynamicComputeUnitLimit": True,
-                "prioritizationFeeLamports": "auto",
-            }, timeout=15)
-            if swap_resp.status_code != 200:
-                raise Exception(f"Swap build failed: {swap_resp.text[:200]}")
-            swap_data = swap_resp.json()
-
-            import base64
-            tx_bytes = base64.b64decode(swap_data["swapTransaction"])
-            tx = VersionedTransaction.from_bytes(tx_bytes)
-            signed_tx = VersionedTransaction(tx.message, [keypair])
-            signed_bytes = base64.b64encode(bytes(signed_tx)).decode("utf-8")
-
-            send_resp = httpx.post(rpc_url, json={
-                "jsonrpc": "2.0", "id": 1,
-                "method": "sendTransaction",
-                "params": [signed_bytes, {"encoding": "base64", "skipPreflight": False, "maxRetries": 3}]
-            }, timeout=30)
-            send_result = send_resp.json()
-            if "error" in send_result:
-                raise Exception(f"Send failed: {json.dumps(send_result['error'])[:200]}")
-
-            signature = send_result["result"]
-            out_amount = int(quote.get("outAmount", 0))
-
-            print(json.dumps({
-                "status": "success",
-                "action": "SELL",
-                "input_amount": sell_amount,
-                "input_mint": args.mint,
-                "output_sol": out_amount / 1e9,
-                "signature": signature,
-            }))
-            return
+    def get_quote():
+        return _get_quote(args.mint, SOL_MINT, sell_amount, slippage)
 
-        except Exception as e:
-            err_class = classify_error(str(e))
-            if err_class == "permanent" or attempt == MAX_RETRIES - 1:
-                print(json.dumps({"error": str(e)[:200], "attempt": attempt + 1, "error_class": err_class}))
-                sys.exit(1)
-            time.sleep(BACKOFF[attempt])
+    quote, signature, state, attempts = run_swap(rpc_url, env, wallet_address, keypair, get_quote, latency,
+                                                 started=started)
+    out_amount = int(quote.get("outAmount", 0))
+    print(json.dumps({
+        "status": "success",
+        "action": "SELL",
+        "input_amount": sell_amount,
+        "input_mint": args.mint,
+        "output_sol": out_amount / 1e9,
+        "signature": signature,
+        "confirmed": state == "confirmed",
+        "attempts": attempts,
+        "latency_ms": latency,
+    }))
 
 def cmd_limits(args):
     """Show current trading limits."""